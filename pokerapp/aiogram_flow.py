@@ -17,7 +17,6 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
-import hashlib
 import json
 import logging
 from functools import wraps
@@ -51,7 +50,9 @@ from pokerapp.config import get_game_constants
 from pokerapp.pokerbotview import CallbackTokenManager
 from pokerapp.player_manager import PlayerManager
 from pokerapp.translations import translate
+from pokerapp.utils.fingerprint import content_fingerprint
 from pokerapp.utils.messaging_service import MessagingService
+from pokerapp.utils.rate_limiter import TelegramPermitLimiter
 from pokerapp.utils.request_metrics import RequestCategory
 
 if TYPE_CHECKING:  # pragma: no cover - used only for static analysis
@@ -471,15 +472,7 @@ def _serialize_markup(markup: Any) -> str:
 
 
 def _content_hash(text: Optional[str], reply_markup: Any) -> str:
-    payload = json.dumps(
-        {
-            "text": text or "",
-            "reply_markup": _canonicalise_markup(reply_markup),
-        },
-        sort_keys=True,
-        ensure_ascii=False,
-    )
-    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return content_fingerprint(text, reply_markup)
 
 
 class RequestManager:
@@ -492,6 +485,7 @@ class RequestManager:
         cache_ttl: int = 3,
         cache_maxsize: int = 500,
         queue_delay: float = 0.075,
+        rate_limiter: Optional[TelegramPermitLimiter] = None,
     ) -> None:
         self._bot = bot
         self._cache: TTLCache[tuple[int, int, str], bool] = TTLCache(
@@ -501,10 +495,13 @@ class RequestManager:
         self._cache_lock = asyncio.Lock()
         self._locks: Dict[tuple[int, int], asyncio.Lock] = {}
         self._locks_guard = asyncio.Lock()
-        self._queue: asyncio.Queue[Optional[tuple[asyncio.Future, Any]]] = (
-            asyncio.Queue()
-        )
+        self._queue: asyncio.Queue[
+            Optional[tuple[asyncio.Future, Any, tuple[int, Optional[int], RequestCategory]]]
+        ] = asyncio.Queue()
         self._queue_delay = max(0.0, queue_delay)
+        # The worker waits for a shared permit right before each call,
+        # replacing the fixed delay between requests.
+        self._rate_limiter = rate_limiter
         self._worker: Optional[asyncio.Task] = None
 
     def _log_extra(
@@ -559,6 +556,7 @@ class RequestManager:
         chat_id: int,
         text: Optional[str],
         reply_markup: Any = None,
+        request_category: RequestCategory = RequestCategory.GENERAL,
         **params: Any,
     ) -> Optional[Message]:
         if not _has_visible_text(text):
@@ -612,9 +610,9 @@ class RequestManager:
                     await self._remember(chat_id, int(message_id), text, reply_markup)
                 return message
 
-        await self._queue.put((future, _execute))
-        await self.start()
-        return await future
+        return await self._enqueue(
+            future, _execute, chat_id=chat_id, category=request_category
+        )
 
     async def edit_message_text(
         self,
@@ -624,6 +622,7 @@ class RequestManager:
         text: Optional[str],
         reply_markup: Any = None,
         skip_cache: bool = False,
+        request_category: RequestCategory = RequestCategory.GENERAL,
         **params: Any,
     ) -> Optional[int]:
         if not _has_visible_text(text):
@@ -710,9 +709,13 @@ class RequestManager:
                     return int(result.message_id)
                 return message_id
 
-        await self._queue.put((future, _execute))
-        await self.start()
-        return await future
+        return await self._enqueue(
+            future,
+            _execute,
+            chat_id=chat_id,
+            message_id=message_id,
+            category=request_category,
+        )
 
     async def edit_message_reply_markup(
         self,
@@ -721,6 +724,7 @@ class RequestManager:
         message_id: int,
         reply_markup: Any = None,
         skip_cache: bool = False,
+        request_category: RequestCategory = RequestCategory.GENERAL,
         **params: Any,
     ) -> bool:
         payload_hash = _content_hash(None, reply_markup)
@@ -791,9 +795,13 @@ class RequestManager:
                 await self._remember(chat_id, message_id, None, reply_markup)
                 return True
 
-        await self._queue.put((future, _execute))
-        await self.start()
-        return await future
+        return await self._enqueue(
+            future,
+            _execute,
+            chat_id=chat_id,
+            message_id=message_id,
+            category=request_category,
+        )
 
     async def safe_edit_message(
         self,
@@ -803,6 +811,7 @@ class RequestManager:
         text: Optional[str],
         reply_markup: Any = None,
         skip_cache: bool = False,
+        request_category: RequestCategory = RequestCategory.GENERAL,
         **params: Any,
     ) -> Optional[int]:
         """Edit message text and markup together while avoiding duplicates."""
@@ -833,6 +842,7 @@ class RequestManager:
             text=text,
             reply_markup=reply_markup,
             skip_cache=skip_cache,
+            request_category=request_category,
             **params,
         )
 
@@ -841,6 +851,7 @@ class RequestManager:
         *,
         chat_id: int,
         message_id: int,
+        request_category: RequestCategory = RequestCategory.DELETE,
         **params: Any,
     ) -> bool:
         future: asyncio.Future = asyncio.get_running_loop().create_future()
@@ -873,7 +884,20 @@ class RequestManager:
                 await self._forget(chat_id, message_id)
                 return True
 
-        await self._queue.put((future, _execute))
+        return await self._enqueue(
+            future, _execute, chat_id=chat_id, category=request_category
+        )
+
+    async def _enqueue(
+        self,
+        future: asyncio.Future,
+        action: Callable[[], Awaitable[Any]],
+        *,
+        chat_id: int,
+        message_id: Optional[int] = None,
+        category: RequestCategory = RequestCategory.GENERAL,
+    ) -> Any:
+        await self._queue.put((future, action, (chat_id, message_id, category)))
         await self.start()
         return await future
 
@@ -883,9 +907,13 @@ class RequestManager:
             if item is None:
                 self._queue.task_done()
                 break
-            future, action = item
+            future, action, (chat_id, message_id, category) = item
             try:
-                if self._queue_delay:
+                if self._rate_limiter is not None:
+                    await self._rate_limiter.acquire(
+                        chat_id, message_id=message_id, category=category
+                    )
+                elif self._queue_delay:
                     await asyncio.sleep(self._queue_delay)
                 result = await action()
                 if not future.done():
@@ -935,7 +963,12 @@ class RequestManager:
 
 
 class PokerMessagingOrchestrator:
-    """Coordinate anchor messages, turn updates and seat voting."""
+    """Coordinate anchor messages, turn updates and seat voting.
+
+    Build it through ``ApplicationServices.messaging_orchestrator_factory``
+    so its :class:`RequestManager` draws from the bot's shared
+    :class:`TelegramPermitLimiter`.
+    """
 
     def __init__(
         self,
@@ -944,6 +977,7 @@ class PokerMessagingOrchestrator:
         chat_id: int,
         max_seats: int = 8,
         queue_delay: float = 0.075,
+        rate_limiter: Optional[TelegramPermitLimiter] = None,
     ) -> None:
         self.chat_id = chat_id
         self.state = GameState.WAITING
@@ -951,6 +985,7 @@ class PokerMessagingOrchestrator:
         self._request_manager = RequestManager(
             bot,
             queue_delay=queue_delay,
+            rate_limiter=rate_limiter,
         )
         self._anchors: Dict[int, AnchorMessage] = {}
         self._turn_message_id: Optional[int] = None
@@ -1250,6 +1285,7 @@ class PokerMessagingOrchestrator:
             message_id=anchor.message_id,
             text=anchor.base_text,
             reply_markup=markup,
+            request_category=RequestCategory.ANCHOR,
         )
 
     async def update_turn_state(self, *, countdown_tick: bool = False, **updates: Any) -> None:
@@ -1355,6 +1391,11 @@ class PokerMessagingOrchestrator:
                         message_id=message_id,
                         text=pending.text,
                         reply_markup=pending.reply_markup,
+                        request_category=(
+                            RequestCategory.COUNTDOWN
+                            if pending.countdown_tick
+                            else RequestCategory.TURN
+                        ),
                     )
                     self._turn_update_cache[key] = True
         finally:
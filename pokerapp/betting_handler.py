@@ -361,7 +361,8 @@ class BettingHandler:
         getter = getattr(self._locks, "get_lock_queue_depth", None)
         if getter is None:
             return 0
-        result = getter(chat_id)
+        # Waiters on acquire_table_write_lock are counted under this key.
+        result = getter(f"table_write:{chat_id}")
         if asyncio.iscoroutine(result):
             return await result
         try:
@@ -22,6 +22,7 @@ from pokerapp.query_optimizer import QueryBatcher
 from pokerapp.table_manager import TableManager
 from pokerapp.translations import init_translations
 from pokerapp.utils.messaging_service import MessagingService
+from pokerapp.utils.rate_limiter import TelegramPermitLimiter
 from pokerapp.utils.redis_safeops import RedisSafeOps
 from pokerapp.utils.request_metrics import RequestMetrics
 from pokerapp.utils.telegram_safeops import TelegramSafeOps
@@ -34,6 +35,7 @@ from pokerapp.telegram_retry_manager import TelegramRetryManager
 from pokerapp.database_schema import Base as StatisticsBase
 
 if TYPE_CHECKING:
+    from pokerapp.aiogram_flow import PokerMessagingOrchestrator
     from pokerapp.lock_manager import LockManager as SmartLockManager
 
 
@@ -77,6 +79,8 @@ class ApplicationServices:
     private_match_service: PrivateMatchService
     messaging_service_factory: Callable[..., MessagingService]
     telegram_safeops_factory: Callable[..., TelegramSafeOps]
+    messaging_orchestrator_factory: Callable[..., "PokerMessagingOrchestrator"]
+    rate_limiter: TelegramPermitLimiter
     retry_manager: TelegramRetryManager
     stats_buffer: Optional[StatsBatchBuffer]
     cache: MultiLayerCache
@@ -515,6 +519,11 @@ def build_services(cfg: Config, *, skip_stats_buffer: bool = False) -> Applicati
         logger_=_make_service_logger(logger, "metrics", "metrics")
     )
 
+    rate_limiter = TelegramPermitLimiter(
+        chat_per_minute=cfg.RATE_LIMIT_PER_MINUTE,
+        logger_=_make_service_logger(logger, "rate_limiter", "messaging"),
+    )
+
     private_match_service = PrivateMatchService(
         kv_async,
         table_manager,
@@ -546,6 +555,7 @@ def build_services(cfg: Config, *, skip_stats_buffer: bool = False) -> Applicati
             table_manager=table_manager,
             retry_manager=retry_manager,
             redis_ops=redis_ops,
+            rate_limiter=rate_limiter,
         )
 
     def telegram_safeops_factory(*, view) -> TelegramSafeOps:
@@ -558,6 +568,19 @@ def build_services(cfg: Config, *, skip_stats_buffer: bool = False) -> Applicati
             base_delay=cfg.TELEGRAM_RETRY_BASE_DELAY,
             max_delay=cfg.TELEGRAM_RETRY_MAX_DELAY,
             backoff_multiplier=cfg.TELEGRAM_RETRY_MULTIPLIER,
+            rate_limiter=rate_limiter,
+        )
+
+    def messaging_orchestrator_factory(
+        *, bot, chat_id: int, max_seats: int = 8
+    ) -> "PokerMessagingOrchestrator":
+        from pokerapp.aiogram_flow import PokerMessagingOrchestrator
+
+        return PokerMessagingOrchestrator(
+            bot=bot,
+            chat_id=chat_id,
+            max_seats=max_seats,
+            rate_limiter=rate_limiter,
         )
 
     return ApplicationServices(
@@ -572,6 +595,8 @@ def build_services(cfg: Config, *, skip_stats_buffer: bool = False) -> Applicati
         private_match_service=private_match_service,
         messaging_service_factory=messaging_service_factory,
         telegram_safeops_factory=telegram_safeops_factory,
+        messaging_orchestrator_factory=messaging_orchestrator_factory,
+        rate_limiter=rate_limiter,
         retry_manager=retry_manager,
         stats_buffer=stats_buffer,
         cache=cache,
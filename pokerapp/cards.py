@@ -1,49 +1,139 @@
 #!/usr/bin/env python3
 
 import random
-from typing import List
+from typing import Dict, Iterable, List, Optional, Tuple
+
+RANKS: Tuple[str, ...] = (
+    "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A",
+)
+SUITS: Tuple[str, ...] = ("♥", "♦", "♣", "♠")
+
+# Alternative glyphs map onto the canonical suit for index/mask purposes.
+_SUIT_ALIASES: Dict[str, str] = {"♡": "♥", "♢": "♦", "♧": "♣", "♤": "♠"}
+_FACE_VALUES: Dict[str, int] = {"J": 11, "Q": 12, "K": 13, "A": 14}
 
 
 class Card(str):
-    @property
-    def suit(self) -> str:
-        return self[-1:]
-
-    @property
-    def rank(self) -> str:
-        return self[:-1]
-
-    @property
-    def value(self) -> str:
-        if self[0] == "J":
-            return 11
-        elif self[0] == "Q":
-            return 12
-        elif self[0] == "K":
-            return 13
-        elif self[0] == "A":
-            return 14
-        return int(self[:-1])
+    """
+    A playing card such as ``"A♠"``.
+
+    Cards remain ``str`` instances so rendering and persistence keep working,
+    but the 52 canonical cards are interned in a table and carry their rank,
+    suit, numeric value, deck index and 52-bit mask as precomputed slots.
+    """
+
+    __slots__ = ("rank", "suit", "value", "index", "mask")
+
+    def __new__(cls, text: str) -> "Card":
+        if cls is Card:
+            card = _CARD_TABLE.get(text)
+            if card is not None:
+                return card
+        card = str.__new__(cls, text)
+        card._populate()
+        return card
+
+    def _populate(self) -> None:
+        rank = self[:-1]
+        suit = self[-1:]
+        if rank in _FACE_VALUES:
+            value = _FACE_VALUES[rank]
+        else:
+            try:
+                value = int(rank)
+            except ValueError:
+                raise ValueError(f"Invalid card: {str(self)!r}") from None
+        self.rank = rank
+        self.suit = suit
+        self.value = value
+        canonical_suit = _SUIT_ALIASES.get(suit, suit)
+        if rank in RANKS and canonical_suit in SUITS:
+            index = SUITS.index(canonical_suit) * len(RANKS) + RANKS.index(rank)
+            mask = 1 << index
+        else:
+            index = -1
+            mask = 0
+        self.index = index
+        self.mask = mask
+
+    def __getattr__(self, name: str):
+        # Instances restored through ``copyreg._reconstructor`` (pickle
+        # protocols 0 and 1) bypass ``__new__`` and arrive with empty slots.
+        if name in Card.__slots__:
+            self._populate()
+            return object.__getattribute__(self, name)
+        raise AttributeError(name)
+
+    def __reduce__(self):
+        return (Card, (str(self),))
 
 
 Cards = List[Card]
 
+# Populated right after the deck is built; ``Card.__new__`` consults it.
+_CARD_TABLE: Dict[str, Card] = {}
+_DECK: Tuple[Card, ...] = tuple(
+    Card(rank + suit) for suit in SUITS for rank in RANKS
+)
+_CARD_TABLE.update((str(card), card) for card in _DECK)
+
+
+def card_from_index(index: int) -> Card:
+    """Return the interned card at ``index`` in canonical deck order."""
+
+    return _DECK[index]
+
+
+def to_card(value: object) -> Optional[Card]:
+    """Coerce a legacy card representation into an interned :class:`Card`.
+
+    Accepts ``Card`` instances, plain strings such as ``"A♠"`` (as stored by
+    older snapshots) and deck indexes. Returns ``None`` for unusable values.
+    """
+
+    if isinstance(value, Card):
+        if type(value) is Card and _CARD_TABLE.get(str(value)) is value:
+            return value
+        value = str(value)
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        if 0 <= value < len(_DECK):
+            return _DECK[value]
+        return None
+    if isinstance(value, str):
+        try:
+            return Card(value)
+        except ValueError:
+            return None
+    return None
+
+
+def to_cards(values: Optional[Iterable[object]]) -> Cards:
+    """Coerce a sequence of legacy card values, dropping unusable entries."""
+
+    if not values:
+        return []
+    cards: Cards = []
+    for value in values:
+        card = to_card(value)
+        if card is not None:
+            cards.append(card)
+    return cards
+
+
+def cards_mask(cards: Iterable[Card]) -> int:
+    """Return the combined 52-bit mask of ``cards``."""
+
+    mask = 0
+    for card in cards:
+        mask |= card.mask
+    return mask
+
 
 def get_cards() -> Cards:
-    cards = [
-        Card("2♥"), Card("3♥"), Card("4♥"), Card("5♥"),
-        Card("6♥"), Card("7♥"), Card("8♥"), Card("9♥"),
-        Card("10♥"), Card("J♥"), Card("Q♥"), Card("K♥"),
-        Card("A♥"), Card("2♦"), Card("3♦"), Card("4♦"),
-        Card("5♦"), Card("6♦"), Card("7♦"), Card("8♦"),
-        Card("9♦"), Card("10♦"), Card("J♦"), Card("Q♦"),
-        Card("K♦"), Card("A♦"), Card("2♣"), Card("3♣"),
-        Card("4♣"), Card("5♣"), Card("6♣"), Card("7♣"),
-        Card("8♣"), Card("9♣"), Card("10♣"), Card("J♣"),
-        Card("Q♣"), Card("K♣"), Card("A♣"), Card("2♠"),
-        Card("3♠"), Card("4♠"), Card("5♠"), Card("6♠"),
-        Card("7♠"), Card("8♠"), Card("9♠"), Card("10♠"),
-        Card("J♠"), Card("Q♠"), Card("K♠"), Card("A♠"),
-    ]
+    """Return a freshly shuffled deck built from the interned card table."""
+
+    cards = list(_DECK)
     random.SystemRandom().shuffle(cards)
     return cards
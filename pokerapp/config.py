@@ -113,7 +113,18 @@ _DEFAULT_SYSTEM_CONSTANTS_DATA: Dict[str, Any] = {
         "rollout_percentage": 0,
         "enable_hierarchy_enforcement": True,
         "enable_duplicate_detection": True,
+        "enable_deadlock_detection": True,
         "enable_stack_trace_logging": True,
+        "stack_trace_sample_rate": 64,
+        "max_lock_objects": 20000,
+        "lease_ttl_seconds": 5,
+        "contention_profile_sample_rate": 0,
+    },
+    "desk_image": {
+        "format": "PNG",
+        "quality": 80,
+        "palette": False,
+        "compress_level": 6,
     },
 }
 
@@ -495,6 +506,12 @@ DEFAULT_WEBHOOK_PATH = _SYSTEM_CONSTANTS["default_webhook_path"]
 DEFAULT_RATE_LIMIT_PER_SECOND = _SYSTEM_CONSTANTS["default_rate_limit_per_second"]
 DEFAULT_RATE_LIMIT_PER_MINUTE = _SYSTEM_CONSTANTS["default_rate_limit_per_minute"]
 DEFAULT_TIMEZONE_NAME = _SYSTEM_CONSTANTS["default_timezone_name"]
+# Board image encoding; ``format`` is PNG (optionally ``palette``-quantised)
+# or WEBP, where ``quality`` applies.
+DESK_IMAGE_SETTINGS: Dict[str, Any] = {
+    **_DEFAULT_SYSTEM_CONSTANTS_DATA["desk_image"],
+    **(_SYSTEM_CONSTANTS.get("desk_image") or {}),
+}
 
 
 GAME_CONSTANTS = GameConstants()
@@ -3,15 +3,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from io import BytesIO
 from pathlib import Path
 from threading import Lock
+from typing import Any, Dict, Optional
 
 from cachetools import LRUCache
 from PIL import Image
 
-from pokerapp.cards import Cards, Card
+from pokerapp.cards import RANKS, SUITS, Cards, Card, card_from_index
+
+_FORMAT_EXTENSIONS: Dict[str, str] = {"PNG": "png", "WEBP": "webp"}
 
 
 class DeskImageGenerator:
@@ -20,6 +24,12 @@ class DeskImageGenerator:
         card_assets: Path = Path("./assets/cards"),
         card_size=(84, 128),
         padding=10,
+        *,
+        image_format: str = "PNG",
+        quality: int = 80,
+        palette: bool = False,
+        compress_level: int = 6,
+        preload: bool = True,
     ):
         self._card_assets = card_assets
         self._file_suit_mapping = {
@@ -30,34 +40,105 @@ class DeskImageGenerator:
         }
         self._card_size = card_size
         self._loaded_card_imgs = {}
+        self._card_imgs_lock = Lock()
         self._padding = padding
+        self._format = str(image_format).upper()
+        if self._format not in _FORMAT_EXTENSIONS:
+            raise ValueError(f"Unsupported desk image format: {image_format!r}")
+        self._quality = max(1, min(100, int(quality)))
+        self._palette = bool(palette) and self._format == "PNG"
+        self._compress_level = max(0, min(9, int(compress_level)))
         self._desk_cache: LRUCache[tuple[Card, ...], bytes] = LRUCache(maxsize=64)
         self._desk_cache_lock = Lock()
         self._logger = logging.getLogger(__name__).getChild("desk_cache")
+        # Every card pre-resized to RGBA by index, so boards paste without
+        # converting.
+        self._card_tiles: Dict[int, Image.Image] = {}
+        self._blank_desks: Dict[int, Image.Image] = {}
+        if preload:
+            self.preload_cards()
+
+    @property
+    def render_variant(self) -> str:
+        """Identify the rendering settings so cached uploads can be keyed on them."""
+
+        width, height = self._card_size
+        variant = f"{self.file_extension}{width}x{height}p{self._padding}"
+        if self._format == "WEBP":
+            variant += f"q{self._quality}"
+        elif self._palette:
+            variant += "pal"
+        return variant
+
+    @property
+    def file_extension(self) -> str:
+        return _FORMAT_EXTENSIONS[self._format]
 
     def _get_file_name(self, card: Card) -> Path:
         return self._card_assets.joinpath(
             card.rank + self._file_suit_mapping[card.suit] + ".jpg",
         )
 
+    def preload_cards(self) -> int:
+        """Load and resize every card into a ready-to-paste RGBA tile.
+
+        Returns the number of cards loaded. Cards whose asset is missing are
+        left out and fall back to :meth:`_load_card_image`.
+        """
+
+        if not self._card_assets.is_dir():
+            self._logger.debug(
+                "Card assets not found; skipping preload",
+                extra={"card_assets": str(self._card_assets)},
+            )
+            return 0
+
+        tiles: Dict[int, Image.Image] = {}
+        for index in range(len(RANKS) * len(SUITS)):
+            card = card_from_index(index)
+            try:
+                with Image.open(self._get_file_name(card)) as im:
+                    tiles[index] = im.convert("RGBA").resize(self._card_size)
+            except OSError:
+                self._logger.warning(
+                    "Card asset missing from preload", extra={"card": str(card)}
+                )
+
+        self._card_tiles = tiles
+        return len(tiles)
+
     def _load_card_image(self, card: Card) -> Image:
-        if card in self._loaded_card_imgs:
-            return self._loaded_card_imgs[card]
+        tile = self._card_tiles.get(card.index)
+        if tile is not None:
+            return tile
+
+        with self._card_imgs_lock:
+            if card in self._loaded_card_imgs:
+                return self._loaded_card_imgs[card]
 
-        im_file = self._get_file_name(card)
-        im = Image.open(im_file)
-        im = im.resize(self._card_size)
+            im_file = self._get_file_name(card)
+            im = Image.open(im_file)
+            im = im.resize(self._card_size)
 
-        self._loaded_card_imgs[card] = im
+            self._loaded_card_imgs[card] = im
 
         return im
 
+    def _blank_desk(self, count: int) -> Image.Image:
+        """Return a transparent canvas for ``count`` cards (copied per board)."""
+
+        blank = self._blank_desks.get(count)
+        if blank is None:
+            padding_horizontal = self._padding * max(count - 1, 0)
+            blank = Image.new(mode="RGBA", size=(
+                self._card_size[0] * count + padding_horizontal,
+                self._card_size[1],
+            ), color=(255, 255, 255, 0))
+            self._blank_desks[count] = blank
+        return blank
+
     def generate_desk(self, cards: Cards) -> Image:
-        padding_horizontal = self._padding * (len(cards) - 1)
-        desk_im = Image.new(mode="RGBA", size=(
-            self._card_size[0] * len(cards) + padding_horizontal,
-            self._card_size[1],
-        ), color=(255, 255, 255, 0))
+        desk_im = self._blank_desk(len(cards)).copy()
 
         offset_x = 0
 
@@ -69,24 +150,48 @@ class DeskImageGenerator:
 
         return desk_im
 
-    def render_cached_png(self, cards: Cards) -> bytes:
-        """Return a PNG rendering of ``cards`` using an LRU cache."""
+    def encode(self, image: Image.Image) -> bytes:
+        """Encode ``image`` with the configured format and quality."""
 
-        key = tuple(cards)
+        options: Dict[str, Any]
+        if self._format == "WEBP":
+            options = {"quality": self._quality}
+        else:
+            options = {"compress_level": self._compress_level}
+            if self._palette:
+                image = image.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+        buffer = BytesIO()
+        image.save(buffer, self._format, **options)
+        return buffer.getvalue()
+
+    def _cached(self, key: tuple[Card, ...]) -> Optional[bytes]:
         with self._desk_cache_lock:
             cached = self._desk_cache.get(key)
-            if cached is not None:
-                self._logger.debug(
-                    "Desk image cache hit", extra={"cards_count": len(key)}
-                )
-                return cached
-        image = self.generate_desk(cards)
-        buffer = BytesIO()
-        image.save(buffer, "PNG")
-        data = buffer.getvalue()
+        if cached is not None:
+            self._logger.debug(
+                "Desk image cache hit", extra={"cards_count": len(key)}
+            )
+        return cached
+
+    def render_cached_image(self, cards: Cards) -> bytes:
+        """Return the encoded rendering of ``cards`` using an LRU cache."""
+
+        key = tuple(cards)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        data = self.encode(self.generate_desk(cards))
         with self._desk_cache_lock:
             self._desk_cache[key] = data
             self._logger.debug(
                 "Desk image cache store", extra={"cards_count": len(key)}
             )
         return data
+
+    async def render_image(self, cards: Cards) -> bytes:
+        """Like :meth:`render_cached_image` but renders on a worker thread."""
+
+        cached = self._cached(tuple(cards))
+        if cached is not None:
+            return cached
+        return await asyncio.to_thread(self.render_cached_image, cards)
@@ -182,6 +182,9 @@ class Game:
         self.turn_message_id: Optional[MessageId] = None
         self.turn_deadline: Optional[float] = None
 
+        # تعداد کارت‌های میز در لحظه‌ای که شرط‌بندی با آل‌این بسته شد
+        self.all_in_board_size: Optional[int] = None
+
         # 🆕 اضافه شده: پیام تصویر میز
         self.board_message_id: Optional[MessageId] = None
 
@@ -0,0 +1,312 @@
+"""All-in equity calculation built on :class:`WinnerDetermination`."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import multiprocessing
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from cachetools import LRUCache
+
+from pokerapp.cards import Card, Cards, card_from_index
+from pokerapp.config import get_game_constants
+from pokerapp.winnerdetermination import WinnerDetermination
+
+_RANK_COUNT = 13
+_SUIT_COUNT = 4
+_DECK_SIZE = _RANK_COUNT * _SUIT_COUNT
+_BOARD_SIZE = 5
+_SUIT_PERMUTATIONS: Tuple[Tuple[int, ...], ...] = tuple(
+    itertools.permutations(range(_SUIT_COUNT))
+)
+
+# (hole card indexes per player, board indexes, dead card indexes)
+EquityKey = Tuple[Tuple[Tuple[int, ...], ...], Tuple[int, ...], Tuple[int, ...]]
+
+_EQUITY_CONSTANTS: Mapping[str, Any] = get_game_constants().game.get("equity", {}) or {}
+
+
+def _config_int(key: str, default: int) -> int:
+    try:
+        value = int(_EQUITY_CONSTANTS.get(key, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+# Monte-Carlo budget for equities priced at showdown, where the result message
+# waits on it; the full ``monte_carlo_samples`` budget is too slow for that.
+SHOWDOWN_SAMPLES = _config_int("showdown_samples", 600)
+
+
+def _card_indexes(cards: Iterable[Card]) -> Tuple[int, ...]:
+    indexes = []
+    for card in cards:
+        index = Card(card).index
+        if index < 0:
+            raise ValueError(f"Unsupported card for equity calculation: {card!r}")
+        indexes.append(index)
+    return tuple(indexes)
+
+
+def _relabel(indexes: Tuple[int, ...], permutation: Tuple[int, ...]) -> Tuple[int, ...]:
+    return tuple(
+        sorted(
+            permutation[index // _RANK_COUNT] * _RANK_COUNT + index % _RANK_COUNT
+            for index in indexes
+        )
+    )
+
+
+def canonical_equity_key(
+    hole_cards: Sequence[Cards],
+    board: Sequence[Card] = (),
+    dead_cards: Sequence[Card] = (),
+) -> EquityKey:
+    """Return a key shared by all suit-isomorphic variants of a spot.
+
+    Cards inside each hand, the board and the dead cards are unordered, and
+    relabelling suits never changes equity, so the key is the smallest
+    encoding over all 24 suit permutations. Player order is preserved.
+    """
+
+    hands = [_card_indexes(hand) for hand in hole_cards]
+    board_indexes = _card_indexes(board)
+    dead_indexes = _card_indexes(dead_cards)
+
+    best: Optional[EquityKey] = None
+    for permutation in _SUIT_PERMUTATIONS:
+        candidate: EquityKey = (
+            tuple(_relabel(hand, permutation) for hand in hands),
+            _relabel(board_indexes, permutation),
+            _relabel(dead_indexes, permutation),
+        )
+        if best is None or candidate < best:
+            best = candidate
+    assert best is not None
+    return best
+
+
+def _runout_count(key: EquityKey) -> Tuple[List[int], int, int]:
+    hands, board, dead = key
+    used = set(board).union(dead)
+    for hand in hands:
+        used.update(hand)
+    deck = [index for index in range(_DECK_SIZE) if index not in used]
+    missing = _BOARD_SIZE - len(board)
+    return deck, missing, math.comb(len(deck), missing) if missing > 0 else 1
+
+
+_WORKER_DETERMINATION: Optional[WinnerDetermination] = None
+
+
+def compute_equity(
+    key: EquityKey,
+    *,
+    samples: int,
+    seed: int,
+    exact_limit: int,
+    determination: Optional[WinnerDetermination] = None,
+) -> Tuple[float, ...]:
+    """Compute per-player equity for ``key``.
+
+    Every runout is enumerated when there are at most ``exact_limit`` of
+    them; otherwise ``samples`` runouts are drawn with a ``seed``-ed RNG.
+    This is a module-level function so it can run in a worker process.
+    """
+
+    global _WORKER_DETERMINATION
+    if determination is None:
+        if _WORKER_DETERMINATION is None:
+            _WORKER_DETERMINATION = WinnerDetermination()
+        determination = _WORKER_DETERMINATION
+
+    hands, board_indexes, _ = key
+    if len(hands) < 2:
+        return tuple(1.0 for _ in hands)
+
+    deck, missing, total = _runout_count(key)
+    hole_cards = {
+        player: [card_from_index(index) for index in hand]
+        for player, hand in enumerate(hands)
+    }
+    board = [card_from_index(index) for index in board_indexes]
+    deck_cards = [card_from_index(index) for index in deck]
+
+    if missing <= 0:
+        runouts: Iterable[Sequence[Card]] = ((),)
+    elif total <= exact_limit:
+        runouts = itertools.combinations(deck_cards, missing)
+    else:
+        rng = random.Random(seed)
+        runouts = (rng.sample(deck_cards, missing) for _ in range(samples))
+
+    shares = [0.0] * len(hands)
+    runout_total = 0
+    for runout in runouts:
+        showdown = determination.evaluate_showdown(board + list(runout), hole_cards)
+        winners = showdown.tie_groups[0]
+        share = 1.0 / len(winners)
+        for player in winners:
+            shares[player] += share
+        runout_total += 1
+
+    return tuple(value / runout_total for value in shares)
+
+
+def _warm_worker() -> None:
+    """No-op job that makes a pool worker start and import this module."""
+
+
+class EquityCalculator:
+    """Memoised all-in equity with exact and Monte-Carlo modes.
+
+    Jobs whose estimated evaluation count reaches ``process_threshold`` run in
+    a :class:`ProcessPoolExecutor` when awaited through
+    :meth:`calculate_async`; smaller jobs are computed inline. The pool uses
+    the ``spawn`` start method so workers never inherit the bot's event loop,
+    sockets or locks, and must be released with :meth:`shutdown`.
+    """
+
+    def __init__(
+        self,
+        *,
+        winner_determination: Optional[WinnerDetermination] = None,
+        samples: Optional[int] = None,
+        exact_limit: Optional[int] = None,
+        process_threshold: Optional[int] = None,
+        seed: Optional[int] = None,
+        cache_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self._determination = winner_determination or WinnerDetermination()
+        self._samples = samples or _config_int("monte_carlo_samples", 4000)
+        self._exact_limit = exact_limit or _config_int("exact_runout_limit", 2000)
+        self._process_threshold = process_threshold or _config_int(
+            "process_pool_threshold", 1500
+        )
+        self._seed = seed if seed is not None else _config_int("seed", 20240917)
+        self._cache: LRUCache[Tuple[EquityKey, int], Tuple[float, ...]] = LRUCache(
+            maxsize=cache_size or _config_int("cache_size", 2048)
+        )
+        self._cache_lock = Lock()
+        self._max_workers = max_workers or _config_int("max_workers", 2)
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def _compute_kwargs(self, samples: int) -> Dict[str, int]:
+        return {
+            "samples": samples,
+            "seed": self._seed,
+            "exact_limit": self._exact_limit,
+        }
+
+    def estimated_evaluations(
+        self, key: EquityKey, *, samples: Optional[int] = None
+    ) -> int:
+        """Number of hand evaluations needed to price ``key``."""
+
+        _, _, total = _runout_count(key)
+        runouts = total if total <= self._exact_limit else samples or self._samples
+        return runouts * len(key[0])
+
+    def _cached(self, key: EquityKey, samples: int) -> Optional[Tuple[float, ...]]:
+        with self._cache_lock:
+            return self._cache.get((key, samples))
+
+    def _store(self, key: EquityKey, samples: int, result: Tuple[float, ...]) -> None:
+        with self._cache_lock:
+            self._cache[(key, samples)] = result
+
+    def calculate(
+        self,
+        hole_cards: Sequence[Cards],
+        board: Sequence[Card] = (),
+        dead_cards: Sequence[Card] = (),
+        *,
+        samples: Optional[int] = None,
+    ) -> Tuple[float, ...]:
+        """Return each player's equity (0..1) in ``hole_cards`` order.
+
+        ``samples`` overrides the Monte-Carlo budget for this call.
+        """
+
+        samples = samples or self._samples
+        key = canonical_equity_key(hole_cards, board, dead_cards)
+        cached = self._cached(key, samples)
+        if cached is not None:
+            return cached
+        result = compute_equity(
+            key, determination=self._determination, **self._compute_kwargs(samples)
+        )
+        self._store(key, samples, result)
+        return result
+
+    async def calculate_async(
+        self,
+        hole_cards: Sequence[Cards],
+        board: Sequence[Card] = (),
+        dead_cards: Sequence[Card] = (),
+        *,
+        samples: Optional[int] = None,
+    ) -> Tuple[float, ...]:
+        """Like :meth:`calculate` but offloads large jobs to worker processes."""
+
+        samples = samples or self._samples
+        key = canonical_equity_key(hole_cards, board, dead_cards)
+        cached = self._cached(key, samples)
+        if cached is not None:
+            return cached
+
+        if self.estimated_evaluations(key, samples=samples) < self._process_threshold:
+            result = compute_equity(
+                key,
+                determination=self._determination,
+                **self._compute_kwargs(samples),
+            )
+        else:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._get_executor(),
+                partial(compute_equity, key, **self._compute_kwargs(samples)),
+            )
+        self._store(key, samples, result)
+        return result
+
+    async def warm_up(self) -> None:
+        """Start every pool worker now instead of on the first large job.
+
+        Spawned workers take close to a second to start, which would
+        otherwise delay the first showdown that needs the pool.
+        """
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, _warm_worker)
+                for _ in range(self._max_workers)
+            )
+        )
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Stop the worker pool if this calculator created one."""
+
+        executor, self._executor = self._executor, None
+        if executor is not None and self._owns_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,886 @@
+"""Versioned binary snapshot codec for :class:`Game` and :class:`Player`.
+
+Snapshots start with :data:`MAGIC`, a format version byte and a flags byte,
+followed by a msgpack body. Known attributes are written positionally in
+schema order so field names never hit the wire, and card lists are stored as
+one deck-index byte per card. Attributes outside the schema (ad-hoc fields
+set by handlers) travel in a ``name → value`` map so nothing is lost.
+
+The body is split in two: attributes that change on most actions (pot,
+bets, cards, callback history) are packed as-is, and everything else (the
+roster, mentions, labels, message ids) is packed separately and deflated
+when that pays off. The stable part rarely changes between two saves of a
+table, so its deflated form is memoised and deflate — the bulk of the
+encode cost — is skipped on most saves.
+
+Anything without the magic prefix is treated as a legacy pickle blob.
+
+Between full snapshots, in-hand changes can be written as small deltas
+(:func:`encode_delta`) that :func:`apply_delta` replays on top of the last
+snapshot. Deltas never span a new hand, street or roster change; those
+require a fresh snapshot.
+"""
+
+from __future__ import annotations
+
+import copy
+import operator
+import pickle
+import struct
+import threading
+import zlib
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from cachetools import LRUCache
+
+try:  # pragma: no cover - optional dependency in some execution environments
+    import msgpack
+except ImportError:  # pragma: no cover - binary codec unavailable
+    msgpack = None  # type: ignore[assignment]
+
+from pokerapp.cards import Card, card_from_index
+from pokerapp.entities import (
+    Game,
+    GameState,
+    Player,
+    PlayerAction,
+    PlayerState,
+    _CALLBACK_HISTORY_LIMIT,
+)
+
+MAGIC = b"PGS"
+DELTA_MAGIC = b"PGD"
+FORMAT_VERSION = 1
+
+CODEC_BINARY = "binary"
+CODEC_PICKLE = "pickle"
+CODECS = (CODEC_BINARY, CODEC_PICKLE)
+
+
+class SnapshotCodecError(ValueError):
+    """Raised when a snapshot cannot be encoded or decoded."""
+
+
+# Schema ---------------------------------------------------------------------
+# Card-list fields get the compact index encoding and tuple fields are sent
+# as plain arrays. Changing these tuples requires bumping ``FORMAT_VERSION``
+# and keeping the old tuple around for decoding.
+_PLAIN = 0
+_CARDS = 1
+_TUPLE = 2
+
+_GAME_FIELDS: Tuple[Tuple[str, int], ...] = (
+    ("id", _PLAIN),
+    ("chat_id", _PLAIN),
+    ("state", _PLAIN),
+    ("pot", _PLAIN),
+    ("max_round_rate", _PLAIN),
+    ("dealer_index", _PLAIN),
+    ("current_player_index", _PLAIN),
+    ("small_blind_index", _PLAIN),
+    ("big_blind_index", _PLAIN),
+    ("cards_table", _CARDS),
+    ("remain_cards", _CARDS),
+    ("ready_users", _PLAIN),
+    ("message_ids", _PLAIN),
+    ("last_actions", _PLAIN),
+    ("ready_message_main_id", _PLAIN),
+    ("ready_message_main_text", _PLAIN),
+    ("ready_message_game_id", _PLAIN),
+    ("ready_message_stage", _PLAIN),
+    ("message_ids_to_delete", _PLAIN),
+    ("turn_message_id", _PLAIN),
+    ("turn_deadline", _PLAIN),
+    ("all_in_board_size", _PLAIN),
+    ("board_message_id", _PLAIN),
+    ("seat_announcement_message_id", _PLAIN),
+    ("callback_version", _PLAIN),
+)
+
+_PLAYER_FIELDS: Tuple[Tuple[str, int], ...] = (
+    ("user_id", _PLAIN),
+    ("mention_markdown", _PLAIN),
+    ("state", _PLAIN),
+    ("cards", _CARDS),
+    ("round_rate", _PLAIN),
+    ("ready_message_id", _PLAIN),
+    ("total_bet", _PLAIN),
+    ("has_acted", _PLAIN),
+    ("seat_index", _PLAIN),
+    ("anchor_message", _TUPLE),
+    ("anchor_role", _PLAIN),
+    ("role_label", _PLAIN),
+    ("is_dealer", _PLAIN),
+    ("is_small_blind", _PLAIN),
+    ("is_big_blind", _PLAIN),
+    ("private_chat_id", _PLAIN),
+    ("private_keyboard_message", _TUPLE),
+    ("private_keyboard_signature", _PLAIN),
+)
+
+# Fields that change on most actions; they are kept out of the deflated,
+# memoised part of the body.
+_GAME_VOLATILE = frozenset(
+    {
+        "state",
+        "pot",
+        "max_round_rate",
+        "dealer_index",
+        "current_player_index",
+        "small_blind_index",
+        "big_blind_index",
+        "cards_table",
+        "remain_cards",
+        "last_actions",
+        "message_ids_to_delete",
+        "turn_message_id",
+        "turn_deadline",
+        "all_in_board_size",
+        "board_message_id",
+        "callback_version",
+    }
+)
+_PLAYER_VOLATILE = frozenset(
+    {
+        "state",
+        "cards",
+        "round_rate",
+        "total_bet",
+        "has_acted",
+    }
+)
+
+
+class _Schema:
+    """Precomputed lookups for one positional field list."""
+
+    __slots__ = (
+        "names",
+        "getter",
+        "cards",
+        "tuples",
+        "skip",
+        "volatile",
+        "stable",
+        "merge",
+    )
+
+    def __init__(
+        self,
+        fields: Tuple[Tuple[str, int], ...],
+        special: Tuple[str, ...],
+        volatile: frozenset,
+    ):
+        self.names = tuple(name for name, _ in fields)
+        self.getter = operator.itemgetter(*self.names)
+        self.cards = tuple(idx for idx, (_, kind) in enumerate(fields) if kind == _CARDS)
+        self.tuples = tuple(idx for idx, (_, kind) in enumerate(fields) if kind == _TUPLE)
+        # Attributes handled outside the positional list.
+        self.skip = frozenset(self.names).union(special)
+        volatile_ids = [idx for idx, name in enumerate(self.names) if name in volatile]
+        stable_ids = [idx for idx, name in enumerate(self.names) if name not in volatile]
+        self.volatile = operator.itemgetter(*volatile_ids)
+        self.stable = operator.itemgetter(*stable_ids)
+        # Restores schema order from ``volatile + stable`` values.
+        order = volatile_ids + stable_ids
+        self.merge = operator.itemgetter(*sorted(range(len(order)), key=order.__getitem__))
+
+
+_GAME_SPECIAL = ("seats", "processed_callbacks", "_processed_callback_order")
+_GAME_SCHEMA = _Schema(_GAME_FIELDS, _GAME_SPECIAL, _GAME_VOLATILE)
+_PLAYER_SCHEMA = _Schema(_PLAYER_FIELDS, ("wallet", "_wallet_info"), _PLAYER_VOLATILE)
+
+# Stable parts at least this large are deflated when that makes them smaller.
+_COMPRESS_MIN_BYTES = 256
+_FLAG_DEFLATE = 0x01
+# Raw deflate (no zlib header/trailer) at the fastest level: snapshots are
+# small and rewritten on every action, so speed beats ratio here.
+_DEFLATE_LEVEL = 1
+_DEFLATE_WBITS = -15
+# Deflated stable parts keyed by their packed bytes, about one per table.
+_STABLE_CACHE_SIZE = 1024
+_stable_blobs: LRUCache[bytes, Tuple[bytes, int]] = LRUCache(maxsize=_STABLE_CACHE_SIZE)
+_stable_blobs_lock = threading.Lock()
+
+# msgpack extension codes
+_EXT_MISSING = 0
+_EXT_TUPLE = 1
+_EXT_SET = 2
+_EXT_CARD = 3
+_EXT_ENUM_BASE = 16
+
+# Enums that may appear anywhere in a snapshot; the position is the wire id.
+_ENUMS: Tuple[type, ...] = (GameState, PlayerState, PlayerAction)
+
+_DECK: Tuple[Card, ...] = tuple(card_from_index(index) for index in range(52))
+_CARD_INDEX: Dict[str, int] = {str(card): card.index for card in _DECK}
+
+
+class _Missing:
+    """Marks a schema attribute the encoded object did not have."""
+
+
+_MISSING = _Missing()
+
+
+# Encoding -------------------------------------------------------------------
+if msgpack is not None:
+    _ENUM_EXT: Dict[Any, Any] = {
+        member: msgpack.ExtType(
+            _EXT_ENUM_BASE + enum_id,
+            msgpack.packb(member.value),
+        )
+        for enum_id, enum_type in enumerate(_ENUMS)
+        for member in enum_type
+    }
+    _CARD_EXT: Dict[Card, Any] = {
+        card: msgpack.ExtType(_EXT_CARD, bytes((card.index,))) for card in _DECK
+    }
+    _MISSING_EXT = msgpack.ExtType(_EXT_MISSING, b"")
+    # Reverse lookup so decoding an enum never unpacks its value again.
+    _ENUM_BY_EXT: Dict[Tuple[int, bytes], Any] = {
+        (ext.code, ext.data): member for member, ext in _ENUM_EXT.items()
+    }
+
+
+def _pack_default(value: Any) -> Any:
+    ext = _ENUM_EXT.get(value) if isinstance(value, Enum) else None
+    if ext is not None:
+        return ext
+    value_type = type(value)
+    if value_type is tuple:
+        return msgpack.ExtType(_EXT_TUPLE, _packb(list(value)))
+    if value_type is set or value_type is frozenset:
+        return msgpack.ExtType(_EXT_SET, _packb(list(value)))
+    if value_type is Card:
+        ext = _CARD_EXT.get(value)
+        if ext is not None and str(value) == str(_DECK[value.index]):
+            return ext
+        return str(value)
+    if value is _MISSING:
+        return _MISSING_EXT
+    raise SnapshotCodecError(f"Cannot encode value of type {value_type.__name__}")
+
+
+def _packb(value: Any) -> bytes:
+    # ``strict_types`` routes tuples, sets, enums and ``Card`` (a ``str``
+    # subclass) through ``_pack_default`` so their types survive decoding.
+    return msgpack.packb(value, default=_pack_default, strict_types=True)
+
+
+_LOCAL = threading.local()
+
+
+def _pack_body(value: Any) -> bytes:
+    # Top-level packs reuse one packer per thread; nested packs from
+    # ``_pack_default`` go through ``_packb`` so they never share it.
+    packer = getattr(_LOCAL, "packer", None)
+    if packer is None:
+        packer = _LOCAL.packer = msgpack.Packer(
+            default=_pack_default, strict_types=True
+        )
+    return packer.pack(value)
+
+
+def _encode_cards(cards: Any) -> Any:
+    # Card fields travel as msgpack ``bin``; nothing else in them is bytes.
+    # Alias-suit spellings are not in ``_CARD_INDEX`` and keep their text.
+    if type(cards) is list:
+        try:
+            return bytes(map(_CARD_INDEX.__getitem__, cards))
+        except (KeyError, TypeError):
+            pass
+    return cards
+
+
+def _encode_fields(
+    state: Dict[str, Any], schema: _Schema
+) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
+    try:
+        values = list(schema.getter(state))
+    except KeyError:
+        get = state.get
+        values = [get(name, _MISSING) for name in schema.names]
+    for idx in schema.cards:
+        value = values[idx]
+        if value is not _MISSING:
+            values[idx] = _encode_cards(value)
+    for idx in schema.tuples:
+        value = values[idx]
+        if type(value) is tuple:
+            values[idx] = list(value)
+    extra_names = state.keys() - schema.skip
+    if not extra_names:
+        return values, None
+    return values, {name: state[name] for name in extra_names}
+
+
+def _encode_player(player: Player) -> Tuple[List[Any], List[Any]]:
+    """Return the volatile values and the stable part of ``player``."""
+
+    state = player.__dict__
+    values, extras = _encode_fields(state, _PLAYER_SCHEMA)
+    # Mirror ``Player.__getstate__``: only the wallet owner id is persisted.
+    wallet = state.get("wallet")
+    if wallet is not None:
+        wallet_info: Any = {"user_id": getattr(wallet, "_user_id", None)}
+    else:
+        wallet_info = state.get("_wallet_info")
+    schema = _PLAYER_SCHEMA
+    return list(schema.volatile(values)), [
+        list(schema.stable(values)),
+        extras,
+        wallet_info,
+    ]
+
+
+_all_str = frozenset({str}).issuperset
+
+
+def _encode_history(history: List[Any]) -> Any:
+    # Telegram callback ids never contain commas, so the history is sent as
+    # one delimited string, which deflates much better than a list. Ids are
+    # usually decimal 64-bit numbers, which pack into eight bytes each.
+    if not history or not _all_str(map(type, history)):
+        return history
+    joined = ",".join(history)
+    if joined.count(",") != len(history) - 1:
+        return history
+    # Plain ASCII digits without leading zeros survive the round trip.
+    if (
+        joined.isascii()
+        and joined.encode().replace(b",", b"").isdigit()
+        and ",0" not in "," + joined
+    ):
+        try:
+            return struct.pack(f">{len(history)}Q", *map(int, history))
+        except (struct.error, ValueError):
+            # Out of range, or an empty id between two commas.
+            pass
+    return joined
+
+
+def _decode_history(history: Any) -> List[Any]:
+    if type(history) is bytes:
+        return list(map(str, struct.unpack(f">{len(history) // 8}Q", history)))
+    if type(history) is str:
+        return history.split(",")
+    return history
+
+
+def encode_game(game: Game) -> bytes:
+    """Serialise ``game`` into the current binary snapshot format."""
+
+    if msgpack is None:
+        raise SnapshotCodecError("msgpack is not installed")
+
+    state = game.__dict__
+    values, extras = _encode_fields(state, _GAME_SCHEMA)
+
+    volatile_seats: List[Any] = []
+    stable_seats: List[Any] = []
+    for player in state.get("seats") or []:
+        if player is None:
+            volatile_seats.append(None)
+            stable_seats.append(None)
+        elif type(player) is Player:
+            volatile, stable = _encode_player(player)
+            volatile_seats.append(volatile)
+            stable_seats.append(stable)
+        else:
+            raise SnapshotCodecError(
+                f"Cannot encode seat of type {type(player).__name__}"
+            )
+
+    # The set is derivable from the bounded history, so only the ordered
+    # history is written.
+    processed = state.get("processed_callbacks") or set()
+    order = state.get("_processed_callback_order")
+    history = list(order) if order is not None else list(processed)
+    if len(history) != len(processed) or not processed.issuperset(history):
+        history = list(processed)
+
+    schema = _GAME_SCHEMA
+    stable, flags = _compress_stable(
+        _pack_body([list(schema.stable(values)), extras, stable_seats])
+    )
+    body = _pack_body(
+        [
+            [list(schema.volatile(values)), volatile_seats, _encode_history(history)],
+            stable,
+        ]
+    )
+    return MAGIC + bytes((FORMAT_VERSION, flags)) + body
+
+
+def _compress_stable(packed: bytes) -> Tuple[bytes, int]:
+    """Return the stored form of the stable part and its header flags."""
+
+    if len(packed) < _COMPRESS_MIN_BYTES:
+        return packed, 0
+    with _stable_blobs_lock:
+        cached = _stable_blobs.get(packed)
+    if cached is not None:
+        return cached
+    deflated = zlib.compress(packed, _DEFLATE_LEVEL, _DEFLATE_WBITS)
+    result = (deflated, _FLAG_DEFLATE) if len(deflated) < len(packed) else (packed, 0)
+    with _stable_blobs_lock:
+        _stable_blobs[packed] = result
+    return result
+
+
+# Decoding -------------------------------------------------------------------
+def _ext_hook(code: int, data: bytes) -> Any:
+    if code == _EXT_TUPLE:
+        return tuple(_unpackb(data))
+    if code == _EXT_SET:
+        return set(_unpackb(data))
+    if code == _EXT_CARD:
+        return _DECK[data[0]]
+    if code == _EXT_MISSING:
+        return _MISSING
+    member = _ENUM_BY_EXT.get((code, data))
+    if member is not None:
+        return member
+    enum_id = code - _EXT_ENUM_BASE
+    if 0 <= enum_id < len(_ENUMS):
+        return _ENUMS[enum_id](_unpackb(data))
+    raise SnapshotCodecError(f"Unknown snapshot extension code {code}")
+
+
+def _unpackb(data: bytes) -> Any:
+    return msgpack.unpackb(
+        data, ext_hook=_ext_hook, raw=False, strict_map_key=False
+    )
+
+
+def _decode_fields(
+    values: List[Any], extras: Optional[Dict[str, Any]], schema: _Schema
+) -> Dict[str, Any]:
+    for idx in schema.cards:
+        value = values[idx]
+        if type(value) is bytes:
+            values[idx] = list(map(_DECK.__getitem__, value))
+    for idx in schema.tuples:
+        value = values[idx]
+        if type(value) is list:
+            values[idx] = tuple(value)
+    state = dict(zip(schema.names, values))
+    if _MISSING in values:
+        state = {name: value for name, value in state.items() if value is not _MISSING}
+    if extras:
+        state.update(extras)
+    return state
+
+
+_TEMPLATES: Dict[type, Dict[str, Any]] = {}
+
+
+def _apply_defaults(obj: Any, template_factory: Callable[[], Any]) -> None:
+    """Fill attributes the snapshot lacks from a default-constructed object."""
+
+    template = _TEMPLATES.get(type(obj))
+    if template is None:
+        template = _TEMPLATES[type(obj)] = dict(template_factory().__dict__)
+    state = obj.__dict__
+    if len(state) >= len(template) and state.keys() >= template.keys():
+        return
+    for name, value in template.items():
+        if name not in state:
+            state[name] = copy.copy(value)
+
+
+def _decode_player(volatile: List[Any], stable: List[Any]) -> Player:
+    stable_values, extras, wallet_info = stable
+    values = list(_PLAYER_SCHEMA.merge(volatile + stable_values))
+    player = Player.__new__(Player)
+    state = _decode_fields(values, extras, _PLAYER_SCHEMA)
+    state["wallet"] = None
+    if wallet_info is not None:
+        state["_wallet_info"] = wallet_info
+    player.__dict__.update(state)
+    _apply_defaults(player, lambda: Player("", "", None, ""))
+    return player
+
+
+def decode_game(data: bytes) -> Game:
+    """Rebuild a :class:`Game` from :func:`encode_game` output."""
+
+    header = len(MAGIC) + 2
+    if not is_binary_snapshot(data) or len(data) < header:
+        raise SnapshotCodecError("Missing binary snapshot header")
+    if msgpack is None:
+        raise SnapshotCodecError("msgpack is not installed")
+    version = data[len(MAGIC)]
+    if version != FORMAT_VERSION:
+        raise SnapshotCodecError(f"Unsupported snapshot format version {version}")
+    flags = data[len(MAGIC) + 1]
+
+    try:
+        volatile, stable = _unpackb(data[header:])
+        if flags & _FLAG_DEFLATE:
+            stable = zlib.decompress(stable, _DEFLATE_WBITS)
+        game_volatile, volatile_seats, history = volatile
+        game_stable, extras, stable_seats = _unpackb(stable)
+        values = list(_GAME_SCHEMA.merge(game_volatile + game_stable))
+        if len(volatile_seats) != len(stable_seats):
+            raise ValueError("seat count mismatch")
+        history = _decode_history(history)
+    except (
+        ValueError,
+        TypeError,
+        IndexError,
+        struct.error,
+        zlib.error,
+        msgpack.UnpackException,
+    ) as exc:
+        raise SnapshotCodecError(f"Corrupt snapshot: {exc}") from exc
+
+    game = Game.__new__(Game)
+    state = _decode_fields(values, extras, _GAME_SCHEMA)
+    state["seats"] = [
+        _decode_player(seat_volatile, seat_stable) if seat_stable is not None else None
+        for seat_volatile, seat_stable in zip(volatile_seats, stable_seats)
+    ]
+    state["processed_callbacks"] = set(history)
+    state["_processed_callback_order"] = deque(
+        history, maxlen=_CALLBACK_HISTORY_LIMIT
+    )
+    game.__dict__.update(state)
+    _apply_defaults(game, Game)
+    return game
+
+
+# Deltas ---------------------------------------------------------------------
+# Changing any of these means a new hand, street or roster, so the delta
+# chain ends there and a full snapshot is written instead.
+_GAME_BOUNDARY_FIELDS = frozenset({"id", "state", "cards_table", "remain_cards"})
+_PLAYER_BOUNDARY_FIELDS = frozenset({"user_id", "cards", "seat_index"})
+_GAME_DELTA_SKIP = frozenset(_GAME_SPECIAL)
+_PLAYER_DELTA_SKIP = frozenset({"wallet", "_wallet_info"})
+
+# Values of these types are immutable and can be kept as-is in a baseline.
+_IMMUTABLE_TYPES = frozenset(
+    {int, float, str, bool, bytes, type(None), Card, *_ENUMS}
+)
+_TOKEN_LIST = 0
+_TOKEN_TUPLE = 1
+_TOKEN_SET = 2
+_TOKEN_DICT = 3
+_TOKEN_PACKED = 4
+_all_immutable = _IMMUTABLE_TYPES.issuperset
+
+# Schema attributes are keyed by their position in deltas; anything else
+# keeps its name.
+_GAME_FIELD_IDS: Dict[str, int] = {name: idx for idx, name in enumerate(_GAME_SCHEMA.names)}
+_PLAYER_FIELD_IDS: Dict[str, int] = {
+    name: idx for idx, name in enumerate(_PLAYER_SCHEMA.names)
+}
+
+
+def _token(value: Any) -> Any:
+    """Return an immutable stand-in for ``value`` that compares by content."""
+
+    value_type = type(value)
+    if value_type in _IMMUTABLE_TYPES:
+        return value
+    if value_type is list:
+        if _all_immutable(map(type, value)):
+            return (_TOKEN_LIST, tuple(value))
+    elif value_type is tuple:
+        if _all_immutable(map(type, value)):
+            return (_TOKEN_TUPLE, value)
+    elif value_type is set:
+        if _all_immutable(map(type, value)):
+            return (_TOKEN_SET, frozenset(value))
+    elif value_type is dict:
+        if _all_immutable(map(type, value)) and _all_immutable(
+            map(type, value.values())
+        ):
+            return (_TOKEN_DICT, tuple(value.items()))
+    return (_TOKEN_PACKED, _packb(value))
+
+
+def _changed(old: Any, new: Any) -> bool:
+    # ``0 == False`` and ``1 == 1.0``, so the type has to match as well.
+    return old is _MISSING or type(old) is not type(new) or old != new
+
+
+class DeltaBaseline:
+    """Content of a game as of the last write, used to compute deltas."""
+
+    __slots__ = ("game_id", "fields", "seats", "history", "count")
+
+    def __init__(
+        self,
+        game_id: Any,
+        fields: Dict[str, Any],
+        seats: List[Optional[Dict[str, Any]]],
+        history: Tuple[Any, ...],
+        count: int = 0,
+    ) -> None:
+        self.game_id = game_id
+        self.fields = fields
+        self.seats = seats
+        self.history = history
+        # Number of deltas written since the last full snapshot.
+        self.count = count
+
+
+def _game_history(state: Dict[str, Any]) -> Tuple[Any, ...]:
+    order = state.get("_processed_callback_order")
+    if order is not None:
+        return tuple(order)
+    return tuple(state.get("processed_callbacks") or ())
+
+
+def _player_tokens(player: Player) -> Dict[str, Any]:
+    return {
+        name: _token(value)
+        for name, value in player.__dict__.items()
+        if name not in _PLAYER_DELTA_SKIP
+    }
+
+
+def capture_baseline(game: Game) -> DeltaBaseline:
+    """Record ``game`` as the state later deltas are computed against."""
+
+    if msgpack is None:
+        raise SnapshotCodecError("msgpack is not installed")
+    state = game.__dict__
+    fields = {
+        name: _token(value)
+        for name, value in state.items()
+        if name not in _GAME_DELTA_SKIP
+    }
+    seats = [
+        _player_tokens(player) if player is not None else None
+        for player in state.get("seats") or []
+    ]
+    return DeltaBaseline(state.get("id"), fields, seats, _game_history(state))
+
+
+def _diff_fields(
+    old_fields: Dict[str, Any],
+    state: Dict[str, Any],
+    skip: frozenset,
+    boundary: frozenset,
+    field_ids: Dict[str, int],
+    appends: Optional[Dict[Any, Any]],
+) -> Optional[Tuple[Dict[str, Any], Dict[Any, Any]]]:
+    """Return ``(new_tokens, changed_values)`` or ``None`` at a boundary."""
+
+    tokens: Dict[str, Any] = {}
+    changed: Dict[Any, Any] = {}
+    for name, value in state.items():
+        if name in skip:
+            continue
+        old = old_fields.get(name, _MISSING)
+        value_type = type(value)
+        if value_type in _IMMUTABLE_TYPES:
+            # Fast path for the scalars that make up most of the state.
+            token = tokens[name] = value
+            if type(old) is value_type and old == value:
+                continue
+        else:
+            token = tokens[name] = _token(value)
+            if not _changed(old, token):
+                continue
+        if name in boundary:
+            return None
+        if (
+            appends is not None
+            and type(old) is tuple
+            and old[0] == _TOKEN_LIST
+            and token[0] == _TOKEN_LIST
+            and len(token[1]) > len(old[1])
+            and token[1][: len(old[1])] == old[1]
+        ):
+            appends[field_ids.get(name, name)] = value[len(old[1]) :]
+        else:
+            changed[field_ids.get(name, name)] = value
+    if not tokens.keys() >= old_fields.keys():
+        # An attribute was deleted; deltas only ever add or overwrite.
+        return None
+    return tokens, changed
+
+
+def encode_delta(
+    baseline: DeltaBaseline, game: Game
+) -> Optional[Tuple[bytes, DeltaBaseline]]:
+    """Encode what changed in ``game`` since ``baseline``.
+
+    Returns ``None`` when the change crosses a hand, street or roster
+    boundary and needs a full snapshot. Otherwise returns the encoded delta
+    (empty when nothing changed) and the baseline for the next call.
+    """
+
+    if msgpack is None:
+        raise SnapshotCodecError("msgpack is not installed")
+    state = game.__dict__
+    seats = state.get("seats") or []
+    if state.get("id") != baseline.game_id or len(seats) != len(baseline.seats):
+        return None
+
+    game_appends: Dict[Any, Any] = {}
+    diff = _diff_fields(
+        baseline.fields,
+        state,
+        _GAME_DELTA_SKIP,
+        _GAME_BOUNDARY_FIELDS,
+        _GAME_FIELD_IDS,
+        game_appends,
+    )
+    if diff is None:
+        return None
+    fields, game_changes = diff
+
+    seat_tokens: List[Optional[Dict[str, Any]]] = []
+    seat_changes: Dict[int, Dict[Any, Any]] = {}
+    for seat, (player, old_tokens) in enumerate(zip(seats, baseline.seats)):
+        if player is None or old_tokens is None:
+            if player is not None or old_tokens is not None:
+                return None
+            seat_tokens.append(None)
+            continue
+        player_diff = _diff_fields(
+            old_tokens,
+            player.__dict__,
+            _PLAYER_DELTA_SKIP,
+            _PLAYER_BOUNDARY_FIELDS,
+            _PLAYER_FIELD_IDS,
+            None,
+        )
+        if player_diff is None:
+            return None
+        tokens, changes = player_diff
+        seat_tokens.append(tokens)
+        if changes:
+            seat_changes[seat] = changes
+
+    history = _game_history(state)
+    callbacks: Any = None
+    if history != baseline.history:
+        known = set(baseline.history)
+        added = [callback_id for callback_id in history if callback_id not in known]
+        if (baseline.history + tuple(added))[-_CALLBACK_HISTORY_LIMIT:] == history:
+            callbacks = [False, added]
+        else:
+            callbacks = [True, list(history)]
+
+    next_baseline = DeltaBaseline(
+        baseline.game_id, fields, seat_tokens, history, baseline.count
+    )
+    if not (game_changes or game_appends or seat_changes or callbacks):
+        return b"", next_baseline
+    body = _packb([game_changes, game_appends, seat_changes, callbacks])
+    return DELTA_MAGIC + bytes((FORMAT_VERSION,)) + body, next_baseline
+
+
+def _named(changes: Dict[Any, Any], names: Tuple[str, ...]) -> Dict[str, Any]:
+    return {
+        names[key] if type(key) is int else key: value
+        for key, value in changes.items()
+    }
+
+
+def apply_delta(game: Game, data: bytes) -> None:
+    """Replay one :func:`encode_delta` payload onto ``game`` in place."""
+
+    header = len(DELTA_MAGIC) + 1
+    if data[: len(DELTA_MAGIC)] != DELTA_MAGIC or len(data) < header:
+        raise SnapshotCodecError("Missing delta header")
+    if msgpack is None:
+        raise SnapshotCodecError("msgpack is not installed")
+    version = data[len(DELTA_MAGIC)]
+    if version != FORMAT_VERSION:
+        raise SnapshotCodecError(f"Unsupported delta format version {version}")
+    try:
+        game_changes, game_appends, seat_changes, callbacks = _unpackb(data[header:])
+    except (ValueError, TypeError, msgpack.UnpackException) as exc:
+        raise SnapshotCodecError(f"Corrupt delta: {exc}") from exc
+
+    game_names = _GAME_SCHEMA.names
+    player_names = _PLAYER_SCHEMA.names
+    try:
+        game_changes = _named(game_changes, game_names)
+        game_appends = _named(game_appends, game_names)
+        seat_changes = {
+            seat: _named(changes, player_names) for seat, changes in seat_changes.items()
+        }
+    except IndexError as exc:
+        raise SnapshotCodecError(f"Unknown field id in delta: {exc}") from exc
+
+    state = game.__dict__
+    state.update(game_changes)
+    for name, items in game_appends.items():
+        current = state.get(name)
+        if type(current) is not list:
+            raise SnapshotCodecError(f"Cannot append to game field {name!r}")
+        current.extend(items)
+
+    seats = state.get("seats") or []
+    for seat, changes in seat_changes.items():
+        player = seats[seat] if 0 <= seat < len(seats) else None
+        if player is None:
+            raise SnapshotCodecError(f"Delta targets empty seat {seat}")
+        player.__dict__.update(changes)
+
+    if callbacks is not None:
+        replace, items = callbacks
+        order = state.get("_processed_callback_order")
+        if replace or order is None:
+            order = deque(items, maxlen=_CALLBACK_HISTORY_LIMIT)
+        else:
+            order.extend(items)
+        state["_processed_callback_order"] = order
+        state["processed_callbacks"] = set(order)
+
+
+def is_binary_snapshot(data: bytes) -> bool:
+    return data[: len(MAGIC)] == MAGIC
+
+
+def dumps(game: Game, codec: str = CODEC_BINARY) -> bytes:
+    """Serialise ``game`` with ``codec``.
+
+    Games carrying values the binary format cannot represent are written as
+    pickle so a save never fails because of the codec choice.
+    """
+
+    if codec == CODEC_BINARY and msgpack is not None:
+        try:
+            return encode_game(game)
+        except SnapshotCodecError:
+            pass
+    return pickle.dumps(game)
+
+
+def loads(data: bytes) -> Game:
+    """Decode either a binary snapshot or a legacy pickle blob."""
+
+    if is_binary_snapshot(data):
+        return decode_game(data)
+    return pickle.loads(data)
+
+
+__all__ = [
+    "CODECS",
+    "CODEC_BINARY",
+    "CODEC_PICKLE",
+    "DELTA_MAGIC",
+    "DeltaBaseline",
+    "FORMAT_VERSION",
+    "MAGIC",
+    "SnapshotCodecError",
+    "apply_delta",
+    "capture_baseline",
+    "decode_game",
+    "dumps",
+    "encode_delta",
+    "encode_game",
+    "is_binary_snapshot",
+    "loads",
+]
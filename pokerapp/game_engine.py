@@ -17,12 +17,13 @@ import asyncio
 import copy
 import inspect
 import datetime
+import hashlib
 import json
 import logging
 import warnings
 from collections import defaultdict
 from dataclasses import dataclass
-from contextlib import asynccontextmanager, suppress
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
 from pathlib import Path
 from typing import (
     Any,
@@ -36,9 +37,11 @@ from typing import (
     Mapping,
     Optional,
     Protocol,
+    Sequence,
     Set,
     Tuple,
 )
+from redis.exceptions import NoScriptError, ResponseError
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.helpers import mention_markdown as format_mention_markdown
@@ -57,7 +60,12 @@ from pokerapp.entities import (
 )
 from pokerapp.config import GameConstants, get_game_constants
 from pokerapp.pokerbotview import PokerBotViewer
-from pokerapp.lock_manager import LockManager
+from pokerapp.lock_manager import (
+    LeaseBackendError,
+    LeaseUnavailable,
+    LockLease,
+    LockManager,
+)
 from pokerapp.table_manager import TableManager
 from pokerapp.redis_client import RedisClient
 from pokerapp.utils.request_metrics import RequestCategory, RequestMetrics
@@ -78,7 +86,9 @@ from pokerapp.winnerdetermination import (
 )
 from pokerapp.translations import translate
 from pokerapp.cache_manager import MultiLayerCache
+from pokerapp.equity import SHOWDOWN_SAMPLES, EquityCalculator
 from pokerapp.query_optimizer import QueryBatcher
+from pokerapp.services.chat_actor import ChatActorPool
 
 
 def clear_all_message_ids(game: Game) -> None:
@@ -121,6 +131,8 @@ if isinstance(_LOCKS_SECTION, dict):
 
 
 _CRITICAL_SECTION_LONG_HOLD_THRESHOLD_SECONDS = 2.0
+# Settlement retries after a busy stage lease, each one lease TTL apart.
+_FINALIZE_LEASE_RETRIES = 3
 
 
 def _compute_language_order(translations_root: Any) -> Tuple[str, ...]:
@@ -151,6 +163,143 @@ redis.call('PEXPIRE', KEYS[1], ARGV[3])
 return 1
 """
 
+# KEYS: action lock, game state hash.
+# ARGV: user_id, action, amount, expected version ("" to skip), state TTL (ms).
+# The script runs atomically, so holding the action lock for its duration
+# reduces to checking that nobody else holds it.
+_ACTION_PIPELINE_LUA = """-- action_pipeline
+if redis.call('EXISTS', KEYS[1]) == 1 then
+  return {'locked'}
+end
+if not cjson.decode_array_with_array_mt then
+  return {'unsupported'}
+end
+local raw = redis.call('HMGET', KEYS[2], 'state', 'version')
+if not raw[1] then
+  return {'no_game'}
+end
+local version = tonumber(raw[2]) or 0
+if ARGV[4] ~= '' and tonumber(ARGV[4]) ~= version then
+  return {'stale', tostring(version)}
+end
+cjson.decode_array_with_array_mt(true)
+local decoded, state = pcall(cjson.decode, raw[1])
+cjson.decode_array_with_array_mt(false)
+if not decoded or type(state) ~= 'table' or type(state['players']) ~= 'table' then
+  return {'no_game'}
+end
+
+local players = state['players']
+local user_id = tonumber(ARGV[1])
+local player = nil
+for _, candidate in ipairs(players) do
+  if tonumber(candidate['user_id']) == user_id then
+    player = candidate
+    break
+  end
+end
+if not player then
+  return {'no_player'}
+end
+local index = tonumber(state['current_player_index']) or 0
+if players[index + 1] ~= player then
+  return {'not_turn'}
+end
+if player['state'] == 'folded' or player['state'] == 'fold' then
+  return {'invalid'}
+end
+if player['has_acted'] == true then
+  return {'cannot_act'}
+end
+
+local action = ARGV[2]
+local amount = tonumber(ARGV[3]) or 0
+local current_bet = tonumber(state['current_bet']) or 0
+local bet = tonumber(player['bet']) or 0
+local chips = tonumber(player['chips']) or 0
+local required = 0
+if action == 'call' then
+  required = current_bet - bet
+elseif action == 'raise' then
+  if amount <= 0 then
+    return {'invalid'}
+  end
+  required = current_bet - bet + amount
+elseif action == 'all_in' then
+  required = chips
+elseif action ~= 'fold' and action ~= 'check' then
+  return {'invalid'}
+end
+
+if action == 'fold' then
+  player['state'] = 'folded'
+elseif action ~= 'check' then
+  if required < 0 then
+    required = 0
+  end
+  if required > chips then
+    return {'failed'}
+  end
+  player['chips'] = chips - required
+  player['bet'] = bet + required
+  if (action == 'raise' or action == 'all_in') and player['bet'] > current_bet then
+    state['current_bet'] = player['bet']
+  end
+end
+player['has_acted'] = true
+
+if action == 'call' or action == 'raise' or action == 'all_in' then
+  local active, all_acted, all_equal = 0, true, true
+  local round_bet = tonumber(state['current_bet']) or 0
+  for _, candidate in ipairs(players) do
+    if candidate['state'] ~= 'folded' then
+      active = active + 1
+      if candidate['has_acted'] ~= true then
+        all_acted = false
+      end
+      if (tonumber(candidate['bet']) or 0) ~= round_bet
+          and (tonumber(candidate['chips']) or 0) ~= 0 then
+        all_equal = false
+      end
+    end
+  end
+  if active <= 1 or (all_acted and all_equal) then
+    local pot = tonumber(state['pot']) or 0
+    for _, candidate in ipairs(players) do
+      pot = pot + math.max(0, tonumber(candidate['bet']) or 0)
+      candidate['bet'] = 0
+    end
+    state['pot'] = pot
+  end
+end
+
+for offset = 1, #players do
+  local next_index = (index + offset) % #players
+  if players[next_index + 1]['state'] ~= 'folded' then
+    state['current_player_index'] = next_index
+    break
+  end
+end
+
+local new_version = version + 1
+state['version'] = nil
+local payload = cjson.encode(state)
+redis.call('HSET', KEYS[2], 'state', payload, 'version', new_version)
+redis.call('PEXPIRE', KEYS[2], ARGV[5])
+return {'ok', payload, tostring(new_version)}
+"""
+_ACTION_PIPELINE_SHA = hashlib.sha1(_ACTION_PIPELINE_LUA.encode("utf-8")).hexdigest()
+_ACTION_PIPELINE_MESSAGES = {
+    "locked": "Action in progress",
+    "no_game": "Game not found",
+    "no_player": "Player not found",
+    "not_turn": "Not your turn",
+    "invalid": "Invalid action",
+    "cannot_act": "Player cannot act",
+    "failed": "Action failed",
+    "stale": "State conflict, retry",
+}
+
 
 def _select_translation(
     entry: Any,
@@ -369,6 +518,14 @@ class GameEngine:
         "stop_resume_callback",
         "stop:resume",
     )
+    CHAT_ACTOR_MODE = bool(_ENGINE_CONSTANTS.get("chat_actor_mode", False))
+    CHAT_ACTOR_IDLE_TIMEOUT_SECONDS = _non_negative_float(
+        _ENGINE_CONSTANTS.get("chat_actor_idle_timeout_seconds"),
+        30.0,
+    )
+    # Run process_action as one server-side script when the engine owns the
+    # Redis game state; falls back to the locked multi-step path otherwise.
+    ACTION_PIPELINE = bool(_ENGINE_CONSTANTS.get("action_pipeline", True))
 
     @staticmethod
     def _loop_time() -> float:
@@ -417,6 +574,8 @@ class GameEngine:
         redis_client: Optional[RedisClient] = None,
         cache: Optional[MultiLayerCache] = None,
         query_batcher: Optional[QueryBatcher] = None,
+        equity_calculator: Optional[EquityCalculator] = None,
+        chat_actor_mode: Optional[bool] = None,
     ) -> None:
         self._table_manager = table_manager
         self._view = view
@@ -446,7 +605,18 @@ class GameEngine:
         self._redis_client = redis_client
         self._cache = cache
         self._query_batcher = query_batcher
+        self._equity_calculator = equity_calculator
         self._game_state_ttl_ms = 15 * 60 * 1000  # 15 minutes of inactivity tolerance
+        # Set once the server reports it cannot run the action pipeline, so
+        # later actions go straight to the locked path.
+        self._action_pipeline_unsupported = False
+        if chat_actor_mode is None:
+            chat_actor_mode = self.CHAT_ACTOR_MODE
+        self._chat_actors: Optional[ChatActorPool] = (
+            ChatActorPool(idle_timeout=self.CHAT_ACTOR_IDLE_TIMEOUT_SECONDS)
+            if chat_actor_mode
+            else None
+        )
 
         self._max_players = _positive_int(
             _GAME_CONSTANTS.get("max_players"), 8
@@ -460,6 +630,9 @@ class GameEngine:
         self._smart_countdown_manager: Optional[SmartCountdownManager] = None
         self._smart_countdown_start_task: Optional[asyncio.Task[None]] = None
         self._save_game_signature_cache: Dict[int, bool] = {}
+        self._fencing_signature_cache: Dict[int, bool] = {}
+        self._stage_leases: Dict[int, LockLease] = {}
+        self._finalize_retry_tasks: Dict[int, asyncio.Task[None]] = {}
 
         bot_instance = getattr(view, "_bot", None)
         if bot_instance is not None:
@@ -942,8 +1115,11 @@ class GameEngine:
 
         result = await redis_client.eval(
             _SAVE_GAME_STATE_LUA,
-            [self._state_key(chat_id)],
-            [payload, str(expected_version), str(self._game_state_ttl_ms)],
+            1,
+            self._state_key(chat_id),
+            payload,
+            str(expected_version),
+            str(self._game_state_ttl_ms),
         )
         return bool(int(result or 0))
 
@@ -959,6 +1135,14 @@ class GameEngine:
     ) -> bool:
         """Join a table with table-level locking and version retries."""
 
+        if self._needs_chat_actor(chat_id):
+            return await self._run_in_chat_actor(
+                chat_id,
+                lambda: self.join_game(
+                    chat_id=chat_id, user_id=user_id, user_name=user_name
+                ),
+            )
+
         async def _process_once() -> Optional[bool]:
             try:
                 game_data, version = await self._table_manager.load_game_with_version(
@@ -1136,6 +1320,11 @@ class GameEngine:
         chat_id: int,
         user_id: int,
     ) -> bool:
+        if self._needs_chat_actor(chat_id):
+            return await self._run_in_chat_actor(
+                chat_id, lambda: self.leave_game(chat_id=chat_id, user_id=user_id)
+            )
+
         logger = self._logger
 
         async def _process_once() -> Optional[bool]:
@@ -1263,6 +1452,14 @@ class GameEngine:
         if amount == 0:
             return True
 
+        if self._needs_chat_actor(chat_id):
+            return await self._run_in_chat_actor(
+                chat_id,
+                lambda: self.update_player_chips(
+                    chat_id=chat_id, user_id=user_id, amount=amount
+                ),
+            )
+
         logger = self._logger
 
         async def _process_once() -> Optional[bool]:
@@ -1715,6 +1912,12 @@ class GameEngine:
     ) -> dict:
         """Handle player action with smart retry fine-grained locking."""
 
+        if self._needs_chat_actor(chat_id):
+            return await self._run_in_chat_actor(
+                chat_id,
+                lambda: self.handle_player_action(chat_id, user_id, action, amount),
+            )
+
         action = (action or "").strip().lower()
         current_state: Optional[Dict[str, Any]] = None
         player_snapshot: Optional[Dict[str, Any]] = None
@@ -1964,6 +2167,17 @@ class GameEngine:
             )
             return False
 
+        if self.ACTION_PIPELINE and getattr(self, "_redis_client", None) is not None:
+            pipeline_result = await self.run_action_pipeline(
+                chat_id, user_id, action_token, amount
+            )
+            if pipeline_result is not None:
+                if pipeline_result.get("locked"):
+                    await self._send_action_lock_feedback(
+                        chat_id, user_id, action_token
+                    )
+                return bool(pipeline_result.get("success"))
+
         lock_token: Optional[str] = None
         result_success = False
 
@@ -1997,39 +2211,7 @@ class GameEngine:
                         "action": action_token,
                     },
                 )
-                if (
-                    hasattr(self, "_safe_ops")
-                    and hasattr(self._safe_ops, "send_message_safe")
-                    and hasattr(self, "_view")
-                    and hasattr(self._view, "send_message")
-                ):
-                    try:
-                        await self._safe_ops.send_message_safe(
-                            call=lambda text=self._action_lock_feedback_text: self._view.send_message(  # type: ignore[misc]
-                                user_id,
-                                text,
-                                request_category=RequestCategory.GENERAL,
-                            ),
-                            chat_id=user_id,
-                            operation="action_lock_feedback",
-                            log_extra={
-                                "event_type": "engine_action_lock_feedback",
-                                "chat_id": chat_id,
-                                "user_id": user_id,
-                                "action": action_token,
-                            },
-                        )
-                    except Exception:
-                        self._logger.debug(
-                            "Unable to send action lock feedback",
-                            extra={
-                                "event_type": "engine_action_lock_feedback_failed",
-                                "chat_id": chat_id,
-                                "user_id": user_id,
-                                "action": action_token,
-                            },
-                            exc_info=True,
-                        )
+                await self._send_action_lock_feedback(chat_id, user_id, action_token)
                 return False
 
             response = await self.handle_player_action(
@@ -2065,6 +2247,142 @@ class GameEngine:
 
         return result_success
 
+    async def run_action_pipeline(
+        self,
+        chat_id: int,
+        user_id: int,
+        action: str,
+        amount: int = 0,
+        *,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Apply ``action`` to the Redis game state in a single script call.
+
+        Replaces the acquire/load/save/release round-trips of the locked
+        path: the script checks the action lock, whose turn it is and the
+        state version, applies the mutation and bumps the version. Returns a
+        result shaped like :meth:`handle_player_action`, including
+        ``new_state`` on success, or ``None`` when the server cannot run the
+        script so the caller can fall back to the locked path.
+        """
+
+        redis_client = self._redis_client
+        if redis_client is None or self._action_pipeline_unsupported:
+            return None
+
+        action_token = (action or "").strip().lower()
+        keys = [
+            self._lock_manager.action_lock_key(chat_id, user_id, action_token),
+            self._state_key(chat_id),
+        ]
+        args = [
+            str(int(user_id)),
+            action_token,
+            str(int(amount or 0)),
+            "" if expected_version is None else str(int(expected_version)),
+            str(self._game_state_ttl_ms),
+        ]
+        log_extra = {
+            "event_type": "engine_action_pipeline",
+            "chat_id": chat_id,
+            "user_id": user_id,
+            "action": action_token,
+        }
+
+        try:
+            reply = await self._eval_action_pipeline(keys, args)
+        except (ModuleNotFoundError, ResponseError):
+            # No Lua runtime, scripting disabled or the script rejected: the
+            # server will not do better next time, so stop paying for EVAL.
+            self._action_pipeline_unsupported = True
+            self._logger.info(
+                "Action pipeline unavailable, using locked path",
+                extra=log_extra,
+                exc_info=True,
+            )
+            return None
+        except Exception:
+            self._logger.exception("Action pipeline failed", extra=log_extra)
+            return {"success": False, "message": "Internal error"}
+
+        fields = [
+            item.decode("utf-8") if isinstance(item, bytes) else str(item)
+            for item in (reply or ())
+        ]
+        status = fields[0] if fields else "unsupported"
+        if status == "unsupported":
+            self._action_pipeline_unsupported = True
+            self._logger.info(
+                "Server cannot run the action pipeline, using locked path",
+                extra=log_extra,
+            )
+            return None
+        if status != "ok":
+            return {
+                "success": False,
+                "message": _ACTION_PIPELINE_MESSAGES.get(status, "Action failed"),
+                "locked": status == "locked",
+            }
+
+        new_state = json.loads(fields[1])
+        new_state["version"] = int(fields[2])
+        return {
+            "success": True,
+            "message": f"{action_token.capitalize()} successful",
+            "new_state": new_state,
+        }
+
+    async def _eval_action_pipeline(
+        self, keys: List[str], args: List[str]
+    ) -> Any:
+        redis_client = self._redis_client
+        evalsha = getattr(redis_client, "evalsha", None)
+        if evalsha is not None:
+            try:
+                return await evalsha(_ACTION_PIPELINE_SHA, len(keys), *keys, *args)
+            except NoScriptError:
+                pass
+        # EVAL also caches the script, so later calls hit EVALSHA.
+        return await redis_client.eval(_ACTION_PIPELINE_LUA, len(keys), *keys, *args)
+
+    async def _send_action_lock_feedback(
+        self, chat_id: int, user_id: int, action_token: str
+    ) -> None:
+        if not (
+            hasattr(self, "_safe_ops")
+            and hasattr(self._safe_ops, "send_message_safe")
+            and hasattr(self, "_view")
+            and hasattr(self._view, "send_message")
+        ):
+            return
+        try:
+            await self._safe_ops.send_message_safe(
+                call=lambda text=self._action_lock_feedback_text: self._view.send_message(  # type: ignore[misc]
+                    user_id,
+                    text,
+                    request_category=RequestCategory.GENERAL,
+                ),
+                chat_id=user_id,
+                operation="action_lock_feedback",
+                log_extra={
+                    "event_type": "engine_action_lock_feedback",
+                    "chat_id": chat_id,
+                    "user_id": user_id,
+                    "action": action_token,
+                },
+            )
+        except Exception:
+            self._logger.debug(
+                "Unable to send action lock feedback",
+                extra={
+                    "event_type": "engine_action_lock_feedback_failed",
+                    "chat_id": chat_id,
+                    "user_id": user_id,
+                    "action": action_token,
+                },
+                exc_info=True,
+            )
+
     async def handle_call(self, chat_id: int, user_id: int) -> bool:
         """Backward-compatible wrapper around :meth:`process_action`."""
 
@@ -2095,6 +2413,11 @@ class GameEngine:
     async def process_bet(self, chat_id: int, user_id: int, amount: int) -> bool:
         """Process a betting request with table-level locking and retries."""
 
+        if self._needs_chat_actor(chat_id):
+            return await self._run_in_chat_actor(
+                chat_id, lambda: self.process_bet(chat_id, user_id, amount)
+            )
+
         if amount is None or amount <= 0:
             self._logger.warning(
                 "Bet rejected due to invalid amount",
@@ -2627,6 +2950,43 @@ class GameEngine:
                 ),
             )
 
+    def _chat_actor_key(self, chat_id: ChatId) -> Any:
+        try:
+            return self._safe_int(chat_id)
+        except Exception:  # pragma: no cover - defensive
+            return chat_id
+
+    def _holds_chat_actor(self, chat_id: Optional[ChatId]) -> bool:
+        """Return ``True`` inside the chat actor job that owns ``chat_id``."""
+
+        actors = getattr(self, "_chat_actors", None)
+        if actors is None or chat_id is None:
+            return False
+        return actors.holds(self._chat_actor_key(chat_id))
+
+    def _needs_chat_actor(self, chat_id: Optional[ChatId]) -> bool:
+        return (
+            getattr(self, "_chat_actors", None) is not None
+            and chat_id is not None
+            and not self._holds_chat_actor(chat_id)
+        )
+
+    async def _run_in_chat_actor(
+        self, chat_id: ChatId, job: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run ``job`` after earlier actor jobs for ``chat_id`` have finished.
+
+        Jobs still take their chat locks: the actor only orders the entry
+        points routed through it, while stage transitions, settlement and the
+        bot model's own handlers reach the same state without it. Queued jobs
+        therefore find those locks free instead of contending and backing off.
+        """
+
+        actors = getattr(self, "_chat_actors", None)
+        if actors is None:
+            return await job()
+        return await actors.submit(self._chat_actor_key(chat_id), job)
+
     def _stage_lock_key(self, chat_id: ChatId) -> str:
         prefix = self.STAGE_LOCK_PREFIX
         if not isinstance(prefix, str) or not prefix.startswith("stage:"):
@@ -3592,6 +3952,16 @@ class GameEngine:
             },
         )
 
+        if self._equity_calculator is None:
+            self._equity_calculator = EquityCalculator()
+        try:
+            await self._equity_calculator.warm_up()
+        except Exception:
+            self._logger.warning(
+                "Equity worker pool warm-up failed during engine start",
+                exc_info=True,
+            )
+
         lock_manager = getattr(self, "_lock_manager", None)
         if lock_manager is not None:
             try:
@@ -3627,6 +3997,20 @@ class GameEngine:
             except Exception:
                 self._logger.exception("Failed to stop SmartCountdownManager")
 
+        chat_actors = getattr(self, "_chat_actors", None)
+        if chat_actors is not None:
+            await chat_actors.close()
+
+        retry_tasks = list(getattr(self, "_finalize_retry_tasks", {}).values())
+        for retry_task in retry_tasks:
+            retry_task.cancel()
+        if retry_tasks:
+            await asyncio.gather(*retry_tasks, return_exceptions=True)
+
+        equity_calculator = getattr(self, "_equity_calculator", None)
+        if equity_calculator is not None:
+            equity_calculator.shutdown()
+
         self._logger.info(
             "GameEngine shutdown requested",
             extra={
@@ -3914,6 +4298,162 @@ class GameEngine:
         self._save_game_signature_cache[method_id] = supports_increment
         return supports_increment
 
+    def _supports_fencing_token(self, save_method: Callable[..., Any]) -> bool:
+        method_id = id(save_method)
+        if method_id in self._fencing_signature_cache:
+            return self._fencing_signature_cache[method_id]
+
+        try:
+            parameters = inspect.signature(save_method).parameters
+        except (TypeError, ValueError):
+            parameters = {}
+
+        supports_fencing = "fencing_token" in parameters
+        self._fencing_signature_cache[method_id] = supports_fencing
+        return supports_fencing
+
+    @asynccontextmanager
+    async def _hold_stage_lease(self, chat_id: ChatId) -> AsyncIterator[None]:
+        """Hold the chat's fenced stage lease while a hand is settled.
+
+        The local stage lock only excludes this process. The lease excludes
+        other workers too, is renewed for as long as settlement takes and
+        lapses a few seconds after a crash. Resets saved meanwhile carry its
+        fencing token, so a worker whose lease lapsed cannot overwrite its
+        successor. Must be entered with the stage lock held.
+
+        If Redis is unreachable the block still runs, under the local stage
+        lock only and without a fencing token. Raises
+        :class:`LeaseUnavailable` when another worker keeps the lease.
+        """
+
+        lock_manager = self._lock_manager
+        if not isinstance(lock_manager, LockManager):
+            yield
+            return
+        normalized_chat = self._safe_int(chat_id)
+        if normalized_chat in self._stage_leases:
+            yield
+            return
+        async with AsyncExitStack() as stack:
+            try:
+                lease = await stack.enter_async_context(
+                    lock_manager.table_lease(
+                        normalized_chat,
+                        "stage",
+                        wait_seconds=self._stage_lock_timeout,
+                    )
+                )
+            except LeaseBackendError:
+                self._logger.warning(
+                    "Stage lease unavailable (redis error); continuing unfenced",
+                    extra={
+                        "event_type": "stage_lease_backend_error",
+                        "chat_id": normalized_chat,
+                    },
+                )
+                lease = None
+            else:
+                if lease is None:
+                    raise LeaseUnavailable(
+                        f"Stage lease for chat {normalized_chat} is held by another worker"
+                    )
+                self._stage_leases[normalized_chat] = lease
+            try:
+                yield
+            finally:
+                if lease is not None:
+                    self._stage_leases.pop(normalized_chat, None)
+
+    def _schedule_finalize_retry(
+        self,
+        *,
+        context: Optional[ContextTypes.DEFAULT_TYPE],
+        game: Game,
+        chat_id: ChatId,
+        lease_retries: int,
+    ) -> None:
+        """Settle ``game`` again once the busy stage lease could have lapsed.
+
+        A holder that crashed mid-settlement stops renewing, so its lease is
+        gone one TTL later. Before retrying, the stored game is reloaded: if
+        it is a different hand, the lease owner settled this one already.
+        """
+
+        normalized_chat = self._safe_int(chat_id)
+        pending = self._finalize_retry_tasks.get(normalized_chat)
+        if pending is not None and not pending.done():
+            return
+        lock_manager = self._lock_manager
+        delay = (
+            lock_manager.lease_ttl_seconds
+            if isinstance(lock_manager, LockManager)
+            else self._stage_lock_timeout
+        )
+        hand_id = game.id
+
+        async def _retry() -> None:
+            await asyncio.sleep(delay)
+            self._finalize_retry_tasks.pop(normalized_chat, None)
+            stored = await self._table_manager.load_game(chat_id)
+            stored_game = stored[0] if isinstance(stored, tuple) else stored
+            if stored_game is None or stored_game.id != hand_id:
+                return
+            await self._finalize_game_legacy(
+                context=context,
+                game=stored_game,
+                chat_id=chat_id,
+                lease_retries=lease_retries,
+            )
+
+        task = asyncio.create_task(
+            _retry(), name=f"finalize-retry:{normalized_chat}"
+        )
+        self._finalize_retry_tasks[normalized_chat] = task
+        task.add_done_callback(
+            lambda done: self._log_finalize_retry_failure(done, chat_id=chat_id)
+        )
+
+    def _log_finalize_retry_failure(
+        self, task: "asyncio.Task[None]", *, chat_id: ChatId
+    ) -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+        self._logger.error(
+            "Retrying settlement after a busy stage lease failed",
+            exc_info=task.exception(),
+            extra=self._log_extra(
+                stage="finalize_game:lease_retry",
+                chat_id=chat_id,
+                game=None,
+                event_type="finalize_retry_failed",
+            ),
+        )
+
+    def _log_stage_lease_busy(
+        self, *, chat_id: ChatId, game: Optional[Game], stage: str
+    ) -> None:
+        self._logger.warning(
+            "Stage lease held by another worker; leaving %s to the lease owner",
+            stage,
+            extra=self._log_extra(
+                stage=f"{stage}:stage_lease_busy",
+                chat_id=chat_id,
+                game=game,
+                event_type="stage_lease_busy",
+            ),
+        )
+
+    def _stage_fence_kwargs(
+        self, chat_id: ChatId, save_method: Callable[..., Any]
+    ) -> Dict[str, Any]:
+        lease = self._stage_leases.get(self._safe_int(chat_id))
+        if lease is None or lease.fencing_token is None:
+            return {}
+        if not self._supports_fencing_token(save_method):
+            return {}
+        return {"fencing_token": lease.fencing_token}
+
     def _create_send_message_task(
         self,
         *,
@@ -4111,10 +4651,17 @@ class GameEngine:
         context: Optional[ContextTypes.DEFAULT_TYPE],
         game: Optional[Game],
         chat_id: ChatId,
+        lease_retries: int = _FINALIZE_LEASE_RETRIES,
     ) -> None:
         if game is None:
             raise ValueError("game is required for legacy finalize_game usage")
 
+        # Price the all-in run-out before the stage lock; settlement only
+        # reads the result.
+        equities = await self._calculate_all_in_equity(
+            game, game.players_by(states=(PlayerState.ACTIVE, PlayerState.ALL_IN))
+        )
+
         async def _finalize_locked() -> Tuple[
             Set[MessageId],
             List[Dict[str, Any]],
@@ -4141,6 +4688,7 @@ class GameEngine:
             payouts, hand_labels, announcements_local = await self._determine_winners(
                 game=game,
                 chat_id=chat_id,
+                equities=equities,
             )
 
             await self._execute_payouts(game=game, payouts=payouts)
@@ -4184,12 +4732,25 @@ class GameEngine:
                 retry_without_timeout=True,
                 retry_stage_label=retry_stage_label,
             ):
-                (
-                    message_cleanup_ids,
-                    announcements,
-                    stats_payload,
-                    reset_notifications,
-                ) = await _finalize_locked()
+                async with self._hold_stage_lease(chat_id):
+                    (
+                        message_cleanup_ids,
+                        announcements,
+                        stats_payload,
+                        reset_notifications,
+                    ) = await _finalize_locked()
+        except LeaseUnavailable:
+            self._log_stage_lease_busy(
+                chat_id=chat_id, game=game, stage=event_stage_label
+            )
+            if lease_retries > 0:
+                self._schedule_finalize_retry(
+                    context=context,
+                    game=game,
+                    chat_id=chat_id,
+                    lease_retries=lease_retries - 1,
+                )
+            return
         except TimeoutError:
             self._log_engine_event_lock_failure(
                 lock_key=lock_key,
@@ -4349,6 +4910,7 @@ class GameEngine:
         *,
         game: Game,
         chat_id: ChatId,
+        equities: Optional[Dict[UserId, float]] = None,
     ) -> Tuple[
         DefaultDict[int, int],
         Dict[int, Optional[str]],
@@ -4388,6 +4950,7 @@ class GameEngine:
                 payouts=payouts,
                 hand_labels=hand_labels,
                 chat_id=chat_id,
+                equities=equities,
             )
         )
         return payouts, hand_labels, announcements
@@ -4673,6 +5236,7 @@ class GameEngine:
         payouts: Dict[int, int],
         hand_labels: Dict[int, Optional[str]],
         chat_id: ChatId,
+        equities: Optional[Dict[UserId, float]] = None,
     ) -> List[Dict[str, Any]]:
         contender_details = list(winner_data.get("contender_details", []))
         winners_by_pot = list(winner_data.get("winners_by_pot", []))
@@ -4726,10 +5290,14 @@ class GameEngine:
                 }
             )
 
+        showdown_kwargs: Dict[str, Any] = {"game": game}
+        if equities:
+            showdown_kwargs["equities"] = equities
+
         announcements.append(
             {
                 "call": lambda winners=winners_by_pot: self._view.send_showdown_results(
-                    chat_id, winners, game=game
+                    chat_id, winners, **showdown_kwargs
                 ),
                 "operation": "send_showdown_results",
                 "log_extra": self._build_telegram_log_extra(
@@ -4744,6 +5312,47 @@ class GameEngine:
 
         return announcements
 
+    async def _calculate_all_in_equity(
+        self, game: Game, players: Sequence[Player]
+    ) -> Dict[UserId, float]:
+        """Return each contender's equity when the board was run out all-in.
+
+        Awaited before settlement takes the stage lock; large jobs run in the
+        calculator's worker pool, which :meth:`start` warms up.
+        """
+
+        board_size = getattr(game, "all_in_board_size", None)
+        board = list(getattr(game, "cards_table", []) or [])
+        if board_size is None or board_size >= len(board):
+            return {}
+
+        if len(players) < 2 or any(len(player.cards) != 2 for player in players):
+            return {}
+
+        if self._equity_calculator is None:
+            self._equity_calculator = EquityCalculator()
+        try:
+            equities = await self._equity_calculator.calculate_async(
+                [player.cards for player in players],
+                board[:board_size],
+                samples=SHOWDOWN_SAMPLES,
+            )
+        except Exception:
+            self._logger.warning(
+                "All-in equity calculation failed",
+                extra=self._log_extra(
+                    stage="payout-resolution",
+                    game=game,
+                    chat_id=getattr(game, "chat_id", None),
+                    event_type="all_in_equity_failed",
+                ),
+                exc_info=True,
+            )
+            return {}
+
+        # Keyed like the view's ``equities.get(player.user_id)`` lookup.
+        return {player.user_id: equity for player, equity in zip(players, equities)}
+
     async def _distribute_payouts(
         self,
         game: Game,
@@ -4825,11 +5434,14 @@ class GameEngine:
             if hasattr(game, "increment_callback_version"):
                 game.increment_callback_version()
 
+            fence_kwargs = self._stage_fence_kwargs(
+                chat_id, self._table_manager.save_game_with_version_check
+            )
             if version is None:
                 await self._table_manager.save_game(chat_id, game)
             else:
                 save_success = await self._table_manager.save_game_with_version_check(
-                    chat_id, game, version
+                    chat_id, game, version, **fence_kwargs
                 )
                 if not save_success:
                     self._logger.warning(
@@ -4859,7 +5471,7 @@ class GameEngine:
                     else:
                         if retry_version is not None:
                             await self._table_manager.save_game_with_version_check(
-                                chat_id, game, retry_version
+                                chat_id, game, retry_version, **fence_kwargs
                             )
                         else:
                             await self._table_manager.save_game(chat_id, game)
@@ -4904,22 +5516,41 @@ class GameEngine:
     def _evaluate_contender_hands(
         self, game: Game, contenders: Iterable[Player]
     ) -> List[Dict[str, object]]:
+        contenders = list(contenders)
+        showdown = self._winner_determination.evaluate_showdown(
+            game.cards_table,
+            {index: player.cards for index, player in enumerate(contenders)},
+        )
         details: List[Dict[str, object]] = []
-        for player in contenders:
-            hand_type, score, best_hand_cards = self._winner_determination.get_hand_value(
-                player.cards, game.cards_table
-            )
+        for index, player in enumerate(contenders):
+            hand = showdown.hands[index]
             details.append(
                 {
                     "player": player,
                     "total_bet": player.total_bet,
-                    "score": score,
-                    "hand_cards": best_hand_cards,
-                    "hand_type": hand_type,
+                    "score": hand.score,
+                    "hand_cards": hand.hand_cards,
+                    "hand_type": hand.hand_type,
+                    "tie_rank": showdown.rank_of(index),
                 }
             )
         return details
 
+    @staticmethod
+    def _contender_tie_groups(
+        contender_details: List[Dict[str, object]]
+    ) -> List[List[Dict[str, object]]]:
+        """Group contenders by hand strength, best group first."""
+
+        ordered = sorted(contender_details, key=lambda detail: detail["tie_rank"])
+        groups: List[List[Dict[str, object]]] = []
+        for detail in ordered:
+            if groups and groups[-1][0]["tie_rank"] == detail["tie_rank"]:
+                groups[-1].append(detail)
+            else:
+                groups.append([detail])
+        return groups
+
     def _determine_pot_winners(
         self, game: Game, contender_details: List[Dict[str, object]]
     ) -> List[Dict[str, object]]:
@@ -4931,6 +5562,7 @@ class GameEngine:
                 set(detail["total_bet"] for detail in contender_details if detail["total_bet"] > 0)
             )
         )
+        tie_groups = self._contender_tie_groups(contender_details)
 
         winners_by_pot: List[Dict[str, object]] = []
         last_bet_tier = 0
@@ -4938,15 +5570,26 @@ class GameEngine:
 
         for tier in bet_tiers:
             tier_contribution = tier - last_bet_tier
-            eligible_for_this_pot = [
-                detail for detail in contender_details if detail["total_bet"] >= tier
-            ]
+            eligible_count = sum(
+                1 for detail in contender_details if detail["total_bet"] >= tier
+            )
 
-            pot_size = tier_contribution * len(eligible_for_this_pot)
+            pot_size = tier_contribution * eligible_count
             calculated_pot_total += pot_size
 
             if pot_size > 0:
-                best_score_in_pot = max(detail["score"] for detail in eligible_for_this_pot)
+                # The first tie group with an eligible member wins this tier.
+                pot_winners = next(
+                    (
+                        eligible
+                        for eligible in (
+                            [detail for detail in group if detail["total_bet"] >= tier]
+                            for group in tie_groups
+                        )
+                        if eligible
+                    ),
+                    [],
+                )
 
                 pot_winners_info = [
                     {
@@ -4954,8 +5597,7 @@ class GameEngine:
                         "hand_cards": detail["hand_cards"],
                         "hand_type": detail["hand_type"],
                     }
-                    for detail in eligible_for_this_pot
-                    if detail["score"] == best_score_in_pot
+                    for detail in pot_winners
                 ]
 
                 winners_by_pot.append({"amount": pot_size, "winners": pot_winners_info})
@@ -5621,12 +6263,13 @@ class GameEngine:
                 await self._player_manager.cleanup_ready_prompt(
                     game, chat_id, persist=False
                 )
-                await self._reset_core_game_state(
-                    game,
-                    context=context,
-                    chat_id=chat_id,
-                    send_stop_notification=False,
-                )
+                async with self._hold_stage_lease(chat_id):
+                    await self._reset_core_game_state(
+                        game,
+                        context=context,
+                        chat_id=chat_id,
+                        send_stop_notification=False,
+                    )
                 await self._telegram_ops.send_message_safe(
                     call=lambda text=self.STOPPED_NOTIFICATION: self._view.send_message(
                         chat_id, text
@@ -5641,6 +6284,10 @@ class GameEngine:
                         request_category=RequestCategory.GENERAL,
                     ),
                 )
+        except LeaseUnavailable:
+            self._log_stage_lease_busy(
+                chat_id=chat_id, game=game, stage=event_stage_label
+            )
         except TimeoutError:
             self._log_engine_event_lock_failure(
                 lock_key=lock_key,
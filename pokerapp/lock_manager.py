@@ -3,16 +3,19 @@
 from __future__ import annotations
 
 import asyncio
-import inspect
+import contextlib
 import json
 import logging
 import math
 import os
 import random
+import sys
+import threading
 import time
 import traceback
 import uuid
 import zlib
+from collections import OrderedDict, deque
 from contextlib import AsyncExitStack, asynccontextmanager
 from contextvars import ContextVar
 from dataclasses import dataclass, field
@@ -21,7 +24,10 @@ from typing import (
     AsyncIterator,
     Awaitable,
     Callable,
+    Deque,
     Dict,
+    Hashable,
+    Iterable,
     List,
     Mapping,
     Optional,
@@ -71,8 +77,11 @@ from pokerapp.bootstrap import _make_service_logger
 from pokerapp.entities import ChatId, UserId
 from pokerapp.metrics import (
     LOCK_ACQUISITIONS,
+    LOCK_DEADLOCK_CYCLES,
+    LOCK_EVICTIONS,
     LOCK_HIERARCHY_VIOLATIONS,
     LOCK_HOLD_TIME,
+    LOCK_LIVE_OBJECTS,
 )
 from pokerapp.utils.locks import ReentrantAsyncLock
 from pokerapp.utils.logging_helpers import add_context, normalise_request_category
@@ -132,6 +141,17 @@ _ENABLE_FAST_PATH = True                    # Skip validation for speed
 _FAST_PATH_SKIP_VALIDATION = True           # Safe for uncontended locks
 _FAST_PATH_MINIMAL_LOGGING = True           # Reduce overhead
 FAST_PATH_TIMEOUT = 0.001                   # 1 millisecond
+_STACK_TRACE_SAMPLE_RATE = 64               # Capture call sites on 1 in N locks
+
+# Queue depth publishing: waiters are counted in-process and flushed to Redis
+_QUEUE_DEPTH_PUBLISH_INTERVAL_SECONDS = 1.0  # Batch window for depth updates
+_QUEUE_DEPTH_TTL_SECONDS = 300               # Expiry for published depth hashes
+
+# Distributed leases: short TTLs kept alive by a renewal task while held
+_LEASE_TTL_SECONDS = 5.0                    # Lapses this long after a crash
+_LEASE_RENEWALS_PER_TTL = 3                 # Renew every third of the TTL
+_LEASE_POLL_INTERVAL_SECONDS = 0.05         # Retry delay while waiting for a lease
+_FENCE_KEY_PREFIX = "lock:fence:"           # Per-scope fencing token counters
 
 # Performance optimization: Lock object pooling
 _LOCK_CLEANUP_BATCH_SIZE = 100              # Process locks in batches
@@ -139,6 +159,14 @@ _LOCK_CLEANUP_IDLE_THRESHOLD_SECONDS = 180.0  # 3 minutes idle before cleanup
 _ENABLE_LOCK_POOLING = True                 # Reuse lock objects
 _LOCK_POOL_MAX_SIZE = 200                   # Cap pool size (40-50 tables)
 
+# Bounded lock state: per-key locks are evicted least-recently-used first
+_LOCK_STATE_MAX_ENTRIES = 20000             # Soft cap on live per-key lock objects
+_LOCK_EVICTION_MIN_IDLE_SECONDS = 5.0       # Never evict under cap pressure sooner
+_LOCK_EVICTION_SWEEP_EVERY = 256            # New keys between amortized sweeps
+_STAGE_LOCK_HOLD_SAMPLES = 1024             # Stage hold times kept for metrics
+_PROFILE_STACK_DEPTH = 4                    # Caller frames kept per profile sample
+_PROFILE_MAX_ROWS = 2048                    # Distinct profile rows before dropping
+
 
 class LockOrderError(RuntimeError):
     """Raised when locks are acquired out of the configured order."""
@@ -148,10 +176,34 @@ class LockHierarchyViolation(LockOrderError):
     """Raised when hierarchical lock ordering constraints are violated."""
 
 
+class DeadlockDetected(LockOrderError):
+    """Raised when waiting for a lock would close a cycle in the wait-for graph.
+
+    ``cycle`` lists ``(task, lock_key)`` pairs starting with the task that
+    tried to wait; each task waits for the key that the next task holds.
+    """
+
+    def __init__(self, message: str, *, cycle: List[Tuple[str, str]]) -> None:
+        super().__init__(message)
+        self.cycle = cycle
+
+    @property
+    def keys(self) -> List[str]:
+        return [key for _, key in self.cycle]
+
+
 class LockAlreadyHeld(LockOrderError):
     """Raised when the current context attempts to reacquire the same lock."""
 
 
+class LeaseUnavailable(RuntimeError):
+    """Raised when a distributed lease stays held by another worker."""
+
+
+class LeaseBackendError(RuntimeError):
+    """Raised when the lease store cannot be reached."""
+
+
 class ConfigurationError(RuntimeError):
     """Raised when lock manager configuration is invalid."""
 
@@ -185,12 +237,65 @@ class LockInfo:
     stack_trace: Optional[str] = None
 
 
-def _event_factory() -> asyncio.Event:
-    """Create an ``asyncio.Event`` initialised to the set state."""
+@dataclass(eq=False)
+class LockLease:
+    """A distributed lock kept alive by a background renewal task.
+
+    ``fencing_token`` increases monotonically per fencing scope (``None``
+    for unfenced leases). Writers pass it along with their data so storage
+    can reject a holder whose lease has already lapsed. ``lost`` flips to
+    ``True`` once renewal fails. Renewal stops at the monotonic
+    ``expires_at`` deadline, if any, after which the key lapses like a plain
+    TTL lock. The renewal task only starts once the holder has kept the
+    lease for a renewal interval; until then ``renew_handle`` is the pending
+    timer.
+    """
+
+    key: str
+    token: str
+    fencing_token: Optional[int]
+    ttl_seconds: float
+    expires_at: Optional[float] = None
+    lost: bool = False
+    renewals: int = 0
+    renew_task: Optional["asyncio.Task[None]"] = field(default=None, repr=False)
+    renew_handle: Optional[asyncio.TimerHandle] = field(default=None, repr=False)
+
+
+# Upper bounds (seconds) of the per-table wait-time histogram buckets; waits
+# above the last bound land in an overflow bucket.
+_RW_WAIT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+
+def _wait_bucket_factory() -> List[int]:
+    return [0] * (len(_RW_WAIT_BUCKETS) + 1)
+
+
+def _observe_wait(buckets: List[int], wait: float) -> None:
+    for index, bound in enumerate(_RW_WAIT_BUCKETS):
+        if wait <= bound:
+            buckets[index] += 1
+            return
+    buckets[-1] += 1
+
+
+def _wait_percentile(buckets: List[int], quantile: float, maximum: float) -> float:
+    """Return the bucket bound holding ``quantile`` of the observations."""
 
-    event = asyncio.Event()
-    event.set()
-    return event
+    total = sum(buckets)
+    if total == 0:
+        return 0.0
+    threshold = quantile * total
+    cumulative = 0
+    for index, count in enumerate(buckets):
+        cumulative += count
+        if cumulative >= threshold:
+            if index < len(_RW_WAIT_BUCKETS):
+                return min(_RW_WAIT_BUCKETS[index], maximum)
+            return maximum
+    return maximum
 
 
 @dataclass
@@ -205,6 +310,35 @@ class _RWLockMetrics:
     total_write_wait_time: float = 0.0
     max_read_wait_time: float = 0.0
     max_write_wait_time: float = 0.0
+    read_wait_buckets: List[int] = field(default_factory=_wait_bucket_factory)
+    write_wait_buckets: List[int] = field(default_factory=_wait_bucket_factory)
+
+    def observe_read_wait(self, wait: float) -> None:
+        self.total_read_wait_time += wait
+        self.max_read_wait_time = max(self.max_read_wait_time, wait)
+        _observe_wait(self.read_wait_buckets, wait)
+
+    def observe_write_wait(self, wait: float) -> None:
+        self.total_write_wait_time += wait
+        self.max_write_wait_time = max(self.max_write_wait_time, wait)
+        _observe_wait(self.write_wait_buckets, wait)
+
+    def read_wait_percentile(self, quantile: float) -> float:
+        return _wait_percentile(
+            self.read_wait_buckets, quantile, self.max_read_wait_time
+        )
+
+    def write_wait_percentile(self, quantile: float) -> float:
+        return _wait_percentile(
+            self.write_wait_buckets, quantile, self.max_write_wait_time
+        )
+
+    def wait_histogram(self) -> Dict[str, Dict[str, int]]:
+        labels = [f"le_{bound:g}" for bound in _RW_WAIT_BUCKETS] + ["le_inf"]
+        return {
+            "read": dict(zip(labels, self.read_wait_buckets)),
+            "write": dict(zip(labels, self.write_wait_buckets)),
+        }
 
     def average_read_hold_time(self) -> float:
         return (
@@ -235,18 +369,326 @@ class _RWLockMetrics:
         )
 
 
+@dataclass(eq=False)
+class _RWWaiter:
+    writer: bool
+    future: "asyncio.Future[None]"
+
+
 @dataclass
 class _RWLockState:
-    """In-memory bookkeeping for per-table read-write locks."""
+    """Fair FIFO read-write lock for one table.
+
+    Waiters queue in arrival order and are woken individually when they are
+    granted, so a writer release never wakes readers that cannot run yet.
+    Readers at the head of the queue are admitted as one batch. With writer
+    priority the batch stops at the first queued writer, and new readers queue
+    behind waiting writers; without it every queued reader is admitted.
+    """
 
-    write_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
-    reader_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
     reader_count: int = 0
     writer_waiting: int = 0
     has_active_writer: bool = False
-    no_writer_event: asyncio.Event = field(default_factory=_event_factory)
+    waiters: Deque[_RWWaiter] = field(default_factory=deque)
     metrics: _RWLockMetrics = field(default_factory=_RWLockMetrics)
 
+    def is_idle(self) -> bool:
+        return not (self.reader_count or self.has_active_writer or self.waiters)
+
+    def can_read(self, writer_priority: bool) -> bool:
+        if self.has_active_writer:
+            return False
+        if writer_priority:
+            return self.writer_waiting == 0
+        return True
+
+    def can_write(self) -> bool:
+        return not (self.has_active_writer or self.reader_count or self.waiters)
+
+    def dispatch(self, writer_priority: bool) -> None:
+        """Grant the lock to the next waiter(s) the current state allows."""
+
+        while self.waiters and not self.has_active_writer:
+            head = self.waiters[0]
+            if head.future.done():
+                self.waiters.popleft()
+                continue
+            if head.writer:
+                if self.reader_count:
+                    return
+                self.waiters.popleft()
+                self.writer_waiting -= 1
+                self.has_active_writer = True
+                head.future.set_result(None)
+                return
+            break
+        else:
+            return
+
+        # Batched reader admission.
+        remaining: Deque[_RWWaiter] = deque()
+        blocked = False
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if waiter.future.done():
+                continue
+            if waiter.writer:
+                blocked = blocked or writer_priority
+                remaining.append(waiter)
+                continue
+            if blocked:
+                remaining.append(waiter)
+                continue
+            self.reader_count += 1
+            waiter.future.set_result(None)
+        self.waiters = remaining
+
+    def release_read(self, writer_priority: bool) -> None:
+        self.reader_count = max(0, self.reader_count - 1)
+        if self.reader_count == 0:
+            self.dispatch(writer_priority)
+
+    def release_write(self, writer_priority: bool) -> None:
+        self.has_active_writer = False
+        self.dispatch(writer_priority)
+
+    def abandon(self, waiter: _RWWaiter, writer_priority: bool) -> None:
+        """Drop a waiter that gave up before (or just as) it was granted."""
+
+        if waiter.future.done() and not waiter.future.cancelled():
+            if waiter.writer:
+                self.release_write(writer_priority)
+            else:
+                self.release_read(writer_priority)
+            return
+        try:
+            self.waiters.remove(waiter)
+        except ValueError:
+            return
+        if waiter.writer:
+            self.writer_waiting = max(0, self.writer_waiting - 1)
+        self.dispatch(writer_priority)
+
+
+class _QueueDepthTracker:
+    """In-process waiter counts per lock key.
+
+    Keys whose depth changed since the last :meth:`drain_dirty` are remembered
+    so they can be published to Redis in one batch.
+    """
+
+    def __init__(self) -> None:
+        self._depths: Dict[str, int] = {}
+        self._dirty: Set[str] = set()
+
+    def increment(self, key: str) -> int:
+        depth = self._depths.get(key, 0) + 1
+        self._depths[key] = depth
+        self._dirty.add(key)
+        return depth
+
+    def decrement(self, key: str) -> int:
+        depth = self._depths.get(key, 0) - 1
+        if depth > 0:
+            self._depths[key] = depth
+        else:
+            depth = 0
+            self._depths.pop(key, None)
+        self._dirty.add(key)
+        return depth
+
+    def get(self, key: str) -> int:
+        return self._depths.get(key, 0)
+
+    def has_dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def drain_dirty(self) -> Dict[str, int]:
+        drained = {key: self._depths.get(key, 0) for key in self._dirty}
+        self._dirty.clear()
+        return drained
+
+    def mark_dirty(self, keys: Iterable[str]) -> None:
+        self._dirty.update(keys)
+
+
+class _LockStateIndex:
+    """Least-recently-used order of per-key lock state.
+
+    Entries are ``(kind, key)`` pairs mapped to their last-use time in an
+    :class:`OrderedDict`, so :meth:`touch` is O(1) and the coldest entry is
+    always at the front. Sweeps only look at the cold end and stop at the
+    first entry that is still warm.
+    """
+
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[Tuple[str, Hashable], float]" = OrderedDict()
+        self.inserts_since_sweep = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def touch(self, kind: str, key: Hashable, now: float) -> bool:
+        """Record a use of ``key`` and return ``True`` when it is new."""
+
+        entry = (kind, key)
+        entries = self._entries
+        is_new = entry not in entries
+        entries[entry] = now
+        if is_new:
+            self.inserts_since_sweep += 1
+        else:
+            entries.move_to_end(entry)
+        return is_new
+
+    def coldest(self) -> Optional[Tuple[str, Hashable, float]]:
+        if not self._entries:
+            return None
+        (kind, key), last_used = next(iter(self._entries.items()))
+        return kind, key, last_used
+
+    def discard(self, kind: str, key: Hashable) -> None:
+        self._entries.pop((kind, key), None)
+
+    def discard_kind(self, kind: str) -> None:
+        for entry in [entry for entry in self._entries if entry[0] == kind]:
+            del self._entries[entry]
+
+
+_PROFILE_SKIP_FILES = frozenset({__file__, contextlib.__file__})
+_PROFILE_SKIP_DIRS = (os.path.dirname(asyncio.__file__),)
+
+
+def _profile_call_stack() -> str:
+    """Return the nearest callers outside the lock manager, outermost first."""
+
+    frame = sys._getframe(2)
+    names: List[str] = []
+    while frame is not None and len(names) < _PROFILE_STACK_DEPTH:
+        code = frame.f_code
+        filename = code.co_filename
+        if filename not in _PROFILE_SKIP_FILES and not filename.startswith(
+            _PROFILE_SKIP_DIRS
+        ):
+            module = frame.f_globals.get("__name__", "?")
+            names.append(f"{module}.{getattr(code, 'co_qualname', code.co_name)}")
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names) or "unknown"
+
+
+class _ProfileSample:
+    __slots__ = ("key", "lock_type", "chat_id", "stack", "started", "acquired")
+
+    def __init__(
+        self, key: str, lock_type: Optional[str], chat_id: Any, stack: str
+    ) -> None:
+        self.key = key
+        self.lock_type = lock_type
+        self.chat_id = chat_id
+        self.stack = stack
+        self.started = time.perf_counter()
+        self.acquired: Optional[float] = None
+
+
+class _ContentionProfiler:
+    """Sampled wait and hold time per (lock type, chat stage, call stack).
+
+    One acquisition in ``sample_rate`` pays for a short frame walk; the rest
+    cost a counter decrement. Exports are read from the metrics server
+    thread, so row updates and snapshots share a :class:`threading.Lock`.
+    """
+
+    def __init__(self, sample_rate: int = 0) -> None:
+        self._rows: Dict[Tuple[str, str, str], List[float]] = {}
+        self._mutex = threading.Lock()
+        self.dropped = 0
+        self.set_sample_rate(sample_rate)
+
+    def set_sample_rate(self, sample_rate: int) -> None:
+        self.sample_rate = max(0, int(sample_rate))
+        # Sample the next acquisition so a fresh profile fills immediately.
+        self._countdown = 1
+
+    def begin(
+        self, key: str, chat_id: Any = None, lock_type: Optional[str] = None
+    ) -> Optional[_ProfileSample]:
+        if self.sample_rate <= 0:
+            return None
+        self._countdown -= 1
+        if self._countdown > 0:
+            return None
+        self._countdown = self.sample_rate
+        return _ProfileSample(key, lock_type, chat_id, _profile_call_stack())
+
+    def record(self, sample: _ProfileSample, lock_type: str, stage: str) -> None:
+        now = time.perf_counter()
+        acquired = sample.acquired if sample.acquired is not None else now
+        wait = acquired - sample.started
+        hold = now - acquired if sample.acquired is not None else 0.0
+        row_key = (lock_type, stage, sample.stack)
+        with self._mutex:
+            row = self._rows.get(row_key)
+            if row is None:
+                if len(self._rows) >= _PROFILE_MAX_ROWS:
+                    self.dropped += 1
+                    return
+                row = self._rows[row_key] = [0, 0.0, 0.0, 0.0, 0.0]
+            row[0] += 1
+            row[1] += wait
+            row[2] += hold
+            row[3] = max(row[3], wait)
+            row[4] = max(row[4], hold)
+
+    def reset(self) -> None:
+        with self._mutex:
+            self._rows.clear()
+            self.dropped = 0
+
+    def rows(self) -> List[Dict[str, Any]]:
+        with self._mutex:
+            items = [(key, list(values)) for key, values in self._rows.items()]
+        return [
+            {
+                "lock_type": lock_type,
+                "stage": stage,
+                "stack": stack,
+                "samples": int(values[0]),
+                "wait_seconds": values[1],
+                "hold_seconds": values[2],
+                "max_wait_seconds": values[3],
+                "max_hold_seconds": values[4],
+            }
+            for (lock_type, stage, stack), values in items
+        ]
+
+    def collapsed(self, metric: str = "hold") -> str:
+        """Return ``lock_type;stage;frames... microseconds`` lines.
+
+        The output is the collapsed-stack format read by ``flamegraph.pl``
+        and speedscope. Values are sampled totals, not scaled by the rate.
+        """
+
+        field_name = "wait_seconds" if metric == "wait" else "hold_seconds"
+        lines = []
+        for row in self.rows():
+            micros = int(row[field_name] * 1_000_000)
+            if micros > 0:
+                lines.append(
+                    f"{row['lock_type']};{row['stage']};{row['stack']} {micros}"
+                )
+        lines.sort()
+        return "".join(f"{line}\n" for line in lines)
+
+
+def _lock_is_busy(lock: Any) -> bool:
+    """Return ``True`` when ``lock`` is held or has tasks queued on it."""
+
+    if lock.locked():
+        return True
+    inner = getattr(lock, "_lock", lock)
+    return bool(getattr(inner, "_waiters", None))
+
 
 class _InMemoryActionLockBackend:
     """Minimal Redis-like backend used when no Redis pool is provided.
@@ -260,6 +702,7 @@ class _InMemoryActionLockBackend:
     def __init__(self) -> None:
         self._lock = asyncio.Lock()
         self._values: Dict[str, Tuple[str, float]] = {}
+        self._counters: Dict[str, int] = {}
         self._metrics: Dict[str, int] = {
             "purge_count": 0,
             "peak_size": 0,
@@ -274,16 +717,18 @@ class _InMemoryActionLockBackend:
         *,
         nx: bool = False,
         ex: Optional[int] = None,
+        px: Optional[int] = None,
     ) -> bool:
-        if ex is None:
+        if ex is None and px is None:
             raise ValueError("In-memory Redis backend requires an expiration (ex) value")
+        ttl_seconds = float(ex) if ex is not None else float(px) / 1000.0
 
         async with self._lock:
             self._purge_expired()
             if nx and key in self._values:
                 return False
 
-            self._values[key] = (value, time.monotonic() + float(ex))
+            self._values[key] = (value, time.monotonic() + ttl_seconds)
             current_size = len(self._values)
             self._metrics["current_size"] = current_size
             self._metrics["peak_size"] = max(
@@ -346,6 +791,23 @@ class _InMemoryActionLockBackend:
             initial_size,
         )
 
+    async def incr(self, key: str) -> int:
+        async with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+
+    async def expire_if_owner(self, key: str, token: str, ttl_ms: int) -> int:
+        """Extend ``key`` by ``ttl_ms`` when it still holds ``token``."""
+
+        async with self._lock:
+            self._purge_expired()
+            current = self._values.get(key)
+            if current is None or current[0] != token:
+                return 0
+            self._values[key] = (token, time.monotonic() + ttl_ms / 1000.0)
+            return 1
+
     async def get(self, key: str) -> Optional[str]:
         async with self._lock:
             self._purge_expired()
@@ -427,6 +889,14 @@ class LockManager:
     """
 
     _LONG_HOLD_THRESHOLD_SECONDS = 2.0
+    RENEW_LEASE_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        redis.call('PEXPIRE', KEYS[1], ARGV[2])
+        return 1
+    end
+    return 0
+    """
+
     RELEASE_ACTION_LOCK_SCRIPT = """
     local key = KEYS[1]
     local expected_token = ARGV[1]
@@ -521,12 +991,49 @@ class LockManager:
         self._enforce_hierarchy: bool = bool(
             lock_manager_flags.get("enable_hierarchy_enforcement", True)
         )
+        self._enable_deadlock_detection: bool = bool(
+            lock_manager_flags.get("enable_deadlock_detection", True)
+        )
         self._enable_duplicate_detection: bool = bool(
             lock_manager_flags.get("enable_duplicate_detection", False)
         )
         self._enable_stack_trace_logging: bool = bool(
             lock_manager_flags.get("enable_stack_trace_logging", False)
         )
+        try:
+            sample_rate = int(
+                lock_manager_flags.get(
+                    "stack_trace_sample_rate", _STACK_TRACE_SAMPLE_RATE
+                )
+            )
+        except (TypeError, ValueError):
+            sample_rate = _STACK_TRACE_SAMPLE_RATE
+        self._stack_trace_sample_rate: int = max(1, sample_rate)
+        # Start at the threshold so the first acquisition is always sampled.
+        self._stack_trace_sample_counter: int = self._stack_trace_sample_rate - 1
+        try:
+            max_lock_objects = int(
+                lock_manager_flags.get("max_lock_objects", _LOCK_STATE_MAX_ENTRIES)
+            )
+        except (TypeError, ValueError):
+            max_lock_objects = _LOCK_STATE_MAX_ENTRIES
+        self._lock_state_max_entries: int = max(1, max_lock_objects)
+        self._lock_state_index = _LockStateIndex()
+        try:
+            lease_ttl = float(
+                lock_manager_flags.get("lease_ttl_seconds", _LEASE_TTL_SECONDS)
+            )
+        except (TypeError, ValueError):
+            lease_ttl = _LEASE_TTL_SECONDS
+        self._lease_ttl_seconds: float = lease_ttl if lease_ttl > 0 else _LEASE_TTL_SECONDS
+        self._active_leases: Dict[str, LockLease] = {}
+        try:
+            profile_rate = int(lock_manager_flags.get("contention_profile_sample_rate", 0))
+        except (TypeError, ValueError):
+            profile_rate = 0
+        self._profiler = _ContentionProfiler(profile_rate)
+        self._stage_resolver: Optional[Callable[[int], Optional[str]]] = None
+        self._lock_evictions: Dict[str, int] = {}
         self._smart_retry_enabled: bool = bool(
             self._lock_manager_flags.get("enable_smart_retry", True)
         )
@@ -552,6 +1059,7 @@ class LockManager:
         )
         self._metrics: Dict[str, int] = {
             "lock_contention": 0,
+            "deadlock_cycles": 0,
             "lock_timeouts": 0,
             "lock_cancellations": 0,
             "lock_cleanup_failures": 0,
@@ -632,7 +1140,9 @@ class LockManager:
         self._table_rw_locks: Dict[int, _RWLockState] = {}
         self._player_locks: Dict[Tuple[int, int], asyncio.Lock] = {}
         self._countdown_locks: Dict[int, asyncio.Lock] = {}
-        self._stage_lock_hold_times: List[float] = []
+        self._stage_lock_hold_times: Deque[float] = deque(
+            maxlen=_STAGE_LOCK_HOLD_SAMPLES
+        )
         self._stage_lock_acquisitions: int = 0
         self.writer_priority = writer_priority
         self.log_slow_lock_threshold = max(0.0, float(log_slow_lock_threshold))
@@ -674,7 +1184,8 @@ class LockManager:
         # Redis key layout used by the lock manager:
         #   * action_lock_prefix        -> Prefix for transient action locks (SETNX)
         #   * engine.table_lock_prefix  -> Prefix for persistent engine/table locks
-        #   * lock_queue_prefix         -> Prefix for the Redis list tracking waiter IDs
+        #   * lock_queue_prefix         -> Prefix for the Redis hash of waiter counts,
+        #                                  one field per process
         #
         # Keeping the structure centralised ensures the Redis footprint is explicitly
         # documented and easy to override from configuration for multi-tenant
@@ -682,8 +1193,11 @@ class LockManager:
         self._redis_keys: Dict[str, Any] = {
             "action_lock_prefix": _resolve_action_lock_prefix(redis_keys_source),
             "engine": engine_defaults,
-            "lock_queue_prefix": "lock:queue:",
+            "lock_queue_prefix": "lock:queue_depth:",
         }
+        self._queue_depths = _QueueDepthTracker()
+        self._queue_depth_instance_id = uuid.uuid4().hex[:12]
+        self._queue_depth_publish_task: Optional[asyncio.Task[None]] = None
 
         redis_host: Optional[str] = None
         redis_port: Optional[int] = None
@@ -956,22 +1470,23 @@ class LockManager:
         if state is None:
             state = _RWLockState()
             self._table_rw_locks[normalized] = state
+        self._touch_lock_state("table", normalized)
         return state
 
-    async def _mark_writer_waiting(self, state: _RWLockState) -> None:
-        async with state.reader_lock:
-            state.writer_waiting += 1
-            state.no_writer_event.clear()
+    async def _wait_for_rw_grant(self, state: _RWLockState, *, writer: bool) -> None:
+        """Queue on ``state`` until :meth:`_RWLockState.dispatch` grants access."""
 
-    async def _unmark_writer_waiting(self, state: _RWLockState) -> None:
-        async with state.reader_lock:
-            state.writer_waiting = max(0, state.writer_waiting - 1)
-            if (
-                state.writer_waiting == 0
-                and not state.write_lock.locked()
-                and not state.has_active_writer
-            ):
-                state.no_writer_event.set()
+        waiter = _RWWaiter(
+            writer=writer, future=asyncio.get_running_loop().create_future()
+        )
+        state.waiters.append(waiter)
+        if writer:
+            state.writer_waiting += 1
+        try:
+            await waiter.future
+        except BaseException:
+            state.abandon(waiter, self.writer_priority)
+            raise
 
     @asynccontextmanager
     async def stage_lock(self, chat_id: int) -> AsyncIterator[None]:
@@ -979,13 +1494,19 @@ class LockManager:
         lock = self._stage_locks.get(lock_id)
         if lock is None:
             lock = self._stage_locks[lock_id] = asyncio.Lock()
+        self._touch_lock_state("stage", lock_id)
 
+        sample = self._profiler.begin("stage", lock_id, "stage")
         start_time = time.perf_counter()
         async with lock:
             self._stage_lock_acquisitions += 1
+            if sample is not None:
+                sample.acquired = time.perf_counter()
             try:
                 yield
             finally:
+                if sample is not None:
+                    self._finish_profile(sample)
                 hold_time = time.perf_counter() - start_time
                 self._stage_lock_hold_times.append(hold_time)
                 self._invalidate_metrics_cache()
@@ -1005,36 +1526,21 @@ class LockManager:
         state = self._get_or_create_table_state(chat_id)
         loop = asyncio.get_running_loop()
         wait_start = loop.time()
-        waited = False
-        last_wait_snapshot = (False, False)
         lock_key = f"table_read:{self._safe_int(chat_id)}"
         hierarchy_level = self.LOCK_LEVELS.get("table_read", self._default_lock_level)
+        if self._enforce_hierarchy:
+            self._validate_lock_hierarchy(lock_key, hierarchy_level)
+        sample = self._profiler.begin(lock_key, chat_id, "table_read")
 
-        while True:
-            async with state.reader_lock:
-                writer_active = state.write_lock.locked() or state.has_active_writer
-                writer_waiting = state.writer_waiting > 0
-                should_wait = writer_active or (
-                    self.writer_priority and writer_waiting
-                )
-                if not should_wait:
-                    state.reader_count += 1
-                    state.metrics.read_acquisitions += 1
-                    if state.writer_waiting == 0 and not state.write_lock.locked():
-                        state.no_writer_event.set()
-                    break
-                wait_event = state.no_writer_event
-                last_wait_snapshot = (writer_active, writer_waiting)
-            waited = True
-            await wait_event.wait()
-
-        if waited:
+        if state.can_read(self.writer_priority):
+            state.reader_count += 1
+            wait_duration = 0.0
+        else:
+            writer_active = state.has_active_writer
+            writer_waiting = state.writer_waiting > 0
+            await self._wait_for_rw_grant(state, writer=False)
             wait_duration = loop.time() - wait_start
-            metrics = state.metrics
-            metrics.total_read_wait_time += wait_duration
-            metrics.max_read_wait_time = max(metrics.max_read_wait_time, wait_duration)
             if wait_duration > self.log_slow_lock_threshold:
-                writer_active, writer_waiting = last_wait_snapshot
                 self._logger.warning(
                     "Slow read lock acquisition for chat %s: waited %.3fs",
                     self._normalize_chat_id(chat_id),
@@ -1045,7 +1551,11 @@ class LockManager:
                         "writer_waiting": writer_waiting,
                         "wait_seconds": wait_duration,
                     },
-                    )
+                )
+        state.metrics.read_acquisitions += 1
+        state.metrics.observe_read_wait(wait_duration)
+        if sample is not None:
+            sample.acquired = time.perf_counter()
 
         hold_start = loop.time()
         context_payload = {
@@ -1054,33 +1564,27 @@ class LockManager:
             "hierarchy_level": hierarchy_level,
         }
         if self._enforce_hierarchy:
-            self._validate_lock_hierarchy(lock_key, hierarchy_level)
             self._record_acquired(lock_key, hierarchy_level, context_payload)
         self._track_lock_acquisition(lock_key, "table_read", hierarchy_level)
         smart_retry_acquired = False
-        if self._smart_retry_enabled:
-            timeout = self._get_lock_timeout("table_read")
-            acquired = await self.acquire_with_smart_retry(
-                lock_key, timeout, context_payload
-            )
-            if not acquired:
-                raise TimeoutError(
-                    f"Failed to acquire {lock_key} after smart retry"
-                )
-            smart_retry_acquired = True
         try:
+            if self._smart_retry_enabled:
+                timeout = self._get_lock_timeout("table_read")
+                acquired = await self.acquire_with_smart_retry(
+                    lock_key, timeout, context_payload
+                )
+                if not acquired:
+                    raise TimeoutError(
+                        f"Failed to acquire {lock_key} after smart retry"
+                    )
+                smart_retry_acquired = True
             yield
         finally:
+            if sample is not None:
+                self._finish_profile(sample)
             hold_duration = loop.time() - hold_start
             state.metrics.total_read_hold_time += hold_duration
-            async with state.reader_lock:
-                state.reader_count = max(0, state.reader_count - 1)
-                if (
-                    state.writer_waiting == 0
-                    and not state.write_lock.locked()
-                    and not state.has_active_writer
-                ):
-                    state.no_writer_event.set()
+            state.release_read(self.writer_priority)
             self._invalidate_metrics_cache()
             self._logger.debug(
                 "Table read lock released after %.3fs",
@@ -1114,6 +1618,7 @@ class LockManager:
         if self._enforce_hierarchy:
             self._validate_lock_hierarchy(lock_key, hierarchy_level)
         self._check_duplicate_lock(lock_key, "table_write")
+        sample = self._profiler.begin(lock_key, chat_id, "table_write")
 
         tracked_externally = False
         smart_retry_acquired = False
@@ -1132,77 +1637,67 @@ class LockManager:
                 )
             smart_retry_acquired = True
 
-        writer_marked = False
         if not tracked_externally and self._enforce_hierarchy:
             # Record acquisition for hierarchy tracking when using legacy path
             self._record_acquired(lock_key, hierarchy_level, context_payload)
 
-        await self._mark_writer_waiting(state)
-        writer_marked = True
+        writer_granted = False
         try:
-            async with state.write_lock:
-                while True:
-                    async with state.reader_lock:
-                        max_reader_wait = max(max_reader_wait, state.reader_count)
-                        if state.reader_count == 0:
-                            break
-                    await asyncio.sleep(0.01)
-
-                wait_duration = loop.time() - wait_start
-                if max_reader_wait > 0 or wait_duration > 0.001:
-                    metrics = state.metrics
-                    metrics.total_write_wait_time += wait_duration
-                    metrics.max_write_wait_time = max(
-                        metrics.max_write_wait_time, wait_duration
-                    )
-                    if wait_duration > self.log_slow_lock_threshold:
-                        self._logger.warning(
-                            "Slow write lock acquisition for chat %s: waited %.3fs for %d readers",
-                            self._normalize_chat_id(chat_id),
-                            wait_duration,
-                            max_reader_wait,
-                            extra={
-                                "event_type": "table_write_lock_slow",
-                                "wait_seconds": wait_duration,
-                                "max_reader_wait": max_reader_wait,
-                            },
-                        )
+            if state.can_write():
+                state.has_active_writer = True
+            else:
+                max_reader_wait = state.reader_count
+                await self._wait_for_rw_grant(state, writer=True)
+            writer_granted = True
 
-                async with state.reader_lock:
-                    state.has_active_writer = True
-                    state.metrics.write_acquisitions += 1
+            wait_duration = loop.time() - wait_start
+            metrics = state.metrics
+            metrics.write_acquisitions += 1
+            metrics.observe_write_wait(wait_duration)
+            if wait_duration > self.log_slow_lock_threshold:
+                self._logger.warning(
+                    "Slow write lock acquisition for chat %s: waited %.3fs for %d readers",
+                    self._normalize_chat_id(chat_id),
+                    wait_duration,
+                    max_reader_wait,
+                    extra={
+                        "event_type": "table_write_lock_slow",
+                        "wait_seconds": wait_duration,
+                        "max_reader_wait": max_reader_wait,
+                    },
+                )
 
-                hold_start = loop.time()
+            hold_start = loop.time()
+            if sample is not None:
+                sample.acquired = time.perf_counter()
+            try:
+                if not tracked_externally:
+                    self._track_lock_acquisition(
+                        lock_key, "table_write", hierarchy_level
+                    )
                 try:
-                    if not tracked_externally:
-                        self._track_lock_acquisition(
-                            lock_key, "table_write", hierarchy_level
-                        )
-                    try:
-                        yield
-                    finally:
-                        if not tracked_externally:
-                            self._release_lock_tracking(lock_key)
+                    yield
                 finally:
-                    hold_duration = loop.time() - hold_start
-                    state.metrics.total_write_hold_time += hold_duration
-                    async with state.reader_lock:
-                        state.has_active_writer = False
-                        if state.writer_waiting == 0 and not state.write_lock.locked():
-                            state.no_writer_event.set()
-                    self._invalidate_metrics_cache()
-                    self._logger.debug(
-                        "Table write lock released after %.3fs",
-                        hold_duration,
-                        extra={
-                            "event_type": "table_write_lock_released",
-                            "chat_id": self._normalize_chat_id(chat_id),
-                            "hold_time_seconds": hold_duration,
-                        },
-                    )
+                    if not tracked_externally:
+                        self._release_lock_tracking(lock_key)
+            finally:
+                if sample is not None:
+                    self._finish_profile(sample)
+                hold_duration = loop.time() - hold_start
+                state.metrics.total_write_hold_time += hold_duration
+                self._invalidate_metrics_cache()
+                self._logger.debug(
+                    "Table write lock released after %.3fs",
+                    hold_duration,
+                    extra={
+                        "event_type": "table_write_lock_released",
+                        "chat_id": self._normalize_chat_id(chat_id),
+                        "hold_time_seconds": hold_duration,
+                    },
+                )
         finally:
-            if writer_marked:
-                await self._unmark_writer_waiting(state)
+            if writer_granted:
+                state.release_write(self.writer_priority)
             if smart_retry_acquired:
                 await self._release_lock_internal(lock_key)
             if self._enforce_hierarchy:
@@ -1535,7 +2030,8 @@ class LockManager:
             acquired_lock = False
             hierarchy_level = level
             if self._enforce_hierarchy:
-                self._validate_lock_hierarchy(lock_key, hierarchy_level)
+                if self._lock_state_var.get():
+                    self._validate_lock_hierarchy(lock_key, hierarchy_level)
                 self._record_acquired(lock_key, hierarchy_level, guard_context)
             self._track_lock_acquisition(lock_key, lock_type_label, hierarchy_level)
             wait_start = time.perf_counter()
@@ -1775,6 +2271,7 @@ class LockManager:
         lock = self._player_locks.get(key)
         if lock is None:
             lock = self._player_locks[key] = asyncio.Lock()
+        self._touch_lock_state("player", key)
 
         async with lock:
             yield
@@ -1785,6 +2282,7 @@ class LockManager:
         lock = self._countdown_locks.get(key)
         if lock is None:
             lock = self._countdown_locks[key] = asyncio.Lock()
+        self._touch_lock_state("countdown", key)
 
         async with lock:
             yield
@@ -1832,6 +2330,7 @@ class LockManager:
                     )
 
                 self._locks[key] = lock
+            self._touch_lock_state("lock", key)
             return lock
 
     async def shutdown(self, timeout: float = 5.0) -> Dict[str, Any]:
@@ -1883,6 +2382,16 @@ class LockManager:
                         },
                     )
 
+            for lease in list(self._active_leases.values()):
+                await self.release_lease(lease)
+
+            publish_task = self._queue_depth_publish_task
+            self._queue_depth_publish_task = None
+            if publish_task is not None and not publish_task.done():
+                publish_task.cancel()
+                await asyncio.gather(publish_task, return_exceptions=True)
+            await self.publish_queue_depths()
+
             shutdown_duration = asyncio.get_running_loop().time() - shutdown_start
 
             stats = {
@@ -1902,113 +2411,186 @@ class LockManager:
             return stats
 
     async def cleanup_idle_locks(self) -> int:
-        """Remove locks idle for longer than the configured threshold."""
+        """Evict lock state idle for longer than the configured threshold.
+
+        Only the cold end of the last-use index is visited, so the cost is
+        proportional to the number of idle entries rather than every key ever
+        seen. Held or waited-on locks are never evicted.
+        """
 
         if not _ENABLE_LOCK_POOLING:
             return 0
 
-        current_time = time.time()
-        removed_count = 0
-        keys_to_remove: Set[str] = set()
-
         async with self._locks_guard:
-            for key, lock in list(self._locks.items()):
-                try:
-                    locked_attr = getattr(lock, "locked", None)
-                    if callable(locked_attr):
-                        try:
-                            is_locked = bool(locked_attr())
-                        except Exception:  # pragma: no cover - defensive
-                            is_locked = getattr(lock, "_count", 0) > 0
-                    else:
-                        is_locked = getattr(lock, "_count", 0) > 0
+            removed_count = self._evict_idle_lock_state(
+                idle_after=_LOCK_CLEANUP_IDLE_THRESHOLD_SECONDS
+            )
 
-                    if is_locked:
-                        continue
+        if removed_count > 0:
+            self._logger.info(
+                "Cleaned up %d idle locks",
+                removed_count,
+                extra={
+                    "event_type": "lock_cleanup",
+                    "removed_count": removed_count,
+                },
+            )
 
-                    last_used = getattr(lock, "_acquired_at_ts", None)
-                    if last_used is None:
-                        continue
+        return removed_count
 
-                    idle_duration = current_time - last_used
-                    if idle_duration < _LOCK_CLEANUP_IDLE_THRESHOLD_SECONDS:
-                        continue
+    def _touch_lock_state(self, kind: str, key: Hashable) -> None:
+        """Mark ``key`` as used and run an amortized sweep on new keys."""
 
-                    if key in keys_to_remove:
-                        continue
+        index = self._lock_state_index
+        if not index.touch(kind, key, time.monotonic()):
+            return
+        if (
+            len(index) > self._lock_state_max_entries
+            or index.inserts_since_sweep >= _LOCK_EVICTION_SWEEP_EVERY
+        ):
+            self._evict_idle_lock_state(
+                idle_after=_LOCK_CLEANUP_IDLE_THRESHOLD_SECONDS,
+                limit=_LOCK_CLEANUP_BATCH_SIZE,
+            )
 
-                    keys_to_remove.add(key)
+    def _evict_idle_lock_state(
+        self, *, idle_after: float, limit: Optional[int] = None
+    ) -> int:
+        """Evict cold entries from the last-use index and return how many.
 
-                    if len(keys_to_remove) >= _LOCK_CLEANUP_BATCH_SIZE:
-                        removed_count += await self._process_lock_cleanup_batch(keys_to_remove)
-                        keys_to_remove = set()
+        An entry goes once it has been idle for ``idle_after`` seconds, or
+        after :data:`_LOCK_EVICTION_MIN_IDLE_SECONDS` while the index is over
+        ``max_lock_objects``. Busy entries are re-touched and skipped.
+        """
 
-                except Exception as exc:  # pragma: no cover - defensive
-                    self._metrics["lock_cleanup_failures"] = (
-                        self._metrics.get("lock_cleanup_failures", 0) + 1
-                    )
-                    self._logger.warning(
-                        "[LOCK_CLEANUP] Error evaluating key=%s: %s",
-                        key,
-                        exc,
-                        extra={"event_type": "lock_cleanup_error", "lock_key": key},
-                    )
+        index = self._lock_state_index
+        index.inserts_since_sweep = 0
+        now = time.monotonic()
+        budget = len(index) if limit is None else min(limit, len(index))
+        removed_count = 0
 
-            if keys_to_remove:
-                removed_count += await self._process_lock_cleanup_batch(keys_to_remove)
+        for _ in range(budget):
+            coldest = index.coldest()
+            if coldest is None:
+                break
+            kind, key, last_used = coldest
+            idle = now - last_used
+            over_cap = len(index) > self._lock_state_max_entries
+            if idle < idle_after and not (
+                over_cap and idle >= _LOCK_EVICTION_MIN_IDLE_SECONDS
+            ):
+                break
+
+            try:
+                evicted = self._evict_lock_state_entry(kind, key)
+            except Exception as exc:  # pragma: no cover - defensive
+                evicted = None
+                self._metrics["lock_cleanup_failures"] = (
+                    self._metrics.get("lock_cleanup_failures", 0) + 1
+                )
+                self._logger.warning(
+                    "[LOCK_CLEANUP] Error evaluating key=%s: %s",
+                    key,
+                    exc,
+                    extra={"event_type": "lock_cleanup_error", "lock_key": key},
+                )
+
+            if evicted is None:
+                index.touch(kind, key, now)
+                continue
+
+            index.discard(kind, key)
+            if evicted:
+                removed_count += 1
+                self._lock_evictions[kind] = self._lock_evictions.get(kind, 0) + 1
+                LOCK_EVICTIONS.labels(kind=kind).inc()
 
         if removed_count > 0:
             self._metrics["lock_cleanup_removed_count"] = (
                 self._metrics.get("lock_cleanup_removed_count", 0) + removed_count
             )
-            self._logger.info(
-                "Cleaned up %d idle locks",
-                removed_count,
-                extra={
-                    "event_type": "lock_cleanup",
-                    "removed_count": removed_count,
-                },
-            )
+            self._invalidate_metrics_cache()
+        self._publish_live_lock_gauges()
+        return removed_count
 
-        if removed_count > 0 and hasattr(self, "_cached_metrics"):
-            self._cached_metrics = None
-            self._cached_metrics_ts = 0.0
+    def _evict_lock_state_entry(self, kind: str, key: Hashable) -> Optional[bool]:
+        """Drop the state behind one index entry.
 
-        return removed_count
+        Returns ``True`` when an object was evicted, ``False`` when it was
+        already gone and ``None`` when it is held or waited on.
+        """
 
-    async def _process_lock_cleanup_batch(self, keys: Set[str]) -> int:
-        """Process a batch of lock removals while holding the locks guard."""
+        if kind == "table":
+            state = self._table_rw_locks.get(key)
+            if state is None:
+                return False
+            if not state.is_idle():
+                return None
+            del self._table_rw_locks[key]
+            return True
 
-        removed_count = 0
-        for batch_key in list(keys):
-            removed_lock = self._locks.pop(batch_key, None)
-            if removed_lock is None:
-                continue
+        if kind == "lock":
+            lock = self._locks.get(key)  # type: ignore[arg-type]
+            if lock is None:
+                return False
+            if _lock_is_busy(lock) or self._queue_depths.get(key) > 0:  # type: ignore[arg-type]
+                return None
+            del self._locks[key]  # type: ignore[arg-type]
+            if self._timeout_count.get(key) == 0:  # type: ignore[arg-type]
+                del self._timeout_count[key]  # type: ignore[arg-type]
+            self._return_lock_to_pool(lock)
+            return True
 
-            removed_count += 1
+        primitives = self._primitive_lock_maps().get(kind)
+        if primitives is None:
+            return False
+        primitive = primitives.get(key)
+        if primitive is None:
+            return False
+        if _lock_is_busy(primitive):
+            return None
+        del primitives[key]
+        return True
 
-            if len(self._lock_pool) >= _LOCK_POOL_MAX_SIZE:
-                continue
+    def _primitive_lock_maps(self) -> Dict[str, Dict[Any, asyncio.Lock]]:
+        return {
+            "stage": self._stage_locks,
+            "player": self._player_locks,
+            "countdown": self._countdown_locks,
+        }
 
-            async with self._lock_pool_lock:
-                if len(self._lock_pool) >= _LOCK_POOL_MAX_SIZE:
-                    continue
+    def _return_lock_to_pool(self, lock: ReentrantAsyncLock) -> None:
+        if len(self._lock_pool) >= _LOCK_POOL_MAX_SIZE:
+            return
 
-                for attr in (
-                    "_acquired_at_ts",
-                    "_acquired_by_callsite",
-                    "_acquired_by_function",
-                    "_acquired_by_task",
-                ):
-                    if hasattr(removed_lock, attr):
-                        try:
-                            delattr(removed_lock, attr)
-                        except AttributeError:
-                            pass
+        for attr in (
+            "_acquired_at_ts",
+            "_acquired_by_callsite",
+            "_acquired_by_function",
+            "_acquired_by_task",
+        ):
+            if hasattr(lock, attr):
+                try:
+                    delattr(lock, attr)
+                except AttributeError:
+                    pass
 
-                self._lock_pool.append(removed_lock)
+        self._lock_pool.append(lock)
 
-        return removed_count
+    def _live_lock_objects(self) -> Dict[str, int]:
+        live = {
+            "lock": len(self._locks),
+            "table": len(self._table_rw_locks),
+        }
+        for kind, primitives in self._primitive_lock_maps().items():
+            live[kind] = len(primitives)
+        return live
+
+    def _publish_live_lock_gauges(self) -> Dict[str, int]:
+        live = self._live_lock_objects()
+        for kind, count in live.items():
+            LOCK_LIVE_OBJECTS.labels(kind=kind).set(count)
+        return live
 
     @asynccontextmanager
     async def acquire_batch(
@@ -2018,65 +2600,74 @@ class LockManager:
         *,
         context: Optional[Mapping[str, Any]] = None,
     ) -> AsyncIterator[Dict[str, bool]]:
-        """Acquire multiple locks atomically in level order."""
+        """Acquire multiple locks as one all-or-nothing unit.
+
+        Keys are taken in one canonical order (highest level first, then by
+        key) so that two batches over overlapping keys can never deadlock.
+        Hierarchy and order rules are checked once for the whole set, against
+        the locks held before the batch, instead of per key. If any key cannot
+        be taken within ``timeout`` the keys already acquired are released
+        before the body runs, and every entry of the yielded mapping is
+        ``False``.
+        """
 
         if not keys:
             yield {}
             return
 
-        # Deduplicate while preserving order
-        unique_keys = list(dict.fromkeys(keys))
+        # Deduplicate, then sort into canonical order (CRITICAL for deadlocks)
+        key_levels = sorted(
+            (
+                (key, self._resolve_level(key, override=None))
+                for key in dict.fromkeys(keys)
+            ),
+            key=lambda item: (-item[1], item[0]),
+        )
+        sorted_keys = [key for key, _ in key_levels]
 
-        # Sort by level to prevent deadlocks (CRITICAL)
-        key_levels = [(k, self._resolve_level(k, override=None)) for k in unique_keys]
-        sorted_keys = [k for k, _ in sorted(key_levels, key=lambda x: x[1])]
+        self._validate_batch_order(key_levels, context)
 
-        # Calculate per-lock timeout (equal distribution)
-        per_lock_timeout: Optional[float]
-        if timeout is not None and len(sorted_keys) > 0:
-            per_lock_timeout = timeout / len(sorted_keys)
-        else:
-            per_lock_timeout = timeout
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + max(0.0, timeout)
 
         # Track acquisition
         acquired_keys: List[str] = []
-        results: Dict[str, bool] = {}
+        results: Dict[str, bool] = {key: False for key in sorted_keys}
         batch_start = time.time()
 
         try:
-            # Acquire in level order
+            # Acquire in canonical order
             for key in sorted_keys:
+                remaining = (
+                    None if deadline is None else max(0.0, deadline - loop.time())
+                )
                 success = await self.acquire(
                     key,
-                    timeout=per_lock_timeout,
+                    timeout=remaining,
                     context=context,
                     timeout_log_level=logging.DEBUG,
+                    validate_order=False,
                 )
-                results[key] = success
-
-                if success:
-                    acquired_keys.append(key)
-                else:
-                    # FAST FAIL: Stop on first failure
+                if not success:
                     elapsed = time.time() - batch_start
                     self._logger.warning(
-                        "[LOCK_BATCH] Failed key=%s after %.3fs (acquired %d/%d)",
+                        "[LOCK_BATCH] Failed key=%s after %.3fs; rolling back %d/%d",
                         key,
                         elapsed,
                         len(acquired_keys),
                         len(sorted_keys),
                         extra={
-                            "event_type": "lock_batch_partial_failure",
+                            "event_type": "lock_batch_rollback",
                             "batch_keys": sorted_keys,
-                            "acquired_keys": acquired_keys,
+                            "acquired_keys": list(acquired_keys),
                             "failed_key": key,
                             "duration": elapsed,
                         },
                     )
                     break
-
-            # Log success
-            if len(acquired_keys) == len(sorted_keys):
+                acquired_keys.append(key)
+            else:
+                results = {key: True for key in sorted_keys}
                 elapsed = time.time() - batch_start
                 self._logger.debug(
                     "[LOCK_BATCH] Acquired %d locks in %.3fs: %s",
@@ -2090,44 +2681,86 @@ class LockManager:
                     },
                 )
 
+            if not all(results.values()):
+                # All-or-nothing: never run the body on a partial set
+                await self._release_batch_keys(acquired_keys, context)
+                acquired_keys = []
+
             # Yield results to caller
             yield results
 
         finally:
-            # Release in REVERSE order (prevent deadlocks)
-            release_start = time.time()
-            release_errors = 0
+            await self._release_batch_keys(acquired_keys, context)
 
-            for key in reversed(acquired_keys):
-                try:
-                    await self.release(key, context=context)
-                except Exception as e:  # pragma: no cover
-                    release_errors += 1
-                    self._logger.error(
-                        "[LOCK_BATCH] Release failed for key=%s: %s",
-                        key,
-                        e,
-                        extra={
-                            "event_type": "lock_batch_release_error",
-                            "lock_key": key,
-                        },
-                    )
+    def _validate_batch_order(
+        self,
+        key_levels: Sequence[Tuple[str, int]],
+        context: Optional[Mapping[str, Any]],
+    ) -> None:
+        """Check a batch against the locks held before it, in one pass.
 
-            release_duration = time.time() - release_start
-            if release_errors > 0 or release_duration > 0.1:
-                self._logger.warning(
-                    "[LOCK_BATCH] Released %d locks in %.3fs (%d errors)",
-                    len(acquired_keys),
-                    release_duration,
-                    release_errors,
+        Members of the batch are not checked against each other: their
+        canonical order is what keeps batches deadlock-free.
+        """
+
+        current_acquisitions = self._get_current_acquisitions()
+        if not current_acquisitions:
+            return
+
+        held_keys = {acq.key for acq in current_acquisitions}
+        for key, level in key_levels:
+            if key in held_keys:
+                continue
+            if self._enforce_hierarchy:
+                self._validate_lock_hierarchy(key, level)
+            self._validate_lock_order(
+                current_acquisitions,
+                key,
+                level,
+                self._build_context_payload(key, level, additional=context),
+            )
+
+    async def _release_batch_keys(
+        self, acquired_keys: Sequence[str], context: Optional[Mapping[str, Any]]
+    ) -> None:
+        """Release batch keys in reverse acquisition order."""
+
+        if not acquired_keys:
+            return
+
+        release_start = time.time()
+        release_errors = 0
+
+        for key in reversed(acquired_keys):
+            try:
+                await self.release(key, context=context)
+            except Exception as e:  # pragma: no cover
+                release_errors += 1
+                self._logger.error(
+                    "[LOCK_BATCH] Release failed for key=%s: %s",
+                    key,
+                    e,
                     extra={
-                        "event_type": "lock_batch_release_complete",
-                        "released_count": len(acquired_keys),
-                        "errors": release_errors,
-                        "duration": release_duration,
+                        "event_type": "lock_batch_release_error",
+                        "lock_key": key,
                     },
                 )
 
+        release_duration = time.time() - release_start
+        if release_errors > 0 or release_duration > 0.1:
+            self._logger.warning(
+                "[LOCK_BATCH] Released %d locks in %.3fs (%d errors)",
+                len(acquired_keys),
+                release_duration,
+                release_errors,
+                extra={
+                    "event_type": "lock_batch_release_complete",
+                    "released_count": len(acquired_keys),
+                    "errors": release_errors,
+                    "duration": release_duration,
+                },
+            )
+
     async def _wait_for_waiting_tasks_clear(self) -> None:
         """Wait for all waiting tasks to complete or be cancelled."""
 
@@ -2358,8 +2991,12 @@ class LockManager:
         if not self._enable_duplicate_detection:
             return
 
-        caller = self._get_caller_info()
-        stack_trace = self._get_stack_trace() if self._enable_stack_trace_logging else None
+        if self._should_sample_stack():
+            caller = self._get_caller_info()
+            stack_trace = self._get_stack_trace()
+        else:
+            caller = "unknown"
+            stack_trace = None
         info = LockInfo(
             lock_id=lock_id,
             lock_type=lock_type,
@@ -2375,36 +3012,49 @@ class LockManager:
         if not self._enable_duplicate_detection:
             return
 
-        current = self._get_context_locks()
-        for index in range(len(current) - 1, -1, -1):
-            if current[index].lock_id == lock_id:
-                current.pop(index)
+        current = self._get_context_locks()
+        for index in range(len(current) - 1, -1, -1):
+            if current[index].lock_id == lock_id:
+                current.pop(index)
+                break
+        self._set_context_locks(current)
+
+    def _should_sample_stack(self) -> bool:
+        """Return ``True`` for one in every ``stack_trace_sample_rate`` calls."""
+
+        if not self._enable_stack_trace_logging:
+            return False
+        self._stack_trace_sample_counter += 1
+        if self._stack_trace_sample_counter < self._stack_trace_sample_rate:
+            return False
+        self._stack_trace_sample_counter = 0
+        return True
+
+    @staticmethod
+    def _outer_frame(depth: int) -> Optional[Any]:
+        """Return the frame ``depth`` levels above the caller, or the outermost.
+
+        Uses ``sys._getframe`` rather than ``inspect.getouterframes``, which
+        resolves modules and reads source for every frame on the stack.
+        """
+
+        frame = sys._getframe(1)
+        for _ in range(depth):
+            if frame.f_back is None:
                 break
-        self._set_context_locks(current)
+            frame = frame.f_back
+        return frame
 
     def _get_caller_info(self) -> str:
         if not self._enable_stack_trace_logging:
             return "unknown"
 
-        frame = inspect.currentframe()
         try:
-            if frame is None:
-                return "unknown"
-            outer_frames = inspect.getouterframes(frame, 4)
-            if len(outer_frames) >= 4:
-                target = outer_frames[3]
-            elif len(outer_frames) >= 3:
-                target = outer_frames[2]
-            else:
-                target = outer_frames[-1]
-            filename = getattr(target, "filename", "<unknown>")
-            lineno = getattr(target, "lineno", 0)
-            function_name = getattr(target, "function", "unknown")
-            return f"{filename}:{lineno}#{function_name}"
+            target = self._outer_frame(3)
+            code = target.f_code
+            return f"{code.co_filename}:{target.f_lineno}#{code.co_name}"
         except Exception:  # pragma: no cover - defensive fallback
             return "unknown"
-        finally:
-            del frame
 
     def _get_stack_trace(self) -> Optional[str]:
         if not self._enable_stack_trace_logging:
@@ -2474,8 +3124,13 @@ class LockManager:
         level: Optional[int] = None,
         timeout_log_level: Optional[int] = logging.WARNING,
         failure_log_level: Optional[int] = logging.ERROR,
+        validate_order: bool = True,
     ) -> bool:
-        """Attempt to acquire the lock identified by ``key``."""
+        """Attempt to acquire the lock identified by ``key``.
+
+        ``validate_order=False`` skips the per-key hierarchy and order checks
+        for callers that already validated the key as part of a set.
+        """
 
         task = asyncio.current_task()
         if task is None:
@@ -2532,6 +3187,15 @@ class LockManager:
                 "chat_id": context.get("chat_id") if context else None,
             }
 
+            # Nothing held in this context and nobody holds or waits on the
+            # lock: hierarchy/order checks are vacuous. The wait stays bounded
+            # either way, since another task can still take the lock first.
+            uncontended = (
+                _FAST_PATH_SKIP_VALIDATION
+                and not self._lock_state_var.get()
+                and not _lock_is_busy(lock)
+            )
+
             stack_registered = False
             exit_stack: Optional[AsyncExitStack] = None
             try:
@@ -2540,21 +3204,33 @@ class LockManager:
                     exit_stack.enter_async_context(lock),
                     timeout=FAST_PATH_TIMEOUT,
                 )
-
-                current_acquisitions = self._get_current_acquisitions()
-                full_context = self._build_context_payload(
-                    key, resolved_level, additional=context
+                # wait_for acquires in a helper task; adopt the lock so this
+                # task can release it if validation fails below.
+                if hasattr(lock, "_owner_id"):
+                    setattr(lock, "_owner", task)
+                    setattr(lock, "_owner_id", id(task))
+
+                current_acquisitions = (
+                    [] if uncontended else self._get_current_acquisitions()
+                )
+                full_context = (
+                    context_payload
+                    if uncontended
+                    else self._build_context_payload(
+                        key, resolved_level, additional=context
+                    )
                 )
                 full_display_level = self._display_level_from_context(
                     full_context, resolved_level
                 )
 
                 try:
-                    if self._enforce_hierarchy:
-                        self._validate_lock_hierarchy(key, resolved_level)
-                    self._validate_lock_order(
-                        current_acquisitions, key, resolved_level, full_context
-                    )
+                    if validate_order:
+                        if self._enforce_hierarchy and not uncontended:
+                            self._validate_lock_hierarchy(key, resolved_level)
+                        self._validate_lock_order(
+                            current_acquisitions, key, resolved_level, full_context
+                        )
                 except LockOrderError as order_err:
                     if stack_registered:
                         await self._release_lock_stack(task, key)
@@ -2600,39 +3276,45 @@ class LockManager:
 
                 elapsed_us = (time.time() - acquire_start_ts) * 1_000_000
                 elapsed_seconds = elapsed_us / 1_000_000
-                lock_identity = self._format_lock_identity(
-                    key, resolved_level, full_context
-                )
-                info_extra = self._log_extra(
-                    full_context,
-                    event_type="lock_acquired",
-                    lock_key=key,
-                    lock_level=full_display_level,
-                    lock_hierarchy_level=resolved_level,
-                    attempts=1,
-                    attempt_duration=elapsed_seconds,
-                    call_site=call_site,
-                    call_site_function=call_function,
-                )
-                self._logger.info(
-                    "%s acquired quickly in %.3fs%s",
-                    lock_identity,
-                    elapsed_seconds,
-                    self._format_context(full_context),
-                    extra=info_extra,
-                )
-
-                self._logger.debug(
-                    "[FAST_PATH] Acquired key=%s in %.1fμs",
-                    key,
-                    elapsed_us,
-                    extra=self._log_extra(
+                if not _FAST_PATH_MINIMAL_LOGGING or self._logger.isEnabledFor(
+                    logging.INFO
+                ):
+                    lock_identity = self._format_lock_identity(
+                        key, resolved_level, full_context
+                    )
+                    info_extra = self._log_extra(
                         full_context,
-                        event_type="lock_fast_path_hit",
+                        event_type="lock_acquired",
                         lock_key=key,
-                        latency_us=elapsed_us,
-                    ),
-                )
+                        lock_level=full_display_level,
+                        lock_hierarchy_level=resolved_level,
+                        attempts=1,
+                        attempt_duration=elapsed_seconds,
+                        call_site=call_site,
+                        call_site_function=call_function,
+                    )
+                    self._logger.info(
+                        "%s acquired quickly in %.3fs%s",
+                        lock_identity,
+                        elapsed_seconds,
+                        self._format_context(full_context),
+                        extra=info_extra,
+                    )
+
+                if not _FAST_PATH_MINIMAL_LOGGING or self._logger.isEnabledFor(
+                    logging.DEBUG
+                ):
+                    self._logger.debug(
+                        "[FAST_PATH] Acquired key=%s in %.1fμs",
+                        key,
+                        elapsed_us,
+                        extra=self._log_extra(
+                            full_context,
+                            event_type="lock_fast_path_hit",
+                            lock_key=key,
+                            latency_us=elapsed_us,
+                        ),
+                    )
 
                 self._reset_circuit_state(key)
                 return True
@@ -2723,11 +3405,12 @@ class LockManager:
                 self._reset_circuit_state(key)
                 return True
 
-        if self._enforce_hierarchy:
-            self._validate_lock_hierarchy(key, resolved_level)
-        self._validate_lock_order(
-            current_acquisitions, key, resolved_level, context_payload
-        )
+        if validate_order:
+            if self._enforce_hierarchy:
+                self._validate_lock_hierarchy(key, resolved_level)
+            self._validate_lock_order(
+                current_acquisitions, key, resolved_level, context_payload
+            )
         acquisition_order = self._get_current_levels()
         acquiring_extra = self._log_extra(
             context_payload,
@@ -3263,6 +3946,7 @@ class LockManager:
         combined_context: Dict[str, Any] = dict(context or {})
         if context_extra:
             combined_context.update(context_extra)
+        sample = self._profiler.begin(key, combined_context.get("chat_id"))
         acquired = await self.acquire(
             key,
             timeout=timeout,
@@ -3272,6 +3956,8 @@ class LockManager:
             failure_log_level=failure_log_level,
         )
         if not acquired:
+            if sample is not None:
+                self._finish_profile(sample)
             resolved_level = self._resolve_level(key, override=level)
             failure_context = self._build_context_payload(
                 key,
@@ -3363,9 +4049,13 @@ class LockManager:
                 acquisition_order=acquisition_order,
             ),
         )
+        if sample is not None:
+            sample.acquired = time.perf_counter()
         try:
             yield
         finally:
+            if sample is not None:
+                self._finish_profile(sample)
             # Release must complete even if cancelled during critical section
             try:
                 await self.release(key, context=combined_context)
@@ -3410,7 +4100,11 @@ class LockManager:
     async def release(
         self, key: str, context: Optional[Mapping[str, Any]] = None
     ) -> None:
-        release_site, release_function = self._resolve_call_site()
+        lock = self._locks.get(key)
+        # Trace the release only when its acquisition was sampled.
+        release_site, release_function = self._resolve_call_site(
+            sampled=getattr(lock, "_acquired_by_callsite", "unknown") != "unknown"
+        )
 
         try:
             task = asyncio.current_task()
@@ -3422,7 +4116,6 @@ class LockManager:
         except RuntimeError:
             running_loop = None
 
-        lock = self._locks.get(key)
         if key in self._bypassed_locks:
             self._bypassed_locks.discard(key)
             self._logger.debug(
@@ -4024,7 +4717,6 @@ class LockManager:
         held_levels = [acq.level for acq in current_acquisitions]
         min_held_level = min(held_levels)
         max_held_level = max(held_levels)
-        display_level = self._display_level_from_context(context, new_level)
 
         highest_hierarchy_acq = max(
             hierarchy_acquisitions,
@@ -4344,6 +5036,15 @@ class LockManager:
         level: int,
         context: Dict[str, Any],
     ) -> None:
+        previous = self._waiting_tasks.get(task)
+        if self._enable_deadlock_detection:
+            cycle = self._find_wait_cycle(task, key)
+            if cycle is not None:
+                self._raise_deadlock(cycle, context)
+        if previous is None or previous.key != key:
+            if previous is not None:
+                self._queue_depths.decrement(previous.key)
+            self._queue_depths.increment(key)
         self._waiting_tasks[task] = _WaitingInfo(key=key, level=level, context=dict(context))
 
     def _register_lock_owner(
@@ -4442,10 +5143,67 @@ class LockManager:
             return
         self._lock_owner_tasks.pop(key, None)
 
+    def _find_wait_cycle(
+        self, task: asyncio.Task[Any], key: str
+    ) -> Optional[List[Tuple[asyncio.Task[Any], str]]]:
+        """Follow holder -> waited key edges from ``key`` back to ``task``.
+
+        Every task waits for at most one key and every key has at most one
+        owner, so the wait-for graph kept in ``_waiting_tasks`` and
+        ``_lock_owner_tasks`` has out-degree one and the walk is linear in the
+        path length. Cycles not involving ``task`` were already rejected when
+        they would have formed, so meeting one simply ends the walk.
+        """
+
+        path: List[Tuple[asyncio.Task[Any], str]] = [(task, key)]
+        visited: Set[asyncio.Task[Any]] = {task}
+        current_key = key
+        while True:
+            owner = self._resolve_lock_owner_task(
+                current_key, self._locks.get(current_key)
+            )
+            if owner is None or owner.done():
+                return None
+            if owner is task:
+                # Holding the key we are about to wait on is re-entrancy.
+                return path if len(path) > 1 else None
+            if owner in visited:
+                return None
+            wait = self._waiting_tasks.get(owner)
+            if wait is None:
+                return None
+            visited.add(owner)
+            path.append((owner, wait.key))
+            current_key = wait.key
+
+    def _raise_deadlock(
+        self,
+        cycle: List[Tuple[asyncio.Task[Any], str]],
+        context: Mapping[str, Any],
+    ) -> None:
+        described = [(self._describe_task(item), key) for item, key in cycle]
+        self._metrics["deadlock_cycles"] += 1
+        LOCK_DEADLOCK_CYCLES.inc()
+        chain = " -> ".join(f"{name} waits {key}" for name, key in described)
+        self._logger.error(
+            "[DEADLOCK] Wait-for cycle detected: %s",
+            chain,
+            extra=self._log_extra(
+                context,
+                event_type="lock_deadlock_detected",
+                lock_key=cycle[0][1],
+                cycle=[{"task": name, "key": key} for name, key in described],
+            ),
+        )
+        raise DeadlockDetected(
+            f"Waiting for {cycle[0][1]} would deadlock: {chain}", cycle=described
+        )
+
     def _unregister_waiting(self, task: asyncio.Task[Any], key: str) -> None:
         info = self._waiting_tasks.get(task)
         if info is not None and info.key == key:
             self._waiting_tasks.pop(task, None)
+            self._queue_depths.decrement(key)
 
     def _detect_cycles(
         self, graph: Dict[asyncio.Task[Any], Set[asyncio.Task[Any]]]
@@ -4571,6 +5329,12 @@ class LockManager:
     def metrics(self) -> Dict[str, int]:
         return dict(self._metrics)
 
+    @property
+    def lease_ttl_seconds(self) -> float:
+        """Default lease TTL, i.e. how long a crashed holder stalls a key."""
+
+        return self._lease_ttl_seconds
+
     def get_metrics(self, *, force_refresh: bool = False) -> Dict[str, Any]:
         """Return lock manager metrics with intelligent caching."""
 
@@ -4585,6 +5349,7 @@ class LockManager:
 
         metrics = {
             "lock_contention": self._metrics["lock_contention"],
+            "deadlock_cycles": self._metrics["deadlock_cycles"],
             "lock_timeouts": self._metrics["lock_timeouts"],
             "lock_cancellations": self._metrics.get("lock_cancellations", 0),
             "lock_cleanup_failures": self._metrics.get("lock_cleanup_failures", 0),
@@ -4593,6 +5358,13 @@ class LockManager:
             "lock_fast_path_hits": self._metrics.get("lock_fast_path_hits", 0),
             "lock_slow_path": self._metrics.get("lock_slow_path", 0),
             "active_locks": len(self._locks),
+            "live_lock_objects": self._publish_live_lock_gauges(),
+            "lock_evictions": dict(self._lock_evictions),
+            "max_lock_objects": self._lock_state_max_entries,
+            "contention_profile_sample_rate": self._profiler.sample_rate,
+            "active_leases": len(self._active_leases),
+            "lease_renewals": self._metrics.get("lease_renewals", 0),
+            "leases_lost": self._metrics.get("leases_lost", 0),
             "waiting_tasks": len(self._waiting_tasks),
             "shutdown_initiated": self._shutdown_initiated,
             "pool_size": len(self._lock_pool),
@@ -4615,7 +5387,7 @@ class LockManager:
             metrics["stage_lock_avg_hold_time"] = 0.0
             metrics["stage_lock_p95_hold_time"] = 0.0
 
-        table_stats: Dict[object, Dict[str, float]] = {}
+        table_stats: Dict[object, Dict[str, Any]] = {}
         for chat_key, state in self._table_rw_locks.items():
             metrics_obj = state.metrics
             table_stats[chat_key] = {
@@ -4629,6 +5401,9 @@ class LockManager:
                 "max_write_wait_time": metrics_obj.max_write_wait_time,
                 "total_read_wait_time": metrics_obj.total_read_wait_time,
                 "total_write_wait_time": metrics_obj.total_write_wait_time,
+                "p99_read_wait_time": metrics_obj.read_wait_percentile(0.99),
+                "p99_write_wait_time": metrics_obj.write_wait_percentile(0.99),
+                "wait_histogram": metrics_obj.wait_histogram(),
             }
 
         metrics["table_lock_stats"] = table_stats
@@ -4649,10 +5424,7 @@ class LockManager:
         self._table_rw_locks = {
             chat_id: state
             for chat_id, state in self._table_rw_locks.items()
-            if state.reader_count
-            or state.writer_waiting
-            or state.write_lock.locked()
-            or state.has_active_writer
+            if not state.is_idle()
         }
         self._invalidate_metrics_cache()
         self._logger.info(
@@ -4674,31 +5446,42 @@ class LockManager:
             retry_config = config_candidate
         return retry_config
 
-    async def get_lock_queue_depth(self, lock_key: str) -> int:
-        """Get current queue depth for a specific lock using Redis.
+    async def get_lock_queue_depth(
+        self, lock_key: str, *, cluster: Optional[bool] = None
+    ) -> int:
+        """Get current queue depth for a specific lock.
 
-        The queue depth is stored in a Redis list keyed by the configured
-        ``lock_queue_prefix`` (``lock:queue:`` by default) followed by the lock
-        identifier. Each waiter pushes its task ID onto the list so we can
-        sample the current depth and feed the histogram metric.
+        The depth comes from in-process counters, so it costs no network
+        round-trip. With ``cluster`` (default: ``lock_retry.cluster_queue_depth``)
+        the depths other processes published under ``lock_queue_prefix``
+        (``lock:queue_depth:`` by default) are added to the local value.
         """
 
+        depth_value = self._queue_depths.get(lock_key)
+        if cluster is None:
+            cluster = bool(
+                self._get_lock_retry_config().get("cluster_queue_depth", False)
+            )
+        if cluster:
+            depth_value += await self._get_remote_queue_depth(lock_key)
+        try:
+            self.lock_queue_depth.labels(
+                lock_type=self._extract_lock_type(lock_key)
+            ).observe(depth_value)
+        except Exception:  # pragma: no cover - metrics best effort
+            pass
+        return depth_value
+
+    async def _get_remote_queue_depth(self, lock_key: str) -> int:
+        """Sum the depths other processes published for ``lock_key``."""
+
         redis_client = getattr(self, "_redis_client", None)
-        if redis_client is None or not hasattr(redis_client, "llen"):
+        if redis_client is None or not hasattr(redis_client, "hgetall"):
             return 0
 
-        prefix = str(self._redis_keys.get("lock_queue_prefix", "lock_queue:"))
-        queue_key = f"{prefix}{lock_key}"
+        queue_key = self._queue_depth_key(lock_key)
         try:
-            depth = await redis_client.llen(queue_key)
-            depth_value = int(depth) if depth is not None else 0
-            try:
-                self.lock_queue_depth.labels(
-                    lock_type=self._extract_lock_type(lock_key)
-                ).observe(depth_value)
-            except Exception:  # pragma: no cover - metrics best effort
-                pass
-            return depth_value
+            published = await redis_client.hgetall(queue_key)
         except Exception as exc:
             self._logger.warning(
                 f"Failed to get queue depth for {lock_key}: {exc}",
@@ -4706,41 +5489,98 @@ class LockManager:
             )
             return 0
 
+        total = 0
+        for field_name, value in (published or {}).items():
+            if isinstance(field_name, bytes):
+                field_name = field_name.decode("utf-8", "replace")
+            if field_name == self._queue_depth_instance_id:
+                continue
+            try:
+                total += max(0, int(value))
+            except (TypeError, ValueError):
+                continue
+        return total
+
+    def _queue_depth_key(self, lock_key: str) -> str:
+        prefix = str(self._redis_keys.get("lock_queue_prefix", "lock:queue_depth:"))
+        return f"{prefix}{lock_key}"
+
     async def _enqueue_lock_waiter(self, lock_key: str, task_id: str) -> None:
-        """Add task to lock queue for depth tracking."""
+        """Count a waiter on ``lock_key`` for depth tracking."""
+
+        self._queue_depths.increment(lock_key)
+        self._schedule_queue_depth_publish()
+
+    async def _dequeue_lock_waiter(self, lock_key: str, task_id: str) -> None:
+        """Stop counting a waiter on ``lock_key``."""
+
+        self._queue_depths.decrement(lock_key)
+        self._schedule_queue_depth_publish()
 
+    def _schedule_queue_depth_publish(self) -> None:
         redis_client = getattr(self, "_redis_client", None)
-        if redis_client is None or not hasattr(redis_client, "lpush"):
+        if redis_client is None or not hasattr(redis_client, "pipeline"):
             return
+        task = self._queue_depth_publish_task
+        if task is not None and not task.done():
+            return
+        try:
+            self._queue_depth_publish_task = asyncio.get_running_loop().create_task(
+                self._publish_queue_depths_later()
+            )
+        except RuntimeError:  # pragma: no cover - no running loop
+            self._queue_depth_publish_task = None
 
-        prefix = str(self._redis_keys.get("lock_queue_prefix", "lock_queue:"))
-        queue_key = f"{prefix}{lock_key}"
+    async def _publish_queue_depths_later(self) -> None:
+        retry_config = self._get_lock_retry_config()
         try:
-            await redis_client.lpush(queue_key, task_id)
-            if hasattr(redis_client, "expire"):
-                await redis_client.expire(queue_key, 300)
-        except Exception as exc:  # pragma: no cover - best-effort logging
-            self._logger.warning(
-                f"Failed to enqueue waiter: {exc}",
-                extra={"lock_key": lock_key, "task_id": task_id},
+            interval = float(
+                retry_config.get(
+                    "queue_depth_publish_interval_seconds",
+                    _QUEUE_DEPTH_PUBLISH_INTERVAL_SECONDS,
+                )
             )
+        except (TypeError, ValueError):
+            interval = _QUEUE_DEPTH_PUBLISH_INTERVAL_SECONDS
+        while True:
+            await asyncio.sleep(max(0.0, interval))
+            if not self._queue_depths.has_dirty():
+                return
+            await self.publish_queue_depths()
 
-    async def _dequeue_lock_waiter(self, lock_key: str, task_id: str) -> None:
-        """Remove task from lock queue."""
+    async def publish_queue_depths(self) -> int:
+        """Flush changed queue depths to Redis in a single pipeline.
+
+        Each lock has a hash with one field per process, so readers can merge
+        depths across the cluster. Returns the number of keys written.
+        """
 
         redis_client = getattr(self, "_redis_client", None)
-        if redis_client is None or not hasattr(redis_client, "lrem"):
-            return
+        if redis_client is None or not hasattr(redis_client, "pipeline"):
+            return 0
+        pending = self._queue_depths.drain_dirty()
+        if not pending:
+            return 0
 
-        prefix = str(self._redis_keys.get("lock_queue_prefix", "lock_queue:"))
-        queue_key = f"{prefix}{lock_key}"
+        instance_id = self._queue_depth_instance_id
         try:
-            await redis_client.lrem(queue_key, 0, task_id)
+            pipe = redis_client.pipeline(transaction=False)
+            for lock_key, depth in pending.items():
+                queue_key = self._queue_depth_key(lock_key)
+                if depth > 0:
+                    pipe.hset(queue_key, instance_id, depth)
+                    pipe.expire(queue_key, _QUEUE_DEPTH_TTL_SECONDS)
+                else:
+                    pipe.hdel(queue_key, instance_id)
+            await pipe.execute()
         except Exception as exc:  # pragma: no cover - best-effort logging
+            self._queue_depths.mark_dirty(pending)
             self._logger.warning(
-                f"Failed to dequeue waiter: {exc}",
-                extra={"lock_key": lock_key, "task_id": task_id},
+                f"Failed to publish queue depths: {exc}",
+                extra={"lock_keys": len(pending), "error": str(exc)},
             )
+            return 0
+        return len(pending)
 
     def _generate_task_id(self) -> str:
         """Generate unique task identifier for queue tracking."""
@@ -5146,29 +5986,17 @@ class LockManager:
         name = task.get_name()
         return f"{name}#{id(task):x}"
 
-    def _resolve_call_site(self) -> Tuple[str, str]:
-        call_site = "unknown"
-        function_name = "unknown"
-        frame = inspect.currentframe()
+    def _resolve_call_site(self, *, sampled: Optional[bool] = None) -> Tuple[str, str]:
+        if sampled is None:
+            sampled = self._should_sample_stack()
+        if not sampled or not self._enable_stack_trace_logging:
+            return "unknown", "unknown"
         try:
-            if frame is not None:
-                outer_frames = inspect.getouterframes(frame, 3)
-                target = None
-                if len(outer_frames) >= 3:
-                    target = outer_frames[2]
-                elif len(outer_frames) >= 2:
-                    target = outer_frames[1]
-                if target is not None:
-                    call_site = f"{target.filename}:{target.lineno}"
-                    if getattr(target, "function", None):
-                        function_name = str(target.function)
-                del outer_frames
+            target = self._outer_frame(2)
+            code = target.f_code
+            return f"{code.co_filename}:{target.f_lineno}", code.co_name
         except Exception:
-            call_site = "unknown"
-            function_name = "unknown"
-        finally:
-            del frame
-        return call_site, function_name
+            return "unknown", "unknown"
 
     def _make_action_lock_key(
         self,
@@ -5184,6 +6012,16 @@ class LockManager:
             return f"{base}:{str(action_identifier)}"
         return base
 
+    def action_lock_key(
+        self,
+        chat_id: int,
+        user_id: int,
+        action_type: Optional[str] = None,
+    ) -> str:
+        """Return the Redis key guarding ``action_type`` for this player."""
+
+        return self._make_action_lock_key(chat_id, user_id, action_type)
+
     async def _estimate_queue_position(self, chat_id: int, user_id: int) -> int:
         """Estimate how many action locks are queued ahead for ``chat_id``."""
 
@@ -5262,6 +6100,346 @@ class LockManager:
                 return 1 if deleted else 0
             return 0
 
+    def set_contention_profiling(self, sample_rate: int) -> None:
+        """Sample one lock acquisition in ``sample_rate``; ``0`` turns it off.
+
+        Collected rows are kept across rate changes; use
+        :meth:`reset_contention_profile` to start over.
+        """
+
+        self._profiler.set_sample_rate(sample_rate)
+
+    def reset_contention_profile(self) -> None:
+        self._profiler.reset()
+
+    def set_stage_resolver(
+        self, resolver: Optional[Callable[[int], Optional[str]]]
+    ) -> None:
+        """Use ``resolver(chat_id)`` to label profile samples with the game stage."""
+
+        self._stage_resolver = resolver
+
+    def contention_profile(self) -> Dict[str, Any]:
+        """Return profiled rows plus the sampling settings that produced them."""
+
+        return {
+            "sample_rate": self._profiler.sample_rate,
+            "dropped_rows": self._profiler.dropped,
+            "rows": self._profiler.rows(),
+        }
+
+    def export_contention_profile(self, metric: str = "hold") -> str:
+        """Return the profile as collapsed stacks weighted by ``metric``.
+
+        ``metric`` is ``"hold"`` or ``"wait"``; each line is
+        ``lock_type;stage;caller;... microseconds``.
+        """
+
+        return self._profiler.collapsed(metric)
+
+    def _finish_profile(self, sample: _ProfileSample) -> None:
+        lock_type = (
+            sample.lock_type or self._resolve_lock_category(sample.key) or "generic"
+        )
+        stage = None
+        resolver = self._stage_resolver
+        if resolver is not None and sample.chat_id is not None:
+            try:
+                stage = resolver(self._safe_int(sample.chat_id))
+            except Exception:  # pragma: no cover - diagnostics must not break locking
+                stage = None
+        self._profiler.record(sample, lock_type, stage or "unknown")
+
+    async def acquire_lease(
+        self,
+        key: str,
+        *,
+        fence_scope: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+        max_hold_seconds: Optional[float] = None,
+    ) -> Optional[LockLease]:
+        """Take ``key`` as a renewable lease, or return ``None`` if it is held.
+
+        A background task extends the TTL every third of ``ttl_seconds``
+        until :meth:`release_lease`, so the TTL only bounds how long a crashed
+        worker can stall the key; holds released within the first third never
+        start that task. ``max_hold_seconds`` caps how long renewal
+        continues for a holder that never releases. With a ``fence_scope``
+        the lease carries a fencing token drawn from a counter per scope.
+        Redis errors are logged and also return ``None``.
+        """
+
+        try:
+            return await self._acquire_lease_or_raise(
+                key,
+                fence_scope=fence_scope,
+                ttl_seconds=ttl_seconds,
+                max_hold_seconds=max_hold_seconds,
+            )
+        except LeaseBackendError:
+            return None
+
+    async def _acquire_lease_or_raise(
+        self,
+        key: str,
+        *,
+        fence_scope: Optional[str],
+        ttl_seconds: Optional[float],
+        max_hold_seconds: Optional[float],
+    ) -> Optional[LockLease]:
+        ttl = self._lease_ttl(ttl_seconds, max_hold_seconds)
+        token = str(uuid.uuid4())
+
+        acquired = False
+        try:
+            acquired = bool(
+                await self._redis_pool.set(key, token, nx=True, px=int(ttl * 1000))
+            )
+            if not acquired:
+                return None
+            fencing_token: Optional[int] = None
+            if fence_scope is not None:
+                fencing_token = int(
+                    await self._redis_pool.incr(f"{_FENCE_KEY_PREFIX}{fence_scope}")
+                )
+        except _RedisError as exc:
+            self._logger.error(
+                "[LEASE] Failed to acquire lease (redis error)",
+                extra={
+                    "event_type": "lease_acquire_error",
+                    "lock_key": key,
+                    "error": str(exc),
+                },
+                exc_info=True,
+            )
+            if acquired:
+                with contextlib.suppress(_RedisError):
+                    await self._execute_release_lock_script(key, token)
+            raise LeaseBackendError(f"Lease store unavailable for {key}") from exc
+
+        lease = self._start_lease(
+            key,
+            token,
+            ttl_seconds=ttl,
+            max_hold_seconds=max_hold_seconds,
+            fencing_token=fencing_token,
+        )
+        self._logger.debug(
+            "[LEASE] Acquired lease",
+            extra={
+                "event_type": "lease_acquired",
+                "lock_key": key,
+                "token_prefix": token[:8],
+                "fencing_token": fencing_token,
+                "ttl_seconds": ttl,
+            },
+        )
+        return lease
+
+    def _lease_ttl(
+        self, ttl_seconds: Optional[float], max_hold_seconds: Optional[float]
+    ) -> float:
+        ttl = self._lease_ttl_seconds if ttl_seconds is None else float(ttl_seconds)
+        if max_hold_seconds is not None:
+            ttl = min(ttl, float(max_hold_seconds))
+        return max(ttl, 0.1)
+
+    def _start_lease(
+        self,
+        key: str,
+        token: str,
+        *,
+        ttl_seconds: float,
+        max_hold_seconds: Optional[float],
+        fencing_token: Optional[int],
+    ) -> LockLease:
+        """Track a freshly set key and renew it while it may still be held."""
+
+        expires_at = None
+        if max_hold_seconds is not None:
+            expires_at = self._monotonic_time() + float(max_hold_seconds)
+        lease = LockLease(
+            key=key,
+            token=token,
+            fencing_token=fencing_token,
+            ttl_seconds=ttl_seconds,
+            expires_at=expires_at,
+        )
+        if max_hold_seconds is None or max_hold_seconds > ttl_seconds:
+            # Most holds end well inside the first renewal interval, so only
+            # arm a timer here and spawn the renewal task if it fires.
+            lease.renew_handle = asyncio.get_running_loop().call_later(
+                ttl_seconds / _LEASE_RENEWALS_PER_TTL,
+                self._begin_lease_renewal,
+                lease,
+            )
+            self._active_leases[key] = lease
+        return lease
+
+    def _begin_lease_renewal(self, lease: LockLease) -> None:
+        lease.renew_handle = None
+        if self._active_leases.get(lease.key) is not lease:
+            return
+        lease.renew_task = asyncio.create_task(
+            self._renew_lease(lease), name=f"lease-renew:{lease.key}"
+        )
+
+    async def _cancel_lease_renewal(self, lease: LockLease) -> None:
+        handle = lease.renew_handle
+        lease.renew_handle = None
+        if handle is not None:
+            handle.cancel()
+        task = lease.renew_task
+        lease.renew_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _stop_lease_renewal(self, key: str, token: str) -> None:
+        lease = self._active_leases.get(key)
+        if lease is None or lease.token != token:
+            return
+        del self._active_leases[key]
+        await self._cancel_lease_renewal(lease)
+
+    async def release_lease(self, lease: LockLease) -> bool:
+        """Stop renewing ``lease`` and delete its key if still owned."""
+
+        await self._cancel_lease_renewal(lease)
+        if self._active_leases.get(lease.key) is lease:
+            del self._active_leases[lease.key]
+
+        try:
+            result = await self._execute_release_lock_script(lease.key, lease.token)
+        except _RedisError as exc:
+            self._logger.error(
+                "[LEASE] Failed to release lease (redis error)",
+                extra={
+                    "event_type": "lease_release_error",
+                    "lock_key": lease.key,
+                    "token_prefix": lease.token[:8],
+                    "error": str(exc),
+                },
+                exc_info=True,
+            )
+            return False
+        return result == 1
+
+    @asynccontextmanager
+    async def table_lease(
+        self,
+        chat_id: int,
+        operation: str,
+        *,
+        ttl_seconds: Optional[float] = None,
+        wait_seconds: float = 0.0,
+    ) -> AsyncIterator[Optional[LockLease]]:
+        """Hold the table lock for ``operation`` as a renewable lease.
+
+        Polls for up to ``wait_seconds`` and yields ``None`` when another
+        holder still has it. Raises :class:`LeaseBackendError` when Redis
+        fails, so callers can tell an outage from contention. Fencing tokens
+        are scoped to the chat, so pass ``lease.fencing_token`` to
+        :meth:`TableManager.save_game_with_version_check`.
+        """
+
+        key = self._make_table_lock_key(chat_id, operation)
+        fence_scope = str(self._safe_int(chat_id))
+        deadline = self._monotonic_time() + max(wait_seconds, 0.0)
+        while True:
+            lease = await self._acquire_lease_or_raise(
+                key,
+                fence_scope=fence_scope,
+                ttl_seconds=ttl_seconds,
+                max_hold_seconds=None,
+            )
+            if lease is not None or self._monotonic_time() >= deadline:
+                break
+            await asyncio.sleep(_LEASE_POLL_INTERVAL_SECONDS)
+        try:
+            yield lease
+        finally:
+            if lease is not None:
+                await self.release_lease(lease)
+
+    async def _renew_lease(self, lease: LockLease) -> None:
+        interval = lease.ttl_seconds / _LEASE_RENEWALS_PER_TTL
+        ttl_ms = int(lease.ttl_seconds * 1000)
+        # Started one interval after the key was set, so renew straight away.
+        last_renewed = self._monotonic_time() - interval
+        delay = 0.0
+
+        try:
+            while True:
+                await asyncio.sleep(delay)
+                delay = interval
+                renew_ms = ttl_ms
+                if lease.expires_at is not None:
+                    remaining = lease.expires_at - self._monotonic_time()
+                    if remaining <= 0:
+                        return
+                    renew_ms = min(ttl_ms, max(1, int(remaining * 1000)))
+                try:
+                    renewed = await self._execute_renew_lock_script(
+                        lease.key, lease.token, renew_ms
+                    )
+                except _RedisError as exc:
+                    if self._monotonic_time() - last_renewed < lease.ttl_seconds:
+                        self._logger.warning(
+                            "[LEASE] Renewal failed, retrying: %s",
+                            exc,
+                            extra={
+                                "event_type": "lease_renew_error",
+                                "lock_key": lease.key,
+                            },
+                        )
+                        continue
+                    renewed = 0
+
+                if renewed == 1:
+                    lease.renewals += 1
+                    last_renewed = self._monotonic_time()
+                    self._metrics["lease_renewals"] = (
+                        self._metrics.get("lease_renewals", 0) + 1
+                    )
+                    continue
+
+                lease.lost = True
+                self._metrics["leases_lost"] = self._metrics.get("leases_lost", 0) + 1
+                self._logger.error(
+                    "[LEASE] Lease lost for %s; writes with fencing token %s will be rejected",
+                    lease.key,
+                    lease.fencing_token,
+                    extra={
+                        "event_type": "lease_lost",
+                        "lock_key": lease.key,
+                        "fencing_token": lease.fencing_token,
+                    },
+                )
+                return
+        finally:
+            if self._active_leases.get(lease.key) is lease:
+                del self._active_leases[lease.key]
+
+    async def _execute_renew_lock_script(
+        self, redis_key: str, token: str, ttl_ms: int
+    ) -> int:
+        if isinstance(self._redis_pool, _InMemoryActionLockBackend):
+            return await self._redis_pool.expire_if_owner(redis_key, token, ttl_ms)
+        try:
+            return int(
+                await self._redis_pool.eval(
+                    self.RENEW_LEASE_SCRIPT, 1, redis_key, token, ttl_ms
+                )
+            )
+        except ModuleNotFoundError:
+            current_value = await self._redis_pool.get(redis_key)
+            if isinstance(current_value, bytes):
+                current_value = current_value.decode()
+            if current_value != token:
+                return 0
+            return 1 if await self._redis_pool.pexpire(redis_key, ttl_ms) else 0
+
     async def acquire_table_lock(
         self,
         *,
@@ -5275,6 +6453,7 @@ class LockManager:
         ttl_seconds = int(timeout_seconds)
         if ttl_seconds <= 0:
             ttl_seconds = 1
+        lease_ttl = self._lease_ttl(None, ttl_seconds)
 
         lock_key = self._make_table_lock_key(chat_id, operation)
         token = str(uuid.uuid4())
@@ -5284,7 +6463,7 @@ class LockManager:
                 lock_key,
                 token,
                 nx=True,
-                ex=ttl_seconds,
+                px=int(lease_ttl * 1000),
             )
         except aioredis.ConnectionError as exc:
             self._logger.error(
@@ -5301,6 +6480,13 @@ class LockManager:
             return None
 
         if acquired:
+            self._start_lease(
+                lock_key,
+                token,
+                ttl_seconds=lease_ttl,
+                max_hold_seconds=ttl_seconds,
+                fencing_token=None,
+            )
             self._logger.debug(
                 "Table lock acquired",
                 extra={
@@ -5309,6 +6495,7 @@ class LockManager:
                     "operation": operation,
                     "token_prefix": token[:8],
                     "ttl_seconds": ttl_seconds,
+                    "lease_ttl_seconds": lease_ttl,
                 },
             )
             return token
@@ -5341,6 +6528,7 @@ class LockManager:
         """
 
         lock_key = self._make_table_lock_key(chat_id, operation)
+        await self._stop_lease_renewal(lock_key, token)
 
         try:
             result = await self._execute_release_lock_script(lock_key, token)
@@ -5399,7 +6587,10 @@ class LockManager:
                 an action type (preferred) or a legacy timeout override.
             action_type: Explicit action type ("fold", "check", "call", "raise").
             action_data: Legacy payload identifier used in earlier releases.
-            ttl: Explicit TTL in seconds for the distributed lock.
+            ttl: Longest time in seconds the lock may be held. The key
+                itself carries the shorter lease TTL and is renewed until
+                released or until ``ttl`` runs out, so a crashed holder
+                stalls the player for at most the lease TTL.
             timeout_seconds: Backwards-compatible TTL override.
         """
 
@@ -5440,13 +6631,14 @@ class LockManager:
 
         redis_key = self._make_action_lock_key(chat_id, user_id, action_identifier)
         token = str(uuid.uuid4())
+        lease_ttl = self._lease_ttl(None, ttl_seconds)
 
         try:
             acquired = await self._redis_pool.set(
                 redis_key,
                 token,
                 nx=True,
-                ex=ttl_seconds,
+                px=int(lease_ttl * 1000),
             )
         except aioredis.ConnectionError as exc:
             self._logger.error(
@@ -5464,6 +6656,13 @@ class LockManager:
             return None
 
         if acquired:
+            self._start_lease(
+                redis_key,
+                token,
+                ttl_seconds=lease_ttl,
+                max_hold_seconds=ttl_seconds,
+                fencing_token=None,
+            )
             self._logger.debug(
                 "[ACTION_LOCK] Acquired distributed lock",
                 extra={
@@ -5472,6 +6671,7 @@ class LockManager:
                     "user_id": user_id,
                     "token_prefix": token[:8],
                     "ttl_seconds": ttl_seconds,
+                    "lease_ttl_seconds": lease_ttl,
                     "action_identifier": action_identifier,
                 },
             )
@@ -5721,6 +6921,7 @@ class LockManager:
             action_identifier = action_data
 
         redis_key = self._make_action_lock_key(chat_id, user_id, action_identifier)
+        await self._stop_lease_renewal(redis_key, resolved_token)
 
         try:
             result = await self._execute_release_lock_script(
@@ -5771,6 +6972,15 @@ class LockManager:
         async with self._locks_guard:
             cleared = len(self._locks)
             self._locks.clear()
+            self._lock_state_index.discard_kind("lock")
         return cleared
 
-__all__ = ["LockManager", "LockOrderError", "LockHierarchyViolation"]
+__all__ = [
+    "DeadlockDetected",
+    "LeaseBackendError",
+    "LeaseUnavailable",
+    "LockLease",
+    "LockManager",
+    "LockOrderError",
+    "LockHierarchyViolation",
+]
@@ -314,6 +314,14 @@ class MatchmakingService:
             GameState.ROUND_TURN: (GameState.ROUND_RIVER, 1, "🃏 ریور"),
         }
 
+        if (
+            getattr(game, "all_in_board_size", None) is None
+            and len(game.players_by(states=(PlayerState.ACTIVE,))) <= 1
+        ):
+            # No further betting is possible; remember the board so the
+            # showdown can report all-in equity for the run-out.
+            game.all_in_board_size = len(game.cards_table)
+
         while True:
             await self.collect_bets_for_pot(game, chat_id)
             for player in game.players:
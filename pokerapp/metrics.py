@@ -1,8 +1,8 @@
 """Centralised Prometheus metric definitions for the poker application.
 
 This module intentionally performs the ``prometheus_client`` imports lazily in
-order to avoid hard dependencies during testing.  All counters and histograms
-are safe no-op stand-ins when ``prometheus_client`` is not installed.
+order to avoid hard dependencies during testing.  All counters, gauges and
+histograms are safe no-op stand-ins when ``prometheus_client`` is not installed.
 """
 
 from __future__ import annotations
@@ -10,7 +10,7 @@ from __future__ import annotations
 from typing import Any
 
 try:  # pragma: no cover - Optional dependency in some execution environments
-    from prometheus_client import Counter, Histogram
+    from prometheus_client import Counter, Gauge, Histogram
 except Exception:  # pragma: no cover - provide lightweight fallbacks for tests
 
     class _Metric:  # type: ignore[override]
@@ -26,7 +26,10 @@ except Exception:  # pragma: no cover - provide lightweight fallbacks for tests
         def observe(self, *_args: Any, **_kwargs: Any) -> None:
             return None
 
-    Counter = Histogram = _Metric  # type: ignore[misc, assignment]
+        def set(self, *_args: Any, **_kwargs: Any) -> None:
+            return None
+
+    Counter = Gauge = Histogram = _Metric  # type: ignore[misc, assignment]
 
 
 WALLET_RESERVE_COUNTER = Counter(
@@ -105,3 +108,59 @@ LOCK_HIERARCHY_VIOLATIONS = Counter(
     ["acquired_lock", "held_lock"],
 )
 
+LOCK_LIVE_OBJECTS = Gauge(
+    "poker_lock_live_objects",
+    "Per-key lock objects currently held in memory by the lock manager",
+    labelnames=["kind"],
+)
+
+LOCK_DEADLOCK_CYCLES = Counter(
+    "poker_lock_deadlock_cycles_total",
+    "Lock waits rejected because they would close a wait-for cycle",
+)
+
+LOCK_EVICTIONS = Counter(
+    "poker_lock_evictions_total",
+    "Idle per-key lock objects evicted by the lock manager",
+    labelnames=["kind"],
+)
+
+
+
+# ============================================================================
+# COUNTDOWN WORKER METRICS
+# ============================================================================
+
+COUNTDOWN_QUEUE_DEPTH = Gauge(
+    "poker_countdown_queue_depth",
+    "Countdown messages waiting to be picked up by the countdown worker",
+)
+
+COUNTDOWN_SCHEDULED = Gauge(
+    "poker_countdown_scheduled",
+    "Countdowns currently parked on the countdown worker timer wheel",
+)
+
+COUNTDOWN_TIMER_LAG = Histogram(
+    "poker_countdown_timer_lag_seconds",
+    "Delay between a countdown step's deadline and its dispatch",
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5],
+)
+
+
+# ============================================================================
+# TELEGRAM RATE LIMITER METRICS
+# ============================================================================
+
+TELEGRAM_RATE_LIMIT_QUEUE_DEPTH = Gauge(
+    "poker_telegram_rate_limit_queue_depth",
+    "Telegram requests waiting for a rate-limit permit",
+    labelnames=["priority"],
+)
+
+TELEGRAM_RATE_LIMIT_WAIT = Histogram(
+    "poker_telegram_rate_limit_wait_seconds",
+    "Time a Telegram request waited for its rate-limit permit",
+    labelnames=["priority"],
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+)
@@ -1,15 +1,66 @@
 """Prometheus metrics HTTP server."""
 import logging
-from typing import Optional
+import threading
+from typing import Callable, Dict, Mapping, Optional
+from urllib.parse import parse_qs
 
 logger = logging.getLogger(__name__)
 
 _metrics_server_started = False
 
+DebugHandler = Callable[[Mapping[str, str]], str]
+
+_debug_handlers: Dict[str, DebugHandler] = {}
+
+
+def register_debug_handler(path: str, handler: Optional[DebugHandler]) -> None:
+    """Serve ``handler(query)`` as ``text/plain`` at ``path`` on the metrics port.
+
+    Handlers run on the metrics server thread and receive the first value of
+    each query parameter. Passing ``None`` removes the route.
+    """
+
+    if handler is None:
+        _debug_handlers.pop(path, None)
+    else:
+        _debug_handlers[path] = handler
+
+
+def _make_app(metrics_app: Callable) -> Callable:
+    def app(environ, start_response):
+        handler = _debug_handlers.get(environ.get("PATH_INFO", ""))
+        if handler is None:
+            return metrics_app(environ, start_response)
+
+        query = {
+            key: values[0]
+            for key, values in parse_qs(environ.get("QUERY_STRING", "")).items()
+        }
+        try:
+            body = handler(query).encode("utf-8")
+            status = "200 OK"
+        except Exception:  # noqa: BLE001 - report instead of killing the server
+            logger.exception("Debug handler failed", extra={"path": environ.get("PATH_INFO")})
+            body = b"debug handler failed\n"
+            status = "500 Internal Server Error"
+        start_response(
+            status,
+            [
+                ("Content-Type", "text/plain; charset=utf-8"),
+                ("Content-Length", str(len(body))),
+            ],
+        )
+        return [body]
+
+    return app
+
 
 def start_metrics_server(port: int = 8000, host: Optional[str] = None) -> bool:
     """Start Prometheus metrics HTTP server on the given port.
 
+    Besides ``/metrics`` the server answers paths added with
+    :func:`register_debug_handler`, such as ``/debug/locks``.
+
     Args:
         port: Port to listen on (default: 8000)
         host: Host/interface to bind the metrics server to. ``None`` will use the
@@ -25,9 +76,26 @@ def start_metrics_server(port: int = 8000, host: Optional[str] = None) -> bool:
         return True
 
     try:
-        from prometheus_client import start_http_server
+        from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+        from prometheus_client import make_wsgi_app
+        from prometheus_client.exposition import ThreadingWSGIServer
+
+        class _QuietHandler(WSGIRequestHandler):
+            def log_message(self, format, *args):  # noqa: A002 - stdlib signature
+                return
+
         listen_host = "" if host is None else host
-        start_http_server(port, addr=listen_host)
+        httpd = make_server(
+            listen_host,
+            port,
+            _make_app(make_wsgi_app()),
+            ThreadingWSGIServer,
+            handler_class=_QuietHandler,
+        )
+        threading.Thread(
+            target=httpd.serve_forever, name="metrics-server", daemon=True
+        ).start()
         _metrics_server_started = True
         bind_label = listen_host or "0.0.0.0"
         logger.info(
@@ -49,4 +117,3 @@ def start_metrics_server(port: int = 8000, host: Optional[str] = None) -> bool:
 def is_metrics_server_running() -> bool:
     """Check if metrics server is running."""
     return _metrics_server_started
-
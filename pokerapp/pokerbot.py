@@ -250,6 +250,7 @@ class PokerBot:
             rate_limit_per_second=self._cfg.RATE_LIMIT_PER_SECOND,
             request_metrics=self._request_metrics,
             messaging_service_factory=self._messaging_service_factory,
+            board_image_redis_ops=self._redis_ops,
         )
         if getattr(self._view, "token_manager", None) is not None:
             self._application.bot_data["token_manager"] = self._view.token_manager
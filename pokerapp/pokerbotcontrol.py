@@ -36,6 +36,7 @@ class PokerBotCotroller:
         application.add_handler(CommandHandler('money', self._handle_money))
         application.add_handler(CommandHandler('ban', self._handle_ban))
         application.add_handler(CommandHandler('get_save_error', self._handle_get_save_error))
+        application.add_handler(CommandHandler('lock_profile', self._handle_lock_profile))
 
         # game management command
         application.add_handler(CommandHandler('newgame', self._handle_create_game))
@@ -169,6 +170,17 @@ class PokerBotCotroller:
         args = list(getattr(context, "args", []) or [])
         await self._model.handle_admin_command("/get_save_error", args, admin_chat_id)
 
+    async def _handle_lock_profile(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        chat = update.effective_chat
+        admin_chat_id = getattr(self._view, "_admin_chat_id", None)
+        if admin_chat_id is None or chat is None or chat.id != admin_chat_id:
+            return
+
+        args = list(getattr(context, "args", []) or [])
+        await self._model.handle_admin_command("/lock_profile", args, admin_chat_id)
+
     async def _handle_ready(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         chat_id = None
         message_id = None
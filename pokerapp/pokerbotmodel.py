@@ -73,6 +73,7 @@ from pokerapp.health_checks import PruningHealthCheck
 from pokerapp.utils.request_metrics import RequestCategory, RequestMetrics
 from pokerapp.utils.redis_safeops import RedisSafeOps
 from pokerapp.lock_manager import LockManager
+from pokerapp.metrics_server import register_debug_handler
 from pokerapp.feature_flags import FeatureFlagManager
 from pokerapp.player_identity_manager import PlayerIdentityManager
 from pokerapp.player_manager import PlayerManager
@@ -159,6 +160,9 @@ _CHAT_GUARD_TIMEOUT_SECONDS = _coerce_positive_float(
     _CATEGORY_TIMEOUTS.get("chat"), 15.0
 )
 
+_LOCK_PROFILE_DEFAULT_RATE = 16
+_LOCK_PROFILE_TOP_LINES = 15
+
 # MAX_PLAYERS = 8 (Defined in entities)
 # MIN_PLAYERS = 2 (Defined in entities)
 # SMALL_BLIND = 5 (Defined in entities)
@@ -342,6 +346,8 @@ class PokerBotModel:
             log_slow_lock_threshold=slow_threshold,
             feature_flags=self._feature_flags,
         )
+        self._lock_manager.set_stage_resolver(self._table_manager.cached_stage)
+        register_debug_handler("/debug/locks", self._render_lock_profile)
         self._chat_guard_timeout_seconds = _CHAT_GUARD_TIMEOUT_SECONDS
         self._player_identity_manager = PlayerIdentityManager(
             table_manager=self._table_manager,
@@ -435,6 +441,7 @@ class PokerBotModel:
             adaptive_player_report_cache=self._player_report_cache,
             cache=self._cache,
             query_batcher=self._query_batcher,
+            redis_client=kv,
         )
 
         self._log_lock_snapshot(stage="startup", level=logging.INFO)
@@ -532,6 +539,44 @@ class PokerBotModel:
             )
             return
 
+        if command == "/lock_profile":
+            await _send_message(self._lock_profile_command(args))
+            return
+
+    def _lock_profile_command(self, args: list[str]) -> str:
+        lock_manager = self._lock_manager
+        action = str(args[0]).lower() if args else "hold"
+        if action == "start":
+            try:
+                rate = int(args[1]) if len(args) > 1 else _LOCK_PROFILE_DEFAULT_RATE
+            except (TypeError, ValueError):
+                return f"Invalid sample rate: {args[1]}"
+            lock_manager.set_contention_profiling(max(rate, 1))
+            return f"Lock profiling on, sampling 1 in {max(rate, 1)} acquisitions."
+        if action == "stop":
+            lock_manager.set_contention_profiling(0)
+            return "Lock profiling off; collected samples are kept."
+        if action == "reset":
+            lock_manager.reset_contention_profile()
+            return "Lock profile cleared."
+        if action not in {"hold", "wait"}:
+            return "Usage: /lock_profile [hold|wait|start [rate]|stop|reset]"
+
+        lines = lock_manager.export_contention_profile(action).splitlines()
+        if not lines:
+            return "No lock samples yet. Start with /lock_profile start [rate]."
+        lines.sort(key=lambda line: int(line.rsplit(" ", 1)[1]), reverse=True)
+        header = (
+            f"Top {action} time by call site (µs, 1 in "
+            f"{lock_manager.contention_profile()['sample_rate'] or '-'} sampled):"
+        )
+        return "\n".join([header, *lines[:_LOCK_PROFILE_TOP_LINES]])
+
+    def _render_lock_profile(self, query: Dict[str, str]) -> str:
+        if query.get("format") == "json":
+            return json.dumps(self._lock_manager.contention_profile())
+        return self._lock_manager.export_contention_profile(query.get("metric", "hold"))
+
     async def load_game_with_version(
         self, chat_id: ChatId
     ) -> Tuple[Optional[Game], int]:
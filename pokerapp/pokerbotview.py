@@ -33,6 +33,7 @@ from typing import (
     Set,
     Callable,
     Awaitable,
+    Mapping,
 )
 from dataclasses import dataclass, field
 import asyncio
@@ -50,6 +51,7 @@ from cachetools import FIFOCache, LRUCache
 from pokerapp.config import (
     DEFAULT_RATE_LIMIT_PER_MINUTE,
     DEFAULT_RATE_LIMIT_PER_SECOND,
+    DESK_IMAGE_SETTINGS,
     get_game_constants,
 )
 from pokerapp.winnerdetermination import HAND_NAMES_TRANSLATIONS
@@ -65,9 +67,12 @@ from pokerapp.entities import (
     Mention,
     Money,
     PlayerState,
+    UserId,
 )
 from pokerapp.telegram_validation import TelegramPayloadValidator
+from pokerapp.utils.board_image_registry import BoardImageRegistry
 from pokerapp.utils.debug_trace import trace_telegram_api_call
+from pokerapp.utils.fingerprint import content_fingerprint
 from pokerapp.utils.messaging_service import MessagingService
 from pokerapp.utils.message_updates import safe_edit_message
 from pokerapp.utils.request_metrics import RequestCategory, RequestMetrics
@@ -88,6 +93,9 @@ class CallbackTokenManager:
     Key: "action_token:{game_id}:{user_id}:{nonce}"
     Value: JSON string with token data
     TTL: 300 seconds (5 minutes)
+
+    Each game also keeps a set of its token keys under
+    "action_tokens:{game_id}" so invalidation never scans the keyspace.
     """
 
     def __init__(
@@ -135,7 +143,13 @@ class CallbackTokenManager:
             "action": action,
         }
 
-        await self.redis.setex(redis_key, self.token_ttl, json.dumps(token_data))
+        index_key = self._game_tokens_key(game_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.setex(redis_key, self.token_ttl, json.dumps(token_data))
+            pipe.sadd(index_key, redis_key)
+            # The set outlives its newest token by one TTL at most.
+            pipe.expire(index_key, self.token_ttl)
+            await pipe.execute()
 
         if self.request_metrics is not None:
             self.request_metrics.record_token_generation(action=action)
@@ -247,17 +261,28 @@ class CallbackTokenManager:
         return True, ""
 
     async def invalidate_all_tokens(self, game_id: int) -> int:
-        """Invalidate all tokens for a specific game."""
+        """Invalidate all tokens for a specific game.
+
+        Only the members that were read are removed from the index, so a
+        token generated meanwhile stays indexed for the next invalidation.
+        """
 
-        pattern = f"action_token:{game_id}:*"
-        keys = list(await self.redis.keys(pattern) or [])
+        index_key = self._game_tokens_key(game_id)
+        keys = list(await self.redis.smembers(index_key) or [])
 
         if not keys:
             return 0
 
-        deleted = await self.redis.delete(*keys)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(*keys)
+            pipe.srem(index_key, *keys)
+            deleted, _ = await pipe.execute()
         return int(deleted or 0)
 
+    @staticmethod
+    def _game_tokens_key(game_id: int) -> str:
+        return f"action_tokens:{game_id}"
+
 
 class TokenValidationError(Exception):
     """Raised when secure callback token validation fails."""
@@ -389,6 +414,8 @@ logger = logging.getLogger(__name__)
 debug_trace_logger = logging.getLogger("pokerbot.debug_trace")
 
 _CARD_SPACER = "     "
+# Telegram rejections that mean a stored board ``file_id`` is unusable.
+_FILE_ID_ERROR_MARKERS = ("file identifier", "file_id", "file reference")
 
 
 _CONSTANTS = get_game_constants()
@@ -1020,6 +1047,7 @@ class PokerBotViewer:
         request_metrics: RequestMetrics,
         messaging_service_factory: Callable[..., MessagingService],
         redis_ops: Optional[Any] = None,
+        board_image_redis_ops: Optional[Any] = None,
     ):
         # ``update_debounce`` historically controlled how quickly message edits
         # were flushed to Telegram.  The messaging rewrite in mid-2023 stopped
@@ -1028,7 +1056,12 @@ class PokerBotViewer:
         self._message_update_debounce_delay = max(0.0, float(update_debounce))
 
         self._bot = bot
-        self._desk_generator = DeskImageGenerator()
+        self._desk_generator = DeskImageGenerator(
+            image_format=DESK_IMAGE_SETTINGS.get("format", "PNG"),
+            quality=DESK_IMAGE_SETTINGS.get("quality", 80),
+            palette=DESK_IMAGE_SETTINGS.get("palette", False),
+            compress_level=DESK_IMAGE_SETTINGS.get("compress_level", 6),
+        )
         self._admin_chat_id = admin_chat_id
         self._validator = TelegramPayloadValidator(
             logger_=logger.getChild("validation")
@@ -1113,6 +1146,14 @@ class PokerBotViewer:
             last_message_hash_lock=self._last_message_hash_lock,
         )
 
+        # Board file_ids only need plain key/value storage, so they can be
+        # shared through Redis without enabling callback tokens.
+        self._board_images = BoardImageRegistry(
+            board_image_redis_ops if board_image_redis_ops is not None else redis_ops,
+            variant=self._desk_generator.render_variant,
+            logger=logger,
+        )
+
         self.game_start_view = GameStartView(
             self._messenger,
             logger=logger.getChild("game_start"),
@@ -1191,9 +1232,7 @@ class PokerBotViewer:
         text: str,
         reply_markup: Optional[InlineKeyboardMarkup | ReplyKeyboardMarkup],
     ) -> str:
-        markup_hash = self._serialize_markup(reply_markup) or ""
-        payload = f"{text}|{markup_hash}"
-        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return content_fingerprint(text, reply_markup)
 
     def payload_signature(
         self,
@@ -4798,11 +4837,7 @@ class PokerBotViewer:
     ) -> None:
         """Send a single card image to the specified chat."""
         try:
-            im_card = self._desk_generator._load_card_image(card)
-            bio = BytesIO()
-            bio.name = "card.png"
-            im_card.save(bio, "PNG")
-            bio.seek(0)
+            bio = await self._desk_upload([card], name="card")
             context = self._build_context("send_single_card", chat_id=chat_id)
             await self._timed_api_call(
                 "send_single_card.send_photo",
@@ -4827,6 +4862,47 @@ class PokerBotViewer:
                 },
             )
 
+    async def _desk_upload(self, cards: Cards, name: str = "desk") -> BytesIO:
+        bio = BytesIO(await self._desk_generator.render_image(cards))
+        bio.name = f"{name}.{self._desk_generator.file_extension}"
+        return bio
+
+    @staticmethod
+    def _photo_file_id(message: Any) -> Optional[str]:
+        photos = getattr(message, "photo", None)
+        if not photos:
+            return None
+        file_id = getattr(photos[-1], "file_id", None)
+        return file_id if isinstance(file_id, str) else None
+
+    @staticmethod
+    def _is_file_id_error(exc: BadRequest) -> bool:
+        message = str(getattr(exc, "message", exc)).lower()
+        return any(marker in message for marker in _FILE_ID_ERROR_MARKERS)
+
+    async def _send_board_image(
+        self, cards: Cards, send: Callable[[Any], Awaitable[Any]]
+    ) -> Any:
+        """Call ``send`` with the board's known ``file_id`` or a fresh upload.
+
+        A ``file_id`` Telegram rejects is forgotten and the board is uploaded
+        again; the identifier of a fresh upload is registered for later sends.
+        Other errors (such as an edit of a vanished message) propagate and
+        keep the stored identifier.
+        """
+
+        file_id = await self._board_images.get_file_id(cards)
+        if file_id is not None:
+            try:
+                return await send(file_id)
+            except BadRequest as exc:
+                if not self._is_file_id_error(exc):
+                    raise
+                await self._board_images.forget(cards)
+        result = await send(await self._desk_upload(cards))
+        await self._board_images.remember(cards, self._photo_file_id(result))
+        return result
+
     async def send_desk_cards_img(
         self,
         chat_id: ChatId,
@@ -4851,16 +4927,13 @@ class PokerBotViewer:
                 extra={"context": context},
             )
             return None
-        try:
-            desk_bytes = self._desk_generator.render_cached_png(cards)
-            bio = BytesIO(desk_bytes)
-            bio.name = "desk.png"
-            bio.seek(0)
-            message = await self._timed_api_call(
+
+        async def _send(photo: Any) -> Any:
+            return await self._timed_api_call(
                 "send_desk_cards_img.send_photo",
                 self._messenger.send_photo(
                     chat_id=chat_id,
-                    photo=bio,
+                    photo=photo,
                     caption=normalized_caption,
                     request_category=RequestCategory.MEDIA,
                     parse_mode=parse_mode,
@@ -4872,6 +4945,9 @@ class PokerBotViewer:
                 timeout=self._DEFAULT_API_TIMEOUT,
                 game=game,
             )
+
+        try:
+            message = await self._send_board_image(cards, _send)
             if isinstance(message, Message):
                 return message
         except Exception as e:
@@ -4901,10 +4977,6 @@ class PokerBotViewer:
         sent instead of editing, otherwise ``None``.
         """
         try:
-            desk_bytes = self._desk_generator.render_cached_png(cards)
-            bio = BytesIO(desk_bytes)
-            bio.name = "desk.png"
-            bio.seek(0)
             context = self._build_context(
                 "edit_desk_cards_img", chat_id=chat_id, message_id=message_id
             )
@@ -4919,21 +4991,25 @@ class PokerBotViewer:
                     extra={"context": context},
                 )
                 return None
-            media = InputMediaPhoto(
-                media=bio, caption=normalized_caption, parse_mode=parse_mode
-            )
-            await self._timed_api_call(
-                "edit_desk_cards_img.edit_message_media",
-                self._bot.edit_message_media(
+
+            async def _edit(photo: Any) -> Any:
+                media = InputMediaPhoto(
+                    media=photo, caption=normalized_caption, parse_mode=parse_mode
+                )
+                return await self._timed_api_call(
+                    "edit_desk_cards_img.edit_message_media",
+                    self._bot.edit_message_media(
+                        chat_id=chat_id,
+                        message_id=message_id,
+                        media=media,
+                        reply_markup=reply_markup,
+                    ),
                     chat_id=chat_id,
-                    message_id=message_id,
-                    media=media,
-                    reply_markup=reply_markup,
-                ),
-                chat_id=chat_id,
-                timeout=self._DEFAULT_API_TIMEOUT,
-                game=game,
-            )
+                    timeout=self._DEFAULT_API_TIMEOUT,
+                    game=game,
+                )
+
+            await self._send_board_image(cards, _edit)
             return None
         except BadRequest:
             # If editing fails (e.g. original message no longer exists or is
@@ -5333,10 +5409,12 @@ class PokerBotViewer:
         winners_by_pot: list,
         *,
         game: Optional[Game] = None,
+        equities: Optional[Mapping[UserId, float]] = None,
     ) -> None:
         """
         پیام نهایی نتایج بازی را با فرمت زیبا ساخته و ارسال می‌کند.
         این نسخه برای مدیریت ساختار داده جدید Side Pot (لیست دیکشنری‌ها) به‌روز شده است.
+        ``equities`` در صورت وجود، شانس برد هر بازیکن در لحظه آل‌این را نشان می‌دهد.
         """
         if game is None:
             logger.warning(
@@ -5387,6 +5465,15 @@ class PokerBotViewer:
                 
                 final_message += "\n" # یک خط فاصله برای جداسازی پات‌ها
 
+        if equities:
+            final_message += "📊 *شانس برد در لحظه آل‌این:*\n"
+            for p in game.players_by(states=(PlayerState.ACTIVE, PlayerState.ALL_IN)):
+                equity = equities.get(p.user_id)
+                if equity is None:
+                    continue
+                final_message += f"  - {p.mention_markdown}: {equity * 100:.1f}%\n"
+            final_message += "\n"
+
         final_message += "⎯" * 20 + "\n"
         board_line = self._format_card_line("🃏 Board", game.cards_table)
         final_message += f"{board_line}\n\n"
@@ -7,7 +7,6 @@ from typing import TYPE_CHECKING, Any, Dict, Optional, Union
 
 from redis.asyncio import Redis
 
-from pokerapp.entities import ChatId
 from pokerapp.services.countdown_queue import CountdownMessageQueue
 from pokerapp.table_manager import TableManager
 
@@ -71,15 +70,14 @@ class RecoveryService:
 
     async def _recover_all_games(self) -> Dict[str, int]:
         stats = {"games_scanned": 0, "games_recovered": 0, "games_deleted": 0}
-        pattern = self._table_manager._game_key("*")
 
-        async for raw_key in self._redis.scan_iter(match=pattern):
-            stats["games_scanned"] += 1
-            key = raw_key.decode() if isinstance(raw_key, bytes) else str(raw_key)
-            chat_id = self._extract_chat_id(key)
-            if chat_id is None:
-                continue
+        try:
+            await self._table_manager.backfill_active_games()
+        except Exception:
+            self._logger.exception("Failed to backfill active games registry")
 
+        for chat_id in await self._table_manager.get_active_game_ids():
+            stats["games_scanned"] += 1
             try:
                 game, validation = await self._table_manager.load_game(
                     chat_id, validate=True
@@ -88,7 +86,7 @@ class RecoveryService:
                 self._logger.exception(
                     "Failed to load game during recovery", extra={"chat_id": chat_id}
                 )
-                await self._safe_delete(raw_key)
+                await self._safe_delete(self._table_manager._game_key(chat_id))
                 stats["games_deleted"] += 1
                 continue
 
@@ -129,16 +127,6 @@ class RecoveryService:
         )
         return cleared
 
-    def _extract_chat_id(self, key: str) -> Optional[Union[ChatId, int]]:
-        parts = key.split(":")
-        if len(parts) < 3:
-            return None
-        raw_id = parts[1]
-        try:
-            return int(raw_id)
-        except (TypeError, ValueError):
-            return raw_id
-
     async def _safe_delete(self, key: Union[str, bytes]) -> None:
         try:
             await self._redis.delete(key)
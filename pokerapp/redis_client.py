@@ -13,6 +13,11 @@ class RedisClient(Protocol):
     ) -> Any:
         ...
 
+    async def evalsha(
+        self, sha: str, keys: Sequence[str], args: Sequence[Any]
+    ) -> Any:
+        ...
+
     async def hgetall(self, key: str) -> Mapping[str, Any]:
         ...
 
@@ -0,0 +1,146 @@
+"""Per-chat actors that run game mutations for a chat one at a time."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_Job = Tuple[Callable[[], Awaitable[Any]], "asyncio.Future[Any]"]
+
+
+@dataclass(eq=False)
+class _ChatActor:
+    """Mailbox and consumer task for one chat."""
+
+    mailbox: "asyncio.Queue[_Job]" = field(default_factory=asyncio.Queue)
+    task: Optional["asyncio.Task[None]"] = None
+    processed: int = 0
+
+
+class ChatActorPool:
+    """Run work for each chat one job at a time on a dedicated consumer task.
+
+    Jobs submitted for the same chat run in submission order and never
+    overlap, so they reach the chat's locks one at a time. Jobs submitted from
+    inside a running job for the same chat run inline, so nested engine calls
+    do not deadlock. Tasks spawned by a job are *not* treated as part of it.
+
+    Actors exit after ``idle_timeout`` seconds without work, so memory stays
+    proportional to the number of busy chats. Ordering only holds within one
+    process; chats must be routed to a single worker for it to hold globally.
+    """
+
+    def __init__(
+        self,
+        *,
+        idle_timeout: float = 30.0,
+    ) -> None:
+        self._idle_timeout = max(float(idle_timeout), 0.0)
+        self._actors: Dict[Hashable, _ChatActor] = {}
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._actors)
+
+    def holds(self, chat_id: Hashable) -> bool:
+        """Return ``True`` when called from the running job of ``chat_id``."""
+
+        actor = self._actors.get(chat_id)
+        return (
+            actor is not None
+            and actor.task is not None
+            and asyncio.current_task() is actor.task
+        )
+
+    async def submit(
+        self, chat_id: Hashable, job: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Run ``job`` on the actor for ``chat_id`` and return its result.
+
+        Cancelling the caller abandons the result but does not interrupt a job
+        that has already started.
+        """
+
+        if self.holds(chat_id):
+            return await job()
+        if self._closed:
+            raise RuntimeError("ChatActorPool is closed")
+
+        actor = self._actors.get(chat_id)
+        if actor is None:
+            actor = self._actors[chat_id] = _ChatActor()
+        future: "asyncio.Future[T]" = asyncio.get_running_loop().create_future()
+        actor.mailbox.put_nowait((job, future))
+        if actor.task is None:
+            # The consumer outlives the caller that happened to start it, so it
+            # must not inherit that caller's context variables (held locks).
+            actor.task = contextvars.Context().run(
+                asyncio.create_task,
+                self._consume(chat_id, actor),
+                name=f"chat-actor:{chat_id}",
+            )
+        return await future
+
+    async def _consume(self, chat_id: Hashable, actor: _ChatActor) -> None:
+        mailbox = actor.mailbox
+        try:
+            while True:
+                try:
+                    job, future = mailbox.get_nowait()
+                except asyncio.QueueEmpty:
+                    try:
+                        job, future = await asyncio.wait_for(
+                            mailbox.get(), timeout=self._idle_timeout
+                        )
+                    except asyncio.TimeoutError:
+                        if mailbox.empty():
+                            return
+                        continue
+
+                if future.done():
+                    continue
+                try:
+                    result = await job()
+                except asyncio.CancelledError:
+                    if not future.done():
+                        future.cancel()
+                    raise
+                except Exception as exc:  # noqa: BLE001 - delivered to the caller
+                    if not future.done():
+                        future.set_exception(exc)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+                actor.processed += 1
+        finally:
+            if self._actors.get(chat_id) is actor:
+                del self._actors[chat_id]
+            # Anything still queued (only possible on cancellation) fails
+            # rather than hanging its caller.
+            while not mailbox.empty():
+                _, future = mailbox.get_nowait()
+                if not future.done():
+                    future.cancel()
+
+    async def close(self) -> None:
+        """Stop every actor, cancelling jobs that have not started."""
+
+        self._closed = True
+        tasks = [actor.task for actor in self._actors.values() if actor.task]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "actors": len(self._actors),
+            "queued": sum(actor.mailbox.qsize() for actor in self._actors.values()),
+        }
+
+
+__all__ = ["ChatActorPool"]
@@ -60,6 +60,7 @@ class CountdownMessageQueue:
         self._queue: Queue[CountdownMessage] = Queue(maxsize=max_size)
         self._active_countdowns: dict[tuple[int, int], CountdownMessage] = {}
         self._tracking_lock = asyncio.Lock()
+        self._listeners: list[Callable[[], None]] = []
 
     async def enqueue(
         self,
@@ -113,8 +114,23 @@ class CountdownMessageQueue:
             self._active_countdowns[key] = msg
 
         await self._queue.put(msg)
+        for listener in list(self._listeners):
+            listener()
         return msg
 
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """Call ``listener`` after every successful :meth:`enqueue`."""
+
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[], None]) -> None:
+        """Stop notifying ``listener``; unknown listeners are ignored."""
+
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            pass
+
     async def dequeue(self) -> Optional[CountdownMessage]:
         """Dequeue the next countdown message.
 
@@ -126,15 +142,32 @@ class CountdownMessageQueue:
         except asyncio.TimeoutError:
             return None
 
-        key = (msg.chat_id, msg.message_id)
         async with self._tracking_lock:
-            if key in self._active_countdowns:
-                tracked_msg = self._active_countdowns[key]
-                if tracked_msg is msg:
-                    del self._active_countdowns[key]
+            self._untrack(msg)
 
         return msg
 
+    def dequeue_nowait(self) -> Optional[CountdownMessage]:
+        """Dequeue the next countdown message without waiting.
+
+        Returns:
+            CountdownMessage if one is queued, ``None`` otherwise.
+        """
+        try:
+            msg = self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+        # No awaits happen while the tracking dict is touched, so this is
+        # atomic with respect to the lock-holding coroutines above.
+        self._untrack(msg)
+        return msg
+
+    def _untrack(self, msg: CountdownMessage) -> None:
+        key = (msg.chat_id, msg.message_id)
+        if self._active_countdowns.get(key) is msg:
+            del self._active_countdowns[key]
+
     async def remove_anchor(self, anchor_key: str) -> None:
         """Remove and cancel all countdowns associated with ``anchor_key``."""
 
@@ -4,14 +4,32 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from aiogram.exceptions import TelegramBadRequest, TelegramAPIError
 
+from pokerapp.metrics import (
+    COUNTDOWN_QUEUE_DEPTH,
+    COUNTDOWN_SCHEDULED,
+    COUNTDOWN_TIMER_LAG,
+)
 from pokerapp.services.countdown_queue import CountdownMessage, CountdownMessageQueue
+from pokerapp.services.timer_wheel import HierarchicalTimerWheel
 from pokerapp.utils.telegram_safeops import TelegramSafeOps
 
 
+@dataclass(eq=False)
+class _ScheduledCountdown:
+    """Per-countdown state carried on the timer wheel."""
+
+    msg: CountdownMessage
+    anchor_key: str
+    end_time: float
+    deadline: float
+    last_edit: float = 0.0
+
+
 class CountdownWorker:
     """Background worker that updates countdown messages in Telegram."""
 
@@ -20,12 +38,20 @@ class CountdownWorker:
         queue: CountdownMessageQueue,
         safe_ops: TelegramSafeOps,
         edit_interval: float = 1.0,
+        tick_interval: float = 0.05,
     ) -> None:
         self._queue = queue
         self._safe_ops = safe_ops
         self._edit_interval = max(edit_interval, 0.0)
+        self._tick_interval = tick_interval if tick_interval > 0 else 0.05
         self._worker_task: Optional[asyncio.Task[None]] = None
+        self._wheel: Optional[HierarchicalTimerWheel[_ScheduledCountdown]] = None
+        self._scheduled: Dict[Tuple[int, int], _ScheduledCountdown] = {}
+        self._in_flight: Set[asyncio.Task[None]] = set()
+        self._last_lag = 0.0
+        self._max_lag = 0.0
         self._shutdown_event = asyncio.Event()
+        self._wakeup = asyncio.Event()
         self._logger = logging.getLogger(__name__)
 
     async def start(self) -> None:
@@ -70,6 +96,7 @@ class CountdownWorker:
         """
 
         try:
+            self._cancel_scheduled_for_anchor(anchor_key)
             remove_anchor = getattr(self._queue, "remove_anchor", None)
             if remove_anchor is None:
                 self._logger.debug(
@@ -91,6 +118,7 @@ class CountdownWorker:
     async def _remove_anchor_updates(self, anchor_key: str) -> None:
         """Remove all pending updates for a deleted anchor message."""
 
+        self._cancel_scheduled_for_anchor(anchor_key)
         remove_anchor = getattr(self._queue, "remove_anchor", None)
         if remove_anchor is None:
             self._logger.debug(
@@ -105,35 +133,81 @@ class CountdownWorker:
             extra={"anchor_key": anchor_key},
         )
 
+    def get_stats(self) -> Dict[str, float]:
+        """Return queue depth, timer wheel occupancy and dispatch lag."""
+
+        return {
+            "queue_depth": self._queue.get_queue_depth(),
+            "scheduled": len(self._wheel) if self._wheel is not None else 0,
+            "in_flight": len(self._in_flight),
+            "last_lag": self._last_lag,
+            "max_lag": self._max_lag,
+        }
+
     async def _worker_loop(self) -> None:
-        """Continuously consume messages from the queue until shutdown."""
+        """Feed queued countdowns into the timer wheel and dispatch due steps.
 
+        Every active countdown lives on a single :class:`HierarchicalTimerWheel`
+        so one task drives any number of concurrent countdowns; each due step
+        (an edit or the completion) runs as a short-lived task. Between steps
+        the loop sleeps until the wheel's next expiry, and enqueues or newly
+        scheduled steps wake it early.
+        """
+
+        loop = asyncio.get_running_loop()
+        wheel: HierarchicalTimerWheel[_ScheduledCountdown] = HierarchicalTimerWheel(
+            self._tick_interval, start=loop.time()
+        )
+        self._wheel = wheel
+        self._queue.add_listener(self._wakeup.set)
         try:
             while not self._shutdown_event.is_set():
+                now = loop.time()
+                while True:
+                    msg = self._queue.dequeue_nowait()
+                    if msg is None:
+                        break
+                    self._admit(msg, now)
+
+                self._dispatch(wheel.advance(now), now)
+                COUNTDOWN_QUEUE_DEPTH.set(self._queue.get_queue_depth())
+                COUNTDOWN_SCHEDULED.set(len(wheel))
+
+                # Nothing above awaits, so no wake-up can be missed here.
+                self._wakeup.clear()
                 try:
-                    msg = await asyncio.wait_for(self._queue.dequeue(), timeout=0.1)
-                except asyncio.TimeoutError:
-                    continue
-                if msg is None:
-                    continue
-                try:
-                    await self._process_countdown(msg)
-                except asyncio.CancelledError:
-                    raise
-                except Exception:
-                    self._logger.exception(
-                        "Unexpected error processing countdown",
-                        extra={
-                            "chat_id": getattr(msg, "chat_id", None),
-                            "message_id": getattr(msg, "message_id", None),
-                        },
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=self._sleep_for(wheel, now)
                     )
+                except asyncio.TimeoutError:
+                    pass
         except asyncio.CancelledError:
             self._logger.debug("Countdown worker loop cancelled")
             raise
-
-    async def _process_countdown(self, msg: CountdownMessage) -> None:
-        """Process a single countdown message."""
+        finally:
+            self._queue.remove_listener(self._wakeup.set)
+            wheel.clear()
+            self._scheduled.clear()
+            in_flight = list(self._in_flight)
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+            COUNTDOWN_SCHEDULED.set(0)
+
+    @staticmethod
+    def _sleep_for(
+        wheel: HierarchicalTimerWheel[_ScheduledCountdown], now: float
+    ) -> Optional[float]:
+        """Seconds until the wheel next has a due step, or ``None`` when idle."""
+
+        due = wheel.next_due()
+        if due is None:
+            return None
+        return max(0.0, due - now)
+
+    def _admit(self, msg: CountdownMessage, now: float) -> None:
+        """Schedule the first step of a freshly dequeued countdown."""
 
         if msg.cancelled:
             self._logger.debug(
@@ -142,103 +216,155 @@ class CountdownWorker:
             )
             return
 
-        anchor_key = getattr(msg, "anchor_key", f"{msg.chat_id}:{msg.message_id}")
-        remaining = float(getattr(msg, "duration_seconds", 0.0))
-        if remaining <= 0:
-            await self._invoke_completion(msg)
-            self._logger.debug(
-                "Countdown completed instantly",
-                extra={"chat_id": msg.chat_id, "message_id": msg.message_id},
-            )
-            return
-
-        loop = asyncio.get_running_loop()
-        end_time = loop.time() + remaining
-        last_edit = 0.0
-
+        key = (msg.chat_id, msg.message_id)
+        previous = self._scheduled.get(key)
+        if previous is not None and previous.msg is not msg:
+            # The queue stops tracking messages once dequeued, so a newer
+            # countdown for the same message supersedes the running one here.
+            previous.msg.cancelled = True
+
+        remaining = max(0.0, float(getattr(msg, "duration_seconds", 0.0)))
+        state = _ScheduledCountdown(
+            msg=msg,
+            anchor_key=getattr(msg, "anchor_key", "") or f"{msg.chat_id}:{msg.message_id}",
+            end_time=now + remaining,
+            deadline=now,
+        )
+        self._scheduled[key] = state
         self._logger.debug(
             "Starting countdown",
             extra={"chat_id": msg.chat_id, "message_id": msg.message_id, "remaining": remaining},
         )
+        self._schedule(state, now)
+
+    def _schedule(self, state: _ScheduledCountdown, deadline: float) -> None:
+        if self._wheel is None or self._shutdown_event.is_set():
+            return
+        state.deadline = deadline
+        self._wheel.schedule(deadline, state)
+        self._wakeup.set()
+
+    def _dispatch(self, due: List[_ScheduledCountdown], now: float) -> None:
+        for state in due:
+            lag = max(0.0, now - state.deadline)
+            self._last_lag = lag
+            self._max_lag = max(self._max_lag, lag)
+            COUNTDOWN_TIMER_LAG.observe(lag)
+
+            msg = state.msg
+            if msg.cancelled:
+                self._forget(state)
+                self._logger.debug(
+                    "Countdown cancelled",
+                    extra={"chat_id": msg.chat_id, "message_id": msg.message_id},
+                )
+                continue
 
-        while not msg.cancelled and not self._shutdown_event.is_set():
+            task = asyncio.create_task(self._run_step(state))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    def _forget(self, state: _ScheduledCountdown) -> None:
+        key = (state.msg.chat_id, state.msg.message_id)
+        if self._scheduled.get(key) is state:
+            del self._scheduled[key]
+
+    def _cancel_scheduled_for_anchor(self, anchor_key: str) -> None:
+        for state in list(self._scheduled.values()):
+            if state.anchor_key == anchor_key:
+                state.msg.cancelled = True
+
+    async def _run_step(self, state: _ScheduledCountdown) -> None:
+        """Run one due step of a countdown and schedule the next one."""
+
+        msg = state.msg
+        try:
+            loop = asyncio.get_running_loop()
             now = loop.time()
-            remaining = max(0.0, end_time - now)
+            remaining = state.end_time - now
             if remaining <= 0:
-                break
+                self._forget(state)
+                await self._invoke_completion(msg)
+                self._logger.debug(
+                    "Countdown completed",
+                    extra={"chat_id": msg.chat_id, "message_id": msg.message_id},
+                )
+                return
 
-            if now - last_edit >= self._edit_interval:
-                try:
-                    await self._safe_ops.edit_message_text(
-                        chat_id=msg.chat_id,
-                        message_id=msg.message_id,
-                        text=self._format_message_text(msg, remaining),
-                        from_countdown=True,
-                    )
-                except TelegramBadRequest as exc:
-                    error_message = str(exc).lower()
-
-                    if "message to edit not found" in error_message or "message can't be edited" in error_message:
-                        self._logger.warning(
-                            "Countdown message deleted; removing from queue",
-                            extra={
-                                "chat_id": msg.chat_id,
-                                "message_id": msg.message_id,
-                                "anchor_key": anchor_key,
-                            },
-                        )
-                        await self._remove_anchor_updates(anchor_key)
-                        return
-
-                    if "message is not modified" in error_message:
-                        self._logger.debug(
-                            "Countdown content unchanged; skipping edit",
-                            extra={"chat_id": msg.chat_id, "message_id": msg.message_id},
-                        )
-                        last_edit = now
-                        continue
-
-                    self._logger.error(
-                        "BadRequest editing countdown message",
-                        extra={
-                            "chat_id": msg.chat_id,
-                            "message_id": msg.message_id,
-                            "error": str(exc),
-                        },
-                    )
-                    return
-                except TelegramAPIError:
-                    self._logger.exception(
-                        "TelegramError while editing countdown message",
-                        extra={"chat_id": msg.chat_id, "message_id": msg.message_id},
-                    )
-                    return
-                last_edit = now
-            sleep_for = min(0.1, remaining)
-            try:
-                await asyncio.sleep(sleep_for)
-            except asyncio.CancelledError:
-                raise
+            if not await self._edit_countdown(state, remaining, now):
+                self._forget(state)
+                return
 
-        if msg.cancelled:
-            self._logger.debug(
-                "Countdown cancelled",
+            if msg.cancelled or self._shutdown_event.is_set():
+                self._forget(state)
+                return
+
+            self._schedule(
+                state,
+                min(state.last_edit + self._edit_interval, state.end_time),
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._forget(state)
+            self._logger.exception(
+                "Unexpected error processing countdown",
                 extra={"chat_id": msg.chat_id, "message_id": msg.message_id},
             )
-            return
 
-        if self._shutdown_event.is_set():
-            self._logger.debug(
-                "Countdown interrupted by shutdown",
-                extra={"chat_id": msg.chat_id, "message_id": msg.message_id},
+    async def _edit_countdown(
+        self, state: _ScheduledCountdown, remaining: float, now: float
+    ) -> bool:
+        """Edit the countdown text; return ``False`` when it must stop."""
+
+        msg = state.msg
+        try:
+            await self._safe_ops.edit_message_text(
+                chat_id=msg.chat_id,
+                message_id=msg.message_id,
+                text=self._format_message_text(msg, remaining),
+                from_countdown=True,
             )
-            return
+        except TelegramBadRequest as exc:
+            error_message = str(exc).lower()
+
+            if "message to edit not found" in error_message or "message can't be edited" in error_message:
+                self._logger.warning(
+                    "Countdown message deleted; removing from queue",
+                    extra={
+                        "chat_id": msg.chat_id,
+                        "message_id": msg.message_id,
+                        "anchor_key": state.anchor_key,
+                    },
+                )
+                await self._remove_anchor_updates(state.anchor_key)
+                return False
 
-        await self._invoke_completion(msg)
-        self._logger.debug(
-            "Countdown completed",
-            extra={"chat_id": msg.chat_id, "message_id": msg.message_id},
-        )
+            if "message is not modified" in error_message:
+                self._logger.debug(
+                    "Countdown content unchanged; skipping edit",
+                    extra={"chat_id": msg.chat_id, "message_id": msg.message_id},
+                )
+                state.last_edit = now
+                return True
+
+            self._logger.error(
+                "BadRequest editing countdown message",
+                extra={
+                    "chat_id": msg.chat_id,
+                    "message_id": msg.message_id,
+                    "error": str(exc),
+                },
+            )
+            return False
+        except TelegramAPIError:
+            self._logger.exception(
+                "TelegramError while editing countdown message",
+                extra={"chat_id": msg.chat_id, "message_id": msg.message_id},
+            )
+            return False
+        state.last_edit = now
+        return True
 
     async def _invoke_completion(self, msg: CountdownMessage) -> None:
         """Invoke the ``on_complete`` callback if present."""
@@ -0,0 +1,170 @@
+"""Hierarchical timer wheel used to schedule many deadlines on one task."""
+
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_Entry = Tuple[int, int, float, T]
+
+_TICK_EPSILON = 1e-9
+
+
+class HierarchicalTimerWheel(Generic[T]):
+    """Bucket deadlines into cascading wheels of ``slots`` buckets each.
+
+    Level ``0`` buckets are one ``tick`` wide; each higher level is ``slots``
+    times coarser. Bucket placement and expiry are O(1) amortised regardless
+    of how many items are pending, and items due in the same tick are
+    returned in deadline order (ties in scheduling order). A heap of due
+    ticks, O(log n) per schedule, keeps :meth:`next_due` cheap enough to
+    call on every step.
+    """
+
+    def __init__(
+        self,
+        tick: float,
+        *,
+        slots: int = 64,
+        levels: int = 4,
+        start: float = 0.0,
+    ) -> None:
+        if tick <= 0:
+            raise ValueError("tick must be positive")
+        if slots < 2 or levels < 1:
+            raise ValueError("timer wheel needs at least 2 slots and 1 level")
+        self._tick = tick
+        self._slots = slots
+        self._levels = levels
+        self._origin = start
+        self._current = 0
+        self._sequence = 0
+        self._size = 0
+        self._wheels: List[List[List[_Entry]]] = [
+            [[] for _ in range(slots)] for _ in range(levels)
+        ]
+        self._due_ticks: List[int] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def tick(self) -> float:
+        return self._tick
+
+    @property
+    def current_time(self) -> float:
+        """Start time of the tick the wheel has advanced to."""
+
+        return self._origin + self._current * self._tick
+
+    def _tick_for(self, deadline: float) -> int:
+        return max(math.ceil((deadline - self._origin) / self._tick), self._current + 1)
+
+    def schedule(self, deadline: float, item: T) -> None:
+        """Schedule ``item`` to expire at ``deadline``."""
+
+        self._sequence += 1
+        entry = (self._tick_for(deadline), self._sequence, deadline, item)
+        self._place(entry)
+        heapq.heappush(self._due_ticks, entry[0])
+        self._size += 1
+
+    def _place(self, entry: _Entry) -> None:
+        target = entry[0]
+        delta = target - self._current
+        span = self._slots
+        for level in range(self._levels):
+            if delta < span or level == self._levels - 1:
+                if delta >= span:
+                    # Beyond the horizon: park in the furthest top-level
+                    # bucket and re-cascade when it comes around.
+                    target = self._current + span - 1
+                slot = (target // (span // self._slots)) % self._slots
+                self._wheels[level][slot].append(entry)
+                return
+            span *= self._slots
+
+    def advance(self, now: float) -> List[T]:
+        """Advance to ``now`` and return every item whose tick has expired."""
+
+        # Tolerate rounding so advance(next_due()) always reaches that tick.
+        target_tick = math.floor((now - self._origin) / self._tick + _TICK_EPSILON)
+        if self._size == 0:
+            self._current = max(self._current, target_tick)
+            return []
+
+        expired: List[_Entry] = []
+        while self._current < target_tick:
+            self._current += 1
+            self._cascade()
+            bucket = self._wheels[0][self._current % self._slots]
+            if bucket:
+                self._wheels[0][self._current % self._slots] = []
+                for entry in bucket:
+                    if entry[0] <= self._current:
+                        expired.append(entry)
+                    else:
+                        self._place(entry)
+        self._current = max(self._current, target_tick)
+        self._size -= len(expired)
+        # Pending entries always sit on a later tick, so exactly the expired
+        # ticks are popped.
+        due_ticks = self._due_ticks
+        while due_ticks and due_ticks[0] <= self._current:
+            heapq.heappop(due_ticks)
+        expired.sort(key=lambda entry: (entry[2], entry[1]))
+        return [entry[3] for entry in expired]
+
+    def _cascade(self) -> None:
+        span = 1
+        for level in range(1, self._levels):
+            span *= self._slots
+            if self._current % span:
+                return
+            slot = (self._current // span) % self._slots
+            bucket = self._wheels[level][slot]
+            if bucket:
+                self._wheels[level][slot] = []
+                for entry in bucket:
+                    self._place(entry)
+
+    def next_due(self) -> Optional[float]:
+        """Earliest time at which :meth:`advance` returns an item, or ``None``.
+
+        O(1): read from the heap of due ticks rather than the buckets.
+        """
+
+        if not self._due_ticks:
+            return None
+        return self._origin + self._due_ticks[0] * self._tick
+
+    def next_expiry(self) -> Optional[float]:
+        """Earliest deadline still pending, or ``None`` when empty.
+
+        This scans the buckets and is meant for idle-time sleeping decisions,
+        not for the per-tick hot path.
+        """
+
+        earliest: Optional[float] = None
+        for wheel in self._wheels:
+            for bucket in wheel:
+                for entry in bucket:
+                    if earliest is None or entry[2] < earliest:
+                        earliest = entry[2]
+        return earliest
+
+    def clear(self) -> List[T]:
+        """Remove and return all pending items."""
+
+        items = [entry[3] for wheel in self._wheels for bucket in wheel for entry in bucket]
+        self._wheels = [[[] for _ in range(self._slots)] for _ in range(self._levels)]
+        self._due_ticks = []
+        self._size = 0
+        return items
+
+
+__all__ = ["HierarchicalTimerWheel"]
@@ -0,0 +1,151 @@
+"""Redis-backed registry of Telegram ``file_id`` values for board images."""
+
+from __future__ import annotations
+
+import logging
+from threading import Lock
+from typing import Iterable, Optional
+
+from cachetools import LRUCache
+
+from pokerapp.cards import Card
+from pokerapp.config import get_game_constants
+from pokerapp.utils.logging_helpers import add_context
+from pokerapp.utils.redis_safeops import RedisSafeOps
+
+
+_CONSTANTS = get_game_constants()
+_REDIS_KEYS = _CONSTANTS.redis_keys
+if isinstance(_REDIS_KEYS, dict):
+    _BOARD_IMAGE_SECTION = _REDIS_KEYS.get("board_image", {})
+    if not isinstance(_BOARD_IMAGE_SECTION, dict):
+        _BOARD_IMAGE_SECTION = {}
+else:
+    _BOARD_IMAGE_SECTION = {}
+
+_DEFAULT_BOARD_IMAGE_PREFIX = _BOARD_IMAGE_SECTION.get(
+    "file_id_prefix", "pokerbot:board_image:"
+)
+# Telegram keeps file identifiers valid for a long time; a week bounds the
+# key count while covering every board a busy deployment sees repeatedly.
+_DEFAULT_BOARD_IMAGE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+class BoardImageRegistry:
+    """Map rendered boards to the ``file_id`` Telegram assigned on upload.
+
+    Boards are keyed by the card tuple in display order plus the renderer
+    ``variant`` so a change in card size or encoding never serves a stale
+    image. Lookups hit a small in-process LRU before Redis, which shares the
+    identifiers across workers.
+    """
+
+    def __init__(
+        self,
+        redis_ops: Optional[RedisSafeOps] = None,
+        *,
+        variant: str = "",
+        key_prefix: str = _DEFAULT_BOARD_IMAGE_PREFIX,
+        ttl_seconds: int = _DEFAULT_BOARD_IMAGE_TTL_SECONDS,
+        local_size: int = 256,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        base_logger = logger or logging.getLogger(__name__)
+        self._logger = add_context(base_logger).getChild("board_image_registry")
+        self._redis_ops = redis_ops
+        self._variant = variant
+        self._key_prefix = key_prefix.rstrip(":") + ":"
+        self._ttl_seconds = max(int(ttl_seconds or 0), 0)
+        self._local: LRUCache[str, str] = LRUCache(maxsize=max(1, local_size))
+        self._local_lock = Lock()
+
+    def board_key(self, cards: Iterable[Card]) -> str:
+        """Return the canonical registry key for ``cards``."""
+
+        parts = []
+        for card in cards:
+            index = getattr(card, "index", -1)
+            parts.append(str(index) if index >= 0 else str(card))
+        board = "-".join(parts) or "empty"
+        if self._variant:
+            return f"{self._key_prefix}{self._variant}:{board}"
+        return f"{self._key_prefix}{board}"
+
+    async def get_file_id(self, cards: Iterable[Card]) -> Optional[str]:
+        """Return the stored ``file_id`` for ``cards`` if one is known."""
+
+        key = self.board_key(cards)
+        with self._local_lock:
+            cached = self._local.get(key)
+        if cached is not None:
+            return cached
+        if self._redis_ops is None:
+            return None
+
+        try:
+            payload = await self._redis_ops.safe_get(
+                key, log_extra={"event_type": "board_image_registry_get"}
+            )
+        except Exception:
+            self._logger.exception(
+                "Failed to load board image file_id from Redis",
+                extra={"event_type": "board_image_registry_get_error", "key": key},
+            )
+            return None
+        if not payload:
+            return None
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8")
+        if not isinstance(payload, str):
+            return None
+        with self._local_lock:
+            self._local[key] = payload
+        return payload
+
+    async def remember(self, cards: Iterable[Card], file_id: Optional[str]) -> bool:
+        """Store ``file_id`` for ``cards`` locally and in Redis."""
+
+        if not file_id:
+            return False
+        key = self.board_key(cards)
+        with self._local_lock:
+            self._local[key] = file_id
+        if self._redis_ops is None:
+            return True
+
+        try:
+            result = await self._redis_ops.safe_set(
+                key,
+                file_id,
+                expire=self._ttl_seconds or None,
+                log_extra={"event_type": "board_image_registry_set"},
+            )
+        except Exception:
+            self._logger.exception(
+                "Failed to persist board image file_id in Redis",
+                extra={"event_type": "board_image_registry_set_error", "key": key},
+            )
+            return False
+        return bool(result)
+
+    async def forget(self, cards: Iterable[Card]) -> None:
+        """Drop the ``file_id`` for ``cards`` after Telegram rejected it."""
+
+        key = self.board_key(cards)
+        with self._local_lock:
+            self._local.pop(key, None)
+        if self._redis_ops is None:
+            return
+
+        try:
+            await self._redis_ops.safe_delete(
+                key, log_extra={"event_type": "board_image_registry_delete"}
+            )
+        except Exception:
+            self._logger.exception(
+                "Failed to remove board image file_id from Redis",
+                extra={"event_type": "board_image_registry_delete_error", "key": key},
+            )
+
+
+__all__ = ["BoardImageRegistry"]
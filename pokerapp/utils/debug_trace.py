@@ -14,14 +14,14 @@ runtime behaviour is unchanged when tracing is enabled.
 
 from __future__ import annotations
 
-import hashlib
 import inspect
-import json
 import logging
 import os
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Sequence
 
+from pokerapp.utils.fingerprint import content_fingerprint
+
 
 LOGGER = logging.getLogger("pokerbot.debug_trace")
 
@@ -259,37 +259,11 @@ def _message_payload_hash(text: Optional[str], reply_markup: Any) -> str:
     if text is None and reply_markup is None:
         return "-"
     try:
-        payload = {
-            "text": text or "",
-            "reply_markup": _serialize_markup(reply_markup),
-        }
-        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
-        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+        return content_fingerprint(text, reply_markup)
     except Exception:
         return "-"
 
 
-def _serialize_markup(markup: Any) -> Any:
-    if markup is None:
-        return None
-    for attr in ("model_dump", "to_python", "to_dict"):
-        serializer = getattr(markup, attr, None)
-        if callable(serializer):
-            try:
-                return serializer()
-            except TypeError:
-                continue
-    try:
-        return json.loads(markup.model_dump_json())  # type: ignore[attr-defined]
-    except Exception:
-        pass
-    if isinstance(markup, dict):
-        return markup
-    if isinstance(markup, (list, tuple)):
-        return list(markup)
-    return repr(markup)
-
-
 class _GameContext:
     __slots__ = ("game_state", "turn_message_id", "anchor_ids")
 
@@ -0,0 +1,155 @@
+"""Cheap content fingerprints used to de-duplicate Telegram edits.
+
+Fingerprints only need to tell payloads apart within the bot, so they use a
+short BLAKE2b digest instead of a cryptographic hash.  Serialising a keyboard
+dominates the cost: immutable python-telegram-bot markups are read straight
+from the button fields they were built from rather than through ``to_dict``,
+and their digests are remembered by identity because the viewer's turn
+keyboard cache hands out the same object repeatedly.  Other markups go
+through a compact JSON rendering.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+from threading import Lock
+from typing import Any, List, Optional, Tuple
+
+from cachetools import LRUCache
+
+
+_DIGEST_SIZE = 16
+_MARKUP_CACHE_SIZE = 512
+
+# ``id()`` values are reused once an object dies, so each entry keeps the
+# markup alive and lookups confirm identity before trusting the digest.
+_markup_digests: LRUCache[int, tuple[Any, str]] = LRUCache(maxsize=_MARKUP_CACHE_SIZE)
+_markup_digests_lock = Lock()
+
+
+def fingerprint_bytes(data: bytes) -> str:
+    """Return the hex fingerprint of ``data``."""
+
+    return hashlib.blake2b(data, digest_size=_DIGEST_SIZE).hexdigest()
+
+
+def serialize_markup(markup: Any) -> Any:
+    """Return a JSON-compatible representation of ``markup``."""
+
+    if markup is None:
+        return None
+    for attr in ("model_dump", "to_python", "to_dict"):
+        serializer = getattr(markup, attr, None)
+        if callable(serializer):
+            try:
+                return serializer()
+            except TypeError:
+                continue
+    try:
+        return json.loads(markup.model_dump_json())  # type: ignore[attr-defined]
+    except Exception:
+        pass
+    if isinstance(markup, dict):
+        return {key: serialize_markup(markup[key]) for key in sorted(markup)}
+    if isinstance(markup, (list, tuple)):
+        return [serialize_markup(item) for item in markup]
+    return repr(markup)
+
+
+def _is_frozen(markup: Any) -> bool:
+    return getattr(markup, "_frozen", False) is True
+
+
+@functools.lru_cache(maxsize=64)
+def _public_slots(cls: type) -> Tuple[str, ...]:
+    names: List[str] = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(
+            name
+            for name in slots
+            if not name.startswith("_") and name != "api_kwargs" and name not in names
+        )
+    return tuple(names)
+
+
+def _append_fields(obj: Any, parts: List[str]) -> bool:
+    """Append the field values of frozen ``obj``; ``False`` if unsupported."""
+
+    if getattr(obj, "api_kwargs", None):
+        return False
+    parts.append(type(obj).__name__)
+    for name in _public_slots(type(obj)):
+        value = getattr(obj, name, None)
+        if value is None:
+            continue
+        parts.append(name)
+        if isinstance(value, (str, int, float)):
+            parts.append(repr(value))
+        elif isinstance(value, tuple):
+            for row in value:
+                parts.append("[")
+                items = row if isinstance(row, tuple) else (row,)
+                for item in items:
+                    if isinstance(item, str):
+                        parts.append(repr(item))
+                    elif not (_is_frozen(item) and _append_fields(item, parts)):
+                        return False
+                parts.append("]")
+        elif not (_is_frozen(value) and _append_fields(value, parts)):
+            return False
+    return True
+
+
+def _frozen_markup_payload(markup: Any) -> Optional[str]:
+    parts: List[str] = []
+    if not _append_fields(markup, parts):
+        return None
+    return "\x1f".join(parts)
+
+
+def markup_fingerprint(markup: Any) -> str:
+    """Return the fingerprint of ``markup`` or ``""`` when there is none."""
+
+    if markup is None:
+        return ""
+    cacheable = _is_frozen(markup)
+    if cacheable:
+        with _markup_digests_lock:
+            entry = _markup_digests.get(id(markup))
+        if entry is not None and entry[0] is markup:
+            return entry[1]
+
+    encoded = _frozen_markup_payload(markup) if cacheable else None
+    if encoded is None:
+        encoded = json.dumps(
+            serialize_markup(markup),
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=str,
+        )
+    digest = fingerprint_bytes(encoded.encode("utf-8"))
+    if cacheable:
+        with _markup_digests_lock:
+            _markup_digests[id(markup)] = (markup, digest)
+    return digest
+
+
+def content_fingerprint(text: Optional[str], reply_markup: Any = None) -> str:
+    """Return the fingerprint of a message's text and reply markup."""
+
+    payload = f"{text or ''}\x1f{markup_fingerprint(reply_markup)}"
+    return fingerprint_bytes(payload.encode("utf-8"))
+
+
+__all__ = [
+    "content_fingerprint",
+    "fingerprint_bytes",
+    "markup_fingerprint",
+    "serialize_markup",
+]
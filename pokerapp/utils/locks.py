@@ -21,6 +21,11 @@ class ReentrantAsyncLock:
         self._owner_id: Optional[int] = None
         self._count = 0
 
+    def locked(self) -> bool:
+        """Return ``True`` when any task holds the lock."""
+
+        return self._lock.locked()
+
     async def acquire(self) -> None:
         current = asyncio.current_task()
         if current is None:
@@ -10,17 +10,23 @@ The public ``send_message``, ``edit_message_text`` and ``delete_message``
 coroutines mirror the behaviour of the underlying Telegram client (aiogram or
 python-telegram-bot).  Each method acquires an ``asyncio.Lock`` for the target
 message, prevents repeated identical edits using a small in-memory cache, and
-handles common ``400 Bad Request`` responses gracefully.
+handles common ``400 Bad Request`` responses gracefully.  Requests then wait
+in a per-chat outbound queue with one lane per message plus one for new
+messages: lanes run concurrently, and new messages are sent by
+:class:`~pokerapp.utils.request_metrics.RequestCategory` priority.
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextvars
 import hashlib
+import itertools
 import json
 import logging
 import time
 import datetime
+import functools
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from typing import (
@@ -48,6 +54,12 @@ except Exception:  # pragma: no cover - optional dependency missing
     Counter = None  # type: ignore[assignment]
 
 from pokerapp.utils.debug_trace import trace_telegram_api_call
+from pokerapp.utils.fingerprint import (
+    content_fingerprint,
+    markup_fingerprint,
+    serialize_markup,
+)
+from pokerapp.utils.rate_limiter import TelegramPermitLimiter, category_priority
 from pokerapp.utils.request_metrics import RequestCategory, RequestMetrics
 from pokerapp.utils.time_utils import now_utc
 
@@ -84,6 +96,12 @@ else:  # pragma: no cover - dependency not installed during tests
 CacheKey = Tuple[int, int]
 CacheEntryKey = Tuple[int, int, str]
 
+#: Set while an outbound lane runs a request whose rate-limit permit it has
+#: already taken, so the request's own throttle does not take a second one.
+_OUTBOUND_PERMIT_HELD: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "messaging_outbound_permit_held", default=False
+)
+
 
 @dataclass(slots=True)
 class _EditPayload:
@@ -124,6 +142,47 @@ class _PendingEditState:
     delete_waiters: List["asyncio.Future[bool]"] = field(default_factory=list)
 
 
+@dataclass(slots=True)
+class _OutboundRequest:
+    """A Telegram call waiting in a chat's outbound queue."""
+
+    priority: int
+    sequence: int
+    kind: str
+    category: RequestCategory
+    run: Callable[[], Awaitable[Any]]
+    futures: List["asyncio.Future[Any]"] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _OutboundLane:
+    """Requests for one message of a chat, or for its new messages.
+
+    A lane runs one request at a time.  Message lanes keep submission order,
+    so an edit can never land after the message's delete; the new-message
+    lane sends by priority.
+    """
+
+    by_priority: bool
+    queue: List[_OutboundRequest] = field(default_factory=list)
+    drain_task: Optional[asyncio.Task] = None
+
+    def next_request(self) -> _OutboundRequest:
+        if self.by_priority:
+            return min(self.queue, key=lambda item: (item.priority, item.sequence))
+        return self.queue[0]
+
+    def most_urgent(self) -> _OutboundRequest:
+        return min(self.queue, key=lambda item: (item.priority, item.sequence))
+
+
+@dataclass(slots=True)
+class _ChatOutbox:
+    """Outbound lanes of one chat, keyed by message id (``None`` for sends)."""
+
+    lanes: Dict[Optional[int], _OutboundLane] = field(default_factory=dict)
+
+
 class MessagingService:
     """Encapsulate all outgoing Telegram requests for the poker bot.
 
@@ -157,6 +216,10 @@ class MessagingService:
     )
 
     _MESSAGE_SENT_TTL = 60 * 60 * 24
+    #: Outbound request kinds where a newer request replaces a pending one.
+    _COALESCED_KINDS = frozenset({"edit", "markup", "delete"})
+    #: Outbound request kinds that draw a permit from the shared rate limiter.
+    _PERMIT_KINDS = frozenset({"send", "photo", "edit"})
 
     def __init__(
         self,
@@ -173,6 +236,7 @@ class MessagingService:
         table_manager: Optional["TableManager"] = None,
         retry_manager: Optional["TelegramRetryManager"] = None,
         redis_ops: Optional[RedisSafeOps] = None,
+        rate_limiter: Optional[TelegramPermitLimiter] = None,
     ) -> None:
         self._bot = bot
         if logger_ is None:
@@ -207,6 +271,9 @@ class MessagingService:
         self._retry_manager = retry_manager
         self._table_manager = table_manager
         self._redis_ops = redis_ops
+        self._rate_limiter = rate_limiter
+        self._outboxes: Dict[int, _ChatOutbox] = {}
+        self._outbound_sequence = itertools.count()
 
     @staticmethod
     def _coerce_context_value(value: Any) -> Any:
@@ -500,9 +567,38 @@ class MessagingService:
         method: Optional[str] = None,
         context: Optional[Mapping[str, Any]] = None,
     ) -> None:
-        """Apply per-chat and global throttling before contacting Telegram."""
+        """Apply per-chat and global throttling before contacting Telegram.
+
+        With a shared :class:`TelegramPermitLimiter` the call waits for its
+        permit; otherwise the local speed tiers below apply.
+        """
 
         chat_key = int(chat_id)
+        if self._rate_limiter is not None:
+            if _OUTBOUND_PERMIT_HELD.get():
+                # The outbound lane took this call's permit before picking it.
+                _OUTBOUND_PERMIT_HELD.set(False)
+                return
+            request = context or {}
+            waited = await self._rate_limiter.acquire(
+                chat_key,
+                message_id=request.get("message_id"),
+                category=request.get("category", RequestCategory.GENERAL),
+            )
+            if waited > 0:
+                self._log_event(
+                    "THROTTLE_PERMIT",
+                    context=self._merge_context(
+                        context,
+                        chat_id=chat_id,
+                        method=method,
+                        delay=waited,
+                        throttle_scope="shared",
+                    ),
+                    include_debug_trace=True,
+                )
+            return
+
         now = time.monotonic()
         history = self._send_history_per_chat[chat_key]
         base_context = self._merge_context(
@@ -666,6 +762,150 @@ class MessagingService:
             return None
         return getattr(stage, "name", str(stage))
 
+    async def _submit_outbound(
+        self,
+        chat_id: int,
+        *,
+        kind: str,
+        message_id: Optional[int],
+        category: RequestCategory,
+        run: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Queue ``run`` on the chat's outbound queue and wait for its result.
+
+        Requests for one message share a lane and run in submission order;
+        new messages share a lane that sends the highest
+        :func:`~pokerapp.utils.rate_limiter.category_priority` first, so a
+        burst of countdown ticks cannot delay a turn prompt.  Lanes run
+        concurrently.  A newer edit, markup edit or delete of a message
+        replaces the same kind of request queued right before it, and every
+        caller receives the result of the request that was actually sent.
+        """
+
+        loop = asyncio.get_running_loop()
+        chat_key = int(chat_id)
+        outbox = self._outboxes.get(chat_key)
+        if outbox is None:
+            outbox = self._outboxes[chat_key] = _ChatOutbox()
+
+        lane_key = None if message_id is None else int(message_id)
+        lane = outbox.lanes.get(lane_key)
+        if lane is None:
+            lane = outbox.lanes[lane_key] = _OutboundLane(
+                by_priority=lane_key is None
+            )
+
+        priority = category_priority(category)
+        last = lane.queue[-1] if lane.queue else None
+        if (
+            kind in self._COALESCED_KINDS
+            and last is not None
+            and last.kind == kind
+        ):
+            request = last
+            request.run = run
+            if priority < request.priority:
+                request.priority = priority
+                request.category = category
+            self._log_event(
+                "OUTBOUND_COALESCED",
+                level=logging.DEBUG,
+                context=self._merge_context(
+                    None,
+                    chat_id=chat_id,
+                    message_id=message_id,
+                    category=category,
+                    kind=kind,
+                    waiters=len(request.futures) + 1,
+                ),
+            )
+        else:
+            request = _OutboundRequest(
+                priority, next(self._outbound_sequence), kind, category, run
+            )
+            lane.queue.append(request)
+
+        future: "asyncio.Future[Any]" = loop.create_future()
+        request.futures.append(future)
+        if lane.drain_task is None or lane.drain_task.done():
+            lane.drain_task = asyncio.create_task(
+                self._drain_lane(chat_key, lane_key, outbox, lane)
+            )
+        return await future
+
+    async def _drain_lane(
+        self,
+        chat_id: int,
+        lane_key: Optional[int],
+        outbox: _ChatOutbox,
+        lane: _OutboundLane,
+    ) -> None:
+        """Run the lane's queued requests until none are left.
+
+        With a shared rate limiter the lane takes the next request's permit
+        before picking it, at the priority of the most urgent request queued,
+        so whatever is most urgent once the permit arrives is sent.
+        """
+
+        try:
+            while lane.queue:
+                permit_held = False
+                if (
+                    self._rate_limiter is not None
+                    and lane.next_request().kind in self._PERMIT_KINDS
+                ):
+                    urgent = lane.most_urgent()
+                    waited = await self._rate_limiter.acquire(
+                        chat_id,
+                        message_id=lane_key,
+                        category=urgent.category,
+                    )
+                    permit_held = True
+                    if waited > 0:
+                        self._log_event(
+                            "THROTTLE_PERMIT",
+                            context=self._merge_context(
+                                None,
+                                chat_id=chat_id,
+                                message_id=lane_key,
+                                category=urgent.category,
+                                delay=waited,
+                                throttle_scope="shared",
+                            ),
+                            include_debug_trace=True,
+                        )
+
+                request = lane.next_request()
+                lane.queue.remove(request)
+                if all(future.done() for future in request.futures):
+                    continue
+                token = _OUTBOUND_PERMIT_HELD.set(permit_held)
+                try:
+                    result = await request.run()
+                except Exception as exc:
+                    for future in request.futures:
+                        if not future.done():
+                            future.set_exception(exc)
+                except asyncio.CancelledError:
+                    for future in request.futures:
+                        future.cancel()
+                    raise
+                else:
+                    for future in request.futures:
+                        if not future.done():
+                            future.set_result(result)
+                finally:
+                    _OUTBOUND_PERMIT_HELD.reset(token)
+        finally:
+            for request in lane.queue:
+                for future in request.futures:
+                    future.cancel()
+            lane.queue.clear()
+            if outbox.lanes.get(lane_key) is lane:
+                del outbox.lanes[lane_key]
+            if not outbox.lanes and self._outboxes.get(chat_id) is outbox:
+                del self._outboxes[chat_id]
+
     async def _call_with_retry(
         self,
         *,
@@ -760,8 +1000,8 @@ class MessagingService:
     ) -> Any:
         """Send a Telegram message and register its content hash.
 
-        The method acquires a per-chat lock so that concurrent sends to the
-        same chat remain ordered.  Once the Telegram API call succeeds the new
+        The request waits in the chat's outbound queue and sends to the same
+        chat of equal priority keep their order.  Once the Telegram API call succeeds the new
         ``message_id`` and its content hash are recorded, allowing future edits
         to be deduplicated.
         """
@@ -783,67 +1023,76 @@ class MessagingService:
             method=telegram_method,
         )
 
-        lock = await self._acquire_lock(chat_id, 0)
-        async with lock:
-            await self._throttle_send(
-                chat_id,
-                method=telegram_method,
-                context=base_context,
-            )
-            trace_telegram_api_call(
-                "sendMessage",
-                chat_id=chat_id,
-                message_id=None,
-                text=text,
-                reply_markup=reply_markup,
-            )
-            result = await self._call_with_retry(
-                chat_id=chat_id,
-                message_id=None,
-                method=telegram_method,
-                operation_name="send_message",
-                critical=True,
-                call=lambda: self._bot.send_message(
+        async def _send() -> Any:
+            lock = await self._acquire_lock(chat_id, 0)
+            async with lock:
+                await self._throttle_send(
+                    chat_id,
+                    method=telegram_method,
+                    context=base_context,
+                )
+                trace_telegram_api_call(
+                    "sendMessage",
                     chat_id=chat_id,
+                    message_id=None,
                     text=text,
                     reply_markup=reply_markup,
-                    **params,
-                ),
-                throttle=lambda: self._throttle_send(
-                    chat_id,
+                )
+                result = await self._call_with_retry(
+                    chat_id=chat_id,
+                    message_id=None,
                     method=telegram_method,
-                    context=base_context,
-                ),
-                context=base_context,
-            )
-            self._register_send_time(chat_id)
-
-            message_id = getattr(result, "message_id", None)
-            if message_id is not None:
-                content_hash = self._content_hash(text, reply_markup)
-                await self._record_message_sent(chat_id, message_id)
-                await self._remember_content(chat_id, message_id, content_hash)
-                if text is not None:
-                    text_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
-                    await self._set_last_text_hash(message_id, text_hash)
-                self._log_api_call(
-                    telegram_method,
-                    context=self._merge_context(
-                        base_context,
-                        message_id=message_id,
-                        content_hash=content_hash,
+                    operation_name="send_message",
+                    critical=True,
+                    call=lambda: self._bot.send_message(
+                        chat_id=chat_id,
+                        text=text,
+                        reply_markup=reply_markup,
+                        **params,
                     ),
-                )
-            else:
-                self._log_api_call(
-                    telegram_method,
-                    context=self._merge_context(
-                        base_context,
-                        content_hash=self._content_hash(text, reply_markup),
+                    throttle=lambda: self._throttle_send(
+                        chat_id,
+                        method=telegram_method,
+                        context=base_context,
                     ),
+                    context=base_context,
                 )
+                self._register_send_time(chat_id)
 
-            return result
+                message_id = getattr(result, "message_id", None)
+                if message_id is not None:
+                    content_hash = self._content_hash(text, reply_markup)
+                    await self._record_message_sent(chat_id, message_id)
+                    await self._remember_content(chat_id, message_id, content_hash)
+                    if text is not None:
+                        text_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
+                        await self._set_last_text_hash(message_id, text_hash)
+                    self._log_api_call(
+                        telegram_method,
+                        context=self._merge_context(
+                            base_context,
+                            message_id=message_id,
+                            content_hash=content_hash,
+                        ),
+                    )
+                else:
+                    self._log_api_call(
+                        telegram_method,
+                        context=self._merge_context(
+                            base_context,
+                            content_hash=self._content_hash(text, reply_markup),
+                        ),
+                    )
+
+                return result
+
+        return await self._submit_outbound(
+            chat_id,
+            kind="send",
+            message_id=None,
+            category=request_category,
+            run=_send,
+        )
 
     async def send_photo(
         self,
@@ -874,52 +1123,61 @@ class MessagingService:
             method=telegram_method,
         )
 
-        lock = await self._acquire_lock(chat_id, 0)
-        async with lock:
-            await self._throttle_send(
-                chat_id,
-                method=telegram_method,
-                context=base_context,
-            )
-            trace_telegram_api_call(
-                "sendPhoto",
-                chat_id=chat_id,
-                message_id=None,
-                text=caption,
-            )
-            result = await self._call_with_retry(
-                chat_id=chat_id,
-                message_id=None,
-                method=telegram_method,
-                operation_name="send_photo",
-                critical=True,
-                call=lambda: self._bot.send_photo(
-                    chat_id=chat_id,
-                    photo=photo,
-                    caption=caption,
-                    **params,
-                ),
-                throttle=lambda: self._throttle_send(
+        async def _send() -> Any:
+            lock = await self._acquire_lock(chat_id, 0)
+            async with lock:
+                await self._throttle_send(
                     chat_id,
                     method=telegram_method,
                     context=base_context,
-                ),
-                context=base_context,
-            )
-            self._register_send_time(chat_id)
+                )
+                trace_telegram_api_call(
+                    "sendPhoto",
+                    chat_id=chat_id,
+                    message_id=None,
+                    text=caption,
+                )
+                result = await self._call_with_retry(
+                    chat_id=chat_id,
+                    message_id=None,
+                    method=telegram_method,
+                    operation_name="send_photo",
+                    critical=True,
+                    call=lambda: self._bot.send_photo(
+                        chat_id=chat_id,
+                        photo=photo,
+                        caption=caption,
+                        **params,
+                    ),
+                    throttle=lambda: self._throttle_send(
+                        chat_id,
+                        method=telegram_method,
+                        context=base_context,
+                    ),
+                    context=base_context,
+                )
+                self._register_send_time(chat_id)
 
-            message_id = getattr(result, "message_id", None)
-            if message_id is not None:
-                await self._record_message_sent(chat_id, message_id)
-            self._log_api_call(
-                telegram_method,
-                context=self._merge_context(
-                    base_context,
-                    message_id=message_id,
-                    content_hash="-",
-                ),
-            )
-            return result
+                message_id = getattr(result, "message_id", None)
+                if message_id is not None:
+                    await self._record_message_sent(chat_id, message_id)
+                self._log_api_call(
+                    telegram_method,
+                    context=self._merge_context(
+                        base_context,
+                        message_id=message_id,
+                        content_hash="-",
+                    ),
+                )
+                return result
+
+        return await self._submit_outbound(
+            chat_id,
+            kind="photo",
+            message_id=None,
+            category=request_category,
+            run=_send,
+        )
 
     async def edit_message_text(
         self,
@@ -1143,7 +1401,15 @@ class MessagingService:
                 continue
 
             try:
-                result = await self._apply_edit(chat_id, message_id, payload)
+                result = await self._submit_outbound(
+                    chat_id,
+                    kind="edit",
+                    message_id=message_id,
+                    category=payload.request_category,
+                    run=functools.partial(
+                        self._apply_edit, chat_id, message_id, payload
+                    ),
+                )
             except Exception as exc:
                 for waiter in waiters:
                     if not waiter.future.done():
@@ -1512,57 +1778,66 @@ class MessagingService:
         ):
             return True
 
-        lock = await self._acquire_lock(chat_id, message_id)
-        async with lock:
-            if not force and await self._should_skip(chat_id, message_id, content_hash):
-                await self._log_skip(
-                    chat_id=chat_id,
-                    message_id=message_id,
-                    category=request_category,
-                    reason="hash_match",
-                    context=base_context,
-                )
-                return True
+        async def _edit() -> bool:
+            lock = await self._acquire_lock(chat_id, message_id)
+            async with lock:
+                if not force and await self._should_skip(chat_id, message_id, content_hash):
+                    await self._log_skip(
+                        chat_id=chat_id,
+                        message_id=message_id,
+                        category=request_category,
+                        reason="hash_match",
+                        context=base_context,
+                    )
+                    return True
 
-            try:
-                await self._bot.edit_message_reply_markup(
-                    chat_id=chat_id,
-                    message_id=message_id,
-                    reply_markup=reply_markup,
-                    **params,
-                )
-                await self._clear_edit_failure(chat_id, message_id)
-            except Exception as exc:  # pragma: no cover - exception path
-                handled = await self._handle_bad_request(
-                    exc,
-                    chat_id=chat_id,
-                    message_id=message_id,
-                    content_hash=content_hash,
-                    category=request_category,
-                    context=base_context,
-                )
-                if handled is not None:
-                    return bool(handled)
-                self._log_event(
-                    "API_ERROR",
-                    level=logging.ERROR,
+                try:
+                    await self._bot.edit_message_reply_markup(
+                        chat_id=chat_id,
+                        message_id=message_id,
+                        reply_markup=reply_markup,
+                        **params,
+                    )
+                    await self._clear_edit_failure(chat_id, message_id)
+                except Exception as exc:  # pragma: no cover - exception path
+                    handled = await self._handle_bad_request(
+                        exc,
+                        chat_id=chat_id,
+                        message_id=message_id,
+                        content_hash=content_hash,
+                        category=request_category,
+                        context=base_context,
+                    )
+                    if handled is not None:
+                        return bool(handled)
+                    self._log_event(
+                        "API_ERROR",
+                        level=logging.ERROR,
+                        context=self._merge_context(
+                            base_context,
+                            error_type=type(exc).__name__,
+                        ),
+                        include_debug_trace=True,
+                    )
+                    raise
+
+                await self._remember_content(chat_id, message_id, content_hash)
+                self._log_api_call(
+                    telegram_method,
                     context=self._merge_context(
                         base_context,
-                        error_type=type(exc).__name__,
+                        content_hash=content_hash,
                     ),
-                    include_debug_trace=True,
                 )
-                raise
+                return True
 
-            await self._remember_content(chat_id, message_id, content_hash)
-            self._log_api_call(
-                telegram_method,
-                context=self._merge_context(
-                    base_context,
-                    content_hash=content_hash,
-                ),
-            )
-            return True
+        return await self._submit_outbound(
+            chat_id,
+            kind="markup",
+            message_id=message_id,
+            category=request_category,
+            run=_edit,
+        )
 
     async def delete_message(
         self,
@@ -1624,92 +1899,102 @@ class MessagingService:
         ):
             return False
 
-        lock = await self._acquire_lock(chat_id, message_id)
-        suppression_handled = False
-        async with lock:
-            result: Any = False
-            deletion_successful = False
-            try:
-                trace_telegram_api_call(
-                    telegram_method,
-                    chat_id=chat_id,
-                    message_id=message_id,
-                )
-
-                async def _perform_delete() -> Any:
-                    return await self._bot.delete_message(
+        async def _delete() -> Tuple[Any, bool]:
+            lock = await self._acquire_lock(chat_id, message_id)
+            suppression_handled = False
+            async with lock:
+                result: Any = False
+                deletion_successful = False
+                try:
+                    trace_telegram_api_call(
+                        telegram_method,
                         chat_id=chat_id,
                         message_id=message_id,
-                        **params,
                     )
 
-                if self._retry_manager is not None:
-                    result = await self._retry_manager.retry_telegram_call(
-                        "delete_message",
-                        critical=False,
-                    )(_perform_delete)()
-                else:
-                    result = await _perform_delete()
-                deletion_successful = bool(result)
-                success_context = self._merge_context(
-                    base_context,
-                    deletion_status="success",
-                )
-                self._logger.debug("Deletion successful", extra=dict(success_context))
-            except Exception as exc:
-                exc_str = str(exc).lower()
-                failure_context = self._merge_context(
-                    base_context,
-                    deletion_status="failure",
-                    error=str(exc),
-                    error_type=type(exc).__name__,
-                )
-                if (
-                    message_age is not None
-                    and message_age < 5
-                    and normalized_context == "routine_cleanup"
-                ):
-                    self._logger.info(
-                        "Early deletion attempt - message may still be sending",
-                        extra=dict(
-                            base_context,
-                            exception=exc_str,
-                            handling="suppressed_early_deletion",
-                        ),
+                    async def _perform_delete() -> Any:
+                        return await self._bot.delete_message(
+                            chat_id=chat_id,
+                            message_id=message_id,
+                            **params,
+                        )
+
+                    if self._retry_manager is not None:
+                        result = await self._retry_manager.retry_telegram_call(
+                            "delete_message",
+                            critical=False,
+                        )(_perform_delete)()
+                    else:
+                        result = await _perform_delete()
+                    deletion_successful = bool(result)
+                    success_context = self._merge_context(
+                        base_context,
+                        deletion_status="success",
+                    )
+                    self._logger.debug("Deletion successful", extra=dict(success_context))
+                except Exception as exc:
+                    exc_str = str(exc).lower()
+                    failure_context = self._merge_context(
+                        base_context,
+                        deletion_status="failure",
+                        error=str(exc),
+                        error_type=type(exc).__name__,
                     )
-                    suppression_handled = True
-                elif message_age is not None and message_age > 300:
                     if (
-                        "message to delete not found" in exc_str
-                        or "message can't be deleted" in exc_str
-                        or "message can’t be deleted" in exc_str
+                        message_age is not None
+                        and message_age < 5
+                        and normalized_context == "routine_cleanup"
                     ):
-                        self._logger.debug(
-                            "Stale message deletion attempt",
+                        self._logger.info(
+                            "Early deletion attempt - message may still be sending",
                             extra=dict(
                                 base_context,
                                 exception=exc_str,
-                                handling="suppressed_stale_deletion",
+                                handling="suppressed_early_deletion",
                             ),
                         )
                         suppression_handled = True
-                if not suppression_handled:
-                    self._logger.warning(
-                        "Deletion failed",
-                        extra=dict(
-                            failure_context,
-                            exception=exc_str,
-                            handling="genuine_failure",
-                        ),
-                    )
-                    raise
-            finally:
-                await self._forget_content(chat_id, message_id)
-                if deletion_successful:
-                    await self._pop_last_text_hash(message_id)
-                    await self._clear_message_sent_record(chat_id, message_id)
-                else:
-                    await self._unmark_message_deleted(message_id)
+                    elif message_age is not None and message_age > 300:
+                        if (
+                            "message to delete not found" in exc_str
+                            or "message can't be deleted" in exc_str
+                            or "message can’t be deleted" in exc_str
+                        ):
+                            self._logger.debug(
+                                "Stale message deletion attempt",
+                                extra=dict(
+                                    base_context,
+                                    exception=exc_str,
+                                    handling="suppressed_stale_deletion",
+                                ),
+                            )
+                            suppression_handled = True
+                    if not suppression_handled:
+                        self._logger.warning(
+                            "Deletion failed",
+                            extra=dict(
+                                failure_context,
+                                exception=exc_str,
+                                handling="genuine_failure",
+                            ),
+                        )
+                        raise
+                finally:
+                    await self._forget_content(chat_id, message_id)
+                    if deletion_successful:
+                        await self._pop_last_text_hash(message_id)
+                        await self._clear_message_sent_record(chat_id, message_id)
+                    else:
+                        await self._unmark_message_deleted(message_id)
+            return result, suppression_handled
+
+        result, suppression_handled = await self._submit_outbound(
+            chat_id,
+            kind="delete",
+            message_id=message_id,
+            category=request_category,
+            run=_delete,
+        )
 
         state = self._pending_edits.pop(key, None)
         if state is not None:
@@ -1973,56 +2258,23 @@ class MessagingService:
 
     @staticmethod
     def _content_hash(text: Optional[str], reply_markup: Any) -> str:
-        serialized_markup = MessagingService._serialize_markup(reply_markup)
-        text_component = text or ""
-        payload = json.dumps(
-            {"text": text_component, "reply_markup": serialized_markup},
-            sort_keys=True,
-            ensure_ascii=False,
-        )
-        return hashlib.md5(payload.encode("utf-8")).hexdigest()
+        return content_fingerprint(text, reply_markup)
 
     def _compute_markup_hash(self, reply_markup: Any) -> Optional[str]:
         if reply_markup is None:
             return None
         try:
-            serialized = self._serialize_markup(reply_markup)
-            payload = json.dumps(
-                serialized,
-                sort_keys=True,
-                ensure_ascii=False,
-            )
+            return markup_fingerprint(reply_markup)
         except Exception:
             self._logger.debug(
                 "Failed to serialise reply markup for hashing; skipping hash",
                 exc_info=True,
             )
             return None
-        return hashlib.md5(payload.encode("utf-8")).hexdigest()
 
     @staticmethod
     def _serialize_markup(markup: Any) -> Any:
-        if markup is None:
-            return None
-        for attr in ("model_dump", "to_python", "to_dict"):
-            serializer = getattr(markup, attr, None)
-            if callable(serializer):
-                try:
-                    return serializer()
-                except TypeError:
-                    continue
-        try:
-            return json.loads(markup.model_dump_json())  # type: ignore[attr-defined]
-        except Exception:
-            pass
-        if isinstance(markup, dict):
-            return {
-                key: MessagingService._serialize_markup(markup[key])
-                for key in sorted(markup)
-            }
-        if isinstance(markup, (list, tuple)):
-            return [MessagingService._serialize_markup(item) for item in markup]
-        return repr(markup)
+        return serialize_markup(markup)
 
     def _log_api_call(
         self,
@@ -0,0 +1,275 @@
+"""Hierarchical token-bucket rate limiting for outgoing Telegram requests.
+
+A single :class:`TelegramPermitLimiter` is shared by every layer that talks to
+Telegram so they draw from one budget: a global bucket (Telegram allows about
+30 messages per second per bot), a bucket per chat for new messages (20 per
+minute in groups) and a minimum spacing between edits of the same message.
+
+Callers ``await`` a permit. Waiting requests are granted in priority order
+(engine-critical, then turn, then general traffic, then countdown ticks);
+requests blocked only by their own chat or message do not hold back other
+chats.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from cachetools import LRUCache
+
+from pokerapp.config import DEFAULT_RATE_LIMIT_PER_MINUTE
+from pokerapp.metrics import TELEGRAM_RATE_LIMIT_QUEUE_DEPTH, TELEGRAM_RATE_LIMIT_WAIT
+from pokerapp.utils.request_metrics import RequestCategory
+
+
+logger = logging.getLogger(__name__)
+
+#: Permit priorities, highest first. Metric labels use these names.
+PRIORITY_NAMES: Tuple[str, ...] = ("engine_critical", "turn", "general", "countdown")
+
+_CATEGORY_PRIORITY: Dict[str, int] = {
+    RequestCategory.ENGINE_CRITICAL.value: 0,
+    RequestCategory.STAGE.value: 0,
+    RequestCategory.START_GAME.value: 0,
+    RequestCategory.TURN.value: 1,
+    RequestCategory.STAGE_PROGRESS.value: 1,
+    RequestCategory.ANCHOR.value: 1,
+    RequestCategory.COUNTDOWN.value: 3,
+}
+_GENERAL_PRIORITY = 2
+
+
+def category_priority(category: object) -> int:
+    """Return the permit priority (``0`` is highest) for ``category``."""
+
+    value = getattr(category, "value", category)
+    return _CATEGORY_PRIORITY.get(str(value), _GENERAL_PRIORITY)
+
+
+@dataclass(slots=True)
+class _TokenBucket:
+    rate: float
+    capacity: float
+    tokens: float
+    updated: float
+
+    def delay(self, now: float) -> float:
+        """Seconds until one token is available."""
+
+        if now > self.updated:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1.0
+
+
+@dataclass(order=True, slots=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    chat_id: int = field(compare=False)
+    message_id: Optional[int] = field(compare=False)
+    enqueued: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class TelegramPermitLimiter:
+    """Hand out Telegram request permits from shared token buckets."""
+
+    def __init__(
+        self,
+        *,
+        global_per_second: float = 30.0,
+        chat_per_minute: float = DEFAULT_RATE_LIMIT_PER_MINUTE,
+        edit_spacing: float = 1.0,
+        max_tracked_chats: int = 4096,
+        logger_: Optional[logging.Logger] = None,
+    ) -> None:
+        if global_per_second <= 0 or chat_per_minute <= 0:
+            raise ValueError("rate limits must be positive")
+        self._logger = logger_ or logger
+        self._global_rate = float(global_per_second)
+        self._chat_rate = float(chat_per_minute) / 60.0
+        self._chat_capacity = max(1.0, float(chat_per_minute))
+        self._edit_spacing = max(0.0, float(edit_spacing))
+        self._global: Optional[_TokenBucket] = None
+        self._chats: LRUCache[int, _TokenBucket] = LRUCache(maxsize=max_tracked_chats)
+        self._last_edit: LRUCache[Tuple[int, int], float] = LRUCache(
+            maxsize=max_tracked_chats * 4
+        )
+        self._waiters: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._granted = [0] * len(PRIORITY_NAMES)
+        self._waited = [0] * len(PRIORITY_NAMES)
+
+    async def acquire(
+        self,
+        chat_id: int,
+        *,
+        message_id: Optional[int] = None,
+        category: object = RequestCategory.GENERAL,
+    ) -> float:
+        """Wait for a permit to call Telegram for ``chat_id``.
+
+        ``message_id`` marks an edit, which is also spaced per message.
+        Returns the number of seconds spent waiting.
+        """
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        priority = category_priority(category)
+        chat_key = int(chat_id)
+        message_key = int(message_id) if message_id else None
+        if not self._waiters and self._grant_now(chat_key, message_key, now):
+            self._granted[priority] += 1
+            return 0.0
+
+        waiter = _Waiter(
+            priority,
+            next(self._sequence),
+            chat_key,
+            message_key,
+            now,
+            loop.create_future(),
+        )
+        heapq.heappush(self._waiters, waiter)
+        self._waited[priority] += 1
+        self._dispatch()
+        self._publish_depth()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.cancelled():
+                self._dispatch()
+                self._publish_depth()
+            raise
+        return loop.time() - now
+
+    def queue_depth(self) -> Dict[str, int]:
+        """Return the number of pending permits per priority name."""
+
+        depth = dict.fromkeys(PRIORITY_NAMES, 0)
+        for waiter in self._waiters:
+            if not waiter.future.done():
+                depth[PRIORITY_NAMES[waiter.priority]] += 1
+        return depth
+
+    def get_metrics(self) -> Dict[str, Dict[str, int]]:
+        return {
+            "queue_depth": self.queue_depth(),
+            "granted": dict(zip(PRIORITY_NAMES, self._granted)),
+            "waited": dict(zip(PRIORITY_NAMES, self._waited)),
+        }
+
+    def _chat_bucket(self, chat_id: int, now: float) -> _TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = _TokenBucket(
+                self._chat_rate, self._chat_capacity, self._chat_capacity, now
+            )
+            self._chats[chat_id] = bucket
+        return bucket
+
+    def _global_bucket(self, now: float) -> _TokenBucket:
+        if self._global is None:
+            self._global = _TokenBucket(
+                self._global_rate, self._global_rate, self._global_rate, now
+            )
+        return self._global
+
+    def _local_delay(
+        self, chat_id: int, message_id: Optional[int], now: float
+    ) -> float:
+        """Seconds until the chat (new message) or message (edit) may proceed."""
+
+        if message_id is None:
+            return self._chat_bucket(chat_id, now).delay(now)
+        last = self._last_edit.get((chat_id, message_id))
+        if last is None or not self._edit_spacing:
+            return 0.0
+        return max(0.0, last + self._edit_spacing - now)
+
+    def _grant_now(self, chat_id: int, message_id: Optional[int], now: float) -> bool:
+        if self._local_delay(chat_id, message_id, now) > 0:
+            return False
+        global_bucket = self._global_bucket(now)
+        if global_bucket.delay(now) > 0:
+            return False
+        global_bucket.take()
+        if message_id is None:
+            self._chat_bucket(chat_id, now).take()
+        else:
+            self._last_edit[(chat_id, message_id)] = now
+        return True
+
+    def _dispatch(self) -> None:
+        """Grant every waiter that fits the budget, in priority order."""
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._waiters:
+            return
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        next_check: Optional[float] = None
+        # A waiter stuck on its chat or message keeps lower priorities for
+        # the same target behind it; only an empty global bucket stops all.
+        blocked: Set[Tuple[int, Optional[int]]] = set()
+        pending: List[_Waiter] = []
+        global_wait = 0.0
+
+        for waiter in sorted(self._waiters):
+            if waiter.future.done():
+                continue
+            target = (waiter.chat_id, waiter.message_id)
+            if global_wait or target in blocked:
+                pending.append(waiter)
+                continue
+
+            delay = self._local_delay(waiter.chat_id, waiter.message_id, now)
+            if delay > 0:
+                blocked.add(target)
+            else:
+                global_wait = delay = self._global_bucket(now).delay(now)
+            if delay > 0:
+                pending.append(waiter)
+                next_check = delay if next_check is None else min(next_check, delay)
+                continue
+
+            self._grant_now(waiter.chat_id, waiter.message_id, now)
+            self._granted[waiter.priority] += 1
+            TELEGRAM_RATE_LIMIT_WAIT.labels(
+                priority=PRIORITY_NAMES[waiter.priority]
+            ).observe(now - waiter.enqueued)
+            waiter.future.set_result(None)
+
+        heapq.heapify(pending)
+        self._waiters = pending
+        if pending and next_check is not None:
+            self._timer = loop.call_later(next_check, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+        self._publish_depth()
+
+    def _publish_depth(self) -> None:
+        for name, depth in self.queue_depth().items():
+            TELEGRAM_RATE_LIMIT_QUEUE_DEPTH.labels(priority=name).set(depth)
+
+
+__all__ = ["PRIORITY_NAMES", "TelegramPermitLimiter", "category_priority"]
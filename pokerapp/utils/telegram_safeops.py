@@ -17,6 +17,7 @@ from telegram.constants import ParseMode
 from telegram.error import BadRequest, NetworkError, RetryAfter, TelegramError, TimedOut
 
 from pokerapp.entities import ChatId, MessageId
+from pokerapp.utils.rate_limiter import TelegramPermitLimiter
 from pokerapp.utils.request_metrics import RequestCategory
 from cachetools import LRUCache
 
@@ -40,6 +41,7 @@ class TelegramSafeOps:
         base_delay: float,
         max_delay: float,
         backoff_multiplier: float,
+        rate_limiter: Optional[TelegramPermitLimiter] = None,
     ) -> None:
         if view is None:
             raise ValueError("view dependency must be provided")
@@ -56,6 +58,9 @@ class TelegramSafeOps:
             maxsize=1024
         )
         self._throttle_lock = asyncio.Lock()
+        # The shared limiter is consulted by the messaging layer right before
+        # the request goes out, so edit spacing is not applied twice here.
+        self._rate_limiter = rate_limiter
 
     async def edit_message_text(
         self,
@@ -76,13 +81,17 @@ class TelegramSafeOps:
         Args:
             from_countdown: When ``True`` the countdown subsystem initiated the
                 edit and we bypass throttling delays so the timer task cannot be
-                starved behind other chat operations.  This flag is best-effort
-                and preserves the existing retry and replacement behaviour.
+                starved behind other chat operations.  The edit is tagged as a
+                countdown request so it yields to turn and engine traffic.  This
+                flag is best-effort and preserves the existing retry and
+                replacement behaviour.
         """
 
         cache_key: Optional[tuple[ChatId, MessageId]] = None
 
-        if from_countdown:
+        if from_countdown and request_category is RequestCategory.GENERAL:
+            request_category = RequestCategory.COUNTDOWN
+        if from_countdown and self._rate_limiter is None:
             self._logger.debug(
                 "Countdown edit bypassing message throttle",
                 extra=self._build_extra(
@@ -116,7 +125,7 @@ class TelegramSafeOps:
                         ),
                     )
                     return message_id
-            if not from_countdown:
+            if not from_countdown and self._rate_limiter is None:
                 await self._apply_edit_throttle(
                     cache_key,
                     chat_id=chat_id,
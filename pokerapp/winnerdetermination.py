@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 
 import enum
-from itertools import combinations
-from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from itertools import combinations, combinations_with_replacement
+from typing import Dict, Generic, Hashable, List, Mapping, Optional, Tuple, TypeVar
 
 from pokerapp.cards import Card, Cards
 from pokerapp.entities import Score
@@ -10,6 +11,17 @@ from pokerapp.config import get_game_constants
 
 HAND_RANK_MULTIPLIER = 15**5
 
+EVALUATOR_LOOKUP = "lookup"
+EVALUATOR_COMBINATIONS = "combinations"
+EVALUATORS: Tuple[str, ...] = (EVALUATOR_LOOKUP, EVALUATOR_COMBINATIONS)
+
+# Each card value maps to a distinct prime so that the product of a hand's
+# values identifies its value multiset regardless of order.
+_VALUE_PRIMES: Dict[int, int] = {
+    2: 2, 3: 3, 4: 5, 5: 7, 6: 11, 7: 13, 8: 17,
+    9: 19, 10: 23, 11: 29, 12: 31, 13: 37, 14: 41,
+}
+
 
 _CONSTANTS = get_game_constants()
 _HANDS_RESOURCE = _CONSTANTS.hands
@@ -53,22 +65,160 @@ class HandsOfPoker(enum.Enum):
 
 HAND_NAMES_TRANSLATIONS: Dict[HandsOfPoker, Dict[str, str]] = _load_hand_translations()
 
+# (score, hand type, values of the best five cards sorted descending)
+_TableEntry = Tuple[Score, HandsOfPoker, Tuple[int, ...]]
+
+
+class _RankTables:
+    """
+    جدول‌های ارزیابی سریع دست‌های ۵ تا ۷ کارتی.
+
+    ``unsuited`` با حاصل‌ضرب اعداد اول ارزش کارت‌ها کلیدگذاری شده و
+    بهترین دست بدون در نظر گرفتن خال را نگه می‌دارد. همه دست‌های ۵ کارتی
+    از ابتدا محاسبه می‌شوند و ورودی‌های ۶ و ۷ کارتی در اولین مراجعه از
+    روی همان جدول ساخته و ذخیره می‌شوند. ``flush`` با بیت‌ماسک ارزش
+    کارت‌های هم‌خال (۵ تا ۷ کارت) کلیدگذاری شده است.
+    """
+
+    _instance: Optional["_RankTables"] = None
+
+    def __init__(self) -> None:
+        self.unsuited: Dict[int, _TableEntry] = {}
+        self.flush: Dict[int, _TableEntry] = {}
+        self._build_unsuited()
+        self._build_flush()
+
+    @classmethod
+    def get(cls) -> "_RankTables":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def unsuited_entry(self, values: List[int], product: int) -> Optional[_TableEntry]:
+        """بهترین دست برای چندمجموعه ارزش‌ها؛ ``None`` برای ورودی نامعتبر."""
+        entry = self.unsuited.get(product)
+        if entry is not None or len(values) <= 5:
+            return entry
+        candidates: List[_TableEntry] = []
+        for value in set(values):
+            rest = list(values)
+            rest.remove(value)
+            sub_entry = self.unsuited_entry(rest, product // _VALUE_PRIMES[value])
+            if sub_entry is None:
+                return None
+            candidates.append(sub_entry)
+        # امتیاز یکتاست، پس مقایسه تاپل‌ها فقط بر اساس امتیاز انجام می‌شود.
+        entry = max(candidates)
+        self.unsuited[product] = entry
+        return entry
+
+    def _build_unsuited(self) -> None:
+        table = self.unsuited
+        for values in combinations_with_replacement(range(14, 1, -1), 5):
+            # مقادیر نزولی مرتب‌اند؛ پنج کارت هم‌ارزش ممکن نیست.
+            if values[0] == values[4]:
+                continue
+            product = 1
+            for value in values:
+                product *= _VALUE_PRIMES[value]
+            score, hand_type = WinnerDetermination._score_sorted_values(
+                list(values), is_flush=False
+            )
+            table[product] = (score, hand_type, values)
+
+    def _build_flush(self) -> None:
+        table = self.flush
+        values_desc = range(14, 1, -1)
+        for size in (5, 6, 7):
+            for values in combinations(values_desc, size):
+                mask = 0
+                for value in values:
+                    mask |= 1 << value
+                if size == 5:
+                    score, hand_type = WinnerDetermination._score_sorted_values(
+                        list(values), is_flush=True
+                    )
+                    table[mask] = (score, hand_type, values)
+                    continue
+                table[mask] = max([table[mask & ~(1 << value)] for value in values])
+
+
+_PlayerKey = TypeVar("_PlayerKey", bound=Hashable)
+
+
+@dataclass(frozen=True)
+class ShowdownHand(Generic[_PlayerKey]):
+    """نتیجه ارزیابی دست یک بازیکن در شودان."""
+
+    key: _PlayerKey
+    hand_type: HandsOfPoker
+    score: Score
+    hand_cards: Tuple[Card, ...]
+
+
+@dataclass(frozen=True)
+class ShowdownResult(Generic[_PlayerKey]):
+    """
+    نتیجه شودان: ``hands`` به ترتیب ورودی و ``tie_groups`` گروه‌های
+    بازیکنان هم‌امتیاز از بهترین به بدترین (اعضای هر گروه به ترتیب ورودی).
+    """
+
+    hands: Dict[_PlayerKey, ShowdownHand[_PlayerKey]]
+    tie_groups: Tuple[Tuple[_PlayerKey, ...], ...]
+
+    def rank_of(self, key: _PlayerKey) -> int:
+        """شماره گروه بازیکن؛ صفر یعنی بهترین دست."""
+        for rank, group in enumerate(self.tie_groups):
+            if key in group:
+                return rank
+        raise KeyError(key)
+
+
 class WinnerDetermination:
     """
     این کلاس مسئولیت تعیین ارزش و امتیاز دست‌های پوکر را بر عهده دارد.
     ترکیبی بهینه از هر دو نسخه قبلی و فعلی.
+
+    ``evaluator`` روش ارزیابی را انتخاب می‌کند: ``"lookup"`` (پیش‌فرض) از
+    جدول‌های از پیش محاسبه‌شده استفاده می‌کند و ``"combinations"`` همه
+    ترکیب‌های ۵ کارتی را بررسی می‌کند. خروجی هر دو روش یکسان است.
     """
 
+    def __init__(self, evaluator: str = EVALUATOR_LOOKUP) -> None:
+        if evaluator not in EVALUATORS:
+            raise ValueError(
+                f"Unknown hand evaluator {evaluator!r}; expected one of {EVALUATORS}"
+            )
+        self._evaluator = evaluator
+        self._tables: Optional[_RankTables] = (
+            _RankTables.get() if evaluator == EVALUATOR_LOOKUP else None
+        )
+
+    @property
+    def evaluator(self) -> str:
+        return self._evaluator
+
     def get_hand_value(self, player_cards: Cards, table_cards: Cards) -> Tuple[HandsOfPoker, Score, Tuple[Card, ...]]:
         """
         متد اصلی و عمومی کلاس.
         کارت‌های بازیکن و میز را گرفته، بهترین دست ۵ کارتی را پیدا کرده
         و (نوع دست، بالاترین امتیاز، کارت‌های آن دست) را برمی‌گرداند.
         """
-        all_cards = player_cards + table_cards
+        all_cards = list(player_cards) + list(table_cards)
         if len(all_cards) < 5:
             return HandsOfPoker.HIGH_CARD, 0, tuple()
 
+        if self._tables is not None and len(all_cards) <= 7:
+            result = self._lookup_hand_value(all_cards)
+            if result is not None:
+                return result
+
+        return self._combinations_hand_value(all_cards)
+
+    def _combinations_hand_value(
+        self, all_cards: List[Card]
+    ) -> Tuple[HandsOfPoker, Score, Tuple[Card, ...]]:
+        """ارزیابی مرجع: بررسی تمام ترکیب‌های ۵ کارتی."""
         possible_hands = list(combinations(all_cards, 5))
 
         max_score = 0
@@ -88,6 +238,122 @@ class WinnerDetermination:
         # برگرداندن بهترین دست ممکن از بین تمام ترکیب‌ها
         return best_hand_type, max_score, best_hand_cards
 
+    def _lookup_hand_value(
+        self, all_cards: List[Card]
+    ) -> Optional[Tuple[HandsOfPoker, Score, Tuple[Card, ...]]]:
+        """
+        ارزیابی ۵ تا ۷ کارت با جدول‌های از پیش محاسبه‌شده.
+
+        برای ورودی نامعتبر (مثلاً کارت تکراری) ``None`` برمی‌گرداند تا
+        ارزیابی مرجع استفاده شود.
+        """
+        values = [card.value for card in all_cards]
+        suits = [card.suit for card in all_cards]
+
+        product = 1
+        for value in values:
+            product *= _VALUE_PRIMES[value]
+        return self._lookup_from_parts(all_cards, values, suits, product)
+
+    def _lookup_from_parts(
+        self,
+        all_cards: List[Card],
+        values: List[int],
+        suits: List[str],
+        product: int,
+    ) -> Optional[Tuple[HandsOfPoker, Score, Tuple[Card, ...]]]:
+        tables = self._tables
+        entry = tables.unsuited_entry(values, product)
+        if entry is None:
+            return None
+
+        flush_suit = None
+        for suit in set(suits):
+            if suits.count(suit) >= 5:
+                flush_suit = suit
+                break
+
+        if flush_suit is not None:
+            mask = 0
+            suited_count = 0
+            for value, suit in zip(values, suits):
+                if suit == flush_suit:
+                    mask |= 1 << value
+                    suited_count += 1
+            if bin(mask).count("1") != suited_count:
+                return None
+            flush_entry = tables.flush[mask]
+            if flush_entry[0] > entry[0]:
+                entry = flush_entry
+            else:
+                flush_suit = None
+
+        score, hand_type, best_values = entry
+        # انتخاب کارت‌ها مانند ارزیابی مرجع: از هر ارزش، اولین کارت‌ها
+        # به ترتیب ورودی، سپس مرتب‌سازی پایدار نزولی بر اساس ارزش.
+        needed: Dict[int, int] = {}
+        for value in best_values:
+            needed[value] = needed.get(value, 0) + 1
+        chosen: List[Tuple[int, Card]] = []
+        for card, value, suit in zip(all_cards, values, suits):
+            if flush_suit is not None and suit != flush_suit:
+                continue
+            if needed.get(value, 0) > 0:
+                needed[value] -= 1
+                chosen.append((value, card))
+        chosen.sort(key=lambda item: item[0], reverse=True)
+        return hand_type, score, tuple(card for _, card in chosen)
+
+    def evaluate_showdown(
+        self,
+        board: Cards,
+        hole_cards_by_player: Mapping[_PlayerKey, Cards],
+    ) -> "ShowdownResult[_PlayerKey]":
+        """
+        دست همه بازیکنان را با یک بار پردازش کارت‌های میز ارزیابی می‌کند.
+
+        خروجی شامل نتیجه هر بازیکن (به ترتیب ورودی) و گروه‌های مساوی
+        مرتب‌شده از بهترین به بدترین است.
+        """
+        board_cards = list(board)
+        board_values = [card.value for card in board_cards]
+        board_suits = [card.suit for card in board_cards]
+        board_product = 1
+        for value in board_values:
+            board_product *= _VALUE_PRIMES[value]
+
+        hands: Dict[_PlayerKey, ShowdownHand[_PlayerKey]] = {}
+        for key, hole_cards in hole_cards_by_player.items():
+            hole = list(hole_cards)
+            all_cards = hole + board_cards
+            result = None
+            if self._tables is not None and 5 <= len(all_cards) <= 7:
+                hole_values = [card.value for card in hole]
+                product = board_product
+                for value in hole_values:
+                    product *= _VALUE_PRIMES[value]
+                result = self._lookup_from_parts(
+                    all_cards,
+                    hole_values + board_values,
+                    [card.suit for card in hole] + board_suits,
+                    product,
+                )
+            if result is None:
+                result = self.get_hand_value(hole, board_cards)
+            hand_type, score, hand_cards = result
+            hands[key] = ShowdownHand(key, hand_type, score, hand_cards)
+
+        ordered = sorted(hands.values(), key=lambda hand: hand.score, reverse=True)
+        tie_groups: List[Tuple[_PlayerKey, ...]] = []
+        last_score: Optional[Score] = None
+        for hand in ordered:
+            if hand.score == last_score:
+                tie_groups[-1] += (hand.key,)
+            else:
+                tie_groups.append((hand.key,))
+                last_score = hand.score
+        return ShowdownResult(hands=hands, tie_groups=tuple(tie_groups))
+
     def determine_best_hand(self, hands: Tuple[Cards, ...]) -> Tuple[HandsOfPoker, Score, Tuple[Card, ...]]:
         """Determine the best hand among multiple 5-card hands."""
         best_type = HandsOfPoker.HIGH_CARD
@@ -107,7 +373,14 @@ class WinnerDetermination:
         values = [card.value for card in hand] # از قبل مرتب شده نزولی
         suits = [card.suit for card in hand]
         is_flush = len(set(suits)) == 1
+        return WinnerDetermination._score_sorted_values(values, is_flush)
 
+    @staticmethod
+    def _score_sorted_values(values: List[int], is_flush: bool) -> Tuple[Score, HandsOfPoker]:
+        """
+        امتیاز و نوع دست را از روی ارزش‌های مرتب‌شده نزولی و وضعیت فلاش
+        محاسبه می‌کند. برای ساخت جدول‌های ارزیابی نیز استفاده می‌شود.
+        """
         # بررسی استریت با توجه به اینکه values از قبل مرتب شده (نزولی)
         is_straight = all(values[i] - values[i+1] == 1 for i in range(len(values)-1))
         
@@ -118,39 +391,39 @@ class WinnerDetermination:
              # برای محاسبه امتیاز، آس را با ارزش ۱ در نظر می‌گیریم تا بعد از ۵ قرار گیرد
              original_values_for_score = [5, 4, 3, 2, 1]
 
-        grouped_counts, grouped_keys = self._group_hand_by_value(values)
+        grouped_counts, grouped_keys = WinnerDetermination._group_hand_by_value(values)
 
         if is_straight and is_flush:
             if values == [14, 13, 12, 11, 10]: # رویال فلاش
                 hand_type = HandsOfPoker.ROYAL_FLUSH
             else: # استریت فلاش (شامل حالت A-2-3-4-5)
                 hand_type = HandsOfPoker.STRAIGHT_FLUSH
-            return self._calculate_score_value(original_values_for_score, hand_type), hand_type
+            return WinnerDetermination._calculate_score_value(original_values_for_score, hand_type), hand_type
 
         if grouped_counts == [1, 4]:
             hand_type = HandsOfPoker.FOUR_OF_A_KIND
-            return self._calculate_score_value(grouped_keys, hand_type), hand_type
+            return WinnerDetermination._calculate_score_value(grouped_keys, hand_type), hand_type
         if grouped_counts == [2, 3]:
             hand_type = HandsOfPoker.FULL_HOUSE
-            return self._calculate_score_value(grouped_keys, hand_type), hand_type
+            return WinnerDetermination._calculate_score_value(grouped_keys, hand_type), hand_type
         if is_flush:
             hand_type = HandsOfPoker.FLUSH
-            return self._calculate_score_value(original_values_for_score, hand_type), hand_type
+            return WinnerDetermination._calculate_score_value(original_values_for_score, hand_type), hand_type
         if is_straight:
             hand_type = HandsOfPoker.STRAIGHT
-            return self._calculate_score_value(original_values_for_score, hand_type), hand_type
+            return WinnerDetermination._calculate_score_value(original_values_for_score, hand_type), hand_type
         if grouped_counts == [1, 1, 3]:
             hand_type = HandsOfPoker.THREE_OF_A_KIND
-            return self._calculate_score_value(grouped_keys, hand_type), hand_type
+            return WinnerDetermination._calculate_score_value(grouped_keys, hand_type), hand_type
         if grouped_counts == [1, 2, 2]:
             hand_type = HandsOfPoker.TWO_PAIR
-            return self._calculate_score_value(grouped_keys, hand_type), hand_type
+            return WinnerDetermination._calculate_score_value(grouped_keys, hand_type), hand_type
         if grouped_counts == [1, 1, 1, 2]:
             hand_type = HandsOfPoker.PAIR
-            return self._calculate_score_value(grouped_keys, hand_type), hand_type
+            return WinnerDetermination._calculate_score_value(grouped_keys, hand_type), hand_type
 
         hand_type = HandsOfPoker.HIGH_CARD
-        return self._calculate_score_value(original_values_for_score, hand_type), hand_type
+        return WinnerDetermination._calculate_score_value(original_values_for_score, hand_type), hand_type
 
     @staticmethod
     def _calculate_score_value(hand_values: List[int], hand_type: HandsOfPoker) -> Score:
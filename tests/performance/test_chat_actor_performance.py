@@ -0,0 +1,101 @@
+"""
+Bets per second for one chat through GameEngine.process_bet, with and without
+the chat actor.
+"""
+import asyncio
+import logging
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from pokerapp.entities import Game, Player
+from pokerapp.game_engine import GameEngine
+from pokerapp.lock_manager import LockManager
+
+_CHAT_ID = -1001234
+_CLICKERS = 4
+_BETS = 400
+
+
+class _TableManager:
+    """In-memory tables that yield to the loop like a Redis round trip."""
+
+    def __init__(self, game: Game) -> None:
+        self.game = game
+        self.version = 0
+
+    async def load_game_with_version(self, chat_id: int):
+        await asyncio.sleep(0)
+        return self.game, self.version
+
+    async def save_game_with_version_check(
+        self, chat_id: int, game: Game, expected_version: int
+    ) -> bool:
+        await asyncio.sleep(0)
+        if expected_version != self.version:
+            return False
+        self.version += 1
+        return True
+
+
+def _engine(chat_actor_mode: bool):
+    game = Game()
+    game.chat_id = _CHAT_ID
+    for seat in range(_CLICKERS):
+        game.add_player(Player(seat + 1, f"p{seat}", None, "ready"), seat_index=seat)
+    tables = _TableManager(game)
+    logger = logging.getLogger("bench.chat_actor")
+    engine = GameEngine(
+        table_manager=tables,
+        view=MagicMock(),
+        winner_determination=MagicMock(),
+        request_metrics=MagicMock(),
+        round_rate=MagicMock(),
+        player_manager=MagicMock(),
+        matchmaking_service=MagicMock(),
+        stats_reporter=MagicMock(),
+        clear_game_messages=AsyncMock(),
+        build_identity_from_player=MagicMock(),
+        safe_int=int,
+        old_players_key="old_players",
+        telegram_safe_ops=MagicMock(),
+        lock_manager=LockManager(logger=logger),
+        logger=logger,
+        chat_actor_mode=chat_actor_mode,
+    )
+    return engine, tables
+
+
+async def _bets_per_second(chat_actor_mode: bool):
+    engine, tables = _engine(chat_actor_mode)
+
+    async def clicker(user_id: int) -> None:
+        for _ in range(_BETS // _CLICKERS):
+            assert await engine.process_bet(_CHAT_ID, user_id, 10)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(clicker(seat + 1) for seat in range(_CLICKERS)))
+    elapsed = time.perf_counter() - start
+    if engine._chat_actors is not None:
+        await engine._chat_actors.close()
+    return _BETS / elapsed, tables
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_chat_actor_vs_lock_stack_throughput():
+    logging.getLogger("bench.chat_actor").setLevel(logging.ERROR)
+
+    locks_per_second, lock_tables = await _bets_per_second(False)
+    actor_per_second, actor_tables = await _bets_per_second(True)
+
+    print(
+        f"\n📊 Bets/s for one chat ({_CLICKERS} concurrent players): "
+        f"locks {locks_per_second:.0f}, actor {actor_per_second:.0f} "
+        f"({actor_per_second / locks_per_second:.2f}x)"
+    )
+    # Every bet was saved exactly once; the pot depends on betting order.
+    assert lock_tables.version == actor_tables.version == _BETS
+    # Jobs still take the chat locks, so the actor only adds a queue hop.
+    assert actor_per_second > locks_per_second * 0.5
@@ -0,0 +1,135 @@
+"""
+Board render cost over 5-card boards sampled from the deck, per output format.
+"""
+import asyncio
+import random
+import statistics
+import time
+
+import pytest
+from PIL import Image, ImageDraw
+
+from pokerapp.cards import get_cards
+from pokerapp.desk import DeskImageGenerator
+
+_BOARDS = 200
+_SUIT_COLOURS = {"♥": (200, 30, 40), "♦": (220, 90, 20), "♣": (20, 120, 40), "♠": (20, 20, 30)}
+_FILE_SUITS = {"♣": "C", "♦": "D", "♥": "H", "♠": "S"}
+
+
+def _deck():
+    return sorted(get_cards(), key=lambda card: card.index)
+
+
+def _write_card_assets(directory) -> None:
+    """Write 52 card faces of the original asset size with some texture."""
+
+    rng = random.Random(7)
+    for card in _deck():
+        image = Image.new("RGB", (250, 363), (250, 250, 245))
+        draw = ImageDraw.Draw(image)
+        colour = _SUIT_COLOURS[card.suit]
+        draw.rounded_rectangle((6, 6, 243, 356), radius=18, outline=colour, width=5)
+        for _ in range(card.value * 3):
+            x, y = rng.randrange(30, 200), rng.randrange(40, 300)
+            draw.ellipse((x, y, x + 22, y + 22), fill=colour)
+        draw.text((16, 14), card.rank, fill=colour)
+        image.save(directory / f"{card.rank}{_FILE_SUITS[card.suit]}.jpg", quality=90)
+
+
+def _boards():
+    rng = random.Random(42)
+    deck = _deck()
+    return [rng.sample(deck, 5) for _ in range(_BOARDS)]
+
+
+def _bench(generator: DeskImageGenerator, boards) -> tuple:
+    timings = []
+    sizes = []
+    for board in boards:
+        start = time.perf_counter()
+        data = generator.encode(generator.generate_desk(board))
+        timings.append(time.perf_counter() - start)
+        sizes.append(len(data))
+    return statistics.median(timings) * 1000, statistics.mean(sizes)
+
+
+def _composite_us(generator: DeskImageGenerator, boards, repeats: int = 3) -> float:
+    """Best median compositing time per board over ``repeats`` passes."""
+
+    medians = []
+    for _ in range(repeats):
+        timings = []
+        for board in boards:
+            start = time.perf_counter()
+            generator.generate_desk(board)
+            timings.append(time.perf_counter() - start)
+        medians.append(statistics.median(timings))
+    return min(medians) * 1e6
+
+
+@pytest.mark.performance
+def test_render_boards_per_format(tmp_path):
+    _write_card_assets(tmp_path)
+    boards = _boards()
+
+    start = time.perf_counter()
+    preloaded_generator = DeskImageGenerator(card_assets=tmp_path)
+    preload_ms = (time.perf_counter() - start) * 1000
+    assert len(preloaded_generator._card_tiles) == 52
+
+    lazy_generator = DeskImageGenerator(card_assets=tmp_path, preload=False)
+    results = {
+        "png (lazy cards)": _bench(lazy_generator, boards),
+        "png": _bench(preloaded_generator, boards),
+        "png fast": _bench(
+            DeskImageGenerator(card_assets=tmp_path, compress_level=1), boards
+        ),
+        "png palette": _bench(
+            DeskImageGenerator(card_assets=tmp_path, palette=True), boards
+        ),
+        "webp q80": _bench(
+            DeskImageGenerator(card_assets=tmp_path, image_format="WEBP"), boards
+        ),
+    }
+
+    print(f"\n📊 Desk render over {_BOARDS} boards (cards preloaded in {preload_ms:.1f}ms)")
+    for label, (median_ms, mean_bytes) in results.items():
+        print(f"   {label:<17} {median_ms:6.2f}ms/board {mean_bytes / 1024:7.1f}KiB")
+
+    # Both generators have every card loaded by now; compare compositing only.
+    preloaded_us = _composite_us(preloaded_generator, boards)
+    lazy_us = _composite_us(lazy_generator, boards)
+    print(f"   compositing: preloaded {preloaded_us:.1f}µs/board, lazy cards {lazy_us:.1f}µs/board")
+
+    assert preloaded_us < lazy_us
+
+    assert results["png palette"][1] < results["png"][1]
+    assert results["webp q80"][1] < results["png"][1]
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_render_image_keeps_event_loop_responsive(tmp_path):
+    _write_card_assets(tmp_path)
+    generator = DeskImageGenerator(card_assets=tmp_path)
+    boards = _boards()[:40]
+    lags = []
+
+    async def ticker(stop: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            expected = loop.time() + 0.001
+            await asyncio.sleep(0.001)
+            lags.append(loop.time() - expected)
+
+    stop = asyncio.Event()
+    tick_task = asyncio.create_task(ticker(stop))
+    for board in boards:
+        await generator.render_image(board)
+    stop.set()
+    await tick_task
+
+    worst_ms = max(lags) * 1000
+    print(f"\n📊 Worst event-loop lag while rendering {len(boards)} boards: {worst_ms:.2f}ms")
+    assert worst_ms < 50.0
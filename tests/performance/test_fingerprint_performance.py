@@ -0,0 +1,61 @@
+"""
+Edit de-duplication hashing cost on a typical 8-button turn keyboard.
+"""
+import hashlib
+import json
+import time
+
+import pytest
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+from pokerapp.utils.fingerprint import content_fingerprint
+
+_ROUNDS = 5000
+_TEXT = "🎯 Your turn, Sara\n💰 Pot: 240 | To call: 40\n🃏 A♠ K♦ | Board: 7♣ 9♥ Q♠"
+
+
+def _turn_keyboard() -> InlineKeyboardMarkup:
+    labels = [
+        ("Check", "check"), ("Call 40", "call"), ("Fold", "fold"), ("All-in", "all_in"),
+        ("Raise 10", "raise-10"), ("Raise 25", "raise-25"),
+        ("Raise 50", "raise-50"), ("Raise 100", "raise-100"),
+    ]
+    buttons = [
+        InlineKeyboardButton(text, callback_data=f"act:123456:{action}:a1b2c3d4")
+        for text, action in labels
+    ]
+    return InlineKeyboardMarkup([buttons[:4], buttons[4:]])
+
+
+def _legacy_hash(text, markup) -> str:
+    payload = json.dumps(
+        {"text": text or "", "reply_markup": markup.to_dict()},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.md5(payload.encode("utf-8")).hexdigest()
+
+
+def _per_call_us(func, markups) -> float:
+    start = time.perf_counter()
+    for markup in markups:
+        func(_TEXT, markup)
+    return (time.perf_counter() - start) / len(markups) * 1e6
+
+
+@pytest.mark.performance
+def test_turn_keyboard_fingerprint_cost():
+    shared = _turn_keyboard()
+    fresh = [_turn_keyboard() for _ in range(_ROUNDS)]
+
+    legacy_us = _per_call_us(_legacy_hash, fresh)
+    cold_us = _per_call_us(content_fingerprint, fresh)
+    warm_us = _per_call_us(content_fingerprint, [shared] * _ROUNDS)
+
+    print(f"\n📊 Turn keyboard hashing over {_ROUNDS} payloads")
+    print(f"   json+md5 (legacy)        {legacy_us:6.2f}µs")
+    print(f"   blake2b, new keyboard    {cold_us:6.2f}µs")
+    print(f"   blake2b, cached keyboard {warm_us:6.2f}µs")
+
+    assert cold_us < legacy_us
+    assert warm_us < cold_us
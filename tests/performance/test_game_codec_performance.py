@@ -0,0 +1,153 @@
+"""
+Benchmarks comparing the binary game snapshot codec with pickle.
+"""
+import copy
+import pickle
+import random
+import statistics
+import time
+
+import pytest
+
+from pokerapp import game_codec
+from pokerapp.entities import Game, GameState, Player, PlayerState
+
+_NAMES = [
+    "Sara", "Reza", "Mina", "Arash", "Neda", "Kian", "Leila", "Omid",
+]
+
+
+class _Wallet:
+    def __init__(self, user_id: int) -> None:
+        self._user_id = user_id
+
+
+def _realistic_game(seed: int) -> Game:
+    """An 8-player hand on the turn with the metadata a live table carries."""
+
+    rng = random.Random(seed)
+    game = Game()
+    game.chat_id = -1001000000000 - seed
+    for seat, name in enumerate(_NAMES):
+        user_id = rng.randrange(10**8, 7 * 10**9)
+        player = Player(
+            user_id=user_id,
+            mention_markdown=f"[{name}](tg://user?id={user_id})",
+            wallet=_Wallet(user_id),
+            ready_message_id=str(rng.randrange(10**5, 10**6)),
+        )
+        game.add_player(player, seat)
+        player.cards = [game.remain_cards.pop(), game.remain_cards.pop()]
+        player.round_rate = rng.choice([0, 20, 40])
+        player.total_bet = player.round_rate + rng.choice([10, 20, 60])
+        player.has_acted = rng.random() < 0.5
+        player.anchor_message = (game.chat_id, rng.randrange(10**5, 10**6))
+        player.private_chat_id = user_id
+        player.private_keyboard_message = (user_id, rng.randrange(10**5, 10**6))
+        player.private_keyboard_signature = f"{rng.getrandbits(64):016x}"
+        player.display_name = name
+        player.username = f"{name.lower()}_{seat}"
+        if rng.random() < 0.25:
+            player.state = PlayerState.FOLD
+    game.state = GameState.ROUND_TURN
+    game.cards_table = [game.remain_cards.pop() for _ in range(4)]
+    game.pot = 760
+    game.max_round_rate = 40
+    game.current_player_index = 3
+    game.ready_users = {player.user_id for player in game.players}
+    game.message_ids = {
+        player.user_id: rng.randrange(10**5, 10**6) for player in game.players
+    }
+    game.last_actions = [
+        f"{name}: {rng.choice(['call', 'raise 40', 'check', 'fold'])}"
+        for name in _NAMES
+    ]
+    game.message_ids_to_delete = [rng.randrange(10**5, 10**6) for _ in range(5)]
+    game.turn_message_id = rng.randrange(10**5, 10**6)
+    game.turn_deadline = time.time() + 30
+    game.board_message_id = rng.randrange(10**5, 10**6)
+    game.ready_message_main_id = rng.randrange(10**5, 10**6)
+    game.ready_message_main_text = "\n".join(
+        f"{seat + 1}. {player.mention_markdown} 🟢" for seat, player in enumerate(game.players)
+    )
+    for _ in range(40):
+        game.mark_callback_processed(str(rng.getrandbits(63)))
+    return game
+
+
+def _table_history(seed: int, saves: int) -> list:
+    """Successive states of one table, as saved after each action."""
+
+    rng = random.Random(seed)
+    game = _realistic_game(seed)
+    states = [copy.deepcopy(game)]
+    for _ in range(saves - 1):
+        player = game.players[game.current_player_index % len(game.players)]
+        raise_to = game.max_round_rate + rng.choice([0, 0, 20])
+        game.pot += raise_to - player.round_rate
+        player.total_bet += raise_to - player.round_rate
+        player.round_rate = raise_to
+        game.max_round_rate = raise_to
+        player.has_acted = True
+        game.last_actions.append(f"{player.display_name}: call {raise_to}")
+        game.mark_callback_processed(str(rng.getrandbits(63)))
+        game.current_player_index += 1
+        game.turn_deadline += 30
+        states.append(copy.deepcopy(game))
+    return states
+
+
+def _per_op_us(func, payloads, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for payload in payloads:
+            func(payload)
+    return (time.perf_counter() - start) / (rounds * len(payloads)) * 1e6
+
+
+def _median_us(func, payloads, rounds: int, repeats: int = 5) -> float:
+    return statistics.median(
+        _per_op_us(func, payloads, rounds) for _ in range(repeats)
+    )
+
+
+def _encode_uncached(game) -> bytes:
+    game_codec._stable_blobs.clear()
+    return game_codec.encode_game(game)
+
+
+@pytest.mark.performance
+class TestGameCodecPerformance:
+    """Payload size and latency of binary snapshots versus pickle."""
+
+    def test_binary_snapshot_vs_pickle(self):
+        # Ten saves in a row for each of twenty tables, like a live hand.
+        games = [
+            state for seed in range(20) for state in _table_history(seed, 10)
+        ]
+        pickled = [pickle.dumps(game) for game in games]
+        encoded = [game_codec.encode_game(game) for game in games]
+
+        pickle_size = sum(map(len, pickled)) / len(games)
+        binary_size = sum(map(len, encoded)) / len(games)
+
+        rounds = 5
+        pickle_encode = _median_us(pickle.dumps, games, rounds)
+        binary_encode = _median_us(game_codec.encode_game, games, rounds)
+        uncached_encode = _median_us(_encode_uncached, games, rounds)
+        pickle_decode = _median_us(pickle.loads, pickled, rounds)
+        binary_decode = _median_us(game_codec.decode_game, encoded, rounds)
+
+        print(
+            f"\n📊 Snapshot size: pickle {pickle_size:.0f}B, binary {binary_size:.0f}B "
+            f"({pickle_size / binary_size:.1f}x smaller)"
+            f"\n📊 Encode: pickle {pickle_encode:.0f}µs, binary cold {uncached_encode:.0f}µs, "
+            f"binary with the roster memoised {binary_encode:.0f}µs"
+            f"\n📊 Decode: pickle {pickle_decode:.0f}µs, binary {binary_decode:.0f}µs"
+        )
+        assert binary_size * 3 <= pickle_size
+        assert binary_decode < pickle_decode
+        # The codec buys size, not encode speed: a cold encode deflates the
+        # roster and is slower than pickle. Only guard it against regressing.
+        assert uncached_encode < pickle_encode * 1.5
+        assert binary_encode <= uncached_encode
@@ -0,0 +1,75 @@
+"""
+Acquire/release latency for uncontended locks: full tracing versus fast path.
+"""
+import logging
+import time
+
+import pytest
+
+from pokerapp import lock_manager as lock_manager_module
+from pokerapp.lock_manager import LockManager
+
+_ITERATIONS = 2000
+
+
+def _manager(*, sample_rate: int) -> LockManager:
+    logger = logging.getLogger("bench.lock_fast_path")
+    logger.setLevel(logging.WARNING)
+    manager = LockManager(logger=logger)
+    manager._enable_stack_trace_logging = True
+    manager._enable_duplicate_detection = True
+    manager._stack_trace_sample_rate = sample_rate
+    return manager
+
+
+async def _acquire_release_us(manager: LockManager) -> float:
+    key = "bench:fast_path"
+    start = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        assert await manager.acquire(key, timeout=1)
+        await manager.release(key)
+    return (time.perf_counter() - start) / _ITERATIONS * 1_000_000
+
+
+async def _distributed_us(manager: LockManager) -> float:
+    key = "player:-1001:42"
+    level = manager.LOCK_LEVELS.get("player", 0)
+    context = {"chat_id": -1001, "lock_type": "player_state"}
+    start = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        async with manager._acquire_distributed_lock(
+            key, timeout=1, level=level, context=context
+        ):
+            pass
+    return (time.perf_counter() - start) / _ITERATIONS * 1_000_000
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_uncontended_acquire_release_latency(monkeypatch):
+    monkeypatch.setattr(lock_manager_module, "_FAST_PATH_SKIP_VALIDATION", False)
+    traced = await _acquire_release_us(_manager(sample_rate=1))
+    monkeypatch.setattr(lock_manager_module, "_FAST_PATH_SKIP_VALIDATION", True)
+    fast = await _acquire_release_us(_manager(sample_rate=64))
+
+    print(
+        f"\n📊 acquire+release: traced {traced:.1f}µs, fast path {fast:.1f}µs "
+        f"({traced / fast:.1f}x)"
+    )
+    assert fast < traced
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_uncontended_distributed_lock_latency(monkeypatch):
+    monkeypatch.setattr(lock_manager_module, "_FAST_PATH_SKIP_VALIDATION", False)
+    traced = await _distributed_us(_manager(sample_rate=1))
+    monkeypatch.setattr(lock_manager_module, "_FAST_PATH_SKIP_VALIDATION", True)
+    fast = await _distributed_us(_manager(sample_rate=64))
+
+    print(
+        f"\n📊 _acquire_distributed_lock: traced {traced:.1f}µs, "
+        f"fast path {fast:.1f}µs ({traced / fast:.1f}x)"
+    )
+    assert fast < traced
+
@@ -0,0 +1,71 @@
+"""
+Read wait under mixed /stats readers and action writers on one table.
+"""
+import asyncio
+import logging
+import statistics
+import time
+
+import pytest
+
+from pokerapp.lock_manager import LockManager
+
+_CHAT_ID = -1004242
+_READERS = 12
+_WRITERS = 3
+_READS_PER_READER = 60
+_WRITES_PER_WRITER = 40
+
+
+def _manager() -> LockManager:
+    logger = logging.getLogger("bench.table_rw_lock")
+    logger.setLevel(logging.ERROR)
+    manager = LockManager(logger=logger)
+    manager._smart_retry_enabled = False
+    return manager
+
+
+async def _mixed_traffic(manager: LockManager) -> list:
+    read_waits: list = []
+
+    async def stats_reader() -> None:
+        for _ in range(_READS_PER_READER):
+            start = time.perf_counter()
+            async with manager.table_read_lock(_CHAT_ID):
+                read_waits.append(time.perf_counter() - start)
+                await asyncio.sleep(0.0005)
+            await asyncio.sleep(0.001)
+
+    async def action_writer() -> None:
+        for _ in range(_WRITES_PER_WRITER):
+            async with manager.table_write_lock(_CHAT_ID):
+                await asyncio.sleep(0.001)
+            await asyncio.sleep(0.002)
+
+    await asyncio.gather(
+        *(stats_reader() for _ in range(_READERS)),
+        *(action_writer() for _ in range(_WRITERS)),
+    )
+    return read_waits
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_mixed_stats_and_action_read_wait():
+    manager = _manager()
+    start = time.perf_counter()
+    read_waits = await _mixed_traffic(manager)
+    elapsed = time.perf_counter() - start
+
+    read_waits.sort()
+    p50 = statistics.median(read_waits) * 1000
+    p99 = read_waits[int(len(read_waits) * 0.99) - 1] * 1000
+    stats = manager.get_metrics()["table_lock_stats"][_CHAT_ID]
+
+    print(
+        f"\n📊 Read wait ({_READERS} readers, {_WRITERS} writers): "
+        f"p50 {p50:.2f}ms, p99 {p99:.2f}ms, total {elapsed:.2f}s"
+    )
+    assert stats["read_acquisitions"] == _READERS * _READS_PER_READER
+    assert stats["write_acquisitions"] == _WRITERS * _WRITES_PER_WRITER
+    assert p99 < 50.0
@@ -0,0 +1,375 @@
+"""Tests for the single-script action pipeline used by ``process_action``."""
+
+import copy
+import json
+import logging
+from unittest.mock import AsyncMock, MagicMock
+
+import fakeredis.aioredis
+import pytest
+from redis.exceptions import NoScriptError, ResponseError
+
+from pokerapp.game_engine import (
+    GameEngine,
+    _ACTION_PIPELINE_LUA,
+    _ACTION_PIPELINE_SHA,
+)
+from pokerapp.lock_manager import LockManager
+from pokerapp.pokerbotmodel import PokerBotModel
+from pokerapp.private_match_service import PrivateMatchService
+from pokerapp.utils.request_metrics import RequestMetrics
+
+
+def _engine(redis_client, *, mock_locked_path=True):
+    lock_manager = LockManager(logger=logging.getLogger("test-pipeline-locks"))
+    if mock_locked_path:
+        lock_manager.acquire_action_lock = AsyncMock(return_value="token")  # type: ignore[assignment]
+        lock_manager.release_action_lock = AsyncMock(return_value=True)  # type: ignore[assignment]
+    safe_ops = MagicMock()
+    safe_ops.send_message_safe = AsyncMock()
+    engine = GameEngine(
+        table_manager=MagicMock(),
+        view=MagicMock(),
+        winner_determination=MagicMock(),
+        request_metrics=MagicMock(),
+        round_rate=MagicMock(),
+        player_manager=MagicMock(),
+        matchmaking_service=MagicMock(),
+        stats_reporter=MagicMock(),
+        clear_game_messages=AsyncMock(),
+        build_identity_from_player=MagicMock(),
+        safe_int=lambda value: int(value),
+        old_players_key="old_players",
+        telegram_safe_ops=safe_ops,
+        lock_manager=lock_manager,
+        logger=logging.getLogger("test-pipeline-engine"),
+        redis_client=redis_client,
+    )
+    if mock_locked_path:
+        engine.handle_player_action = AsyncMock(return_value={"success": True})  # type: ignore[assignment]
+    return engine, lock_manager
+
+
+@pytest.mark.asyncio
+async def test_process_action_uses_one_script_call():
+    new_state = {"players": [{"user_id": 7, "has_acted": True}], "pot": 30}
+    redis_client = AsyncMock()
+    redis_client.evalsha.return_value = [b"ok", json.dumps(new_state).encode(), b"5"]
+    engine, lock_manager = _engine(redis_client)
+
+    assert await engine.process_action(-100, 7, "call") is True
+
+    redis_client.evalsha.assert_awaited_once()
+    sha, numkeys, *keys_and_args = redis_client.evalsha.await_args.args
+    assert sha == _ACTION_PIPELINE_SHA
+    assert numkeys == 2
+    assert keys_and_args[:2] == [
+        lock_manager.action_lock_key(-100, 7, "call"),
+        "game:-100:state",
+    ]
+    assert keys_and_args[2:6] == ["7", "call", "0", ""]
+    redis_client.eval.assert_not_awaited()
+    lock_manager.acquire_action_lock.assert_not_awaited()
+    engine.handle_player_action.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_run_action_pipeline_returns_new_state():
+    redis_client = AsyncMock()
+    redis_client.evalsha.return_value = ["ok", '{"pot": 30, "players": []}', "9"]
+    engine, _ = _engine(redis_client)
+
+    result = await engine.run_action_pipeline(-100, 7, "raise", 20, expected_version=8)
+
+    assert result == {
+        "success": True,
+        "message": "Raise successful",
+        "new_state": {"pot": 30, "players": [], "version": 9},
+    }
+    assert redis_client.evalsha.await_args.args[6:8] == ("20", "8")
+
+
+@pytest.mark.asyncio
+async def test_pipeline_loads_script_when_not_cached():
+    redis_client = AsyncMock()
+    redis_client.evalsha.side_effect = NoScriptError("NOSCRIPT")
+    redis_client.eval.return_value = [b"not_turn"]
+    engine, _ = _engine(redis_client)
+
+    result = await engine.run_action_pipeline(-100, 7, "check")
+
+    assert result["success"] is False
+    assert result["message"] == "Not your turn"
+    assert redis_client.eval.await_args.args[0] == _ACTION_PIPELINE_LUA
+
+
+@pytest.mark.asyncio
+async def test_pipeline_lock_contention_sends_feedback():
+    redis_client = AsyncMock()
+    redis_client.evalsha.return_value = [b"locked"]
+    engine, _ = _engine(redis_client)
+
+    assert await engine.process_action(-100, 7, "fold") is False
+    engine._safe_ops.send_message_safe.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_process_action_falls_back_without_scripting():
+    redis_client = AsyncMock()
+    redis_client.evalsha.side_effect = ModuleNotFoundError("lupa")
+    redis_client.eval.side_effect = ModuleNotFoundError("lupa")
+    engine, lock_manager = _engine(redis_client)
+
+    assert await engine.process_action(-100, 7, "fold") is True
+
+    lock_manager.acquire_action_lock.assert_awaited_once()
+    engine.handle_player_action.assert_awaited_once()
+    lock_manager.release_action_lock.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_unsupported_server_is_not_asked_again():
+    redis_client = AsyncMock()
+    redis_client.evalsha.return_value = [b"unsupported"]
+    engine, _ = _engine(redis_client)
+
+    assert await engine.process_action(-100, 7, "fold") is True
+    assert await engine.process_action(-100, 7, "check") is True
+
+    redis_client.evalsha.assert_awaited_once()
+    assert engine.handle_player_action.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_script_errors_are_not_retried():
+    redis_client = AsyncMock()
+    redis_client.evalsha.side_effect = ResponseError("ERR scripting is disabled")
+    engine, _ = _engine(redis_client)
+
+    assert await engine.process_action(-100, 7, "fold") is True
+    assert await engine.process_action(-100, 7, "check") is True
+
+    redis_client.evalsha.assert_awaited_once()
+    assert engine.handle_player_action.await_count == 2
+
+
+def test_bot_model_gives_the_engine_its_redis_client(config_factory):
+    kv = fakeredis.aioredis.FakeRedis()
+    view = MagicMock()
+    view.request_metrics = RequestMetrics(logger_=logging.getLogger("test-pipeline-metrics"))
+
+    model = PokerBotModel(
+        view=view,
+        bot=MagicMock(),
+        cfg=config_factory(),
+        kv=kv,
+        table_manager=MagicMock(),
+        private_match_service=MagicMock(spec=PrivateMatchService),
+    )
+
+    assert model._game_engine._redis_client is kv
+
+
+# fakeredis runs scripts through lupa but ships no ``cjson`` library, so the
+# scripted tests install a minimal one backed by ``json`` that mirrors the
+# Redis behaviour the pipeline relies on.
+def _cjson_runtime_class(lupa):
+    class _CJsonLuaRuntime(lupa.LuaRuntime):
+        def __init__(self, *args, **kwargs):
+            super().__init__()
+            lua_globals = self.globals()
+            self._array_mt = self.table()
+            self._null = self.table()
+            self._use_array_mt = False
+            self._setmetatable = lua_globals.setmetatable
+            self._getmetatable = lua_globals.getmetatable
+            self._rawequal = lua_globals.rawequal
+            lua_globals.cjson = self.table_from(
+                {
+                    b"null": self._null,
+                    b"decode": self._decode,
+                    b"encode": self._encode,
+                    b"decode_array_with_array_mt": self._set_array_mt,
+                }
+            )
+
+        def _set_array_mt(self, enabled):
+            self._use_array_mt = bool(enabled)
+
+        def _to_lua(self, value):
+            if value is None:
+                return self._null
+            if isinstance(value, str):
+                return value.encode("utf-8")
+            if isinstance(value, dict):
+                return self.table_from(
+                    {key.encode("utf-8"): self._to_lua(item) for key, item in value.items()}
+                )
+            if isinstance(value, list):
+                table = self.table_from([self._to_lua(item) for item in value])
+                if self._use_array_mt:
+                    self._setmetatable(table, self._array_mt)
+                return table
+            return value
+
+        def _from_lua(self, value):
+            if isinstance(value, bytes):
+                return value.decode("utf-8")
+            if lupa.lua_type(value) != "table":
+                return value
+            if self._rawequal(value, self._null):
+                return None
+            keys = list(value.keys())
+            if self._rawequal(self._getmetatable(value), self._array_mt) or (
+                keys and keys == list(range(1, len(keys) + 1))
+            ):
+                return [self._from_lua(value[index]) for index in range(1, len(keys) + 1)]
+            return {
+                self._from_lua(key): self._from_lua(item) for key, item in value.items()
+            }
+
+        def _decode(self, text):
+            return self._to_lua(json.loads(text))
+
+        def _encode(self, value):
+            return json.dumps(self._from_lua(value)).encode("utf-8")
+
+    return _CJsonLuaRuntime
+
+
+@pytest.fixture
+def scripted_redis(monkeypatch):
+    lupa = pytest.importorskip("lupa")
+    import fakeredis.aioredis
+
+    monkeypatch.setattr(lupa, "LuaRuntime", _cjson_runtime_class(lupa))
+
+    def factory():
+        return fakeredis.aioredis.FakeRedis(
+            server=fakeredis.FakeServer(), decode_responses=True
+        )
+
+    return factory
+
+
+def _hand_state():
+    return {
+        "chat_id": -100,
+        "pot": 15,
+        "current_bet": 10,
+        "current_player_index": 0,
+        "last_actions": [],
+        "players": [
+            {"user_id": 1, "chips": 100, "bet": 0, "state": "active", "has_acted": False, "cards": []},
+            {"user_id": 2, "chips": 90, "bet": 10, "state": "active", "has_acted": True, "cards": []},
+            {"user_id": 3, "chips": 95, "bet": 5, "state": "active", "has_acted": False, "cards": []},
+        ],
+    }
+
+
+def _check_round():
+    state = _hand_state()
+    state["current_bet"] = 0
+    for player in state["players"]:
+        player["bet"] = 0
+        player["has_acted"] = False
+    return state
+
+
+def _closing_call():
+    state = _hand_state()
+    state["current_player_index"] = 2
+    state["players"][0].update(bet=10, chips=90, has_acted=True)
+    return state
+
+
+def _folded_neighbour():
+    state = _hand_state()
+    state["players"][1]["state"] = "folded"
+    return state
+
+
+async def _store(redis_client, state, version=4):
+    await redis_client.hset(
+        "game:-100:state", mapping={"state": json.dumps(state), "version": version}
+    )
+
+
+async def _stored(redis_client):
+    raw = await redis_client.hgetall("game:-100:state")
+    return json.loads(raw["state"]), int(raw["version"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "build_state, user_id, action, amount",
+    [
+        (_hand_state, 1, "fold", 0),
+        (_check_round, 1, "check", 0),
+        (_hand_state, 1, "call", 0),
+        (_hand_state, 1, "raise", 30),
+        (_hand_state, 1, "all_in", 0),
+        (_closing_call, 3, "call", 0),
+        (_folded_neighbour, 1, "call", 0),
+    ],
+    ids=["fold", "check", "call", "raise", "all_in", "pot_roll_up", "turn_skips_folded"],
+)
+async def test_script_matches_locked_path(
+    scripted_redis, build_state, user_id, action, amount
+):
+    locked_redis = scripted_redis()
+    script_redis = scripted_redis()
+    await _store(locked_redis, build_state())
+    await _store(script_redis, build_state())
+    locked_engine, _ = _engine(locked_redis, mock_locked_path=False)
+    script_engine, _ = _engine(script_redis, mock_locked_path=False)
+
+    expected = await locked_engine.handle_player_action(-100, user_id, action, amount)
+    result = await script_engine.run_action_pipeline(-100, user_id, action, amount)
+
+    assert expected["success"] is True
+    assert result == expected
+    assert await _stored(script_redis) == await _stored(locked_redis)
+
+
+@pytest.mark.asyncio
+async def test_script_moves_chips_into_the_pot(scripted_redis):
+    redis_client = scripted_redis()
+    await _store(redis_client, _closing_call())
+    engine, _ = _engine(redis_client, mock_locked_path=False)
+
+    assert await engine.process_action(-100, 3, "call") is True
+
+    state, version = await _stored(redis_client)
+    assert version == 5
+    assert state["pot"] == 45
+    assert [player["bet"] for player in state["players"]] == [0, 0, 0]
+    assert [player["chips"] for player in state["players"]] == [90, 90, 90]
+    assert state["current_player_index"] == 0
+    assert state["players"][0]["cards"] == []
+
+
+@pytest.mark.asyncio
+async def test_script_rejects_out_of_turn_actions(scripted_redis):
+    redis_client = scripted_redis()
+    original = _hand_state()
+    await _store(redis_client, copy.deepcopy(original))
+    engine, _ = _engine(redis_client, mock_locked_path=False)
+
+    result = await engine.run_action_pipeline(-100, 2, "check")
+
+    assert result["success"] is False
+    assert result["message"] == "Not your turn"
+    assert await _stored(redis_client) == (original, 4)
+
+
+@pytest.mark.asyncio
+async def test_script_rejects_stale_versions(scripted_redis):
+    redis_client = scripted_redis()
+    await _store(redis_client, _hand_state())
+    engine, _ = _engine(redis_client, mock_locked_path=False)
+
+    result = await engine.run_action_pipeline(-100, 1, "call", expected_version=3)
+
+    assert result["message"] == "State conflict, retry"
+    assert (await _stored(redis_client))[1] == 4
@@ -131,3 +131,25 @@ async def test_handle_admin_command_fallback_raw_payload():
         == "Messaging service unavailable; cannot retrieve save errors."
     )
 
+
+
+@pytest.mark.asyncio
+async def test_lock_profile_command_reports_top_call_sites():
+    model, messaging_service, _ = _make_model()
+    model._lock_manager = MagicMock()
+    model._lock_manager.export_contention_profile.return_value = (
+        "table_write;ROUND_FLOP;engine.fold 900\n"
+        "table_write;ROUND_RIVER;engine.showdown 4200\n"
+    )
+    model._lock_manager.contention_profile.return_value = {"sample_rate": 16}
+
+    await model.handle_admin_command("/lock_profile", ["start", "8"], 123)
+    model._lock_manager.set_contention_profiling.assert_called_once_with(8)
+
+    await model.handle_admin_command("/lock_profile", [], 123)
+
+    text = messaging_service.send_message.await_args.kwargs["text"]
+    lines = text.splitlines()
+    assert lines[1] == "table_write;ROUND_RIVER;engine.showdown 4200"
+    assert lines[2] == "table_write;ROUND_FLOP;engine.fold 900"
+    model._lock_manager.export_contention_profile.assert_called_with("hold")
@@ -0,0 +1,34 @@
+import asyncio
+
+import fakeredis.aioredis
+
+from pokerapp.cards import Card
+from pokerapp.utils.board_image_registry import BoardImageRegistry
+from pokerapp.utils.redis_safeops import RedisSafeOps
+
+
+def test_board_image_file_ids_are_shared_through_redis():
+    async def scenario():
+        redis = fakeredis.aioredis.FakeRedis()
+        redis_ops = RedisSafeOps(redis, max_retries=0, timeout_seconds=0.1)
+        writer = BoardImageRegistry(redis_ops, variant="png84x128p10", ttl_seconds=60)
+        reader = BoardImageRegistry(redis_ops, variant="png84x128p10")
+        other_renderer = BoardImageRegistry(redis_ops, variant="webp84x128p10")
+        flop = [Card("A♠"), Card("K♦"), Card("10♥")]
+
+        assert await reader.get_file_id(flop) is None
+        assert await writer.remember(flop, "file-1")
+
+        ttl = await redis.ttl(writer.board_key(flop))
+        assert 0 < ttl <= 60
+        assert await reader.get_file_id(flop) == "file-1"
+        assert await reader.get_file_id(list(reversed(flop))) is None
+        assert await other_renderer.get_file_id(flop) is None
+
+        await reader.forget(flop)
+        assert await writer.get_file_id(flop) == "file-1"  # local copy
+        assert await BoardImageRegistry(redis_ops, variant="png84x128p10").get_file_id(
+            flop
+        ) is None
+
+    asyncio.run(scenario())
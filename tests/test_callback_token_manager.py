@@ -54,3 +54,49 @@ async def test_validate_token_marks_token_as_used() -> None:
     payload = json.loads(stored_bytes.decode("utf-8"))
     assert payload["used"] is True
     assert payload["used_at"] >= timestamp
+
+
+@pytest.mark.asyncio
+async def test_invalidate_all_tokens_uses_game_token_set() -> None:
+    redis = fakeredis.aioredis.FakeRedis()
+    manager = CallbackTokenManager(redis_client=redis, token_ttl=60)
+
+    _, first_nonce, _ = await manager.generate_token(game_id=7, user_id=1, action="fold")
+    _, second_nonce, _ = await manager.generate_token(game_id=7, user_id=2, action="call")
+    _, other_nonce, _ = await manager.generate_token(game_id=8, user_id=1, action="fold")
+
+    assert await manager.invalidate_all_tokens(7) == 2
+
+    assert await redis.get(f"action_token:7:1:{first_nonce}") is None
+    assert await redis.get(f"action_token:7:2:{second_nonce}") is None
+    assert await redis.exists("action_tokens:7") == 0
+    assert await redis.get(f"action_token:8:1:{other_nonce}") is not None
+    assert await manager.invalidate_all_tokens(7) == 0
+
+
+@pytest.mark.asyncio
+async def test_invalidate_all_tokens_keeps_tokens_indexed_meanwhile() -> None:
+    redis = fakeredis.aioredis.FakeRedis()
+    manager = CallbackTokenManager(redis_client=redis, token_ttl=60)
+
+    await manager.generate_token(game_id=9, user_id=1, action="fold")
+    smembers = redis.smembers
+    late_nonce = None
+
+    async def smembers_then_generate(key):
+        nonlocal late_nonce
+        members = await smembers(key)
+        # A token generated between the read and the delete.
+        _, late_nonce, _ = await manager.generate_token(
+            game_id=9, user_id=2, action="call"
+        )
+        return members
+
+    redis.smembers = smembers_then_generate
+    assert await manager.invalidate_all_tokens(9) == 1
+    redis.smembers = smembers
+
+    late_key = f"action_token:9:2:{late_nonce}".encode()
+    assert await redis.smembers("action_tokens:9") == {late_key}
+    assert await manager.invalidate_all_tokens(9) == 1
+    assert await redis.get(late_key) is None
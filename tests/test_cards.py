@@ -0,0 +1,51 @@
+import copy
+import pickle
+
+from pokerapp.cards import Card, card_from_index, cards_mask, get_cards, to_card, to_cards
+
+
+def test_canonical_cards_are_interned_with_precomputed_fields():
+    card = Card("10♠")
+
+    assert card is Card("10♠")
+    assert card == "10♠"
+    assert (card.rank, card.suit, card.value) == ("10", "♠", 10)
+    assert card_from_index(card.index) is card
+    assert card.mask == 1 << card.index
+
+
+def test_face_cards_and_alias_suits():
+    assert Card("A♥").value == 14
+    assert Card("J♦").value == 11
+
+    alias = Card("Q♧")
+    assert alias.suit == "♧"
+    assert alias.value == 12
+    assert alias.index == Card("Q♣").index
+
+
+def test_get_cards_returns_full_shuffled_deck():
+    deck = get_cards()
+
+    assert len(deck) == 52
+    assert cards_mask(deck) == (1 << 52) - 1
+    deck.pop()
+    assert len(get_cards()) == 52
+
+
+def test_pickle_and_copy_preserve_interning():
+    card = Card("K♣")
+
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        restored = pickle.loads(pickle.dumps(card, protocol=protocol))
+        assert restored == card
+        assert restored.value == 13
+    assert pickle.loads(pickle.dumps(card)) is card
+    assert copy.deepcopy(card) is card
+
+
+def test_legacy_values_are_coerced():
+    assert to_card("A♠") is Card("A♠")
+    assert to_card(Card("A♠").index) is Card("A♠")
+    assert to_card("bogus") is None
+    assert to_cards(["2♥", None, "3♥"]) == [Card("2♥"), Card("3♥")]
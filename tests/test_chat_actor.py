@@ -0,0 +1,132 @@
+import asyncio
+import logging
+
+import pytest
+
+from pokerapp.entities import Game
+from pokerapp.lock_manager import LockManager
+from pokerapp.services.chat_actor import ChatActorPool
+
+
+@pytest.mark.asyncio
+async def test_jobs_for_one_chat_run_in_order_without_overlap():
+    pool = ChatActorPool(idle_timeout=0.05)
+    running = 0
+    order = []
+
+    async def job(index: int) -> int:
+        nonlocal running
+        running += 1
+        assert running == 1
+        await asyncio.sleep(0)
+        order.append(index)
+        running -= 1
+        return index
+
+    results = await asyncio.gather(*(pool.submit(1, lambda i=i: job(i)) for i in range(20)))
+
+    assert results == list(range(20))
+    assert order == list(range(20))
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_nested_submit_runs_inline_and_errors_reach_caller():
+    pool = ChatActorPool(idle_timeout=0.05)
+
+    async def inner() -> str:
+        assert pool.holds(7)
+        return "inner"
+
+    async def outer() -> str:
+        return await pool.submit(7, inner)
+
+    assert await pool.submit(7, outer) == "inner"
+    assert not pool.holds(7)
+
+    async def boom() -> None:
+        raise ValueError("bad action")
+
+    with pytest.raises(ValueError):
+        await pool.submit(7, boom)
+    assert await pool.submit(7, inner) == "inner"
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_actors_are_released():
+    pool = ChatActorPool(idle_timeout=0.01)
+
+    async def noop() -> None:
+        return None
+
+    await asyncio.gather(*(pool.submit(chat, noop) for chat in range(5)))
+    assert len(pool) == 5
+
+    await asyncio.sleep(0.05)
+    assert len(pool) == 0
+    assert pool.get_stats() == {"actors": 0, "queued": 0}
+
+
+def _actor_engine(game_engine_factory):
+    engine, _, _ = game_engine_factory(game=Game())
+    engine._chat_actors = ChatActorPool(idle_timeout=0.05)
+    engine._lock_manager = LockManager(logger=logging.getLogger("chat-actor"))
+    engine._safe_int = int
+    return engine
+
+
+def _stage_guard(engine, chat_id):
+    return engine._trace_lock_guard(
+        lock_key=engine._stage_lock_key(chat_id),
+        chat_id=chat_id,
+        game=None,
+        stage_label="stage_lock:test",
+    )
+
+
+@pytest.mark.asyncio
+async def test_actor_jobs_wait_for_unrouted_lock_holders(game_engine_factory):
+    engine = _actor_engine(game_engine_factory)
+    holding = asyncio.Event()
+    release = asyncio.Event()
+    order = []
+
+    async def unrouted() -> None:
+        # Like _execute_player_action, which takes the stage lock directly.
+        async with _stage_guard(engine, 5):
+            holding.set()
+            await release.wait()
+            order.append("unrouted")
+
+    async def routed() -> None:
+        async with _stage_guard(engine, 5):
+            order.append("routed")
+
+    holder = asyncio.create_task(unrouted())
+    await holding.wait()
+    job = asyncio.create_task(engine._run_in_chat_actor(5, routed))
+    await asyncio.sleep(0.05)
+    assert order == []
+
+    release.set()
+    await asyncio.wait_for(asyncio.gather(holder, job), timeout=2)
+    assert order == ["unrouted", "routed"]
+    await engine._chat_actors.close()
+
+
+@pytest.mark.asyncio
+async def test_actor_does_not_inherit_the_submitters_locks(game_engine_factory):
+    engine = _actor_engine(game_engine_factory)
+    seen = []
+
+    async def job() -> None:
+        seen.append(engine._lock_manager._get_current_acquisitions())
+
+    async with _stage_guard(engine, 6):
+        assert engine._lock_manager._get_current_acquisitions()
+        await engine._run_in_chat_actor(5, job)
+
+    assert seen == [[]]
+    assert not engine._holds_chat_actor(5)
+    await engine._chat_actors.close()
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import math
+import time
 from typing import List
 from unittest.mock import AsyncMock, MagicMock
 
@@ -12,6 +13,7 @@ from aiogram.exceptions import TelegramAPIError
 
 from pokerapp.services.countdown_queue import CountdownMessageQueue
 from pokerapp.services.countdown_worker import CountdownWorker
+from pokerapp.services.timer_wheel import HierarchicalTimerWheel
 
 
 @pytest.mark.asyncio
@@ -246,3 +248,139 @@ async def test_shutdown_during_countdown() -> None:
     assert len(timestamps) >= 1
     on_complete.assert_not_called()
     assert msg.cancelled is False
+
+
+@pytest.mark.asyncio
+async def test_concurrent_countdowns_share_one_worker() -> None:
+    queue = CountdownMessageQueue()
+    safe_ops = MagicMock()
+    safe_ops.edit_message_text = AsyncMock()
+
+    completions: List[int] = []
+
+    def make_callback(identifier: int):
+        async def _callback() -> None:
+            completions.append(identifier)
+        return _callback
+
+    worker = CountdownWorker(queue, safe_ops, edit_interval=0.2, tick_interval=0.02)
+    await worker.start()
+
+    started = asyncio.get_running_loop().time()
+    for idx in range(50):
+        await queue.enqueue(
+            chat_id=100 + idx,
+            message_id=idx,
+            text="Many",
+            duration_seconds=0.5,
+            formatter=lambda remaining: f"{int(math.ceil(remaining))}",
+            on_complete=make_callback(idx),
+        )
+
+    await asyncio.sleep(0.1)
+    stats = worker.get_stats()
+    assert stats["scheduled"] + stats["in_flight"] == 50
+
+    while len(completions) < 50:
+        await asyncio.sleep(0.02)
+        assert asyncio.get_running_loop().time() - started < 2.0
+    await worker.stop()
+
+    # Sequential processing would need 50 * 0.5s; the wheel runs them together.
+    assert completions == list(range(50))
+    assert worker.get_stats()["max_lag"] < 0.5
+
+
+@pytest.mark.asyncio
+async def test_cancel_updates_for_anchor_stops_running_countdown() -> None:
+    queue = CountdownMessageQueue()
+    safe_ops = MagicMock()
+    safe_ops.edit_message_text = AsyncMock()
+
+    on_complete = AsyncMock()
+    worker = CountdownWorker(queue, safe_ops, edit_interval=0.1, tick_interval=0.02)
+    await worker.start()
+
+    msg = await queue.enqueue(
+        chat_id=21,
+        message_id=210,
+        text="Anchor",
+        duration_seconds=0.6,
+        formatter=lambda remaining: f"{int(math.ceil(remaining))}",
+        on_complete=on_complete,
+        anchor_key="table:21",
+    )
+
+    await asyncio.sleep(0.2)
+    await worker.cancel_updates_for_anchor("table:21")
+    await asyncio.sleep(0.6)
+    await worker.stop()
+
+    assert msg.cancelled is True
+    on_complete.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_worker_sleeps_until_next_expiry_and_wakes_on_enqueue() -> None:
+    queue = CountdownMessageQueue()
+    safe_ops = MagicMock()
+    edits: List[int] = []
+
+    async def record_edit(**kwargs: object) -> None:
+        edits.append(kwargs["message_id"])  # type: ignore[arg-type]
+
+    safe_ops.edit_message_text = AsyncMock(side_effect=record_edit)
+    worker = CountdownWorker(queue, safe_ops, edit_interval=1.0, tick_interval=0.02)
+    await worker.start()
+
+    await queue.enqueue(
+        chat_id=31,
+        message_id=310,
+        text="Slow",
+        duration_seconds=5.0,
+        formatter=lambda remaining: f"{int(math.ceil(remaining))}",
+    )
+    await asyncio.sleep(0.1)
+
+    dispatches = 0
+    dispatch = worker._dispatch  # type: ignore[attr-defined]
+
+    def counting_dispatch(due, now):  # type: ignore[no-untyped-def]
+        nonlocal dispatches
+        dispatches += 1
+        dispatch(due, now)
+
+    worker._dispatch = counting_dispatch  # type: ignore[attr-defined]
+    await asyncio.sleep(0.4)
+    # Polling every tick would have spun about 20 times by now.
+    assert dispatches <= 2
+
+    await queue.enqueue(
+        chat_id=32,
+        message_id=320,
+        text="Fast",
+        duration_seconds=5.0,
+        formatter=lambda remaining: f"{int(math.ceil(remaining))}",
+    )
+    await asyncio.sleep(0.05)
+    await worker.stop()
+
+    assert edits == [310, 320]
+
+
+def test_sleep_computation_does_not_grow_with_scheduled_countdowns() -> None:
+    def step_cost(scheduled: int) -> float:
+        wheel: HierarchicalTimerWheel[int] = HierarchicalTimerWheel(0.05)
+        for idx in range(scheduled):
+            wheel.schedule(1.0 + (idx % 600) * 0.1, idx)
+        started = time.perf_counter()
+        for _ in range(2000):
+            CountdownWorker._sleep_for(wheel, 0.5)  # type: ignore[arg-type]
+            wheel.advance(0.5)
+        return time.perf_counter() - started
+
+    small = min(step_cost(10) for _ in range(3))
+    large = min(step_cost(20000) for _ in range(3))
+
+    # A scan of every bucket entry would make this ~2000x slower.
+    assert large < small * 10
@@ -0,0 +1,69 @@
+import asyncio
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from pokerapp.cards import Card, get_cards
+from pokerapp.desk import DeskImageGenerator
+
+_FILE_SUITS = {"♣": "C", "♦": "D", "♥": "H", "♠": "S"}
+
+
+@pytest.fixture
+def card_assets(tmp_path):
+    for card in get_cards():
+        shade = card.index * 4
+        Image.new("RGB", (25, 36), (shade, 255 - shade, 90)).save(
+            tmp_path / f"{card.rank}{_FILE_SUITS[card.suit]}.jpg"
+        )
+    return tmp_path
+
+
+def test_preload_holds_every_card(card_assets):
+    generator = DeskImageGenerator(card_assets=card_assets, card_size=(10, 14), padding=2)
+
+    assert generator.preload_cards() == 52
+    assert generator._load_card_image(Card("A♠")).size == (10, 14)
+    assert generator._load_card_image(Card("A♠")).mode == "RGBA"
+
+    board = [Card("A♠"), Card("2♥"), Card("10♦")]
+    desk = generator.generate_desk(board)
+    assert desk.size == (3 * 10 + 2 * 2, 14)
+    assert desk.getpixel((0, 0)) == generator._load_card_image(Card("A♠")).getpixel((0, 0))
+    assert desk.getpixel((10, 0))[3] == 0  # transparent gap
+    # Blank canvases are reused as templates, never drawn on.
+    assert generator._blank_desk(3).getpixel((0, 0))[3] == 0
+
+
+def test_missing_assets_fall_back_to_lazy_loading(tmp_path):
+    generator = DeskImageGenerator(card_assets=tmp_path / "missing")
+
+    assert generator._card_tiles == {}
+    with pytest.raises(FileNotFoundError):
+        generator.render_cached_image([Card("A♠")])
+
+
+def test_webp_rendering_runs_off_the_event_loop(card_assets):
+    generator = DeskImageGenerator(
+        card_assets=card_assets, card_size=(10, 14), image_format="webp", quality=50
+    )
+    board = [Card("K♣"), Card("Q♣"), Card("J♣")]
+
+    data = asyncio.run(generator.render_image(board))
+
+    assert generator.file_extension == "webp"
+    assert generator.render_variant == "webp10x14p10q50"
+    assert Image.open(BytesIO(data)).format == "WEBP"
+    assert generator.render_cached_image(board) is data
+
+
+def test_palette_png_and_unknown_format(card_assets):
+    generator = DeskImageGenerator(card_assets=card_assets, palette=True)
+
+    data = generator.render_cached_image([Card("3♥")])
+
+    assert generator.render_variant == "png84x128p10pal"
+    assert Image.open(BytesIO(data)).mode == "P"
+    with pytest.raises(ValueError):
+        DeskImageGenerator(card_assets=card_assets, image_format="gif")
@@ -0,0 +1,115 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from pokerapp.cards import Card
+from pokerapp.equity import EquityCalculator, canonical_equity_key
+
+
+def _cards(*names):
+    return [Card(name) for name in names]
+
+
+def test_canonical_key_is_suit_isomorphic():
+    spades_hearts = canonical_equity_key(
+        [_cards("A♠", "A♥"), _cards("K♠", "K♥")], _cards("2♦", "7♣", "9♠")
+    )
+    clubs_diamonds = canonical_equity_key(
+        [_cards("A♣", "A♦"), _cards("K♦", "K♣")], _cards("9♣", "2♥", "7♠")
+    )
+
+    assert spades_hearts == clubs_diamonds
+    assert spades_hearts != canonical_equity_key(
+        [_cards("K♠", "K♥"), _cards("A♠", "A♥")], _cards("2♦", "7♣", "9♠")
+    )
+
+
+def test_exact_river_equity_on_turn():
+    calculator = EquityCalculator()
+    board = _cards("2♣", "7♦", "9♠", "K♦")
+
+    # Aces are drawing dead except to the two remaining aces.
+    aces, kings = calculator.calculate(
+        [_cards("A♠", "A♥"), _cards("K♠", "K♥")], board
+    )
+
+    assert aces == pytest.approx(2 / 44)
+    assert kings == pytest.approx(42 / 44)
+
+
+def test_split_pot_shares_equity():
+    calculator = EquityCalculator()
+    board = _cards("A♣", "K♦", "Q♠", "J♥", "2♣")
+
+    assert calculator.calculate(
+        [_cards("10♠", "3♦"), _cards("10♥", "4♦")], board
+    ) == (0.5, 0.5)
+
+
+def test_monte_carlo_is_seeded_and_memoised():
+    hands = [_cards("A♠", "A♥"), _cards("K♠", "K♥")]
+    first = EquityCalculator(samples=300, seed=7).calculate(hands)
+    second = EquityCalculator(samples=300, seed=7).calculate(hands)
+
+    assert first == second
+    assert sum(first) == pytest.approx(1.0)
+    assert first[0] > first[1]
+
+
+def test_calculate_async_offloads_large_jobs_to_executor():
+    executor = ThreadPoolExecutor(max_workers=1)
+    calculator = EquityCalculator(
+        samples=200, process_threshold=1, executor=executor
+    )
+    hands = [_cards("A♠", "A♥"), _cards("K♠", "K♥")]
+
+    try:
+        result = asyncio.run(calculator.calculate_async(hands))
+    finally:
+        calculator.shutdown()
+        executor.shutdown()
+
+    assert result == EquityCalculator(samples=200).calculate(hands)
+
+
+def test_worker_pool_uses_spawn_and_is_released_on_shutdown():
+    calculator = EquityCalculator(samples=200, process_threshold=1, max_workers=1)
+    hands = [_cards("A♠", "A♥"), _cards("K♠", "K♥")]
+
+    try:
+        result = asyncio.run(calculator.calculate_async(hands))
+        executor = calculator._executor
+        assert executor._mp_context.get_start_method() == "spawn"
+    finally:
+        calculator.shutdown()
+
+    assert calculator._executor is None
+    assert result == EquityCalculator(samples=200).calculate(hands)
+
+
+def test_samples_override_is_cached_separately():
+    calculator = EquityCalculator(samples=400, seed=3)
+    hands = [_cards("A♠", "A♥"), _cards("K♠", "K♥")]
+
+    capped = calculator.calculate(hands, samples=50)
+
+    assert capped == EquityCalculator(samples=50, seed=3).calculate(hands)
+    assert calculator.calculate(hands) == EquityCalculator(
+        samples=400, seed=3
+    ).calculate(hands)
+
+
+def test_warm_up_starts_every_worker():
+    executor = ThreadPoolExecutor(max_workers=2)
+    calculator = EquityCalculator(max_workers=2, executor=executor)
+    submit = MagicMock(wraps=executor.submit)
+    executor.submit = submit
+
+    try:
+        asyncio.run(calculator.warm_up())
+    finally:
+        executor.shutdown()
+
+    assert submit.call_count == 2
@@ -0,0 +1,47 @@
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+from pokerapp.utils import fingerprint
+from pokerapp.utils.fingerprint import content_fingerprint, markup_fingerprint
+
+
+def _keyboard(label: str = "Call") -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        [
+            [
+                InlineKeyboardButton(label, callback_data="call"),
+                InlineKeyboardButton("Fold", callback_data="fold"),
+            ]
+        ]
+    )
+
+
+def test_equal_payloads_share_a_fingerprint():
+    first = content_fingerprint("Your turn", _keyboard())
+    second = content_fingerprint("Your turn", _keyboard())
+
+    assert first == second
+    assert len(first) == 32
+    assert first != content_fingerprint("Your turn", _keyboard("Check"))
+    assert first != content_fingerprint("Their turn", _keyboard())
+    assert content_fingerprint("Your turn") == content_fingerprint("Your turn", None)
+
+
+def test_frozen_markup_digest_is_reused(monkeypatch):
+    keyboard = _keyboard()
+    digest = markup_fingerprint(keyboard)
+
+    def _fail(_markup):
+        raise AssertionError("markup serialised twice")
+
+    monkeypatch.setattr(fingerprint, "serialize_markup", _fail)
+
+    assert markup_fingerprint(keyboard) == digest
+
+
+def test_mutable_markup_is_rehashed():
+    keyboard = {"inline_keyboard": [[{"text": "Call"}]]}
+    before = markup_fingerprint(keyboard)
+
+    keyboard["inline_keyboard"][0][0]["text"] = "Check"
+
+    assert markup_fingerprint(keyboard) != before
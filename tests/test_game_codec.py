@@ -0,0 +1,221 @@
+import pickle
+from types import SimpleNamespace
+
+import pytest
+
+from pokerapp import game_codec
+from pokerapp.entities import MAX_PLAYERS, Game, GameState, Player, PlayerState
+
+
+def _make_game() -> Game:
+    game = Game()
+    game.chat_id = -100200
+    for seat in range(3):
+        player = Player(
+            user_id=10 + seat,
+            mention_markdown=f"[P{seat}](tg://user?id={10 + seat})",
+            wallet=None,
+            ready_message_id=str(500 + seat),
+        )
+        game.add_player(player, seat)
+        player.cards = [game.remain_cards.pop(), game.remain_cards.pop()]
+        player.anchor_message = (game.chat_id, 700 + seat)
+        player.display_name = f"Player {seat}"
+    game.seats[2].state = PlayerState.FOLD
+    game.state = GameState.ROUND_FLOP
+    game.cards_table = [game.remain_cards.pop() for _ in range(3)]
+    game.pot = 90
+    game.ready_users = {10, 11, 12}
+    game.message_ids = {10: 901, 11: 902}
+    game.turn_deadline = 1700000000.25
+    game.trading_end_user_id = 11
+    for callback_id in ("4382188484382188484", "0123", "abc"):
+        game.mark_callback_processed(callback_id)
+    return game
+
+
+def _state(obj):
+    state = dict(obj.__dict__)
+    state.pop("seats", None)
+    return state
+
+
+def test_round_trip_matches_pickle():
+    game = _make_game()
+    data = game_codec.encode_game(game)
+    restored = game_codec.decode_game(data)
+    expected = pickle.loads(pickle.dumps(game))
+
+    assert _state(restored) == _state(expected)
+    assert list(restored._processed_callback_order) == ["4382188484382188484", "0123", "abc"]
+    for seat, other in zip(restored.seats, expected.seats):
+        assert (seat is None) == (other is None)
+        if seat is not None:
+            assert seat.__dict__ == other.__dict__
+    assert restored.seats[0].cards[0] is game.seats[0].cards[0]
+    assert isinstance(restored.seats[0].anchor_message, tuple)
+
+
+def test_binary_snapshot_is_smaller_than_pickle():
+    game = _make_game()
+
+    assert len(game_codec.encode_game(game)) * 3 <= len(pickle.dumps(game))
+
+
+def test_full_table_snapshot_stays_three_times_smaller_than_pickle():
+    game = Game()
+    game.chat_id = -1001000000042
+    for seat in range(MAX_PLAYERS):
+        user_id = 5_000_000_000 + seat
+        player = Player(
+            user_id=user_id,
+            mention_markdown=f"[Player {seat}](tg://user?id={user_id})",
+            wallet=SimpleNamespace(_user_id=user_id),
+            ready_message_id=str(400_000 + seat),
+        )
+        game.add_player(player, seat)
+        player.cards = [game.remain_cards.pop(), game.remain_cards.pop()]
+        player.round_rate = 40
+        player.total_bet = 100
+        player.anchor_message = (game.chat_id, 600_000 + seat)
+        player.private_chat_id = user_id
+        player.private_keyboard_message = (user_id, 800_000 + seat)
+        player.display_name = f"Player {seat}"
+        player.username = f"player_{seat}"
+    game.state = GameState.ROUND_RIVER
+    game.cards_table = [game.remain_cards.pop() for _ in range(5)]
+    game.pot = 800
+    game.ready_users = {player.user_id for player in game.players}
+    game.message_ids = {player.user_id: 900_000 + i for i, player in enumerate(game.players)}
+    game.last_actions = [f"Player {seat}: call 40" for seat in range(MAX_PLAYERS)]
+    for callback_id in range(40):
+        game.mark_callback_processed(str(7_000_000_000_000 + callback_id))
+    game_codec._stable_blobs.clear()
+
+    assert len(game_codec.encode_game(game)) * 3 <= len(pickle.dumps(game))
+
+
+def test_wallet_owner_is_kept_for_rehydration():
+    game = Game()
+    wallet = SimpleNamespace(_user_id="user1")
+    game.add_player(Player("user1", "@u1", wallet, "ready"), 0)
+
+    restored = game_codec.decode_game(game_codec.encode_game(game))
+
+    assert restored.seats[0].wallet is None
+    assert restored.seats[0]._wallet_info == {"user_id": "user1"}
+
+
+def test_loads_accepts_legacy_pickle():
+    game = _make_game()
+
+    restored = game_codec.loads(pickle.dumps(game))
+
+    assert restored.pot == 90
+    assert restored.seats[1].user_id == 11
+
+
+def test_unsupported_values_fall_back_to_pickle():
+    game = _make_game()
+    game.unexpected = object()
+
+    with pytest.raises(game_codec.SnapshotCodecError):
+        game_codec.encode_game(game)
+    data = game_codec.dumps(game)
+
+    assert not game_codec.is_binary_snapshot(data)
+
+
+def test_missing_attributes_get_defaults():
+    game = _make_game()
+    del game.seat_announcement_message_id
+
+    restored = game_codec.decode_game(game_codec.encode_game(game))
+
+    assert restored.seat_announcement_message_id is None
+
+
+def test_corrupt_snapshot_raises_codec_error():
+    data = game_codec.encode_game(_make_game())
+
+    with pytest.raises(game_codec.SnapshotCodecError):
+        game_codec.decode_game(data[:12])
+    with pytest.raises(game_codec.SnapshotCodecError):
+        game_codec.decode_game(game_codec.MAGIC + bytes((99, 0)))
+
+
+def test_numeric_callback_history_round_trips():
+    game = Game()
+    ids = ["4382188484382188484", "0", "18446744073709551616", "7"]
+    for callback_id in ids:
+        game.mark_callback_processed(callback_id)
+    numeric = Game()
+    for callback_id in ("4382188484382188484", "12", "7"):
+        numeric.mark_callback_processed(callback_id)
+
+    for source in (game, numeric):
+        restored = game_codec.decode_game(game_codec.encode_game(source))
+        assert list(restored._processed_callback_order) == list(
+            source._processed_callback_order
+        )
+        assert restored.processed_callbacks == source.processed_callbacks
+
+
+def test_in_hand_changes_reuse_the_deflated_roster():
+    game = _make_game()
+    first = game_codec.encode_game(game)
+    cached = len(game_codec._stable_blobs)
+
+    game.pot += 20
+    game.seats[0].round_rate = 20
+    game.last_actions.append("P0: raise 20")
+    second = game_codec.encode_game(game)
+
+    restored = game_codec.decode_game(second)
+    assert restored.pot == 110
+    assert restored.seats[0].round_rate == 20
+    assert restored.seats[0].mention_markdown == "[P0](tg://user?id=10)"
+    # Only the volatile part changed, so the deflated roster was reused.
+    assert len(game_codec._stable_blobs) == cached
+    assert first[-40:] == second[-40:]
+
+
+def test_delta_replays_in_hand_changes():
+    game = _make_game()
+    snapshot = game_codec.encode_game(game)
+    baseline = game_codec.capture_baseline(game)
+
+    game.seats[0].round_rate = 40
+    game.seats[0].total_bet = 60
+    game.seats[0].has_acted = True
+    game.pot = 130
+    game.max_round_rate = 40
+    game.current_player_index = 1
+    game.last_actions.append("P0 raised to 40")
+    game.mark_callback_processed("next-callback")
+    data, baseline = game_codec.encode_delta(baseline, game)
+
+    assert data.startswith(game_codec.DELTA_MAGIC)
+    assert len(data) < 120
+
+    restored = game_codec.decode_game(snapshot)
+    game_codec.apply_delta(restored, data)
+    expected = pickle.loads(pickle.dumps(game))
+    assert _state(restored) == _state(expected)
+    assert restored.seats[0].__dict__ == expected.seats[0].__dict__
+
+    unchanged, _ = game_codec.encode_delta(baseline, game)
+    assert unchanged == b""
+
+
+def test_delta_unavailable_across_street_and_roster_changes():
+    game = _make_game()
+    baseline = game_codec.capture_baseline(game)
+
+    game.state = GameState.ROUND_TURN
+    assert game_codec.encode_delta(baseline, game) is None
+
+    game = _make_game()
+    baseline = game_codec.capture_baseline(game)
+    game.seats[3] = Player(99, "@p99", None, "r")
+    assert game_codec.encode_delta(baseline, game) is None
@@ -397,6 +397,7 @@ async def test_determine_winners_returns_payouts_and_labels_for_showdown():
         payouts: Dict[int, int],
         hand_labels: Dict[int, Optional[str]],
         chat_id: int,
+        equities: Optional[Dict[str, float]] = None,
     ) -> List[Dict[str, Any]]:
         payouts[active_player.user_id] += 75
         hand_labels[active_player.user_id] = "label"
@@ -1,5 +1,6 @@
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, call
@@ -7,9 +8,12 @@ from unittest.mock import AsyncMock, MagicMock, call
 import pytest
 from telegram.error import RetryAfter
 
+from pokerapp.cards import Card
 from pokerapp.config import GameConstants
 from pokerapp.entities import Game, GameState, Player, PlayerState, UserException
+from pokerapp.equity import EquityCalculator
 from pokerapp.game_engine import GameEngine
+from pokerapp.winnerdetermination import WinnerDetermination
 from pokerapp.utils.request_metrics import RequestCategory
 from pokerapp.utils.telegram_safeops import TelegramSafeOps
 
@@ -662,3 +666,129 @@ def test_game_engine_custom_stop_translations(tmp_path):
         player=player.mention_markdown,
     )
     assert expected_line in message
+
+
+def test_determine_pot_winners_uses_tie_groups_per_side_pot(game_engine_setup):
+    engine = game_engine_setup.engine
+    engine._winner_determination = WinnerDetermination()
+
+    game = Game()
+    game.cards_table = [Card("2♣"), Card("7♦"), Card("9♠"), Card("J♥"), Card("K♦")]
+    players = []
+    for user_id, cards, total_bet in (
+        (1, [Card("A♠"), Card("A♦")], 20),
+        (2, [Card("K♠"), Card("Q♣")], 50),
+        (3, [Card("K♣"), Card("Q♦")], 50),
+        (4, [Card("3♠"), Card("4♦")], 80),
+    ):
+        player = Player(
+            user_id=user_id,
+            mention_markdown=f"@{user_id}",
+            wallet=MagicMock(),
+            ready_message_id=f"r{user_id}",
+        )
+        player.cards = cards
+        player.total_bet = total_bet
+        players.append(player)
+    game.pot = sum(player.total_bet for player in players)
+
+    details = engine._evaluate_contender_hands(game, players)
+    winners_by_pot = engine._determine_pot_winners(game, details)
+
+    assert [pot["amount"] for pot in winners_by_pot] == [80, 90, 30]
+    assert [
+        [winner["player"].user_id for winner in pot["winners"]]
+        for pot in winners_by_pot
+    ] == [[1], [2, 3], [4]]
+
+
+@pytest.mark.asyncio
+async def test_calculate_all_in_equity_uses_board_at_all_in(game_engine_setup):
+    engine = game_engine_setup.engine
+    executor = ThreadPoolExecutor(max_workers=1)
+    engine._equity_calculator = EquityCalculator(process_threshold=1, executor=executor)
+
+    game = Game()
+    game.cards_table = [Card("2♣"), Card("7♦"), Card("9♠"), Card("K♦"), Card("3♥")]
+    game.all_in_board_size = 4
+    aces = Player(user_id="1", mention_markdown="@a", wallet=MagicMock(), ready_message_id="r1")
+    kings = Player(user_id="2", mention_markdown="@k", wallet=MagicMock(), ready_message_id="r2")
+    aces.cards = [Card("A♠"), Card("A♥")]
+    kings.cards = [Card("K♠"), Card("K♥")]
+
+    submit = MagicMock(wraps=executor.submit)
+    executor.submit = submit
+    try:
+        equities = await engine._calculate_all_in_equity(game, [aces, kings])
+    finally:
+        executor.shutdown()
+
+    # Large jobs go to the pool, and keys match the view's user_id lookup.
+    submit.assert_called_once()
+    assert equities["1"] == pytest.approx(2 / 44)
+    assert equities["2"] == pytest.approx(42 / 44)
+
+    game.all_in_board_size = None
+    assert await engine._calculate_all_in_equity(game, [aces, kings]) == {}
+
+
+@pytest.mark.asyncio
+async def test_finalize_game_prices_all_in_equity_before_lock(game_engine_setup):
+    engine = game_engine_setup.engine
+    engine._clear_game_messages = AsyncMock(return_value=set())
+    engine._notify_results = AsyncMock()
+    engine._execute_payouts = AsyncMock()
+    engine._reset_game_state = AsyncMock(return_value=None)
+    engine._record_hand_results = AsyncMock()
+    engine._prepare_hand_statistics = MagicMock(return_value=None)
+    engine._player_manager.send_join_prompt = AsyncMock()
+
+    events = []
+    equities = {"1": 0.25, "2": 0.75}
+
+    async def fake_equity(game, players):
+        events.append("equity")
+        return equities
+
+    @asynccontextmanager
+    async def fake_guard(**_kwargs):
+        events.append("lock")
+        yield
+
+    engine._calculate_all_in_equity = AsyncMock(side_effect=fake_equity)
+    engine._determine_winners = AsyncMock(return_value=({}, {}, []))
+    engine._trace_lock_guard = MagicMock(side_effect=lambda **kwargs: fake_guard(**kwargs))
+
+    game = Game()
+    game.state = GameState.ROUND_RIVER
+
+    with pytest.warns(DeprecationWarning):
+        await engine.finalize_game(
+            context=SimpleNamespace(chat_data={}), game=game, chat_id=-789
+        )
+
+    assert events == ["equity", "lock"]
+    assert engine._determine_winners.await_args.kwargs["equities"] is equities
+
+
+@pytest.mark.asyncio
+async def test_start_warms_equity_worker_pool(game_engine_setup):
+    engine = game_engine_setup.engine
+    calculator = MagicMock()
+    calculator.warm_up = AsyncMock()
+    engine._equity_calculator = calculator
+
+    await engine.start()
+
+    calculator.warm_up.assert_awaited_once_with()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_releases_equity_worker_pool(game_engine_setup):
+    engine = game_engine_setup.engine
+    calculator = MagicMock()
+    engine._equity_calculator = calculator
+
+    await engine.shutdown()
+
+    calculator.shutdown.assert_called_once_with()
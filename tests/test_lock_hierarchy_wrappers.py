@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 import pytest
@@ -45,3 +46,58 @@ async def test_table_then_player_lock_violates_hierarchy():
         async with manager.acquire_table_write_lock(chat_id=104):
             async with manager.acquire_player_lock(chat_id=104, user_id=10):
                 pass  # pragma: no cover - hierarchy violation should raise
+
+
+
+@pytest.mark.asyncio
+async def test_acquire_batch_takes_keys_in_canonical_order():
+    manager = LockManager(logger=logging.getLogger("hierarchy-batch"))
+
+    keys = ["player_report:5", "wallet:5", "stage:105"]
+    async with manager.acquire_batch(keys, timeout=1.0) as results:
+        assert results == {key: True for key in keys}
+        # Highest level first, ties broken by key.
+        assert [acq.key for acq in manager._get_current_acquisitions()] == [
+            "stage:105",
+            "wallet:5",
+            "player_report:5",
+        ]
+
+    assert manager._get_current_acquisitions() == []
+
+
+@pytest.mark.asyncio
+async def test_acquire_batch_rolls_back_on_failure():
+    manager = LockManager(logger=logging.getLogger("hierarchy-batch-rollback"))
+    holder_ready = asyncio.Event()
+    release_holder = asyncio.Event()
+
+    async def hold_second_player() -> None:
+        async with manager.guard("player:106:2", timeout=1.0):
+            holder_ready.set()
+            await release_holder.wait()
+
+    holder = asyncio.create_task(hold_second_player())
+    await holder_ready.wait()
+    try:
+        async with manager.acquire_batch(
+            ["player:106:2", "player:106:1"], timeout=0.1
+        ) as results:
+            assert results == {"player:106:1": False, "player:106:2": False}
+            # The first player lock was released before the body ran.
+            assert manager._get_current_acquisitions() == []
+            assert not manager._locks["player:106:1"].locked()
+    finally:
+        release_holder.set()
+        await holder
+
+
+@pytest.mark.asyncio
+async def test_acquire_batch_validates_the_set_before_acquiring():
+    manager = LockManager(logger=logging.getLogger("hierarchy-batch-violation"))
+
+    async with manager.acquire_table_write_lock(chat_id=107):
+        with pytest.raises(LockHierarchyViolation):
+            async with manager.acquire_batch(["player:107:1", "player:107:2"]):
+                pass  # pragma: no cover - hierarchy violation should raise
+        assert "player:107:1" not in manager._locks
@@ -5,7 +5,7 @@ from typing import List
 
 import pytest
 
-from pokerapp.lock_manager import LockManager, LockOrderError
+from pokerapp.lock_manager import DeadlockDetected, LockManager, LockOrderError
 
 
 class _ListHandler(logging.Handler):
@@ -314,6 +314,8 @@ async def test_detect_deadlock_cycle_detection() -> None:
         max_retries=0,
         retry_backoff_seconds=0.01,
     )
+    # Let the cycle form so the on-demand snapshot can report it.
+    manager._enable_deadlock_detection = False
 
     ready_stage = asyncio.Event()
     ready_player = asyncio.Event()
@@ -384,6 +386,90 @@ async def test_detect_deadlock_cycle_detection() -> None:
         await task_two_future
 
 
+@pytest.mark.asyncio
+async def test_waiting_into_cycle_raises_deadlock_detected() -> None:
+    manager = LockManager(
+        logger=logging.getLogger("lock_manager_test_deadlock_incremental"),
+        default_timeout_seconds=5,
+        max_retries=0,
+    )
+    holding_a = asyncio.Event()
+    holding_b = asyncio.Event()
+    release_first = asyncio.Event()
+
+    async def first() -> None:
+        async with manager.guard("wallet:a", timeout=5, level=5):
+            holding_a.set()
+            await holding_b.wait()
+            await manager.acquire("wallet:b", timeout=5, level=5)
+            await release_first.wait()
+            await manager.release("wallet:b")
+
+    async def second() -> None:
+        async with manager.guard("wallet:b", timeout=5, level=5):
+            holding_b.set()
+            await holding_a.wait()
+            await asyncio.sleep(0.05)
+            await manager.acquire("wallet:a", timeout=5, level=5)
+
+    first_task = asyncio.create_task(first(), name="cycle-first")
+    second_task = asyncio.create_task(second(), name="cycle-second")
+
+    with pytest.raises(DeadlockDetected) as excinfo:
+        await second_task
+
+    assert excinfo.value.keys == ["wallet:a", "wallet:b"]
+    assert "cycle-second" in excinfo.value.cycle[0][0]
+    assert "cycle-first" in excinfo.value.cycle[1][0]
+    assert manager.get_metrics()["deadlock_cycles"] == 1
+
+    release_first.set()
+    await first_task
+
+
+@pytest.mark.asyncio
+async def test_contention_profile_exports_collapsed_stacks() -> None:
+    manager = LockManager(
+        logger=logging.getLogger("lock_manager_test_profile"),
+        default_timeout_seconds=5,
+    )
+    manager._smart_retry_enabled = False
+    manager.set_contention_profiling(1)
+    manager.set_stage_resolver(lambda chat_id: "ROUND_FLOP" if chat_id == -7 else None)
+
+    async def settle_pot() -> None:
+        async with manager.table_write_lock(-7):
+            await asyncio.sleep(0.02)
+
+    async def read_stats() -> None:
+        async with manager.table_read_lock(-7):
+            pass
+
+    writer = asyncio.create_task(settle_pot())
+    await asyncio.sleep(0)
+    await read_stats()
+    await writer
+
+    hold_lines = manager.export_contention_profile("hold").splitlines()
+    wait_lines = manager.export_contention_profile("wait").splitlines()
+
+    write_line = next(line for line in hold_lines if line.startswith("table_write;"))
+    assert write_line.startswith("table_write;ROUND_FLOP;")
+    assert "settle_pot" in write_line
+    assert int(write_line.rsplit(" ", 1)[1]) >= 15_000
+    assert any(
+        line.startswith("table_read;ROUND_FLOP;") and "read_stats" in line
+        for line in wait_lines
+    )
+
+    manager.set_contention_profiling(0)
+    async with manager.table_write_lock(-7):
+        pass
+    assert len(manager.contention_profile()["rows"]) == 2
+    manager.reset_contention_profile()
+    assert manager.export_contention_profile() == ""
+
+
 @pytest.fixture
 def rw_lock_manager() -> LockManager:
     """Return a fresh lock manager instance for read/write lock tests."""
@@ -661,3 +747,138 @@ async def test_wait_time_metrics_accuracy(rw_lock_manager: LockManager) -> None:
     assert metrics.total_read_wait_time > 0.14
     assert metrics.max_read_wait_time > 0.14
     assert metrics.average_read_wait_time() > 0.14
+
+
+@pytest.mark.asyncio
+async def test_writer_release_admits_waiting_readers_as_one_batch(
+    rw_lock_manager: LockManager,
+) -> None:
+    chat_id = 1001
+    writer_holding = asyncio.Event()
+    release_writer = asyncio.Event()
+    inside: list[int] = []
+    max_concurrent = 0
+
+    async def writer() -> None:
+        async with rw_lock_manager.table_write_lock(chat_id):
+            writer_holding.set()
+            await release_writer.wait()
+
+    async def reader(reader_id: int) -> None:
+        nonlocal max_concurrent
+        async with rw_lock_manager.table_read_lock(chat_id):
+            inside.append(reader_id)
+            max_concurrent = max(max_concurrent, len(inside))
+            await asyncio.sleep(0.01)
+            inside.remove(reader_id)
+
+    writer_task = asyncio.create_task(writer())
+    await writer_holding.wait()
+    readers = [asyncio.create_task(reader(i)) for i in range(5)]
+    await asyncio.sleep(0.01)
+
+    state = rw_lock_manager._table_rw_locks[chat_id]
+    assert len(state.waiters) == 5
+
+    release_writer.set()
+    await asyncio.gather(writer_task, *readers)
+
+    assert max_concurrent == 5
+    assert state.is_idle()
+
+
+@pytest.mark.asyncio
+async def test_reader_preference_admits_readers_past_waiting_writer(
+    rw_lock_manager: LockManager,
+) -> None:
+    rw_lock_manager.writer_priority = False
+    chat_id = 1002
+    events: list[str] = []
+    first_reader_in = asyncio.Event()
+
+    async def first_reader() -> None:
+        async with rw_lock_manager.table_read_lock(chat_id):
+            first_reader_in.set()
+            await asyncio.sleep(0.05)
+        events.append("first_reader_released")
+
+    async def writer() -> None:
+        async with rw_lock_manager.table_write_lock(chat_id):
+            events.append("writer_acquired")
+
+    async def late_reader() -> None:
+        async with rw_lock_manager.table_read_lock(chat_id):
+            events.append("late_reader_acquired")
+
+    reader_task = asyncio.create_task(first_reader())
+    await first_reader_in.wait()
+    writer_task = asyncio.create_task(writer())
+    await asyncio.sleep(0.01)
+    await late_reader()
+    await asyncio.gather(reader_task, writer_task)
+
+    assert events.index("late_reader_acquired") < events.index("writer_acquired")
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_writer_unblocks_readers(
+    rw_lock_manager: LockManager,
+) -> None:
+    chat_id = 1003
+    reader_in = asyncio.Event()
+    release_reader = asyncio.Event()
+
+    async def holder() -> None:
+        async with rw_lock_manager.table_read_lock(chat_id):
+            reader_in.set()
+            await release_reader.wait()
+
+    holder_task = asyncio.create_task(holder())
+    await reader_in.wait()
+
+    async def writer() -> None:
+        async with rw_lock_manager.table_write_lock(chat_id):
+            pass
+
+    writer_task = asyncio.create_task(writer())
+    await asyncio.sleep(0.01)
+
+    state = rw_lock_manager._table_rw_locks[chat_id]
+    assert state.writer_waiting == 1
+    writer_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await writer_task
+    assert state.writer_waiting == 0
+
+    async def second_reader() -> None:
+        async with rw_lock_manager.table_read_lock(chat_id):
+            pass
+
+    await asyncio.wait_for(second_reader(), timeout=0.5)
+    release_reader.set()
+    await holder_task
+    assert state.is_idle()
+
+
+@pytest.mark.asyncio
+async def test_wait_histogram_reported_per_table(
+    rw_lock_manager: LockManager,
+) -> None:
+    chat_id = 1004
+
+    async def blocking_writer() -> None:
+        async with rw_lock_manager.table_write_lock(chat_id):
+            await asyncio.sleep(0.03)
+
+    async def waiting_reader() -> None:
+        await asyncio.sleep(0.005)
+        async with rw_lock_manager.table_read_lock(chat_id):
+            pass
+
+    await asyncio.gather(blocking_writer(), waiting_reader())
+
+    stats = rw_lock_manager.get_metrics()["table_lock_stats"][chat_id]
+    assert sum(stats["wait_histogram"]["read"].values()) == 1
+    assert sum(stats["wait_histogram"]["write"].values()) == 1
+    assert stats["wait_histogram"]["read"]["le_0.01"] == 0
+    assert stats["p99_read_wait_time"] > 0.02
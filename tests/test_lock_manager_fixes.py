@@ -39,14 +39,73 @@ async def test_batch_cleanup_complete():
         acquired = await lm.acquire(f"cleanup:test:{i}", timeout=1)
         assert acquired
         await lm.release(f"cleanup:test:{i}")
-        lock = await lm._get_lock(f"cleanup:test:{i}")
-        setattr(lock, "_acquired_at_ts", time.time() - 200)
+        lm._lock_state_index.touch("lock", f"cleanup:test:{i}", time.monotonic() - 200)
 
     removed = await lm.cleanup_idle_locks()
 
     assert removed == 250, f"Expected 250 removed, got {removed}"
 
 
+@pytest.mark.asyncio
+async def test_cleanup_never_evicts_held_or_waited_locks():
+    lm = LockManager(logger=logging.getLogger(__name__))
+    held = asyncio.Event()
+    release = asyncio.Event()
+
+    async def hold(key):
+        async with lm.guard(key, timeout=1):
+            held.set()
+            await release.wait()
+
+    holder = asyncio.create_task(hold("evict:held"))
+    await held.wait()
+    waiter = asyncio.create_task(lm.acquire("evict:held", timeout=5))
+    await asyncio.sleep(0.01)
+
+    assert await lm.acquire("evict:idle", timeout=1)
+    await lm.release("evict:idle")
+
+    async with lm.table_read_lock(-100):
+        async with lm.player_lock(-100, 7):
+            aged = time.monotonic() - 200
+            for kind, key in list(lm._lock_state_index._entries):
+                lm._lock_state_index.touch(kind, key, aged)
+
+            removed = await lm.cleanup_idle_locks()
+
+            assert removed == 1
+            assert "evict:idle" not in lm._locks
+            assert "evict:held" in lm._locks
+            assert -100 in lm._table_rw_locks
+            assert (-100, 7) in lm._player_locks
+
+    release.set()
+    await holder
+    assert await waiter
+    await lm.release("evict:held")
+
+
+@pytest.mark.asyncio
+async def test_lock_state_cap_evicts_least_recently_used():
+    lm = LockManager(logger=logging.getLogger(__name__))
+    lm._lock_state_max_entries = 50
+
+    for player_id in range(100):
+        async with lm.player_lock(-200, player_id):
+            pass
+        lm._lock_state_index.touch("player", (-200, player_id), time.monotonic() - 10)
+
+    async with lm.player_lock(-200, 1000):
+        pass
+
+    live = lm.get_metrics()["live_lock_objects"]
+    assert live["player"] <= 50
+    assert (-200, 1000) in lm._player_locks
+    assert (-200, 99) in lm._player_locks
+    assert (-200, 0) not in lm._player_locks
+    assert lm.get_metrics()["lock_evictions"]["player"] >= 50
+
+
 @pytest.mark.asyncio
 async def test_pool_bounds_safety():
     """Verify pool operations are thread-safe."""
@@ -122,3 +181,51 @@ async def test_fast_path_validation_rollback():
     assert not violating_lock._lock.locked()
 
     await lm.release("chat:test")
+
+
+
+@pytest.mark.asyncio
+async def test_call_site_capture_is_sampled():
+    """Only one in ``stack_trace_sample_rate`` calls inspects the stack."""
+
+    lm = LockManager(logger=logging.getLogger(__name__))
+    lm._enable_stack_trace_logging = True
+    lm._stack_trace_sample_rate = 4
+
+    call_sites = [lm._resolve_call_site()[0] for _ in range(8)]
+    assert call_sites.count("unknown") == 6
+
+    lm._stack_trace_sample_rate = 1
+    assert await lm.acquire("sampled:test", timeout=1)
+    lock = await lm._get_lock("sampled:test")
+    assert lock._acquired_by_callsite.startswith(f"{__file__}:")
+    assert lock._acquired_by_function == "test_call_site_capture_is_sampled"
+    await lm.release("sampled:test")
+
+
+@pytest.mark.asyncio
+async def test_fast_path_wait_stays_bounded_during_handoff():
+    """A lock handed to a woken waiter must not block the fast path forever."""
+
+    lm = LockManager(logger=logging.getLogger(__name__), default_timeout_seconds=5)
+
+    key = "handoff:test"
+    lock = await lm._get_lock(key)
+    await lock._lock.acquire()
+    waiter = asyncio.create_task(lock._lock.acquire())
+    await asyncio.sleep(0)
+    # The lock now looks free, but it belongs to the waiter that has not run.
+    lock._lock.release()
+    assert not lock.locked()
+
+    # Call acquire directly so it runs before the waiter; cancel it if hung.
+    watchdog = asyncio.get_running_loop().call_later(
+        1, asyncio.current_task().cancel
+    )
+    try:
+        result = await lm.acquire(key, timeout=0.05)
+        assert result is False
+    finally:
+        watchdog.cancel()
+        await waiter
+        lock._lock.release()
@@ -0,0 +1,238 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from pokerapp.utils.messaging_service import MessagingService
+from pokerapp.utils.request_metrics import RequestCategory, RequestMetrics
+
+
+class _GatedBot:
+    """Bot whose first ``send_message`` blocks until ``gate`` is set."""
+
+    def __init__(self) -> None:
+        self.gate = asyncio.Event()
+        self.sent = []
+        self.edit_message_reply_markup = AsyncMock(return_value=True)
+        self.delete_message = AsyncMock(return_value=True)
+
+    async def send_message(self, *, chat_id, text, reply_markup=None, **params):
+        if not self.sent:
+            self.sent.append(text)
+            await self.gate.wait()
+        else:
+            self.sent.append(text)
+        return SimpleNamespace(message_id=100 + len(self.sent))
+
+
+def _make_service(bot) -> MessagingService:
+    return MessagingService(
+        bot,
+        logger_=logging.getLogger("tests.messaging_outbox"),
+        request_metrics=MagicMock(spec=RequestMetrics),
+    )
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_queued_sends_drain_by_priority():
+    bot = _GatedBot()
+    service = _make_service(bot)
+
+    first = asyncio.create_task(service.send_message(chat_id=1, text="first"))
+    await _settle()
+    queued = [
+        asyncio.create_task(
+            service.send_message(chat_id=1, text=text, request_category=category)
+        )
+        for text, category in (
+            ("countdown", RequestCategory.COUNTDOWN),
+            ("general", RequestCategory.GENERAL),
+            ("turn", RequestCategory.TURN),
+            ("engine", RequestCategory.ENGINE_CRITICAL),
+        )
+    ]
+    await _settle()
+    bot.gate.set()
+    await asyncio.wait_for(asyncio.gather(first, *queued), timeout=2)
+
+    assert bot.sent == ["first", "engine", "turn", "general", "countdown"]
+    assert service._outboxes == {}
+
+
+@pytest.mark.asyncio
+async def test_newer_markup_edit_replaces_pending_one():
+    bot = _GatedBot()
+    gate = asyncio.Event()
+    calls = []
+
+    async def edit_markup(*, chat_id, message_id, reply_markup, **params):
+        calls.append(reply_markup)
+        if len(calls) == 1:
+            await gate.wait()
+        return True
+
+    bot.edit_message_reply_markup = edit_markup
+    service = _make_service(bot)
+
+    first = asyncio.create_task(
+        service.edit_message_reply_markup(chat_id=1, message_id=9, reply_markup="a")
+    )
+    await _settle()
+    older = asyncio.create_task(
+        service.edit_message_reply_markup(chat_id=1, message_id=9, reply_markup="b")
+    )
+    newer = asyncio.create_task(
+        service.edit_message_reply_markup(chat_id=1, message_id=9, reply_markup="c")
+    )
+    await _settle()
+    gate.set()
+
+    results = await asyncio.wait_for(asyncio.gather(first, older, newer), timeout=2)
+
+    assert results == [True, True, True]
+    assert calls == ["a", "c"]
+
+
+@pytest.mark.asyncio
+async def test_busy_message_does_not_block_other_messages():
+    bot = _GatedBot()
+    bot.gate.set()
+    gate = asyncio.Event()
+
+    async def edit_markup(*, chat_id, message_id, reply_markup, **params):
+        if message_id == 9:
+            await gate.wait()
+        return True
+
+    bot.edit_message_reply_markup = edit_markup
+    service = _make_service(bot)
+
+    blocked = asyncio.create_task(
+        service.edit_message_reply_markup(chat_id=1, message_id=9, reply_markup="a")
+    )
+    await _settle()
+
+    assert await asyncio.wait_for(
+        service.edit_message_reply_markup(
+            chat_id=1, message_id=10, reply_markup="b"
+        ),
+        timeout=1,
+    )
+    assert await asyncio.wait_for(service.send_message(chat_id=1, text="x"), timeout=1)
+    assert not blocked.done()
+    gate.set()
+    await asyncio.wait_for(blocked, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_delete_waits_for_earlier_requests_of_the_same_message():
+    bot = _GatedBot()
+    gate = asyncio.Event()
+    calls = []
+
+    async def edit_markup(*, chat_id, message_id, reply_markup, **params):
+        calls.append(("markup", reply_markup))
+        if len(calls) == 1:
+            await gate.wait()
+        return True
+
+    async def delete_message(*, chat_id, message_id, **params):
+        calls.append(("delete", message_id))
+        return True
+
+    bot.edit_message_reply_markup = edit_markup
+    bot.delete_message = delete_message
+    service = _make_service(bot)
+
+    first = asyncio.create_task(
+        service.edit_message_reply_markup(chat_id=1, message_id=9, reply_markup="a")
+    )
+    await _settle()
+    queued = asyncio.create_task(
+        service.edit_message_reply_markup(
+            chat_id=1,
+            message_id=9,
+            reply_markup="b",
+            request_category=RequestCategory.COUNTDOWN,
+        )
+    )
+    await _settle()
+    delete = asyncio.create_task(
+        service.delete_message(
+            chat_id=1,
+            message_id=9,
+            request_category=RequestCategory.ENGINE_CRITICAL,
+        )
+    )
+    await _settle()
+    gate.set()
+    await asyncio.wait_for(asyncio.gather(first, queued, delete), timeout=2)
+
+    assert calls == [("markup", "a"), ("markup", "b"), ("delete", 9)]
+
+
+class _GatedLimiter:
+    """Rate limiter whose first permit is held until ``gate`` is set."""
+
+    def __init__(self) -> None:
+        self.gate = asyncio.Event()
+        self.calls = 0
+
+    async def acquire(self, chat_id, *, message_id=None, category=None):
+        self.calls += 1
+        if self.calls == 1:
+            await self.gate.wait()
+        return 0.0
+
+
+@pytest.mark.asyncio
+async def test_send_is_picked_after_its_permit_arrives():
+    bot = _GatedBot()
+    bot.gate.set()
+    limiter = _GatedLimiter()
+    service = MessagingService(
+        bot,
+        logger_=logging.getLogger("tests.messaging_outbox"),
+        request_metrics=MagicMock(spec=RequestMetrics),
+        rate_limiter=limiter,
+    )
+
+    general = asyncio.create_task(service.send_message(chat_id=1, text="general"))
+    await _settle()
+    turn = asyncio.create_task(
+        service.send_message(
+            chat_id=1, text="turn", request_category=RequestCategory.TURN
+        )
+    )
+    await _settle()
+    limiter.gate.set()
+    await asyncio.wait_for(asyncio.gather(general, turn), timeout=2)
+
+    assert bot.sent == ["turn", "general"]
+    # One permit per send: the lane's permit was not taken twice.
+    assert limiter.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_busy_chat_does_not_block_other_chats():
+    bot = _GatedBot()
+    service = _make_service(bot)
+
+    first = asyncio.create_task(service.send_message(chat_id=1, text="first"))
+    await _settle()
+
+    deleted = await asyncio.wait_for(
+        service.delete_message(chat_id=2, message_id=5), timeout=1
+    )
+
+    assert deleted is True
+    assert not first.done()
+    bot.gate.set()
+    await asyncio.wait_for(first, timeout=1)
@@ -0,0 +1,45 @@
+from pokerapp import metrics_server
+
+
+def _call(app, path, query=""):
+    captured = {}
+
+    def start_response(status, headers):
+        captured["status"] = status
+        captured["headers"] = dict(headers)
+
+    body = b"".join(app({"PATH_INFO": path, "QUERY_STRING": query}, start_response))
+    return captured["status"], body.decode()
+
+
+def test_debug_handler_routes_before_metrics():
+    def metrics_app(environ, start_response):
+        start_response("200 OK", [])
+        return [b"metrics"]
+
+    app = metrics_server._make_app(metrics_app)
+    metrics_server.register_debug_handler(
+        "/debug/locks", lambda query: f"metric={query.get('metric')}\n"
+    )
+    try:
+        assert _call(app, "/debug/locks", "metric=wait") == ("200 OK", "metric=wait\n")
+        assert _call(app, "/metrics") == ("200 OK", "metrics")
+    finally:
+        metrics_server.register_debug_handler("/debug/locks", None)
+
+    assert _call(app, "/debug/locks") == ("200 OK", "metrics")
+
+
+def test_failing_debug_handler_returns_500():
+    app = metrics_server._make_app(lambda environ, start_response: [])
+
+    def broken(query):
+        raise RuntimeError("boom")
+
+    metrics_server.register_debug_handler("/debug/broken", broken)
+    try:
+        status, _ = _call(app, "/debug/broken")
+    finally:
+        metrics_server.register_debug_handler("/debug/broken", None)
+
+    assert status.startswith("500")
@@ -841,3 +841,57 @@ def test_send_message_skips_when_validation_fails():
 
     assert result is None
     assert viewer._bot.send_message.await_count == 0
+
+
+def _photo_message(file_id):
+    return SimpleNamespace(
+        photo=[SimpleNamespace(file_id=f"{file_id}-thumb"), SimpleNamespace(file_id=file_id)]
+    )
+
+
+def test_send_desk_cards_img_reuses_uploaded_file_id():
+    viewer = PokerBotViewer(bot=MagicMock())
+    viewer._desk_generator.render_image = AsyncMock(return_value=b"png")
+    viewer._messenger.send_photo = AsyncMock(return_value=_photo_message("board-1"))
+    cards = [Card("A♠"), Card("K♦"), Card("10♥")]
+
+    run(viewer.send_desk_cards_img(chat_id=1, cards=cards))
+    run(viewer.send_desk_cards_img(chat_id=2, cards=cards))
+
+    first, second = viewer._messenger.send_photo.await_args_list
+    assert first.kwargs["photo"].name == "desk.png"
+    assert second.kwargs["photo"] == "board-1"
+    viewer._desk_generator.render_image.assert_awaited_once()
+
+
+def test_edit_desk_cards_img_reuploads_rejected_file_id():
+    viewer = PokerBotViewer(bot=MagicMock())
+    viewer._desk_generator.render_image = AsyncMock(return_value=b"png")
+    viewer._bot.edit_message_media = AsyncMock(
+        side_effect=[BadRequest("Wrong file identifier"), _photo_message("fresh")]
+    )
+    cards = [Card("2♣"), Card("3♣"), Card("4♣"), Card("5♣")]
+    run(viewer._board_images.remember(cards, "stale"))
+
+    assert run(viewer.edit_desk_cards_img(chat_id=3, message_id=9, cards=cards)) is None
+
+    stale_call, upload_call = viewer._bot.edit_message_media.await_args_list
+    assert stale_call.kwargs["media"].media == "stale"
+    assert upload_call.kwargs["media"].media != "stale"
+    assert run(viewer._board_images.get_file_id(cards)) == "fresh"
+
+
+def test_edit_desk_cards_img_keeps_file_id_on_other_bad_request():
+    viewer = PokerBotViewer(bot=MagicMock())
+    viewer._desk_generator.render_image = AsyncMock(return_value=b"png")
+    viewer._bot.edit_message_media = AsyncMock(
+        side_effect=BadRequest("Message is not modified")
+    )
+    cards = [Card("2♦"), Card("3♦"), Card("4♦")]
+    run(viewer._board_images.remember(cards, "known"))
+
+    run(viewer.edit_desk_cards_img(chat_id=3, message_id=9, cards=cards))
+
+    viewer._bot.edit_message_media.assert_awaited_once()
+    viewer._desk_generator.render_image.assert_not_awaited()
+    assert run(viewer._board_images.get_file_id(cards)) == "known"
@@ -0,0 +1,203 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from pokerapp.aiogram_flow import PokerMessagingOrchestrator, RequestManager
+from pokerapp.utils.messaging_service import MessagingService
+from pokerapp.utils.rate_limiter import TelegramPermitLimiter, category_priority
+from pokerapp.utils.request_metrics import RequestCategory, RequestMetrics
+from pokerapp.utils.telegram_safeops import TelegramSafeOps
+
+
+def test_category_priority_orders_engine_turn_countdown():
+    engine = category_priority(RequestCategory.ENGINE_CRITICAL)
+    turn = category_priority(RequestCategory.TURN)
+    general = category_priority("unknown")
+    countdown = category_priority(RequestCategory.COUNTDOWN.value)
+
+    assert engine < turn < general < countdown
+
+
+@pytest.mark.asyncio
+async def test_first_permits_are_granted_without_waiting():
+    limiter = TelegramPermitLimiter(global_per_second=10, chat_per_minute=20)
+
+    waits = [await limiter.acquire(1) for _ in range(5)]
+
+    assert waits == [0.0] * 5
+    assert limiter.get_metrics()["granted"]["general"] == 5
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_granted_in_priority_order():
+    # A slow refill keeps every request queued until the bucket drains.
+    limiter = TelegramPermitLimiter(global_per_second=5, chat_per_minute=600)
+    for _ in range(5):
+        await limiter.acquire(1)
+
+    order = []
+
+    async def request(chat_id, category, label):
+        await limiter.acquire(chat_id, category=category)
+        order.append(label)
+
+    tasks = [
+        asyncio.create_task(request(2, RequestCategory.COUNTDOWN, "countdown")),
+        asyncio.create_task(request(3, RequestCategory.GENERAL, "general")),
+        asyncio.create_task(request(4, RequestCategory.TURN, "turn")),
+        asyncio.create_task(request(5, RequestCategory.ENGINE_CRITICAL, "engine")),
+    ]
+    await asyncio.sleep(0)
+    assert limiter.queue_depth() == {
+        "engine_critical": 1,
+        "turn": 1,
+        "general": 1,
+        "countdown": 1,
+    }
+
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=2)
+
+    assert order == ["engine", "turn", "general", "countdown"]
+    assert sum(limiter.queue_depth().values()) == 0
+
+
+@pytest.mark.asyncio
+async def test_exhausted_chat_does_not_hold_back_other_chats():
+    limiter = TelegramPermitLimiter(global_per_second=100, chat_per_minute=2)
+    await limiter.acquire(1)
+    await limiter.acquire(1)
+
+    blocked = asyncio.create_task(
+        limiter.acquire(1, category=RequestCategory.ENGINE_CRITICAL)
+    )
+    await asyncio.sleep(0)
+
+    waited = await asyncio.wait_for(limiter.acquire(2), timeout=0.5)
+
+    assert waited < 0.1
+    assert not blocked.done()
+    blocked.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await blocked
+    assert sum(limiter.queue_depth().values()) == 0
+
+
+@pytest.mark.asyncio
+async def test_edits_of_one_message_are_spaced():
+    limiter = TelegramPermitLimiter(
+        global_per_second=100, chat_per_minute=1, edit_spacing=0.05
+    )
+
+    assert await limiter.acquire(1, message_id=10) == 0.0
+    # Other messages and edits are not charged to the chat message bucket.
+    assert await limiter.acquire(1, message_id=11) == 0.0
+    assert await limiter.acquire(1) == 0.0
+
+    waited = await limiter.acquire(1, message_id=10)
+
+    assert waited >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_request_manager_waits_for_shared_permits():
+    bot = AsyncMock()
+    limiter = TelegramPermitLimiter(global_per_second=100, chat_per_minute=20)
+    manager = RequestManager(bot, queue_delay=5, rate_limiter=limiter)
+
+    await asyncio.wait_for(
+        manager.send_message(
+            chat_id=1, text="hello", request_category=RequestCategory.TURN
+        ),
+        timeout=1,
+    )
+    await manager.close()
+
+    bot.send_message.assert_awaited_once_with(
+        chat_id=1, text="hello", reply_markup=None
+    )
+    assert limiter.get_metrics()["granted"]["turn"] == 1
+
+
+@pytest.mark.asyncio
+async def test_request_manager_takes_permit_when_the_call_runs():
+    gate = asyncio.Event()
+    bot = AsyncMock()
+
+    async def slow_send(**_kwargs):
+        await gate.wait()
+
+    bot.send_message.side_effect = slow_send
+    limiter = TelegramPermitLimiter(global_per_second=100, chat_per_minute=20)
+    manager = RequestManager(bot, queue_delay=0, rate_limiter=limiter)
+
+    sends = [
+        asyncio.create_task(manager.send_message(chat_id=1, text=f"m{index}"))
+        for index in range(3)
+    ]
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    # Only the call in flight holds a permit; queued calls have none yet.
+    assert limiter.get_metrics()["granted"]["general"] == 1
+
+    gate.set()
+    await asyncio.wait_for(asyncio.gather(*sends), timeout=1)
+    await manager.close()
+    assert limiter.get_metrics()["granted"]["general"] == 3
+
+
+@pytest.mark.asyncio
+async def test_messaging_layers_share_one_permit_budget():
+    limiter = TelegramPermitLimiter(
+        global_per_second=100, chat_per_minute=20, edit_spacing=0.05
+    )
+    bot = AsyncMock()
+    service = MessagingService(
+        bot,
+        logger_=logging.getLogger("tests.rate_limiter"),
+        request_metrics=MagicMock(spec=RequestMetrics),
+        rate_limiter=limiter,
+    )
+
+    async def view_edit(*, chat_id, message_id, text, request_category, **_kwargs):
+        return await service.edit_message_text(
+            chat_id=chat_id,
+            message_id=message_id,
+            text=text,
+            request_category=request_category,
+        )
+
+    safe_ops = TelegramSafeOps(
+        SimpleNamespace(edit_message_text=view_edit),
+        logger=logging.getLogger("tests.rate_limiter"),
+        max_retries=0,
+        base_delay=0.1,
+        max_delay=0.1,
+        backoff_multiplier=1.0,
+        rate_limiter=limiter,
+    )
+    orchestrator = PokerMessagingOrchestrator(
+        bot=bot, chat_id=1, queue_delay=5, rate_limiter=limiter
+    )
+
+    loop = asyncio.get_running_loop()
+    await safe_ops.edit_message_text(chat_id=1, message_id=10, text="one")
+    # The orchestrator edits the same message right away, so it must wait out
+    # the spacing the edit through TelegramSafeOps used up.
+    started = loop.time()
+    await asyncio.wait_for(
+        orchestrator.request_manager.edit_message_text(
+            chat_id=1, message_id=10, text="two"
+        ),
+        timeout=1,
+    )
+    orchestrator_wait = loop.time() - started
+    await service.edit_message_text(chat_id=1, message_id=10, text="three")
+    await orchestrator.request_manager.close()
+
+    assert bot.edit_message_text.await_count == 3
+    assert limiter.get_metrics()["granted"]["general"] == 3
+    assert orchestrator_wait >= 0.04
@@ -1,7 +1,7 @@
 import asyncio
 import logging
 from typing import Dict
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -16,6 +16,14 @@ def _make_lock_manager(mock_redis: AsyncMock, logger_name: str = "lock-test") ->
     )
 
 
+def _mock_redis_with_pipeline() -> AsyncMock:
+    mock_redis = AsyncMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[])
+    mock_redis.pipeline = MagicMock(return_value=pipe)
+    return mock_redis
+
+
 def _smart_retry_config(overrides: Dict[str, float | int | bool | list]) -> Dict[str, object]:
     base: Dict[str, object] = {
         "max_attempts": 3,
@@ -34,29 +42,93 @@ def _smart_retry_config(overrides: Dict[str, float | int | bool | list]) -> Dict
 class TestSmartLockRetry:
     @pytest.mark.asyncio
     async def test_queue_depth_tracking(self) -> None:
-        mock_redis = AsyncMock()
-        mock_redis.llen.return_value = 3
+        mock_redis = _mock_redis_with_pipeline()
 
         lock_manager = _make_lock_manager(mock_redis, "queue-depth")
+        for task_id in ("a", "b", "c"):
+            await lock_manager._enqueue_lock_waiter("test_lock", task_id)
 
         depth = await lock_manager.get_lock_queue_depth("test_lock")
         assert depth == 3
+        mock_redis.hgetall.assert_not_awaited()
+
+        await lock_manager._dequeue_lock_waiter("test_lock", "a")
+        assert await lock_manager.get_lock_queue_depth("test_lock") == 2
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_merges_cluster_depths(self) -> None:
+        mock_redis = _mock_redis_with_pipeline()
 
+        lock_manager = _make_lock_manager(mock_redis, "queue-depth-cluster")
+        await lock_manager._enqueue_lock_waiter("shared_lock", "a")
+        mock_redis.hgetall.return_value = {
+            lock_manager._queue_depth_instance_id.encode(): b"1",
+            b"other-worker": b"4",
+        }
+
+        depth = await lock_manager.get_lock_queue_depth("shared_lock", cluster=True)
+
+        assert depth == 5
         prefix = lock_manager._redis_keys["lock_queue_prefix"]
-        mock_redis.llen.assert_awaited_once_with(f"{prefix}test_lock")
+        mock_redis.hgetall.assert_awaited_once_with(f"{prefix}shared_lock")
 
     @pytest.mark.asyncio
     async def test_queue_depth_handles_redis_failure(self) -> None:
-        mock_redis = AsyncMock()
-        mock_redis.llen.side_effect = ConnectionError("boom")
+        mock_redis = _mock_redis_with_pipeline()
+        mock_redis.hgetall.side_effect = ConnectionError("boom")
 
         lock_manager = _make_lock_manager(mock_redis, "queue-depth-error")
+        await lock_manager._enqueue_lock_waiter("flaky_lock", "a")
+
+        depth = await lock_manager.get_lock_queue_depth("flaky_lock", cluster=True)
+
+        assert depth == 1
 
-        depth = await lock_manager.get_lock_queue_depth("flaky_lock")
+    @pytest.mark.asyncio
+    async def test_guard_waiters_are_counted(self) -> None:
+        lock_manager = LockManager(logger=logging.getLogger("queue-guard"))
+        release = asyncio.Event()
+
+        async def holder() -> None:
+            async with lock_manager.acquire_table_write_lock(1, timeout=1.0):
+                await release.wait()
+
+        async def waiter() -> None:
+            async with lock_manager.acquire_table_write_lock(1, timeout=1.0):
+                pass
+
+        holder_task = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiter_task = asyncio.create_task(waiter())
+        await asyncio.sleep(0.05)
+
+        assert await lock_manager.get_lock_queue_depth("table_write:1") == 1
+
+        release.set()
+        await asyncio.gather(holder_task, waiter_task)
+        assert await lock_manager.get_lock_queue_depth("table_write:1") == 0
 
-        assert depth == 0
+    @pytest.mark.asyncio
+    async def test_publish_queue_depths_batches_changes(self) -> None:
+        mock_redis = _mock_redis_with_pipeline()
+        pipe = mock_redis.pipeline.return_value
+
+        lock_manager = _make_lock_manager(mock_redis, "queue-publish")
+        await lock_manager._enqueue_lock_waiter("lock_a", "t1")
+        await lock_manager._enqueue_lock_waiter("lock_a", "t2")
+        await lock_manager._enqueue_lock_waiter("lock_b", "t3")
+        await lock_manager._dequeue_lock_waiter("lock_b", "t3")
+
+        published = await lock_manager.publish_queue_depths()
+
+        assert published == 2
         prefix = lock_manager._redis_keys["lock_queue_prefix"]
-        mock_redis.llen.assert_awaited_once_with(f"{prefix}flaky_lock")
+        instance_id = lock_manager._queue_depth_instance_id
+        pipe.hset.assert_called_once_with(f"{prefix}lock_a", instance_id, 2)
+        pipe.hdel.assert_called_once_with(f"{prefix}lock_b", instance_id)
+        pipe.execute.assert_awaited_once()
+        mock_redis.lpush.assert_not_awaited()
+        assert await lock_manager.publish_queue_depths() == 0
 
     @pytest.mark.asyncio
     async def test_smart_retry_with_backoff(self) -> None:
@@ -74,16 +146,18 @@ class TestSmartLockRetry:
         assert acquired is True
         assert mock_redis.set.await_count == 3
         assert mock_sleep.await_count == 2
-        assert mock_redis.lpush.await_count == 1
-        assert mock_redis.lrem.await_count == 1
+        mock_redis.lpush.assert_not_awaited()
+        mock_redis.lrem.assert_not_awaited()
+        assert await lock_manager.get_lock_queue_depth("test_lock") == 0
 
     @pytest.mark.asyncio
     async def test_smart_retry_with_queue_depth(self) -> None:
-        mock_redis = AsyncMock()
-        mock_redis.llen.return_value = 10
+        mock_redis = _mock_redis_with_pipeline()
         mock_redis.set.return_value = False
 
         lock_manager = _make_lock_manager(mock_redis, "queue-threshold")
+        for index in range(10):
+            await lock_manager._enqueue_lock_waiter("congested_lock", str(index))
         lock_manager._system_constants = _smart_retry_config(
             {
                 "queue_depth_threshold": 2,
@@ -121,8 +195,10 @@ class TestSmartLockRetry:
         )
 
         assert all(results)
-        assert mock_redis.lpush.await_count == 5
-        assert mock_redis.lrem.await_count == 5
+        for index in range(1, 6):
+            depth = await lock_manager.get_lock_queue_depth(f"shared_lock_task{index}")
+            assert depth == 0
+        assert lock_manager._queue_depths.has_dirty()
 
     @pytest.mark.asyncio
     async def test_grace_buffer_timeout(self) -> None:
@@ -4,8 +4,10 @@ import pytest
 import fakeredis
 import fakeredis.aioredis
 
-from pokerapp.entities import Game, Player
+from pokerapp.cards import Card
+from pokerapp.entities import Game, GameState, Player
 from pokerapp.pokerbotmodel import WalletManagerModel
+from pokerapp import game_codec
 from pokerapp.table_manager import TableManager
 
 
@@ -107,3 +109,307 @@ async def test_find_game_by_user_after_restart_loads_from_disk():
 
 def test_game_pickle():
     pickle.dumps(Game())
+
+
+def test_game_pickle_round_trips_interned_cards():
+    game = Game()
+    game.cards_table = [game.remain_cards.pop() for _ in range(3)]
+
+    restored = pickle.loads(pickle.dumps(game))
+
+    assert restored.cards_table == game.cards_table
+    assert all(a is b for a, b in zip(restored.cards_table, game.cards_table))
+    assert len(restored.remain_cards) == 49
+
+
+@pytest.mark.asyncio
+async def test_load_game_upgrades_legacy_string_cards():
+    server = fakeredis.FakeServer()
+    redis_async = fakeredis.aioredis.FakeRedis(server=server)
+    tm = TableManager(redis_async, snapshot_codec="pickle")
+
+    chat = 555
+    game = await tm.create_game(chat)
+    wallet = WalletManagerModel("user1", redis_async)
+    player = Player(user_id="user1", mention_markdown="@u1", wallet=wallet, ready_message_id="ready")
+    game.add_player(player, seat_index=0)
+    # Older snapshots stored plain ``str`` cards.
+    game.remain_cards = [str(card) for card in game.remain_cards]
+    await tm.save_game(chat, game)
+
+    loaded_game, _ = await TableManager(redis_async).load_game(chat, validate=False)
+
+    assert loaded_game is not None
+    assert len(loaded_game.remain_cards) == 52
+    assert all(type(card) is Card for card in loaded_game.remain_cards)
+    assert loaded_game.remain_cards[0].value in range(2, 15)
+
+
+@pytest.mark.asyncio
+async def test_binary_snapshots_saved_and_legacy_pickle_still_loads():
+    server = fakeredis.FakeServer()
+    redis_async = fakeredis.aioredis.FakeRedis(server=server)
+    tm = TableManager(redis_async, snapshot_codec="binary")
+
+    chat = 777
+    game = await tm.create_game(chat)
+    wallet = WalletManagerModel("user7", redis_async)
+    game.add_player(
+        Player(user_id="user7", mention_markdown="@u7", wallet=wallet, ready_message_id="r"),
+        seat_index=0,
+    )
+    game.pot = 40
+    await tm.save_game(chat, game)
+
+    raw = await redis_async.get(tm._game_key(chat))
+    assert game_codec.is_binary_snapshot(raw)
+
+    loaded, _ = await TableManager(redis_async).load_game(chat, validate=False)
+    assert loaded.pot == 40
+    assert isinstance(loaded.seats[0].wallet, WalletManagerModel)
+
+    await redis_async.set(tm._game_key(chat), pickle.dumps(game))
+    legacy, _ = await TableManager(redis_async).load_game(chat, validate=False)
+    assert legacy.pot == 40
+    assert legacy.seats[0].user_id == "user7"
+
+
+def test_unknown_snapshot_codec_rejected():
+    redis_async = fakeredis.aioredis.FakeRedis()
+
+    with pytest.raises(ValueError):
+        TableManager(redis_async, snapshot_codec="json")
+
+
+@pytest.mark.asyncio
+async def test_in_hand_saves_write_deltas_replayed_on_cold_load():
+    server = fakeredis.FakeServer()
+    redis_async = fakeredis.aioredis.FakeRedis(server=server)
+    tm = TableManager(redis_async, delta_persistence=True, delta_compact_after=3)
+
+    chat = 888
+    game = await tm.create_game(chat)
+    for seat in range(2):
+        game.add_player(
+            Player(user_id=f"u{seat}", mention_markdown=f"@u{seat}", wallet=None, ready_message_id="r"),
+            seat_index=seat,
+        )
+    await tm.save_game(chat, game)
+    snapshot = await redis_async.get(tm._game_key(chat))
+
+    game.pot = 30
+    game.seats[0].round_rate = 30
+    game.current_player_index = 1
+    await tm.save_game(chat, game)
+
+    assert await redis_async.get(tm._game_key(chat)) == snapshot
+    assert await redis_async.xlen(tm._deltas_key(chat)) == 1
+
+    loaded, _ = await TableManager(redis_async).load_game(chat, validate=False)
+    assert loaded.pot == 30
+    assert loaded.seats[0].round_rate == 30
+    assert loaded.current_player_index == 1
+
+    # Reaching the threshold folds the deltas into a new snapshot.
+    for pot in (40, 50, 60):
+        game.pot = pot
+        await tm.save_game(chat, game)
+    assert await redis_async.xlen(tm._deltas_key(chat)) == 0
+    assert await redis_async.get(tm._game_key(chat)) != snapshot
+
+    # A street change always writes a full snapshot.
+    game.pot = 70
+    await tm.save_game(chat, game)
+    assert await redis_async.xlen(tm._deltas_key(chat)) == 1
+    game.state = GameState.ROUND_FLOP
+    await tm.save_game(chat, game)
+    assert await redis_async.xlen(tm._deltas_key(chat)) == 0
+
+    loaded, _ = await TableManager(redis_async).load_game(chat, validate=False)
+    assert loaded.pot == 70
+    assert loaded.state == GameState.ROUND_FLOP
+
+
+async def _two_seat_game(tm, chat):
+    game = await tm.create_game(chat)
+    for seat in range(2):
+        game.add_player(
+            Player(user_id=f"u{seat}", mention_markdown=f"@u{seat}", wallet=None, ready_message_id="r"),
+            seat_index=seat,
+        )
+    await tm.save_game(chat, game)
+    return game
+
+
+@pytest.mark.asyncio
+async def test_loaded_game_continues_the_delta_chain():
+    server = fakeredis.FakeServer()
+    redis_async = fakeredis.aioredis.FakeRedis(server=server)
+    writer = TableManager(redis_async, delta_persistence=True)
+    chat = 889
+    game = await _two_seat_game(writer, chat)
+    game.pot = 10
+    await writer.save_game(chat, game)
+
+    reader = TableManager(redis_async, delta_persistence=True)
+    loaded, _ = await reader.load_game(chat, validate=False)
+    loaded.pot = 20
+    await reader.save_game(chat, loaded)
+
+    assert await redis_async.xlen(reader._deltas_key(chat)) == 2
+    restored, _ = await TableManager(redis_async).load_game(chat, validate=False)
+    assert restored.pot == 20
+
+
+@pytest.mark.asyncio
+async def test_stale_writer_falls_back_to_a_full_snapshot():
+    server = fakeredis.FakeServer()
+    redis_async = fakeredis.aioredis.FakeRedis(server=server)
+    stale = TableManager(redis_async, delta_persistence=True)
+    chat = 890
+    game = await _two_seat_game(stale, chat)
+
+    # Another worker replaces the snapshot behind the stale writer's back.
+    other = TableManager(redis_async, delta_persistence=True)
+    fresh, _ = await other.load_game(chat, validate=False)
+    fresh.pot = 99
+    fresh.state = GameState.ROUND_FLOP
+    await other.save_game(chat, fresh)
+
+    game.pot = 15
+    await stale.save_game(chat, game)
+
+    # The stale delta was not appended on top of the other snapshot.
+    assert await redis_async.xlen(stale._deltas_key(chat)) == 0
+    restored, _ = await TableManager(redis_async).load_game(chat, validate=False)
+    assert restored.pot == 15
+
+
+@pytest.mark.asyncio
+async def test_replay_skips_deltas_of_another_snapshot():
+    server = fakeredis.FakeServer()
+    redis_async = fakeredis.aioredis.FakeRedis(server=server)
+    tm = TableManager(redis_async, delta_persistence=True)
+    chat = 891
+    game = await _two_seat_game(tm, chat)
+    game.pot = 25
+    await tm.save_game(chat, game)
+    entries = await redis_async.xrange(tm._deltas_key(chat))
+
+    # A snapshot written without clearing the stream (e.g. an older build).
+    game.pot = 5
+    await redis_async.set(tm._game_key(chat), game_codec.encode_game(game))
+    await redis_async.xadd(tm._deltas_key(chat), entries[0][1])
+
+    restored, _ = await TableManager(redis_async).load_game(chat, validate=False)
+    assert restored.pot == 5
+
+
+@pytest.mark.asyncio
+async def test_player_index_written_only_when_roster_changes():
+    server = fakeredis.FakeServer()
+    redis_async = fakeredis.aioredis.FakeRedis(server=server)
+    tm = TableManager(redis_async, delta_persistence=False)
+
+    chat = 555
+    game = await tm.create_game(chat)
+    for seat, user_id in enumerate(("u1", "u2")):
+        game.add_player(
+            Player(user_id=user_id, mention_markdown=f"@{user_id}", wallet=None, ready_message_id="r"),
+            seat_index=seat,
+        )
+    await tm.save_game(chat, game)
+    assert await redis_async.smembers(tm._chat_players_key(chat)) == {b"u1", b"u2"}
+
+    # An unchanged roster leaves the index alone.
+    await redis_async.delete(tm._player_chat_key("u1"))
+    game.pot = 25
+    await tm.save_game(chat, game)
+    assert await redis_async.get(tm._player_chat_key("u1")) is None
+
+    game.remove_player_by_user("u2")
+    game.add_player(
+        Player(user_id="u3", mention_markdown="@u3", wallet=None, ready_message_id="r"),
+        seat_index=2,
+    )
+    await tm.save_game(chat, game)
+    assert await redis_async.smembers(tm._chat_players_key(chat)) == {b"u1", b"u3"}
+    assert await redis_async.get(tm._player_chat_key("u2")) is None
+    assert await redis_async.get(tm._player_chat_key("u3")) == str(chat).encode()
+
+
+@pytest.mark.asyncio
+async def test_player_index_repaired_after_another_writer_saves():
+    server = fakeredis.FakeServer()
+    redis_async = fakeredis.aioredis.FakeRedis(server=server)
+    tm = TableManager(redis_async, delta_persistence=False)
+    other = TableManager(redis_async, delta_persistence=False)
+
+    chat = 556
+    game = await tm.create_game(chat)
+    game.add_player(
+        Player(user_id="u1", mention_markdown="@u1", wallet=None, ready_message_id="r"),
+        seat_index=0,
+    )
+    await tm.save_game(chat, game)
+
+    # Another worker drops the player and rewrites the index.
+    foreign, _ = await other.load_game(chat, validate=False)
+    foreign.remove_player_by_user("u1")
+    await other.save_game(chat, foreign)
+    assert await redis_async.get(tm._player_chat_key("u1")) is None
+
+    # Loading that snapshot expires the cached roster, so saving "u1" again
+    # repairs the index instead of trusting the stale cache.
+    reloaded, _ = await tm.load_game(chat, validate=False)
+    reloaded.add_player(
+        Player(user_id="u1", mention_markdown="@u1", wallet=None, ready_message_id="r"),
+        seat_index=0,
+    )
+    await tm.save_game(chat, reloaded)
+    assert await redis_async.get(tm._player_chat_key("u1")) == str(chat).encode()
+    assert await redis_async.smembers(tm._chat_players_key(chat)) == {b"u1"}
+
+
+@pytest.mark.asyncio
+async def test_save_game_returns_version_written_with_snapshot():
+    server = fakeredis.FakeServer()
+    redis_async = fakeredis.aioredis.FakeRedis(server=server)
+    tm = TableManager(redis_async)
+
+    chat = 777
+    game = await tm.create_game(chat)
+    assert await tm.get_game_version(chat) == 1
+
+    game.pot = 15
+    assert await tm.save_game(chat, game) == 2
+    game.state = GameState.ROUND_PRE_FLOP
+    assert await tm.save_game(chat, game) == 3
+    assert await tm.save_game(chat, game, increment_version=False) is None
+    assert await tm.get_game_version(chat) == 3
+
+    loaded, _ = await TableManager(redis_async).load_game(chat, validate=False)
+    assert loaded.pot == 15
+    assert loaded.state == GameState.ROUND_PRE_FLOP
+
+
+@pytest.mark.asyncio
+async def test_active_games_registry_tracks_saves_and_deletes():
+    server = fakeredis.FakeServer()
+    redis_async = fakeredis.aioredis.FakeRedis(server=server)
+    tm = TableManager(redis_async)
+
+    await tm.create_game(1)
+    await tm.create_game(-1002)
+    # A snapshot written before the registry existed.
+    await redis_async.set(tm._game_key(42), game_codec.encode_game(Game()))
+
+    restarted = TableManager(redis_async)
+    assert sorted(await restarted.get_active_game_ids()) == [-1002, 1]
+
+    assert await restarted.backfill_active_games() == 1
+    assert await restarted.backfill_active_games() == 0
+    assert sorted(await restarted.get_active_game_ids()) == [-1002, 1, 42]
+
+    await restarted.delete_game(1)
+    assert sorted(await restarted.get_active_game_ids()) == [-1002, 42]
@@ -204,3 +204,27 @@ class TestOptimisticLocking:
         assert final_game is not None
         assert final_version == version + 1
         assert final_game.pot in {10, 20}
+
+    @pytest.mark.asyncio
+    async def test_stale_fencing_token_rejected(self) -> None:
+        redis_async = fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer())
+        table_manager = TableManager(redis_async)
+
+        chat_id = 556
+        game = await table_manager.create_game(chat_id)
+        await table_manager.save_game(chat_id, game)
+        _, version = await table_manager.load_game_with_version(chat_id)
+
+        assert await table_manager.save_game_with_version_check(
+            chat_id, game, version, fencing_token=2
+        )
+        # A worker whose lease lapsed still holds token 1 but a current version.
+        assert not await table_manager.save_game_with_version_check(
+            chat_id, game, version + 1, fencing_token=1
+        )
+        assert await table_manager.save_game_with_version_check(
+            chat_id, game, version + 1, fencing_token=2
+        )
+
+        _, final_version = await table_manager.load_game_with_version(chat_id)
+        assert final_version == version + 2
@@ -10,7 +10,7 @@ import pytest_asyncio
 
 from pokerapp.game_engine import GameEngine
 from pokerapp.entities import Game, Player, Wallet
-from pokerapp.lock_manager import LockManager
+from pokerapp.lock_manager import LeaseUnavailable, LockManager
 
 
 class _TestWallet(Wallet):
@@ -256,3 +256,261 @@ async def test_table_lock_timeout_expires(lock_manager: LockManager):
         timeout_seconds=1,
     )
     assert token2 is not None
+
+
+@pytest.mark.asyncio
+async def test_table_lease_renews_past_ttl_and_fences(lock_manager: LockManager):
+    chat_id = 305
+
+    async with lock_manager.table_lease(chat_id, "hand", ttl_seconds=0.3) as lease:
+        assert lease is not None
+        await asyncio.sleep(0.5)
+
+        assert lease.renewals >= 1
+        assert lease.lost is False
+        async with lock_manager.table_lease(chat_id, "hand") as blocked:
+            assert blocked is None
+
+    assert lock_manager.get_metrics()["active_leases"] == 0
+    async with lock_manager.table_lease(chat_id, "hand") as successor:
+        assert successor is not None
+        assert successor.fencing_token > lease.fencing_token
+
+
+@pytest.mark.asyncio
+async def test_lease_marked_lost_when_key_taken_over(lock_manager: LockManager):
+    lease = await lock_manager.acquire_lease(
+        "table:lock:306:hand", fence_scope="306", ttl_seconds=0.3
+    )
+    assert lease is not None
+
+    await lock_manager._redis_pool.set("table:lock:306:hand", "other-worker")
+    await asyncio.sleep(0.2)
+
+    assert lease.lost is True
+    assert lock_manager.get_metrics()["leases_lost"] == 1
+    assert await lock_manager.release_lease(lease) is False
+
+
+@pytest.mark.asyncio
+async def test_table_lock_renews_lease_until_released(lock_manager: LockManager):
+    lock_manager._lease_ttl_seconds = 0.3
+    chat_id = 307
+
+    token = await lock_manager.acquire_table_lock(
+        chat_id=chat_id, operation="join", timeout_seconds=5
+    )
+    assert token is not None
+    assert await lock_manager._redis_pool.pttl("table:lock:307:join") <= 300
+
+    await asyncio.sleep(0.6)
+    assert (
+        await lock_manager.acquire_table_lock(
+            chat_id=chat_id, operation="join", timeout_seconds=5
+        )
+        is None
+    )
+
+    assert await lock_manager.release_table_lock(chat_id, token, "join") is True
+    assert lock_manager.get_metrics()["active_leases"] == 0
+
+
+@pytest.mark.asyncio
+async def test_unreleased_table_lock_stops_renewing_at_timeout(
+    lock_manager: LockManager,
+):
+    lock_manager._lease_ttl_seconds = 0.3
+    chat_id = 308
+
+    token = await lock_manager.acquire_table_lock(
+        chat_id=chat_id, operation="join", timeout_seconds=1
+    )
+    assert token is not None
+
+    await asyncio.sleep(0.6)
+    assert await lock_manager._redis_pool.exists("table:lock:308:join") == 1
+
+    await asyncio.sleep(0.6)
+    assert await lock_manager._redis_pool.exists("table:lock:308:join") == 0
+    assert lock_manager.get_metrics()["active_leases"] == 0
+
+
+def _stage_engine(lock_manager: LockManager, saves: List[Dict[str, object]]):
+    async def save_game_with_version_check(
+        chat_id, game, expected_version, *, fencing_token=None
+    ):
+        saves.append({"version": expected_version, "fencing_token": fencing_token})
+        return True
+
+    table_manager = SimpleNamespace(
+        load_game_with_version=AsyncMock(return_value=(Game(), 3)),
+        save_game_with_version_check=save_game_with_version_check,
+        save_game=AsyncMock(),
+    )
+    player_manager = Mock()
+    player_manager.cleanup_ready_prompt = AsyncMock()
+    player_manager.clear_player_anchors = AsyncMock()
+    request_metrics = Mock()
+    request_metrics.end_cycle = AsyncMock()
+    telegram_ops = Mock()
+    telegram_ops.send_message_safe = AsyncMock()
+
+    return GameEngine(
+        table_manager=table_manager,
+        view=Mock(),
+        winner_determination=Mock(),
+        request_metrics=request_metrics,
+        round_rate=Mock(),
+        player_manager=player_manager,
+        matchmaking_service=Mock(),
+        stats_reporter=Mock(),
+        clear_game_messages=AsyncMock(),
+        build_identity_from_player=lambda player: player,
+        safe_int=int,
+        old_players_key="old_players",
+        telegram_safe_ops=telegram_ops,
+        lock_manager=lock_manager,
+        logger=Mock(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_reset_saves_with_stage_lease_fencing_token(
+    lock_manager: LockManager,
+):
+    chat_id = 309
+    saves: List[Dict[str, object]] = []
+    engine = _stage_engine(lock_manager, saves)
+
+    async with lock_manager.table_lease(chat_id, "stage") as earlier:
+        assert earlier is not None
+
+    async with engine._hold_stage_lease(chat_id):
+        await engine._reset_core_game_state(
+            Game(), context=SimpleNamespace(chat_data={}), chat_id=chat_id
+        )
+
+    assert saves == [{"version": 3, "fencing_token": earlier.fencing_token + 1}]
+    assert engine._stage_leases == {}
+    assert lock_manager.get_metrics()["active_leases"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stage_lease_refused_while_another_worker_holds_it(
+    lock_manager: LockManager,
+):
+    chat_id = 310
+    engine = _stage_engine(lock_manager, [])
+    engine._stage_lock_timeout = 0.1
+
+    async with lock_manager.table_lease(chat_id, "stage") as other_worker:
+        assert other_worker is not None
+        with pytest.raises(LeaseUnavailable):
+            async with engine._hold_stage_lease(chat_id):
+                pytest.fail("entered a stage held by another worker")
+
+    assert engine._stage_leases == {}
+
+
+@pytest.mark.asyncio
+async def test_stop_reset_leaves_the_hand_to_the_lease_owner(
+    lock_manager: LockManager,
+):
+    chat_id = 311
+    engine = _stage_engine(lock_manager, [])
+    engine._stage_lock_timeout = 0.1
+    engine._reset_core_game_state = AsyncMock()
+
+    async with lock_manager.table_lease(chat_id, "stage") as other_worker:
+        assert other_worker is not None
+        await engine._reset_game_state_after_stop(
+            game=Game(), chat_id=chat_id, context=SimpleNamespace(chat_data={})
+        )
+
+    engine._reset_core_game_state.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_reset_runs_unfenced_when_redis_fails(lock_manager: LockManager):
+    from redis.exceptions import ConnectionError as RedisConnectionError
+
+    chat_id = 312
+    saves: List[Dict[str, object]] = []
+    engine = _stage_engine(lock_manager, saves)
+    lock_manager._redis_pool.set = AsyncMock(side_effect=RedisConnectionError("down"))
+
+    async with engine._hold_stage_lease(chat_id):
+        await engine._reset_core_game_state(
+            Game(), context=SimpleNamespace(chat_data={}), chat_id=chat_id
+        )
+
+    assert saves == [{"version": 3, "fencing_token": None}]
+    assert engine._stage_leases == {}
+
+
+@pytest.mark.asyncio
+async def test_short_table_lock_hold_starts_no_renewal_task(
+    lock_manager: LockManager,
+):
+    lock_manager._lease_ttl_seconds = 0.3
+    chat_id = 313
+
+    token = await lock_manager.acquire_table_lock(
+        chat_id=chat_id, operation="join", timeout_seconds=5
+    )
+    assert token is not None
+    lease = lock_manager._active_leases["table:lock:313:join"]
+    assert lease.renew_task is None
+    assert lease.renew_handle is not None
+
+    assert await lock_manager.release_table_lock(chat_id, token, "join") is True
+    await asyncio.sleep(0.15)
+
+    assert lease.renew_task is None
+    assert lease.renew_handle is None
+    assert lock_manager.get_metrics()["active_leases"] == 0
+
+
+@pytest.mark.asyncio
+async def test_busy_finalize_retries_after_the_lease_ttl(lock_manager: LockManager):
+    chat_id = 314
+    engine = _stage_engine(lock_manager, [])
+    engine._stage_lock_timeout = 0.05
+    lock_manager._lease_ttl_seconds = 0.2
+    game = Game()
+    engine._table_manager.load_game = AsyncMock(return_value=(game, None))
+
+    # A worker that crashed mid-settlement: its lease is never renewed.
+    await lock_manager._redis_pool.set("table:lock:314:stage", "crashed", px=200)
+    await engine._finalize_game_legacy(context=None, game=game, chat_id=chat_id)
+
+    retry = engine._finalize_retry_tasks[chat_id]
+    engine._finalize_game_legacy = AsyncMock()
+    await retry
+
+    engine._finalize_game_legacy.assert_awaited_once_with(
+        context=None, game=game, chat_id=chat_id, lease_retries=2
+    )
+    assert engine._finalize_retry_tasks == {}
+
+
+@pytest.mark.asyncio
+async def test_busy_finalize_skips_retry_once_the_owner_settled(
+    lock_manager: LockManager,
+):
+    chat_id = 315
+    engine = _stage_engine(lock_manager, [])
+    engine._stage_lock_timeout = 0.05
+    lock_manager._lease_ttl_seconds = 0.1
+    game = Game()
+    engine._table_manager.load_game = AsyncMock(return_value=(Game(), None))
+
+    async with lock_manager.table_lease(chat_id, "stage") as other_worker:
+        assert other_worker is not None
+        await engine._finalize_game_legacy(context=None, game=game, chat_id=chat_id)
+
+    retry = engine._finalize_retry_tasks[chat_id]
+    engine._finalize_game_legacy = AsyncMock()
+    await retry
+
+    engine._finalize_game_legacy.assert_not_awaited()
@@ -6,6 +6,7 @@ from unittest.mock import AsyncMock
 import pytest
 from telegram.error import BadRequest, RetryAfter, TimedOut
 
+from pokerapp.utils.rate_limiter import TelegramPermitLimiter
 from pokerapp.utils.request_metrics import RequestCategory
 from pokerapp.utils.telegram_safeops import TelegramSafeOps
 
@@ -35,6 +36,7 @@ class _DummyView:
         current_game_id=None,
     ):
         self.calls.edit += 1
+        self.last_edit_category = request_category
         if self._edit_side_effects:
             effect = self._edit_side_effects.pop(0)
             if isinstance(effect, Exception):
@@ -246,3 +248,36 @@ async def test_delete_message_safe_exhausts_retries(monkeypatch, logger):
 
     assert sleep_calls == [0.2]
     assert attempts["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_rate_limiter_replaces_edit_throttle(monkeypatch, logger):
+    view = _DummyView()
+    sleep_calls = []
+
+    async def fake_sleep(duration):
+        sleep_calls.append(duration)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+    safe_ops = TelegramSafeOps(
+        view,
+        logger=logger,
+        max_retries=0,
+        base_delay=0.2,
+        max_delay=1.0,
+        backoff_multiplier=2.0,
+        rate_limiter=TelegramPermitLimiter(),
+    )
+
+    await safe_ops.edit_message_text(chat_id=7, message_id=70, text="one")
+    await safe_ops.edit_message_text(chat_id=7, message_id=70, text="two")
+    assert view.last_edit_category is RequestCategory.GENERAL
+
+    await safe_ops.edit_message_text(
+        chat_id=7, message_id=70, text="three", from_countdown=True
+    )
+
+    assert sleep_calls == []
+    assert view.calls.edit == 3
+    assert view.last_edit_category is RequestCategory.COUNTDOWN
@@ -0,0 +1,87 @@
+"""Tests for the hierarchical timer wheel."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from pokerapp.services.timer_wheel import HierarchicalTimerWheel
+
+
+def test_items_expire_in_deadline_order() -> None:
+    wheel: HierarchicalTimerWheel[str] = HierarchicalTimerWheel(0.1)
+    wheel.schedule(0.35, "c")
+    wheel.schedule(0.15, "a")
+    wheel.schedule(0.15, "b")
+
+    assert wheel.advance(0.1) == []
+    assert wheel.advance(0.2) == ["a", "b"]
+    assert len(wheel) == 1
+    assert wheel.next_expiry() == pytest.approx(0.35)
+    assert wheel.advance(1.0) == ["c"]
+    assert len(wheel) == 0
+
+
+def test_past_deadline_expires_on_next_tick() -> None:
+    wheel: HierarchicalTimerWheel[int] = HierarchicalTimerWheel(0.05, start=10.0)
+    wheel.advance(11.0)
+    wheel.schedule(5.0, 1)
+
+    assert wheel.advance(11.0) == []
+    assert wheel.advance(11.05) == [1]
+
+
+def test_cascading_matches_deadlines_across_levels() -> None:
+    wheel: HierarchicalTimerWheel[int] = HierarchicalTimerWheel(0.01, slots=8, levels=3)
+    rng = random.Random(7)
+    deadlines = {}
+    for item in range(2000):
+        # Includes deadlines beyond the 8**3 tick horizon.
+        deadlines[item] = rng.uniform(0.0, 12.0)
+        wheel.schedule(deadlines[item], item)
+
+    now = 0.0
+    seen = set()
+    while now < 13.0:
+        now += rng.uniform(0.0, 0.1)
+        for item in wheel.advance(now):
+            assert deadlines[item] <= now + 1e-9
+            assert item not in seen
+            seen.add(item)
+        for item, deadline in deadlines.items():
+            if item not in seen:
+                assert deadline > now - 0.011
+    assert seen == set(deadlines)
+
+
+def test_clear_returns_pending_items() -> None:
+    wheel: HierarchicalTimerWheel[str] = HierarchicalTimerWheel(1.0)
+    wheel.schedule(3.0, "x")
+    wheel.schedule(300.0, "y")
+
+    assert sorted(wheel.clear()) == ["x", "y"]
+    assert len(wheel) == 0
+    assert wheel.next_expiry() is None
+    assert wheel.next_due() is None
+
+
+def test_next_due_is_the_first_tick_advance_expires() -> None:
+    wheel: HierarchicalTimerWheel[int] = HierarchicalTimerWheel(0.01, slots=8, levels=3)
+    rng = random.Random(11)
+    for item in range(500):
+        wheel.schedule(rng.uniform(0.0, 8.0), item)
+
+    while len(wheel):
+        due = wheel.next_due()
+        assert due is not None
+        assert wheel.advance(due - 0.001) == []
+        assert wheel.advance(due) != []
+    assert wheel.next_due() is None
+
+
+def test_invalid_configuration_rejected() -> None:
+    with pytest.raises(ValueError):
+        HierarchicalTimerWheel(0)
+    with pytest.raises(ValueError):
+        HierarchicalTimerWheel(1.0, slots=1)
@@ -5,7 +5,12 @@ import unittest
 from typing import Tuple
 
 from pokerapp.cards import Cards, Card
-from pokerapp.winnerdetermination import HandsOfPoker, WinnerDetermination
+from pokerapp.winnerdetermination import (
+    EVALUATOR_COMBINATIONS,
+    EVALUATOR_LOOKUP,
+    HandsOfPoker,
+    WinnerDetermination,
+)
 
 
 HANDS_FILE = "./tests/hands.txt"
@@ -44,6 +49,61 @@ class TestWinnerDetermination(unittest.TestCase):
             best_type, _, best_cards = determinator.determine_best_hand(hands)
             self.assertListEqual(list(best_cards), list(hands[0]))
 
+    def test_lookup_evaluator_matches_combinations(self):
+        """
+        The lookup-table evaluator must reproduce the combination scan exactly
+        for 5, 6 and 7 card inputs built from the fixture hands.
+        """
+
+        with open(HANDS_FILE, "r") as f:
+            game_lines = f.readlines()
+
+        lookup = WinnerDetermination(evaluator=EVALUATOR_LOOKUP)
+        reference = WinnerDetermination(evaluator=EVALUATOR_COMBINATIONS)
+        for ln in game_lines:
+            first, second = TestWinnerDetermination._parse_hands(ln)
+            for player_cards, table_cards in (
+                (first[:2], first[2:]),
+                (second[:2], second[2:]),
+                (first[:2], second),
+                (second[:2], first),
+                (first[:1], second),
+            ):
+                self.assertEqual(
+                    lookup.get_hand_value(player_cards, table_cards),
+                    reference.get_hand_value(player_cards, table_cards),
+                    ln,
+                )
+
+    def test_evaluate_showdown_matches_per_player_evaluation(self):
+        board = [Card("2♣"), Card("3♦"), Card("4♠"), Card("5♥"), Card("K♦")]
+        holes = {
+            "straight": [Card("A♠"), Card("9♦")],
+            "kings": [Card("K♠"), Card("Q♣")],
+            "straight_too": [Card("A♣"), Card("7♥")],
+            "queens": [Card("Q♦"), Card("Q♥")],
+        }
+
+        for evaluator in (EVALUATOR_LOOKUP, EVALUATOR_COMBINATIONS):
+            determinator = WinnerDetermination(evaluator=evaluator)
+            result = determinator.evaluate_showdown(board, holes)
+
+            for key, hole in holes.items():
+                hand = result.hands[key]
+                self.assertEqual(
+                    (hand.hand_type, hand.score, hand.hand_cards),
+                    determinator.get_hand_value(hole, board),
+                )
+            self.assertEqual(
+                result.tie_groups,
+                (("straight", "straight_too"), ("kings",), ("queens",)),
+            )
+            self.assertEqual(result.rank_of("queens"), 2)
+
+    def test_unknown_evaluator_rejected(self):
+        with self.assertRaises(ValueError):
+            WinnerDetermination(evaluator="unknown")
+
     def test_wheel_straight_flush_not_royal(self):
         determinator = WinnerDetermination()
         wheel_cards = [Card("A♣"), Card("2♣"), Card("3♣"), Card("4♣"), Card("5♣")]